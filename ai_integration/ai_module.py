@@ -1,21 +1,55 @@
 # ai_integration/ai_module.py
+import hashlib
 import json
 import logging
 import os
 import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from ai_integration.http_pool import get_http_client, start_warmup
+from ai_integration.scheduler import INTERACTIVE, estimate_tokens, get_scheduler
+from utilities import metrics, tracing
+
 logger = logging.getLogger(__name__)  # Reuse the global logger
 
 # Initialize global variables
 model = None
 prompt_template = None
+delta_prompt_template = None
+
+# Bump whenever the prompt text changes; it is part of every cache key
+PROMPT_VERSION = "1"
+
+# In-memory cache of parsed model responses, keyed by request_cache_key()
+RESPONSE_CACHE_SIZE = 64
+_response_cache = OrderedDict()
+_in_flight = {}  # cache_key -> {"future", "priority", "waiters"}
+_cache_lock = threading.Lock()
+
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "llm_request_seconds", "Model call latency, excluding scheduler queueing."
+)
+LLM_ERRORS = metrics.counter("llm_errors_total", "Model calls that raised an error.")
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total",
+    "Tokens per model call: the estimate charged by the scheduler and the usage reported.",
+    ["kind"],
+)
+RESPONSE_CACHE_REQUESTS = metrics.counter(
+    "llm_response_cache_requests_total",
+    "Recommendation requests by how they were served (hit, joined or miss).",
+    ["result"],
+)
 
 
 # TODO: sFunction to parse the content into a structured format using regex
+@tracing.traced()
 def extract_starred_lines(input_text):
     """
     Extracts lines that contain an asterisk (*) from the input text.
@@ -48,6 +82,7 @@ def extract_starred_lines(input_text):
     return starred_lines
 
 
+@tracing.traced()
 def parse_course_data(starred_lines):
     """
     Parses the array of starred lines and converts them into a list of dictionaries.
@@ -134,11 +169,11 @@ def main_int_ai():
 
     This function prints messages indicating the start and completion of AI integration.
     """
-    global model, prompt_template
+    global model, prompt_template, delta_prompt_template
     print("Initializing AI Integration...")
     try:
-        # Create a ChatOpenAI model
-        model = ChatOpenAI(model="gpt-4o")
+        # Create a ChatOpenAI model on top of the shared HTTP connection pool
+        model = ChatOpenAI(model="gpt-4o", http_client=get_http_client())
     except Exception as e:
         logger.error(f"Error during Create a ChatOpenAI model: {e}")
         sys.exit(1)
@@ -193,6 +228,21 @@ def main_int_ai():
 
     prompt_template = ChatPromptTemplate.from_messages(messages)
 
+    # Same counselor instructions, but only the electives added since the last
+    # generation are rated; the caller merges them into the stored ranking
+    delta_messages = [
+        messages[0],
+        (
+            "human",
+            "These electives were newly added to my degree, in the format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description' {p_electives} . Rate and explain every one of them, and do not recommend any other course.",
+        ),
+    ]
+    delta_prompt_template = ChatPromptTemplate.from_messages(delta_messages)
+
+    # Pay the TCP/TLS setup cost in the background instead of on the first request
+    if os.getenv("AI_ENABLED", "False").lower() == "true":
+        start_warmup()
+
     print("AI Integration Initialized.")
 
 
@@ -255,7 +305,281 @@ def format_elective_string(prerequisites, course_code, units, name, description)
 # What electives should I take to be a game Developer ?
 
 
-def get_recommendations_ai(job_id, job_name, degree_name, degree_electives):
+@tracing.traced()
+def format_electives(degree_electives):
+    """
+    Formats the degree electives into the newline-separated block sent to the model.
+
+    :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :return: str, One 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description' line per elective.
+    """
+    return "\n".join(
+        [
+            format_elective_string(
+                e["prerequisites"],
+                e["course_code"],
+                e["units"],
+                e["name"],
+                e["description"],
+            )
+            for e in degree_electives
+        ]
+    )
+
+
+def request_cache_key(job_name, degree_name, electives_str, delta=False):
+    """
+    Builds the response cache key for a prompt.
+
+    :param job_name: str, The career path in the prompt.
+    :param degree_name: str, The degree in the prompt.
+    :param electives_str: str, The formatted electives block (see format_electives).
+    :param delta: bool, True for the added-electives-only prompt.
+    :return: str, A SHA-256 hex digest that also covers PROMPT_VERSION.
+    """
+    template = "delta" if delta else "full"
+    payload = json.dumps(
+        [PROMPT_VERSION, template, job_name, degree_name, electives_str]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(cache_key):
+    """
+    Returns a cached JSON response for cache_key, or None.
+
+    :param cache_key: str, Key from request_cache_key.
+    :return: str or None, The JSON-formatted string of course recommendations.
+    """
+    with _cache_lock:
+        json_data = _response_cache.get(cache_key)
+        if json_data is not None:
+            _response_cache.move_to_end(cache_key)
+        return json_data
+
+
+def _store_response(cache_key, future):
+    """Done-callback for model requests: caches successful results."""
+    with _cache_lock:
+        _in_flight.pop(cache_key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        _response_cache[cache_key] = future.result()
+        _response_cache.move_to_end(cache_key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _invoke_model(prompt, estimated_tokens):
+    """
+    Calls the model and parses its reply. Runs on a scheduler worker thread.
+
+    :param prompt: The prompt value produced by prompt_template.
+    :param estimated_tokens: int, The token estimate charged when the call was admitted.
+    :return: str, The JSON-formatted string of course recommendations.
+    """
+    logger.debug("---Working---")
+    with tracing.span("model.invoke", estimated_tokens=estimated_tokens) as call:
+        try:
+            with LLM_REQUEST_SECONDS.time():
+                result = model.invoke(prompt)
+        except Exception:
+            LLM_ERRORS.inc()
+            raise
+        usage = getattr(result, "usage_metadata", None) or {}
+        call.set(total_tokens=usage.get("total_tokens"))
+    LLM_TOKENS.labels("estimated").inc(estimated_tokens)
+    if usage.get("total_tokens"):
+        LLM_TOKENS.labels("actual").inc(usage["total_tokens"])
+    get_scheduler().record_usage(estimated_tokens, usage.get("total_tokens"))
+    logger.debug("---DONE---")
+
+    # Logged, not printed: servers and workers must not copy responses to stdout
+    logger.debug("---Raw AI Response---")
+    logger.debug(result.content)
+
+    # Extract lines containing '*'
+    starred_lines = extract_starred_lines(result.content)
+
+    # Print the resulting array
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("---Lines containing '*': Extracted---")
+        for line in starred_lines:
+            logger.debug(line)
+
+    # Parse the raw data
+    courses = parse_course_data(starred_lines)
+
+    logger.debug("---Parsed Courses---")
+    logger.debug(courses)
+
+    # Convert the list of courses to JSON
+    json_data = json.dumps(courses, indent=4)
+
+    logger.debug("---JSON data---")
+    logger.debug(json_data)
+
+    return json_data
+
+
+@tracing.traced()
+def request_recommendations(
+    job_name, degree_name, degree_electives, priority=INTERACTIVE, delta=False
+):
+    """
+    Starts a model request, or joins an identical one that is cached or already running.
+
+    A request that is still queued at a lower priority is moved up to `priority`, so an
+    interactive caller never waits behind its own prefetch.
+
+    :param job_name: str, The name of the job associated with the recommendations.
+    :param degree_name: str, The name of the degree for which recommendations are generated.
+    :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :param priority: int, Scheduler priority class (INTERACTIVE, PREFETCH or BATCH).
+    :param delta: bool, Rate only the given electives (delta_prompt_template) instead of
+        choosing the best ten from them.
+    :return: tuple, (cache_key, Future resolving to the JSON-formatted recommendations).
+    :raises SchedulerFullError: If the scheduler sheds the request.
+    """
+    # Prepare the prompt with the provided parameters
+    # Convert degree_electives to a formatted string
+    # format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
+    electives_str = format_electives(degree_electives)
+    cache_key = request_cache_key(job_name, degree_name, electives_str, delta)
+
+    with _cache_lock:
+        json_data = _response_cache.get(cache_key)
+        if json_data is not None:
+            _response_cache.move_to_end(cache_key)
+            logger.info("Recommendations served from the response cache.")
+            RESPONSE_CACHE_REQUESTS.labels("hit").inc()
+            future = Future()
+            future.set_result(json_data)
+            return cache_key, future
+
+        entry = _in_flight.get(cache_key)
+        if entry is not None:
+            entry["waiters"] += 1
+            if priority < entry["priority"] and get_scheduler().reprioritize(
+                entry["future"], priority
+            ):
+                entry["priority"] = priority
+            logger.info("Joined an in-flight recommendation request.")
+            RESPONSE_CACHE_REQUESTS.labels("joined").inc()
+            return cache_key, entry["future"]
+
+        logger.debug("Formatted electives_str:\n%s", electives_str)
+        template = delta_prompt_template if delta else prompt_template
+        with tracing.span("ai_module.build_prompt", delta=delta):
+            prompt = template.invoke(
+                {
+                    "p_career_path": job_name,
+                    "p_degree": degree_name,
+                    "p_electives": electives_str,
+                }
+            )
+
+        #         """
+        # CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement and analyze machine learning algorithms, including supervised learning and unsupervised learning algorithms. Methods to address uncertainty. Projects with real-world data."
+        # CPSC 131,MATH 338,,CPSC 375,3,Introduction to Data Science and Big Data ,"Techniques for data preparation, exploratory analysis, statistical modeling, machine learning and visualization. Methods for analyzing different types of data, such as natural language and time-series, from emerging applications, including Internet-of-Things. Big data platforms. Projects with real-world data."
+        # CPSC 131,,,CPSC 485,3,Computational Bioinformatics,"Algorithmic approaches to biological problems. Specific topics include motif finding, genome rearrangement, DNA sequence comparison, sequence alignment, DNA sequencing, repeat finding and gene expression analysis."
+        # MATH 270B,CPSC 131,,CPSC 452,3,Cryptography,"Introduction to cryptography and steganography. Encryption, cryptographic hashing, certificates, and signatures. Classical, symmetric-key, and public-key ciphers. Block modes of operation. Cryptanalysis including exhaustive search, man-in-the-middle, and birthday attacks. Programing projects involving implementation of cryptographic systems."
+        # CPSC 351, CPSC 353,,CPSC 454,3,Cloud Computing and Security,"Cloud computing and cloud security, distributed computing, computer clusters, grid computing, virtual machines and virtualization, cloud computing platforms and deployment models, cloud programming and software environments, vulnerabilities and risks of cloud computing, cloud infrastructure protection, data privacy and protection."
+        # CPSC 351 or CPSC 353,,,CPSC 455,3,Web Security,"Concepts of web application security. Web security mechanisms, including authentication, access control and protecting sensitive data. Common vulnerabilities, including code and SQL attacks, cross-site scripting and cross-site request forgery. Implement hands-on web application security mechanisms and security testing."
+        # CPSC 351,,,CPSC 474,3,Parallel and Distributed Computing,"Concepts of distributed computing; distributed memory and shared memory architectures; parallel programming techniques; inter-process communication and synchronization; programming for parallel architectures such as multi-core and GPU platforms; project involving distributed application development."
+        # CPSC 351,,,CPSC 479,3,Introduction to High Performance Computing,"Introduction to the concepts of high-performance computing and the paradigms of parallel programming in a high level programming language, design and implementation of parallel algorithms on distributed memory, machine learning techniques on large data sets, implementation of parallel algorithms."
+        # CPSC 121 or MATH 320,MATH 270B or MATH 280,,CPSC 439,3,Theory of Computation,"Introduction to the theory of computation. Automata theory; finite state machines, context free grammars, and Turing machines; hierarchy of formal language classes. Computability theory and undecidable problems. Time complexity; P and NP-complete problems. Applications to software design and security."
+        # MATH 250A ,,,MATH 335,3,Mathematical Probability,"Probability theory; discrete, continuous and multivariate probability distributions, independence, conditional probability distribution, expectation, moment generating functions, functions of random variables and the central limit theorem."
+        # CPSC 131, MATH 150B, MATH 270B,CPSC 484,3,Principles of Computer Graphics,"Examine and analyze computer graphics, software structures, display processor organization, graphical input/output devices, display files. Algorithmic techniques for clipping, windowing, character generation and viewpoint transformation."
+        # ,,,CPSC 499,3,Independent Study,"Special topic in computer science, selected in consultation with and completed under the supervision of instructor. May be repeated for a maximum of 9 units of Undergraduate credit and 6 units of Graduate credit. Requires approval by the Computer Science chair."
+        # CPSC 351,CPSC 353 or CPSC 452,,CPSC 459,3,Blockchain Technologies,"Digital assets as a medium of exchange to secure financial transactions; decentralized and distributed ledgers that record verifiable transactions; smart contracts and Ethereum; Bitcoin mechanics and mining; the cryptocurrency ecosystem; blockchain mechanics and applications."
+        # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 370,3,Mathematical Model Building,"Introduction to mathematical models in science and engineering: dimensional analysis, discrete and continuous dynamical systems, flow and diffusion models."
+        # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 340,,Numerical Analysis,"Approximate numerical solutions of systems of linear and nonlinear equations, interpolation theory, numerical differentiation and integration, numerical solution of ordinary differential equations. Computer coding of numerical methods."
+        # CPSC 351,,,CPSC 456,3,Network Security Fundamentals,"Learn about vulnerabilities of network protocols, attacks targeting confidentiality, integrity and availability of data transmitted across networks, and methods for diagnosing and closing security gaps through hands-on exercises."
+        # CPSC 351,,,CPSC 458,3,Malware Analysis,"Introduction to principles and practices of malware analysis. Topics include static and dynamic code analysis, data decoding, analysis tools, debugging, shellcode analysis, reverse engineering of stealthy malware and written presentation of analysis results."
+        # CPSC 332,,,CPSC 431,3,Database and Applications,"Database design and application development techniques for a real world system. System analysis, requirement specifications, conceptual modeling, logic design, physical design and web interface development. Develop projects using contemporary database management system and web-based application development platform."
+        # CPSC 332,,,CPSC 449,3,Web Back-End Engineering,"Design and architecture of large-scale web applications. Techniques for scalability, session management and load balancing. Dependency injection, application tiers, message queues, web services and REST architecture. Caching and eventual consistency. Data models, partitioning and replication in relational and non-relational databases."
+        # CPSC 240,,,CPSC 440,3,Computer System Architecture,"Computer performance, price/performance, instruction set design and examples. Processor design, pipelining, memory hierarchy design and input/output subsystems."
+        # CPSC 131 ,,,CPSC 349 ,3, Web Front-End Engineering ,"Concepts and architecture of interactive web applications, including markup, stylesheets and behavior. Functional and object-oriented aspects of JavaScript. Model-view design patterns, templates and frameworks. Client-side technologies for asynchronous events, real-time interaction and access to back-end web services."
+        # CPSC 131,,,CPSC 411,3,Mobile Device Application Programming,"Introduction to developing applications for mobile devices, including but not limited to runtime environments, development tools and debugging tools used in creating applications for mobile devices. Use emulators in lab. Students must provide their own mobile devices."
+        # CPSC 362,,,CPSC 464,3,Software Architecture,"Basic principles and practices of software design and architecture. High-level design, software architecture, documenting software architecture, software and architecture evaluation, software product lines and some considerations beyond software architecture."
+        # CPSC 362,,,CPSC 462,3,Software Design,"Concepts of software modeling, software process and some tools. Object-oriented analysis and design and Unified process. Some computer-aided software engineering (CASE) tools will be recommended to use for doing homework assignments."
+        # CPSC 362,,,CPSC 463,3,Software Testing,"Software testing techniques, reporting problems effectively and planning testing projects. Students apply what they learned throughout the course to a sample application that is either commercially available or under development."
+        # CPSC 362,,,CPSC 466,3,Software Process,"Practical guidance for improving the software development process. How to establish, maintain and improve software processes. Exposure to agile processes, ISO 12207 and CMMI."
+        # CPSC 386,CPSC 484,,CPSC 486,3,Game Programming,"Survey of data structures and algorithms used for real-time rendering and computer game programming. Build upon existing mathematics and programming knowledge to create interactive graphics programs."
+        # CPSC 486,,,CPSC 489,3,Game Development Project,"Individually or in teams, students design, plan and build a computer game."
+        # CPSC 121,,,CPSC 386,3,Introduction to Game Design and Production,"Current and future technologies and market trends in game design and production. Game technologies, basic building tools for games and the process of game design, development and production."
+        # ,,,CPSC 301,2,Programming Lab Practicum ,"Intensive programming covering concepts learned in lower-division courses. Procedural and object oriented design, documentation, arrays, classes, file input/output, recursion, pointers, dynamic variables, data and file structures."
+
+        # """,
+        #     }
+        # )
+
+        # All model calls go through the shared rate limiter
+        estimated_tokens = estimate_tokens(prompt.to_string())
+        future = get_scheduler().submit(
+            _invoke_model,
+            prompt,
+            estimated_tokens,
+            priority=priority,
+            tokens=estimated_tokens,
+        )
+        _in_flight[cache_key] = {"future": future, "priority": priority, "waiters": 1}
+        RESPONSE_CACHE_REQUESTS.labels("miss").inc()
+
+    future.add_done_callback(lambda f: _store_response(cache_key, f))
+    return cache_key, future
+
+
+def save_response(json_data, path="courses.json"):
+    """
+    Keeps the latest model response in courses.json, the stand-in used when
+    AI_ENABLED is off, unless AI_SAVE_RESPONSE is false (the API server, the workers
+    and concurrent CLI runs turn it off: their responses belong to many users).
+
+    The file is replaced atomically, so concurrent writers never interleave and a
+    reader always loads one complete response.
+
+    :param json_data: str, The JSON-formatted recommendations.
+    :param path: str, The file to replace.
+    """
+    if os.getenv("AI_SAVE_RESPONSE", "True").lower() != "true":
+        return
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json_file.write(json_data)
+        os.replace(temporary_path, path)
+        logger.info(f"AI recommendations written to {path}")
+    except OSError as e:
+        logger.error(f"Could not write {path}: {e}")
+
+
+def cancel_request(cache_key):
+    """
+    Withdraws one waiter from an in-flight request, cancelling it if nobody else waits.
+
+    Only requests that are still queued can be cancelled; a running model call finishes
+    and its result is cached.
+
+    :param cache_key: str, Key returned by request_recommendations.
+    :return: bool, True if the request was cancelled.
+    """
+    with _cache_lock:
+        entry = _in_flight.get(cache_key)
+        if entry is None:
+            return False
+        entry["waiters"] -= 1
+        if entry["waiters"] > 0:
+            return False
+        future = entry["future"]
+    return future.cancel()
+
+
+@tracing.traced()
+def get_recommendations_ai(
+    job_id, job_name, degree_name, degree_electives, priority=INTERACTIVE
+):
     """
     Generate recommendations based on job and degree information using a ChatOpenAI model.
 
@@ -263,13 +587,16 @@ def get_recommendations_ai(job_id, job_name, degree_name, degree_electives):
     :param job_name: str, The name of the job associated with the recommendations.
     :param degree_name: str, The name of the degree for which recommendations are generated.
     :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :param priority: int, Scheduler priority class (INTERACTIVE, PREFETCH or BATCH).
     :return: str, The JSON-formatted string of course recommendations.
-    :raises SystemExit: If an error occurs during model invocation or file operations.
+    :raises RuntimeError: If an error occurs during model invocation.
     """
     global model, prompt_template
 
     logger.info("AI_ENABLED=True: Invoking AI model for recommendations.")
-    logger.debug(f"Job ID: {job_id}, Job Name: {job_name}, Degree Name: {degree_name}")
+    logger.debug(
+        "Job ID: %s, Job Name: %s, Degree Name: %s", job_id, job_name, degree_name
+    )
 
     # Retrieve AI_ENABLED environment variable
     ai_enabled = os.getenv("AI_ENABLED", "False").lower() == "true"
@@ -277,117 +604,27 @@ def get_recommendations_ai(job_id, job_name, degree_name, degree_electives):
         try:
             logger.info("AI_ENABLED=True: Invoking AI model for recommendations.")
             logger.debug(
-                f"Job ID: {job_id}, Job Name: {job_name}, Degree Name: {degree_name}"
-            )
-
-            # Prepare the prompt with the provided parameters
-            # Convert degree_electives to a formatted string
-            # format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
-            # Format electives_str as 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
-            electives_str = "\n".join(
-                [
-                    format_elective_string(
-                        e["prerequisites"],
-                        e["course_code"],
-                        e["units"],
-                        e["name"],
-                        e["description"],
-                    )
-                    for e in degree_electives
-                ]
+                "Job ID: %s, Job Name: %s, Degree Name: %s",
+                job_id,
+                job_name,
+                degree_name,
             )
-            logger.debug(f"Formatted electives_str:\n{electives_str}")
 
-            prompt = prompt_template.invoke(
-                {
-                    "p_career_path": job_name,
-                    "p_degree": degree_name,
-                    "p_electives": electives_str,
-                }
+            # Start (or join) the model request and wait for the parsed result
+            cache_key, future = request_recommendations(
+                job_name, degree_name, degree_electives, priority=priority
             )
+            json_data = future.result()
 
-            #         """
-            # CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement and analyze machine learning algorithms, including supervised learning and unsupervised learning algorithms. Methods to address uncertainty. Projects with real-world data."
-            # CPSC 131,MATH 338,,CPSC 375,3,Introduction to Data Science and Big Data ,"Techniques for data preparation, exploratory analysis, statistical modeling, machine learning and visualization. Methods for analyzing different types of data, such as natural language and time-series, from emerging applications, including Internet-of-Things. Big data platforms. Projects with real-world data."
-            # CPSC 131,,,CPSC 485,3,Computational Bioinformatics,"Algorithmic approaches to biological problems. Specific topics include motif finding, genome rearrangement, DNA sequence comparison, sequence alignment, DNA sequencing, repeat finding and gene expression analysis."
-            # MATH 270B,CPSC 131,,CPSC 452,3,Cryptography,"Introduction to cryptography and steganography. Encryption, cryptographic hashing, certificates, and signatures. Classical, symmetric-key, and public-key ciphers. Block modes of operation. Cryptanalysis including exhaustive search, man-in-the-middle, and birthday attacks. Programing projects involving implementation of cryptographic systems."
-            # CPSC 351, CPSC 353,,CPSC 454,3,Cloud Computing and Security,"Cloud computing and cloud security, distributed computing, computer clusters, grid computing, virtual machines and virtualization, cloud computing platforms and deployment models, cloud programming and software environments, vulnerabilities and risks of cloud computing, cloud infrastructure protection, data privacy and protection."
-            # CPSC 351 or CPSC 353,,,CPSC 455,3,Web Security,"Concepts of web application security. Web security mechanisms, including authentication, access control and protecting sensitive data. Common vulnerabilities, including code and SQL attacks, cross-site scripting and cross-site request forgery. Implement hands-on web application security mechanisms and security testing."
-            # CPSC 351,,,CPSC 474,3,Parallel and Distributed Computing,"Concepts of distributed computing; distributed memory and shared memory architectures; parallel programming techniques; inter-process communication and synchronization; programming for parallel architectures such as multi-core and GPU platforms; project involving distributed application development."
-            # CPSC 351,,,CPSC 479,3,Introduction to High Performance Computing,"Introduction to the concepts of high-performance computing and the paradigms of parallel programming in a high level programming language, design and implementation of parallel algorithms on distributed memory, machine learning techniques on large data sets, implementation of parallel algorithms."
-            # CPSC 121 or MATH 320,MATH 270B or MATH 280,,CPSC 439,3,Theory of Computation,"Introduction to the theory of computation. Automata theory; finite state machines, context free grammars, and Turing machines; hierarchy of formal language classes. Computability theory and undecidable problems. Time complexity; P and NP-complete problems. Applications to software design and security."
-            # MATH 250A ,,,MATH 335,3,Mathematical Probability,"Probability theory; discrete, continuous and multivariate probability distributions, independence, conditional probability distribution, expectation, moment generating functions, functions of random variables and the central limit theorem."
-            # CPSC 131, MATH 150B, MATH 270B,CPSC 484,3,Principles of Computer Graphics,"Examine and analyze computer graphics, software structures, display processor organization, graphical input/output devices, display files. Algorithmic techniques for clipping, windowing, character generation and viewpoint transformation."
-            # ,,,CPSC 499,3,Independent Study,"Special topic in computer science, selected in consultation with and completed under the supervision of instructor. May be repeated for a maximum of 9 units of Undergraduate credit and 6 units of Graduate credit. Requires approval by the Computer Science chair."
-            # CPSC 351,CPSC 353 or CPSC 452,,CPSC 459,3,Blockchain Technologies,"Digital assets as a medium of exchange to secure financial transactions; decentralized and distributed ledgers that record verifiable transactions; smart contracts and Ethereum; Bitcoin mechanics and mining; the cryptocurrency ecosystem; blockchain mechanics and applications."
-            # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 370,3,Mathematical Model Building,"Introduction to mathematical models in science and engineering: dimensional analysis, discrete and continuous dynamical systems, flow and diffusion models."
-            # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 340,,Numerical Analysis,"Approximate numerical solutions of systems of linear and nonlinear equations, interpolation theory, numerical differentiation and integration, numerical solution of ordinary differential equations. Computer coding of numerical methods."
-            # CPSC 351,,,CPSC 456,3,Network Security Fundamentals,"Learn about vulnerabilities of network protocols, attacks targeting confidentiality, integrity and availability of data transmitted across networks, and methods for diagnosing and closing security gaps through hands-on exercises."
-            # CPSC 351,,,CPSC 458,3,Malware Analysis,"Introduction to principles and practices of malware analysis. Topics include static and dynamic code analysis, data decoding, analysis tools, debugging, shellcode analysis, reverse engineering of stealthy malware and written presentation of analysis results."
-            # CPSC 332,,,CPSC 431,3,Database and Applications,"Database design and application development techniques for a real world system. System analysis, requirement specifications, conceptual modeling, logic design, physical design and web interface development. Develop projects using contemporary database management system and web-based application development platform."
-            # CPSC 332,,,CPSC 449,3,Web Back-End Engineering,"Design and architecture of large-scale web applications. Techniques for scalability, session management and load balancing. Dependency injection, application tiers, message queues, web services and REST architecture. Caching and eventual consistency. Data models, partitioning and replication in relational and non-relational databases."
-            # CPSC 240,,,CPSC 440,3,Computer System Architecture,"Computer performance, price/performance, instruction set design and examples. Processor design, pipelining, memory hierarchy design and input/output subsystems."
-            # CPSC 131 ,,,CPSC 349 ,3, Web Front-End Engineering ,"Concepts and architecture of interactive web applications, including markup, stylesheets and behavior. Functional and object-oriented aspects of JavaScript. Model-view design patterns, templates and frameworks. Client-side technologies for asynchronous events, real-time interaction and access to back-end web services."
-            # CPSC 131,,,CPSC 411,3,Mobile Device Application Programming,"Introduction to developing applications for mobile devices, including but not limited to runtime environments, development tools and debugging tools used in creating applications for mobile devices. Use emulators in lab. Students must provide their own mobile devices."
-            # CPSC 362,,,CPSC 464,3,Software Architecture,"Basic principles and practices of software design and architecture. High-level design, software architecture, documenting software architecture, software and architecture evaluation, software product lines and some considerations beyond software architecture."
-            # CPSC 362,,,CPSC 462,3,Software Design,"Concepts of software modeling, software process and some tools. Object-oriented analysis and design and Unified process. Some computer-aided software engineering (CASE) tools will be recommended to use for doing homework assignments."
-            # CPSC 362,,,CPSC 463,3,Software Testing,"Software testing techniques, reporting problems effectively and planning testing projects. Students apply what they learned throughout the course to a sample application that is either commercially available or under development."
-            # CPSC 362,,,CPSC 466,3,Software Process,"Practical guidance for improving the software development process. How to establish, maintain and improve software processes. Exposure to agile processes, ISO 12207 and CMMI."
-            # CPSC 386,CPSC 484,,CPSC 486,3,Game Programming,"Survey of data structures and algorithms used for real-time rendering and computer game programming. Build upon existing mathematics and programming knowledge to create interactive graphics programs."
-            # CPSC 486,,,CPSC 489,3,Game Development Project,"Individually or in teams, students design, plan and build a computer game."
-            # CPSC 121,,,CPSC 386,3,Introduction to Game Design and Production,"Current and future technologies and market trends in game design and production. Game technologies, basic building tools for games and the process of game design, development and production."
-            # ,,,CPSC 301,2,Programming Lab Practicum ,"Intensive programming covering concepts learned in lower-division courses. Procedural and object oriented design, documentation, arrays, classes, file input/output, recursion, pointers, dynamic variables, data and file structures."
-
-            # """,
-            #     }
-            # )
-
-            print("---Working---")
-            result = model.invoke(prompt)
-            print("---DONE---")
-
-            logger.debug("---Raw AI Response---")
-            logger.debug(result.content)
-
-            # Print the raw content from the result to see its structure
-            print("---Raw Result Content---")
-            print(
-                result.content
-            )  # Add this line to check what the raw response looks like
-
-            # Extract lines containing '*'
-            starred_lines = extract_starred_lines(result.content)
-
-            # Print the resulting array
-            logger.debug("---Lines containing '*': Extracted---")
-            for idx, line in enumerate(starred_lines, start=1):
-                logger.debug(line)
-
-            # Parse the raw data
-            courses = parse_course_data(starred_lines)
-
-            logger.debug("---Parsed Courses---")
-            logger.debug(courses)
-
-            # Convert the list of courses to JSON
-            json_data = json.dumps(courses, indent=4)
-
-            # Print the JSON data
-            print("Print the JSON data:")
-            print(json_data)
-
-            # After converting to JSON
-            with open("courses.json", "w", encoding="utf-8") as json_file:
-                json_file.write(json_data)
-                logger.info("AI recommendations written to courses.json")
-
+            save_response(json_data)
             return json_data
 
         except Exception as e:
             logger.error(
                 f"Error during Prompt with System and Human Messages (Tuple):OpenAI agent execution: {e}"
             )
-            sys.exit(1)
+            # Raised rather than exiting so that batch callers can carry on
+            raise RuntimeError(f"Model invocation failed: {e}") from e
     else:
         try:
             logger.info("AI_ENABLED=False: Loading recommendations from courses.json")
@@ -0,0 +1,208 @@
+# ai_integration/http_pool.py
+
+import logging
+import os
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Global shared HTTP client for the model backend
+http_client = None
+_client_lock = threading.Lock()
+
+# Warm-up thread state
+_warmup_thread = None
+_warmup_stop = threading.Event()
+_last_used = time.monotonic()
+
+# Connection timings are collected per thread by the httpcore trace callback
+_trace_state = threading.local()
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "requests": 0,
+    "responses": 0,
+    "new_connections": 0,
+    "tls_handshakes": 0,
+    "connect_seconds_total": 0.0,
+    "tls_seconds_total": 0.0,
+    "warmup_pings": 0,
+    "warmup_failures": 0,
+}
+
+
+def get_base_url():
+    """Returns the model backend base URL (OPENAI_BASE_URL or the OpenAI default)."""
+    return os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
+
+def _trace(event_name, info):
+    """httpcore trace hook: times TCP connects and TLS handshakes."""
+    if event_name == "connection.connect_tcp.started":
+        _trace_state.connect_started = time.perf_counter()
+    elif event_name == "connection.connect_tcp.complete":
+        elapsed = time.perf_counter() - getattr(
+            _trace_state, "connect_started", time.perf_counter()
+        )
+        with _metrics_lock:
+            _metrics["new_connections"] += 1
+            _metrics["connect_seconds_total"] += elapsed
+    elif event_name == "connection.start_tls.started":
+        _trace_state.tls_started = time.perf_counter()
+    elif event_name == "connection.start_tls.complete":
+        elapsed = time.perf_counter() - getattr(
+            _trace_state, "tls_started", time.perf_counter()
+        )
+        with _metrics_lock:
+            _metrics["tls_handshakes"] += 1
+            _metrics["tls_seconds_total"] += elapsed
+
+
+def _on_request(request):
+    global _last_used
+    _last_used = time.monotonic()
+    request.extensions["trace"] = _trace
+    with _metrics_lock:
+        _metrics["requests"] += 1
+
+
+def _on_response(response):
+    with _metrics_lock:
+        _metrics["responses"] += 1
+
+
+def create_http_client(
+    max_connections=None, max_keepalive_connections=None, keepalive_expiry=None
+):
+    """
+    Creates an httpx.Client with an explicit connection pool and metrics hooks.
+
+    Parameters:
+        max_connections (int, optional): Upper bound on open connections.
+        max_keepalive_connections (int, optional): Idle connections kept for reuse.
+        keepalive_expiry (float, optional): Seconds an idle connection is kept open.
+
+    Returns:
+        httpx.Client: The configured client.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections
+        or int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "10")),
+        max_keepalive_connections=max_keepalive_connections
+        or int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "5")),
+        keepalive_expiry=keepalive_expiry
+        or float(os.getenv("HTTP_POOL_KEEPALIVE_SECONDS", "120")),
+    )
+    return httpx.Client(
+        limits=limits,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+
+
+def get_http_client():
+    """Returns the process-wide HTTP client, creating it on first use."""
+    global http_client
+    with _client_lock:
+        if http_client is None:
+            http_client = create_http_client()
+            logger.info("Shared HTTP connection pool created for the model backend.")
+        return http_client
+
+
+def warm_up():
+    """
+    Opens (or refreshes) a pooled connection to the model backend.
+
+    Any HTTP status counts as success; only the TCP/TLS setup matters here.
+
+    Returns:
+        bool: True if the backend was reached, False otherwise.
+    """
+    client = get_http_client()
+    try:
+        response = client.get(get_base_url() + "/models", timeout=10.0)
+        response.close()
+        with _metrics_lock:
+            _metrics["warmup_pings"] += 1
+        logger.debug("HTTP warm-up ping returned %s.", response.status_code)
+        return True
+    except httpx.HTTPError as e:
+        with _metrics_lock:
+            _metrics["warmup_failures"] += 1
+        logger.warning(f"HTTP warm-up ping failed: {e}")
+        return False
+
+
+def _warmup_loop(idle_seconds, check_interval):
+    warm_up()
+    while not _warmup_stop.wait(check_interval):
+        if time.monotonic() - _last_used >= idle_seconds:
+            warm_up()
+
+
+def start_warmup(idle_seconds=None, check_interval=None):
+    """
+    Warms the pool in the background at startup and again after idle periods.
+
+    Parameters:
+        idle_seconds (float, optional): Idle time after which the pool is re-warmed.
+        check_interval (float, optional): How often the idle time is checked.
+    """
+    global _warmup_thread
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        return
+    idle_seconds = idle_seconds or float(os.getenv("HTTP_WARMUP_IDLE_SECONDS", "90"))
+    check_interval = check_interval or min(idle_seconds / 3, 30.0)
+    _warmup_stop.clear()
+    _warmup_thread = threading.Thread(
+        target=_warmup_loop,
+        args=(idle_seconds, check_interval),
+        name="http-warmup",
+        daemon=True,
+    )
+    _warmup_thread.start()
+    logger.info("HTTP warm-up thread started.")
+
+
+def stop_warmup():
+    """Stops the background warm-up thread."""
+    _warmup_stop.set()
+
+
+def get_pool_metrics():
+    """
+    Returns request/connection counters and the current pool occupancy.
+
+    Returns:
+        dict: Counters plus 'reused_requests', 'idle_connections' and 'active_connections'.
+    """
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    snapshot["reused_requests"] = max(
+        0, snapshot["responses"] - snapshot["new_connections"]
+    )
+
+    # Pool occupancy is only exposed through httpcore internals; report it when available
+    idle = active = None
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is not None:
+        idle = sum(1 for conn in connections if conn.is_idle())
+        active = len(connections) - idle
+    snapshot["idle_connections"] = idle
+    snapshot["active_connections"] = active
+    return snapshot
+
+
+def close_http_client():
+    """Stops warm-up and closes every pooled connection."""
+    global http_client
+    stop_warmup()
+    with _client_lock:
+        if http_client is not None:
+            http_client.close()
+            http_client = None
@@ -0,0 +1,122 @@
+# ai_integration/prefetch.py
+
+import logging
+import os
+import threading
+
+from ai_integration import ai_module, recommendation_pipeline
+from ai_integration.scheduler import PREFETCH, SchedulerFullError
+from database import db_operations
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Seconds a (degree, job) selection must stay unchanged before generation starts
+PREFETCH_DELAY_SECONDS = float(os.getenv("PREFETCH_DELAY_SECONDS", "0.75"))
+
+# Current speculative request: {"pair", "timer", "cache_key"}
+_current = None
+_lock = threading.Lock()
+
+
+def prefetch_recommendations(degree_id, job_id, delay=None):
+    """
+    Speculatively generates recommendations for a (degree, job) pair in the background.
+
+    The request is issued at PREFETCH priority once the selection has settled for
+    `delay` seconds, and its result lands in the AI response cache so a later
+    "Generate Recommendations" click is answered immediately. Any earlier prefetch for
+    a different pair is cancelled.
+
+    Parameters:
+        degree_id (int): The selected degree.
+        job_id (int): The selected job.
+        delay (float, optional): Settle time in seconds (PREFETCH_DELAY_SECONDS by default).
+    """
+    global _current
+    if os.getenv("AI_ENABLED", "False").lower() != "true":
+        return  # Responses come from courses.json; nothing to prefetch
+    if not degree_id or not job_id:
+        return
+
+    pair = (degree_id, job_id)
+    with _lock:
+        if _current is not None and _current["pair"] == pair:
+            return  # Already scheduled or running for this selection
+    cancel_prefetch()
+
+    entry = {"pair": pair, "timer": None, "cache_key": None}
+    entry["timer"] = threading.Timer(
+        PREFETCH_DELAY_SECONDS if delay is None else delay, _start_prefetch, (entry,)
+    )
+    entry["timer"].daemon = True
+    with _lock:
+        _current = entry
+    entry["timer"].start()
+    logger.debug("Prefetch scheduled for degree_id %s, job_id %s.", degree_id, job_id)
+
+
+def _start_prefetch(entry):
+    """Timer callback: resolves the prompt inputs and submits the model request."""
+    pair = entry["pair"]
+    degree_id, job_id = pair
+    future = None
+    try:
+        job = db_operations.get_job_by_id(job_id)
+        degree = db_operations.get_degree_by_id(degree_id)
+        if not job or not degree:
+            logger.warning(f"Prefetch skipped: unknown job or degree for {pair}.")
+            return
+        degree_electives = db_operations.get_degree_electives(degree_id)
+
+        # A stored set with the same fingerprint is linked without calling the model
+        inputs = recommendation_pipeline.compute_inputs(job, degree, degree_electives)
+        if db_operations.find_recommendation_set(inputs["fingerprint"]):
+            logger.debug("Prefetch skipped: recommendations for %s are stored.", pair)
+            return
+
+        with _lock:
+            if _current is not entry:
+                return  # Selection changed while we were reading the database
+            cache_key, future = ai_module.request_recommendations(
+                job["name"], degree["name"], degree_electives, priority=PREFETCH
+            )
+            entry["cache_key"] = cache_key
+        logger.info(
+            f"Prefetching recommendations for degree_id {degree_id}, job_id {job_id}."
+        )
+    except SchedulerFullError as e:
+        logger.info(f"Prefetch skipped, scheduler is busy: {e}")
+    except Exception as e:
+        logger.error(f"Error starting recommendation prefetch for {pair}: {e}")
+    finally:
+        # Forget the pair once its request is over, so selecting it again after the
+        # response has left the cache prefetches it again
+        if future is None:
+            _finish(entry)
+        else:
+            future.add_done_callback(lambda _: _finish(entry))
+
+
+def _finish(entry):
+    """Clears the current prefetch if it is still `entry`."""
+    global _current
+    with _lock:
+        if _current is entry:
+            _current = None
+
+
+def cancel_prefetch():
+    """
+    Cancels the pending speculative request, if any.
+
+    A request that the model is already working on cannot be stopped; it completes and
+    is cached.
+    """
+    global _current
+    with _lock:
+        current, _current = _current, None
+    if current is None:
+        return
+    current["timer"].cancel()
+    if current["cache_key"] and ai_module.cancel_request(current["cache_key"]):
+        logger.info(f"Cancelled prefetch for degree/job {current['pair']}.")
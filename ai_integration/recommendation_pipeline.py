@@ -0,0 +1,438 @@
+# ai_integration/recommendation_pipeline.py
+
+import json
+import logging
+import os
+
+from ai_integration.ai_module import (
+    PROMPT_VERSION,
+    get_recommendations_ai,
+    request_recommendations,
+)
+from ai_integration.scheduler import INTERACTIVE
+from database import db_operations
+from utilities import metrics, tracing
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+RECOMMENDATION_REQUESTS = metrics.counter(
+    "recommendation_requests_total",
+    "Recommendation requests by outcome (unchanged, reused, incremental, generated).",
+    ["status"],
+)
+
+# Outcomes of generate_recommendations
+UNCHANGED = "unchanged"  # The user's linked set already matches every input
+REUSED = "reused"  # Another user's set with the same fingerprint was linked
+INCREMENTAL = "incremental"  # Only the changed electives were sent to the model
+GENERATED = "generated"  # Full generation
+
+# The prompt asks the model for ten electives to choose from
+RECOMMENDATION_LIMIT = 10
+
+# Above this share of changed electives a full generation is cheaper to reason about
+# than a merge, and ranks better
+INCREMENTAL_MAX_CHANGED_FRACTION = float(
+    os.getenv("INCREMENTAL_MAX_CHANGED_FRACTION", "0.5")
+)
+
+
+@tracing.traced()
+def parse_recommendations(raw_response):
+    """
+    Parses the raw AI response (JSON string) into a structured list of course recommendations.
+
+    :param raw_response: str, The raw JSON response from the AI model.
+    :return: list of dicts, Each dict contains course details.
+    """
+    recommendations = []
+    try:
+        # Parse the JSON string into a Python list
+        data = json.loads(raw_response)
+        logger.debug("Parsed JSON response successfully.")
+
+        if isinstance(data, list):
+            for course in data:
+                # Optional: Validate required keys
+                required_keys = [
+                    "Course Code",
+                    "Course Name",
+                    "Rating",
+                    "Prerequisites",
+                    "Explanation",
+                ]
+                if all(key in course for key in required_keys):
+                    recommendations.append(course)
+                else:
+                    logger.warning(f"Course data missing required keys: {course}")
+        else:
+            logger.error("AI response is not a list.")
+    except json.JSONDecodeError as jde:
+        logger.error(f"JSON decoding failed: {jde}")
+    except Exception as e:
+        logger.error(f"Error parsing AI recommendations: {e}")
+    return recommendations
+
+
+@tracing.traced()
+def build_set_items(recommendations):
+    """
+    Validates parsed recommendations and resolves their course IDs.
+
+    :param recommendations: list of dicts, Parsed model output (see parse_recommendations).
+    :return: list of dicts, Items with keys 'course_id', 'course_code', 'rating', 'explanation', 'rank'.
+    """
+    items = []
+    for rec in recommendations:
+        course_code = rec["Course Code"] if "Course Code" in rec else None
+        rating = rec["Rating"] if "Rating" in rec else None
+        explanation = (
+            rec["Explanation"] if "Explanation" in rec else "No explanation provided."
+        )
+        rank = rec["Number"] if "Number" in rec else 0  # Assign default rank if missing
+
+        # Validate required fields
+        if not course_code:
+            logger.warning("Recommendation missing 'Course Code'. Skipping.")
+            continue
+        if rating is None:
+            logger.warning(
+                "Recommendation for %s missing 'Rating'. Skipping.", course_code
+            )
+            continue
+
+        # Fetch course_id from course_code
+        course = db_operations.get_course_by_code(course_code)
+        if not course or course["course_id"] is None:
+            logger.warning("Course with code %s not found in database.", course_code)
+            continue
+
+        # Handle rank if 'Number' is missing or invalid
+        if not isinstance(rank, int):
+            logger.warning(
+                "Recommendation for course %s has invalid 'Number': %s. Assigning default rank.",
+                course_code,
+                rank,
+            )
+            rank = 0
+
+        items.append(
+            {
+                "course_id": course["course_id"],
+                "course_code": course_code,
+                "rating": rating,
+                "explanation": explanation,
+                "rank": rank,
+            }
+        )
+
+    logger.debug(
+        "Validated %s out of %s recommendations", len(items), len(recommendations)
+    )
+    return items
+
+
+def diff_electives(old_snapshot, new_snapshot):
+    """
+    Compares two elective snapshots (see db_operations.snapshot_electives).
+
+    An elective whose contents changed counts as both removed and added, so it is
+    re-evaluated.
+
+    :param old_snapshot: dict, Snapshot stored with the previous set.
+    :param new_snapshot: dict, Snapshot of the current elective list.
+    :return: tuple, (added course codes, removed course codes) as sets.
+    """
+    changed = {
+        code
+        for code in old_snapshot.keys() & new_snapshot.keys()
+        if old_snapshot[code] != new_snapshot[code]
+    }
+    added = (new_snapshot.keys() - old_snapshot.keys()) | changed
+    removed = (old_snapshot.keys() - new_snapshot.keys()) | changed
+    return added, removed
+
+
+def _rating_value(item):
+    rating = item["rating"]
+    return rating if isinstance(rating, (int, float)) else 0
+
+
+def merge_ranked_items(
+    existing_items, removed_codes, new_items, limit=RECOMMENDATION_LIMIT
+):
+    """
+    Merges newly rated electives into an existing ranking and re-ranks the result.
+
+    Items for removed electives are dropped. Ties keep the previous order, with existing
+    items ahead of new ones. Electives removed from the previous top `limit` leave their
+    slot to a new elective only if one was added; the ranking may otherwise shrink.
+
+    :param existing_items: list of dicts, Items of the previous set in rank order.
+    :param removed_codes: set, Course codes that are no longer electives (or changed).
+    :param new_items: list of dicts, Items for the added electives.
+    :param limit: int, Maximum number of items to keep.
+    :return: list of dicts, The merged items with ranks 1..n.
+    """
+    kept = [item for item in existing_items if item["course_code"] not in removed_codes]
+    seen = {item["course_code"] for item in kept}
+    merged = kept + [item for item in new_items if item["course_code"] not in seen]
+    merged.sort(key=_rating_value, reverse=True)  # Stable, so ties keep their order
+    return [dict(item, rank=rank) for rank, item in enumerate(merged[:limit], start=1)]
+
+
+def response_source():
+    """
+    Where generated recommendations come from: "model", or "stand-in" when
+    AI_ENABLED is off and the stored courses.json response is used instead.
+
+    :return: str, Passed to db_operations.compute_context_hash.
+    """
+    if os.getenv("AI_ENABLED", "False").lower() == "true":
+        return "model"
+    return "stand-in"
+
+
+@tracing.traced()
+def compute_inputs(job, degree, degree_electives):
+    """
+    Hashes the generation inputs for a (degree, job) pair, including the response
+    source, so stand-in sets are never reused once the model is enabled.
+
+    :param job: sqlite3.Row or dict, The job (needs 'name' and 'description').
+    :param degree: sqlite3.Row or dict, The degree (needs 'name').
+    :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :return: dict, Keys 'electives_hash', 'context_hash', 'fingerprint' and 'snapshot'.
+    """
+    electives_hash = db_operations.compute_electives_hash(degree_electives)
+    context_hash = db_operations.compute_context_hash(
+        degree["name"],
+        job["name"],
+        job["description"],
+        PROMPT_VERSION,
+        source=response_source(),
+    )
+    return {
+        "electives_hash": electives_hash,
+        "context_hash": context_hash,
+        "fingerprint": db_operations.compute_fingerprint(context_hash, electives_hash),
+        "snapshot": db_operations.snapshot_electives(degree_electives),
+    }
+
+
+@tracing.traced()
+def resolve_inputs(user_id=None, degree_id=None, job_id=None, catalog=None):
+    """
+    Looks up the job, degree and electives to generate recommendations for.
+
+    Missing degree or job IDs are taken from the user's saved preferences.
+
+    :param user_id: int, optional, The user; None for a plain (degree, job) pair.
+    :param degree_id: int, optional, Overrides the user's preferred degree.
+    :param job_id: int, optional, Overrides the user's preferred job.
+    :param catalog: SharedCatalog, optional, Attached shared catalog to read the job,
+        degree and electives from instead of the database (database.shared_catalog).
+    :return: tuple, (user_id, job, degree, degree_electives).
+    :raises ValueError: If the IDs are incomplete or refer to unknown rows.
+    """
+    if user_id is not None:
+        prefs = db_operations.get_user_preferences(user_id)
+        if not prefs:
+            raise ValueError(f"No saved preferences for user_id {user_id}.")
+        degree_id = degree_id or prefs.get("degree_id")
+        job_id = job_id or prefs.get("job_id")
+    if not degree_id or not job_id:
+        raise ValueError(
+            "A request needs a user_id with saved degree and job preferences, "
+            "or both degree_id and job_id."
+        )
+
+    job = catalog.job(job_id) if catalog else db_operations.get_job_by_id(job_id)
+    if not job:
+        raise ValueError(f"Unknown job_id {job_id}.")
+    degree = (
+        catalog.degree(degree_id)
+        if catalog
+        else db_operations.get_degree_by_id(degree_id)
+    )
+    if not degree:
+        raise ValueError(f"Unknown degree_id {degree_id}.")
+    degree_electives = (
+        catalog.degree_electives(degree_id)
+        if catalog
+        else db_operations.get_degree_electives(degree_id)
+    )
+    if not degree_electives:
+        raise ValueError(f"No electives found for degree_id {degree_id}.")
+    return user_id, job, degree, degree_electives
+
+
+@tracing.traced()
+def _save_and_link(user_id, job_id, degree_id, items, inputs):
+    """Saves a set and links it to `user_id` (unless None); returns the set ID."""
+    set_id = db_operations.save_recommendation_set(
+        degree_id,
+        job_id,
+        inputs["electives_hash"],
+        PROMPT_VERSION,
+        items,
+        inputs["fingerprint"],
+        context_hash=inputs["context_hash"],
+        electives_snapshot=inputs["snapshot"],
+    )
+    if set_id is None:
+        raise RuntimeError("Failed to save the recommendation set.")
+    if user_id is not None:
+        db_operations.link_user_recommendation_set(user_id, job_id, set_id)
+    return set_id
+
+
+@tracing.traced()
+def _incremental_items(current, job, degree, degree_electives, inputs, priority):
+    """
+    Returns merged items for a delta update of `current`, or None if a full generation
+    is needed instead.
+    """
+    if response_source() != "model":
+        return None  # The stored-response mode has no way to rate a subset
+    if (
+        current is None
+        or not current["electives_snapshot"]
+        or current["context_hash"] != inputs["context_hash"]
+        or current["degree_id"] != degree["degree_id"]
+    ):
+        return None
+
+    added, removed = diff_electives(current["electives_snapshot"], inputs["snapshot"])
+    if len(added | removed) > INCREMENTAL_MAX_CHANGED_FRACTION * max(
+        len(inputs["snapshot"]), 1
+    ):
+        logger.info(
+            "%s elective(s) changed; regenerating in full.", len(added | removed)
+        )
+        return None
+
+    new_items = []
+    if added:
+        logger.info("Evaluating %s added elective(s): %s", len(added), sorted(added))
+        _, future = request_recommendations(
+            job["name"],
+            degree["name"],
+            [e for e in degree_electives if e["course_code"] in added],
+            priority=priority,
+            delta=True,
+        )
+        new_items = [
+            item
+            for item in build_set_items(parse_recommendations(future.result()))
+            if item["course_code"] in added
+        ]
+
+    existing_items = db_operations.get_recommendation_set_items(current["set_id"])
+    return merge_ranked_items(existing_items, removed, new_items)
+
+
+@tracing.traced()
+def generate_recommendations(
+    user_id, job, degree, degree_electives, priority=INTERACTIVE
+):
+    """
+    Brings a user's recommendations for a job up to date with the current inputs.
+
+    The inputs (elective contents, job description, degree and prompt version) are
+    fingerprinted. Nothing is regenerated if the user's linked set already has that
+    fingerprint, and a set another user generated from the same inputs is linked
+    instead of calling the model. When only some electives were added or removed since
+    the linked set was generated, just the added ones are sent to the model and merged
+    into the existing ranking.
+
+    :param user_id: int, The ID of the user.
+    :param job: sqlite3.Row or dict, The job (as returned by db_operations.get_job_by_id).
+    :param degree: sqlite3.Row or dict, The degree (as returned by db_operations.get_degree_by_id).
+    :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :param priority: int, Scheduler priority class for any model request.
+    :return: tuple, (status, recommendations) where status is UNCHANGED, REUSED,
+        INCREMENTAL or GENERATED and recommendations are as returned by
+        db_operations.get_recommendations.
+    :raises RuntimeError: If the model response cannot be parsed or saved.
+    """
+    job_id = job["job_id"]
+    degree_id = degree["degree_id"]
+    inputs = compute_inputs(job, degree, degree_electives)
+
+    current = db_operations.get_user_recommendation_set(user_id, job_id)
+    if current and current["fingerprint"] == inputs["fingerprint"]:
+        logger.debug(
+            "Recommendation inputs unchanged for user_id %s and job_id %s.",
+            user_id,
+            job_id,
+        )
+        RECOMMENDATION_REQUESTS.labels(UNCHANGED).inc()
+        return UNCHANGED, db_operations.get_recommendations(user_id, job_id)
+
+    # Reuse a result set already generated from the same inputs (by any user)
+    set_id = db_operations.find_recommendation_set(inputs["fingerprint"])
+    if set_id:
+        db_operations.link_user_recommendation_set(user_id, job_id, set_id)
+        logger.debug("Reusing shared recommendation set %s.", set_id)
+        RECOMMENDATION_REQUESTS.labels(REUSED).inc()
+        return REUSED, db_operations.get_recommendations(user_id, job_id)
+
+    items = _incremental_items(current, job, degree, degree_electives, inputs, priority)
+    if items:
+        set_id = _save_and_link(user_id, job_id, degree_id, items, inputs)
+        logger.info(
+            "Recommendation set %s updated incrementally from set %s.",
+            set_id,
+            current["set_id"],
+        )
+        RECOMMENDATION_REQUESTS.labels(INCREMENTAL).inc()
+        return INCREMENTAL, db_operations.get_recommendations(user_id, job_id)
+
+    _generate_set(user_id, job, degree, degree_electives, inputs, priority)
+    RECOMMENDATION_REQUESTS.labels(GENERATED).inc()
+    return GENERATED, db_operations.get_recommendations(user_id, job_id)
+
+
+@tracing.traced()
+def _generate_set(user_id, job, degree, degree_electives, inputs, priority):
+    """Runs a full generation, saves it and links it to `user_id` (unless None)."""
+    # Invoke AI to get recommendations
+    # The required format will be Prepare in the ai_integration/ai_module.py file
+    recommendations_raw = get_recommendations_ai(
+        job["job_id"], job["name"], degree["name"], degree_electives, priority=priority
+    )
+    logger.debug("AI Recommendations Raw Response:\n%s", recommendations_raw)
+
+    items = build_set_items(parse_recommendations(recommendations_raw))
+    if not items:
+        raise RuntimeError("No recommendations parsed from AI response.")
+    set_id = _save_and_link(user_id, job["job_id"], degree["degree_id"], items, inputs)
+    logger.info("Recommendation set %s generated in full.", set_id)
+    return set_id
+
+
+@tracing.traced()
+def generate_recommendation_set(job, degree, degree_electives, priority=INTERACTIVE):
+    """
+    Makes sure a recommendation set exists for a (degree, job) pair, without a user.
+
+    A stored set with the same input fingerprint is reused; otherwise the model is
+    called and the result stored, so a later user with these inputs gets it linked.
+
+    :param job: sqlite3.Row or dict, The job.
+    :param degree: sqlite3.Row or dict, The degree.
+    :param degree_electives: list of dict, The elective courses relevant to the degree.
+    :param priority: int, Scheduler priority class for any model request.
+    :return: tuple, (status, set_id, recommendations) where status is REUSED or
+        GENERATED and recommendations are as returned by db_operations.get_recommendations.
+    :raises RuntimeError: If the model response cannot be parsed or saved.
+    """
+    inputs = compute_inputs(job, degree, degree_electives)
+    set_id = db_operations.find_recommendation_set(inputs["fingerprint"])
+    status = REUSED
+    if not set_id:
+        set_id = _generate_set(None, job, degree, degree_electives, inputs, priority)
+        status = GENERATED
+    RECOMMENDATION_REQUESTS.labels(status).inc()
+    return status, set_id, db_operations.get_recommendation_set_courses(set_id)
@@ -0,0 +1,460 @@
+# ai_integration/scheduler.py
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+
+from utilities import tracing
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Priority classes, lower value is served first
+INTERACTIVE = 0  # User clicked "Generate Recommendations"
+PREFETCH = 1  # Speculative background generation
+BATCH = 2  # Headless / bulk generation
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", PREFETCH: "prefetch", BATCH: "batch"}
+
+# Global scheduler shared by every caller in the process
+scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class SchedulerFullError(RuntimeError):
+    """Raised when a priority queue is at capacity and the request is shed."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    The bucket may go negative when a request turns out to be more expensive than
+    estimated; the debt is repaid by future refills before new work is admitted.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+
+    def wait_time(self, amount):
+        """Returns the seconds until `amount` tokens are available (0 if available now)."""
+        with self.lock:
+            self._refill()
+            # A single request larger than the bucket is admitted once the bucket is full
+            amount = min(amount, self.capacity)
+            if self.tokens >= amount:
+                return 0.0
+            return (amount - self.tokens) / self.rate_per_second
+
+    def consume(self, amount):
+        """Removes `amount` tokens unconditionally (the balance may become negative)."""
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+
+    def available(self):
+        with self.lock:
+            self._refill()
+            return self.tokens
+
+
+class _Job:
+    """A queued model call."""
+
+    def __init__(self, fn, args, kwargs, priority, tokens, future):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+        self.stale = False  # Set when the job is re-queued under another priority
+
+
+class RequestScheduler:
+    """
+    Admits model calls under a requests/min and tokens/min budget, serving
+    interactive work before prefetch work before batch work.
+
+    Calls are queued with submit() and executed on a small worker pool once both
+    token buckets allow it. Each call returns a concurrent.futures.Future.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute=60,
+        tokens_per_minute=90000,
+        max_concurrency=4,
+        max_queue_depth=None,
+        max_retries=3,
+        backoff_seconds=5.0,
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        # Per-priority queue limits; interactive work is never shed
+        self.max_queue_depth = max_queue_depth or {
+            INTERACTIVE: None,
+            PREFETCH: 8,
+            BATCH: 1000,
+        }
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._jobs_by_future = {}
+        self._depth = {priority: 0 for priority in PRIORITY_NAMES}
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-worker"
+        )
+        self._running = True
+
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "rate_limited": 0,
+            "in_flight": 0,
+            "max_depth": {name: 0 for name in PRIORITY_NAMES.values()},
+            "total_wait_seconds": {name: 0.0 for name in PRIORITY_NAMES.values()},
+            "dispatched": {name: 0 for name in PRIORITY_NAMES.values()},
+        }
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="llm-scheduler", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, fn, *args, priority=INTERACTIVE, tokens=1000, **kwargs):
+        """
+        Queues fn(*args, **kwargs) for execution under the rate limits.
+
+        Parameters:
+            fn (callable): The model call to execute.
+            priority (int): INTERACTIVE, PREFETCH or BATCH.
+            tokens (int): Estimated prompt + completion tokens for the call.
+
+        Returns:
+            Future: Resolves to the return value of fn.
+
+        Raises:
+            SchedulerFullError: If the queue for this priority is at capacity.
+        """
+        future = Future()
+        # Run in the caller's context so the call joins the caller's trace
+        job = _Job(tracing.wrap(fn), args, kwargs, priority, tokens, future)
+
+        with self._condition:
+            limit = self.max_queue_depth.get(priority)
+            if limit is not None and self._depth[priority] >= limit:
+                self._metrics["rejected"] += 1
+                logger.warning(
+                    f"LLM scheduler queue full for {PRIORITY_NAMES[priority]} "
+                    f"(depth {self._depth[priority]}). Request rejected."
+                )
+                raise SchedulerFullError(
+                    f"{PRIORITY_NAMES[priority]} queue is full ({limit} pending)."
+                )
+            self._push(job)
+            self._jobs_by_future[future] = job
+            self._metrics["submitted"] += 1
+            self._condition.notify()
+
+        future.add_done_callback(self._on_future_done)
+        return future
+
+    def reprioritize(self, future, priority):
+        """
+        Moves a still-queued request to a different priority class.
+
+        Returns:
+            bool: True if the request was re-queued, False if it already started.
+        """
+        with self._condition:
+            job = self._jobs_by_future.get(future)
+            if job is None or job.stale or future.done() or future.running():
+                return False
+            if job.priority == priority:
+                return True
+            job.stale = True
+            self._depth[job.priority] -= 1
+            moved = _Job(job.fn, job.args, job.kwargs, priority, job.tokens, future)
+            moved.enqueued_at = job.enqueued_at
+            moved.attempts = job.attempts
+            self._push(moved)
+            self._jobs_by_future[future] = moved
+            self._condition.notify()
+        logger.debug("Moved queued LLM request to %s.", PRIORITY_NAMES[priority])
+        return True
+
+    def queue_depth(self, priority=None):
+        """Returns the number of queued requests, optionally for one priority class."""
+        with self._condition:
+            if priority is None:
+                return sum(self._depth.values())
+            return self._depth[priority]
+
+    def get_metrics(self):
+        """Returns a snapshot of queue depths, counters and bucket levels."""
+        with self._condition:
+            snapshot = {
+                key: (dict(value) if isinstance(value, dict) else value)
+                for key, value in self._metrics.items()
+            }
+            snapshot["depth"] = {
+                PRIORITY_NAMES[priority]: depth
+                for priority, depth in self._depth.items()
+            }
+            snapshot["paused_for_seconds"] = max(
+                0.0, self._paused_until - time.monotonic()
+            )
+        snapshot["requests_available"] = self.request_bucket.available()
+        snapshot["tokens_available"] = self.token_bucket.available()
+        return snapshot
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Charges (or refunds) the token bucket once the real usage is known."""
+        if actual_tokens is None:
+            return
+        self.token_bucket.consume(actual_tokens - estimated_tokens)
+
+    def shutdown(self, wait=True):
+        """Stops the dispatcher and fails anything still queued."""
+        with self._condition:
+            self._running = False
+            pending = [job for _, _, job in self._heap if not job.stale]
+            self._heap.clear()
+            self._condition.notify_all()
+        for job in pending:
+            _fail_shut_down(job)
+        self._executor.shutdown(wait=wait)
+
+    # Internal helpers
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.priority, next(self._counter), job))
+        self._depth[job.priority] += 1
+        name = PRIORITY_NAMES[job.priority]
+        self._metrics["max_depth"][name] = max(
+            self._metrics["max_depth"][name], self._depth[job.priority]
+        )
+
+    def _on_future_done(self, future):
+        with self._condition:
+            job = self._jobs_by_future.pop(future, None)
+            if future.cancelled():
+                self._metrics["cancelled"] += 1
+                # Cancelled while still queued: drop it from the depth count now,
+                # the heap entry is skipped lazily by the dispatcher
+                if job is not None and not job.stale:
+                    job.stale = True
+                    self._depth[job.priority] -= 1
+
+    def _next_job(self):
+        """Pops the next live job, waiting while the queue is empty or paused."""
+        with self._condition:
+            while self._running:
+                while self._heap and self._heap[0][2].stale:
+                    heapq.heappop(self._heap)
+                pause = self._paused_until - time.monotonic()
+                if self._heap and pause <= 0:
+                    _, _, job = heapq.heappop(self._heap)
+                    self._depth[job.priority] -= 1
+                    job.stale = True
+                    return job
+                self._condition.wait(timeout=pause if pause > 0 else None)
+            return None
+
+    def _dispatch_loop(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            # Wait until both buckets can admit the request
+            while True:
+                delay = max(
+                    self.request_bucket.wait_time(1),
+                    self.token_bucket.wait_time(job.tokens),
+                )
+                if delay <= 0:
+                    break
+                time.sleep(min(delay, 1.0))
+                # A higher priority request may have arrived while waiting
+                with self._condition:
+                    if (
+                        self._heap
+                        and not self._heap[0][2].stale
+                        and self._heap[0][0] < job.priority
+                    ):
+                        job.stale = False
+                        self._push(job)
+                        job = None
+                        break
+            if job is None:
+                continue
+
+            if not self._running:
+                _fail_shut_down(job)  # Shut down while waiting for the buckets
+                continue
+            if not job.future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued
+
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(job.tokens)
+            name = PRIORITY_NAMES[job.priority]
+            with self._condition:
+                self._metrics["dispatched"][name] += 1
+                self._metrics["total_wait_seconds"][name] += (
+                    time.monotonic() - job.enqueued_at
+                )
+                self._metrics["in_flight"] += 1
+            try:
+                self._executor.submit(self._run, job)
+            except RuntimeError:
+                # The executor was shut down between the check above and now
+                with self._condition:
+                    self._metrics["in_flight"] -= 1
+                _fail_shut_down(job)
+
+    def _run(self, job):
+        try:
+            result = job.fn(*job.args, **job.kwargs)
+        except Exception as e:
+            if _is_rate_limit_error(e) and job.attempts < self.max_retries:
+                self._retry_after_rate_limit(job, e)
+                return
+            with self._condition:
+                self._metrics["in_flight"] -= 1
+                self._metrics["failed"] += 1
+            job.future.set_exception(e)
+            return
+
+        with self._condition:
+            self._metrics["in_flight"] -= 1
+            self._metrics["completed"] += 1
+        job.future.set_result(result)
+
+    def _retry_after_rate_limit(self, job, error):
+        """Pauses all dispatching and re-queues the job after a 429 response."""
+        job.attempts += 1
+        backoff = self.backoff_seconds * (2 ** (job.attempts - 1))
+        logger.warning(
+            f"LLM rate limit hit ({error}). Pausing dispatch for {backoff:.1f}s "
+            f"(attempt {job.attempts}/{self.max_retries})."
+        )
+        # The future is already running; wrap the retry in a fresh job sharing it
+        retry = _Job(job.fn, job.args, job.kwargs, job.priority, job.tokens, None)
+        retry.attempts = job.attempts
+        retry.future = _RunningFuture(job.future)
+        with self._condition:
+            self._metrics["in_flight"] -= 1
+            self._metrics["rate_limited"] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+            self._push(retry)
+            self._condition.notify()
+
+
+class _RunningFuture:
+    """
+    Adapter that lets a retried job complete a future that is already running.
+
+    The original Future cannot be moved back to pending, so retries report into it
+    through this wrapper, which accepts the dispatcher's state transitions.
+    """
+
+    def __init__(self, future):
+        self._future = future
+
+    def set_running_or_notify_cancel(self):
+        return not self._future.cancelled()
+
+    def set_result(self, result):
+        self._future.set_result(result)
+
+    def set_exception(self, exception):
+        self._future.set_exception(exception)
+
+    def cancel(self):
+        return False
+
+    def cancelled(self):
+        return self._future.cancelled()
+
+    def done(self):
+        return self._future.done()
+
+    def running(self):
+        return True
+
+
+def _fail_shut_down(job):
+    """
+    Resolves a job that will never run, so its caller does not block forever.
+
+    cancel() is not enough: a retried job's future is already running and cannot
+    be cancelled, so the error is set on it instead.
+    """
+    if job.future.done():
+        return
+    try:
+        job.future.set_exception(RuntimeError("scheduler shut down"))
+    except InvalidStateError:
+        pass  # Cancelled by the caller in the meantime
+
+
+def _is_rate_limit_error(error):
+    """Detects HTTP 429 errors from the OpenAI client without importing it."""
+    if type(error).__name__ == "RateLimitError":
+        return True
+    return getattr(error, "status_code", None) == 429
+
+
+def estimate_tokens(text, completion_tokens=3000):
+    """
+    Roughly estimates the tokens a request will use (about 4 characters per token).
+
+    Parameters:
+        text (str): The prompt text sent to the model.
+        completion_tokens (int): Expected size of the model's answer.
+
+    Returns:
+        int: Estimated prompt + completion tokens.
+    """
+    return len(text) // 4 + completion_tokens
+
+
+def get_scheduler():
+    """Returns the process-wide scheduler, creating it from the environment on first use."""
+    global scheduler
+    with _scheduler_lock:
+        if scheduler is None:
+            scheduler = RequestScheduler(
+                requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MIN", "60")),
+                tokens_per_minute=int(os.getenv("LLM_TOKENS_PER_MIN", "90000")),
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+            )
+            logger.info(
+                f"LLM scheduler started: {os.getenv('LLM_REQUESTS_PER_MIN', '60')} req/min, "
+                f"{os.getenv('LLM_TOKENS_PER_MIN', '90000')} tokens/min."
+            )
+        return scheduler
@@ -0,0 +1,490 @@
+# api/server.py
+"""
+Local HTTP API for the Smart Elective Advisor.
+
+An asyncio server (standard library only) exposing login, preferences, catalog
+browsing and recommendation generation. Each client authenticates once and then sends
+its session token as `Authorization: Bearer <token>`, so any number of users can be
+served by one process. Database and model calls block, so they run in thread pools
+while the event loop keeps accepting and parsing requests.
+
+Usage:
+    python -m api.server --host 127.0.0.1 --port 8080
+
+Endpoints:
+    GET  /health
+    GET  /metrics                       Prometheus text format
+    POST /register                      {"full_name", "email", "password"}
+    POST /login                         {"email", "password"} -> {"token", "user"}
+    POST /logout
+    GET  /catalog/colleges
+    GET  /catalog/colleges/<id>/departments
+    GET  /catalog/departments/<id>/degree-levels
+    GET  /catalog/degree-levels/<id>/degrees
+    GET  /catalog/degrees/<id>/jobs
+    GET  /preferences
+    PUT  /preferences                   {"college_id", ..., "job_id"}
+    GET  /recommendations[?job_id=<id>]
+    POST /recommendations               {"job_id"} (optional)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from ai_integration import recommendation_pipeline
+from ai_integration.ai_module import main_int_ai
+from api.sessions import SessionStore
+from database import db_operations, query_log
+from database.db_setup import main_int_db
+from utilities import metrics, tracing
+from utilities.load_env import apply_service_defaults, load_environment
+from utilities.logger_setup import setup_logger
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Threads for short database calls, and separately for recommendation generation,
+# which can wait on the model for a long time
+DB_WORKERS = int(os.getenv("API_DB_WORKERS", "8"))
+GENERATION_WORKERS = int(os.getenv("API_GENERATION_WORKERS", "4"))
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total",
+    "API requests by method, route and status.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "API request handling time by route.", ["route"]
+)
+API_SESSIONS = metrics.gauge("api_sessions", "Active API sessions.")
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_SECONDS = 30
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+PREFERENCE_KEYS = (
+    "college_id",
+    "department_id",
+    "degree_level_id",
+    "degree_id",
+    "job_id",
+)
+
+
+class HttpError(Exception):
+    """Ends a request with an error status and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path.rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+        self.session = None
+        self.route = None  # The matched route pattern, for metrics
+
+    def json(self):
+        """Returns the body parsed as a JSON object ({} when empty)."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HttpError(400, f"Invalid JSON body: {e}")
+        if not isinstance(data, dict):
+            raise HttpError(400, "The JSON body must be an object.")
+        return data
+
+    @property
+    def keep_alive(self):
+        return self.headers.get("connection", "").lower() != "close"
+
+
+def _jsonable(value):
+    """Converts sqlite3.Row results (alone or in lists) to plain dicts."""
+    if isinstance(value, sqlite3.Row):
+        return dict(value)
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+class ApiServer:
+    """Routes HTTP requests to the database and recommendation pipeline."""
+
+    def __init__(self, sessions=None):
+        """
+        :param sessions: SessionStore, optional, Defaults to a new in-memory store.
+        """
+        self.sessions = sessions or SessionStore()
+        self.db_executor = ThreadPoolExecutor(DB_WORKERS, thread_name_prefix="api-db")
+        self.generation_executor = ThreadPoolExecutor(
+            GENERATION_WORKERS, thread_name_prefix="api-generate"
+        )
+        self.routes = []  # [(method, compiled path pattern, handler, needs session)]
+        self.requests_served = 0
+
+        self.route("GET", r"/health", self.health, auth=False)
+        self.route("GET", r"/metrics", self.metrics, auth=False)
+        self.route("POST", r"/register", self.register, auth=False)
+        self.route("POST", r"/login", self.login, auth=False)
+        self.route("POST", r"/logout", self.logout)
+        self.route("GET", r"/catalog/colleges", self.colleges, auth=False)
+        self.route(
+            "GET", r"/catalog/colleges/(\d+)/departments", self.departments, auth=False
+        )
+        self.route(
+            "GET",
+            r"/catalog/departments/(\d+)/degree-levels",
+            self.degree_levels,
+            auth=False,
+        )
+        self.route(
+            "GET", r"/catalog/degree-levels/(\d+)/degrees", self.degrees, auth=False
+        )
+        self.route("GET", r"/catalog/degrees/(\d+)/jobs", self.jobs, auth=False)
+        self.route("GET", r"/preferences", self.get_preferences)
+        self.route("PUT", r"/preferences", self.put_preferences)
+        self.route("GET", r"/recommendations", self.get_recommendations)
+        self.route("POST", r"/recommendations", self.generate_recommendations)
+
+    def route(self, method, pattern, handler, auth=True):
+        """
+        Registers a handler.
+
+        :param method: str, HTTP method.
+        :param pattern: str, Regular expression for the whole path; groups are passed
+            to the handler as strings.
+        :param handler: coroutine function, Called as handler(request, *groups) and
+            returning (status, JSON-serializable body).
+        :param auth: bool, Require a valid session token.
+        """
+        self.routes.append((method, re.compile(pattern + r"\Z"), handler, auth))
+
+    async def run_db(self, function, *args):
+        """Runs a blocking database call in the database thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.db_executor, tracing.wrap(function), *args
+        )
+
+    # -- connection handling --------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self.read_request(reader), KEEP_ALIVE_SECONDS
+                    )
+                except HttpError as e:
+                    await self.write_response(writer, e.status, {"error": e.message})
+                    break
+                if request is None:
+                    break
+                status, body = await self.dispatch(request)
+                await self.write_response(writer, status, body, request.keep_alive)
+                self.requests_served += 1
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """Reads one request; returns None when the client closed the connection."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(400, "Incomplete request.")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Request headers too large.")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):  # Also rejects "-1"
+            raise HttpError(400, "Invalid Content-Length header.")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, headers, body)
+
+    async def write_response(self, writer, status, body, keep_alive=False):
+        if isinstance(body, str):  # Plain text (the metrics exposition)
+            payload = body.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            payload = json.dumps(body).encode("utf-8")
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def dispatch(self, request):
+        """Finds the route for a request and runs it; returns (status, body)."""
+        start = time.perf_counter()
+        with tracing.span(
+            "http.request", new_trace=True, method=request.method, path=request.path
+        ) as request_span:
+            status, body = await self._dispatch(request)
+            request_span.set(status=status)
+        route = request.route or "unmatched"
+        HTTP_REQUEST_SECONDS.labels(route).observe(time.perf_counter() - start)
+        HTTP_REQUESTS.labels(request.method, route, status).inc()
+        return status, body
+
+    async def _dispatch(self, request):
+        start = time.perf_counter()
+        allowed = []
+        try:
+            for method, pattern, handler, auth in self.routes:
+                match = pattern.match(request.path)
+                if not match:
+                    continue
+                request.route = pattern.pattern.removesuffix(r"\Z")
+                if method != request.method:
+                    allowed.append(method)
+                    continue
+                if auth:
+                    request.session = self.authenticate(request)
+                status, body = await handler(request, *match.groups())
+                break
+            else:
+                if allowed:
+                    raise HttpError(
+                        405, f"Use {', '.join(allowed)} for {request.path}."
+                    )
+                raise HttpError(404, f"No route for {request.path}.")
+        except HttpError as e:
+            status, body = e.status, {"error": e.message}
+        except Exception:
+            logger.exception(f"Unhandled error for {request.method} {request.path}.")
+            status, body = 500, {"error": "Internal server error."}
+
+        logger.debug(
+            f"{request.method} {request.path} -> {status} in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return status, body
+
+    def authenticate(self, request):
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        session = self.sessions.get(token) if scheme.lower() == "bearer" else None
+        if session is None:
+            raise HttpError(401, "Log in and send the session token as a Bearer token.")
+        return session
+
+    # -- handlers ---------------------------------------------------------------
+
+    async def health(self, request):
+        return 200, {"status": "ok", "sessions": len(self.sessions)}
+
+    async def metrics(self, request):
+        API_SESSIONS.set(len(self.sessions))
+        return 200, metrics.render()
+
+    async def register(self, request):
+        data = request.json()
+        fields = [data.get(key) for key in ("full_name", "email", "password")]
+        if not all(isinstance(value, str) and value for value in fields):
+            raise HttpError(422, "full_name, email and password are required.")
+        if not await self.run_db(db_operations.register_user, *fields):
+            raise HttpError(409, "Registration failed; the email may already exist.")
+        return 201, {"registered": data["email"]}
+
+    async def login(self, request):
+        data = request.json()
+        user = await self.run_db(
+            db_operations.authenticate_user, data.get("email"), data.get("password")
+        )
+        if not user:
+            raise HttpError(401, "Invalid email or password.")
+        session = self.sessions.create(user)
+        return 200, {"token": session.token, "user": user}
+
+    async def logout(self, request):
+        self.sessions.delete(request.session.token)
+        return 200, {"logged_out": True}
+
+    async def colleges(self, request):
+        return 200, _jsonable(await self.run_db(db_operations.get_colleges))
+
+    async def departments(self, request, college_id):
+        rows = await self.run_db(db_operations.get_departments, int(college_id))
+        return 200, _jsonable(rows)
+
+    async def degree_levels(self, request, department_id):
+        rows = await self.run_db(db_operations.get_degree_levels, int(department_id))
+        return 200, _jsonable(rows)
+
+    async def degrees(self, request, degree_level_id):
+        rows = await self.run_db(db_operations.get_degrees, int(degree_level_id))
+        return 200, _jsonable(rows)
+
+    async def jobs(self, request, degree_id):
+        rows = await self.run_db(db_operations.get_jobs_by_degree, int(degree_id))
+        return 200, _jsonable(rows)
+
+    async def get_preferences(self, request):
+        prefs = await self.run_db(
+            db_operations.get_user_preferences, request.session.user_id
+        )
+        return 200, _jsonable(prefs)
+
+    async def put_preferences(self, request):
+        data = request.json()
+        preferences = {key: data[key] for key in PREFERENCE_KEYS if key in data}
+        if not all(isinstance(value, int) for value in preferences.values()):
+            raise HttpError(422, "Preference IDs must be integers.")
+        saved = await self.run_db(
+            db_operations.save_user_preferences, request.session.user_id, preferences
+        )
+        if not saved:
+            raise HttpError(500, "Failed to save preferences.")
+        return 200, preferences
+
+    async def get_recommendations(self, request):
+        user_id = request.session.user_id
+        job_id = request.query.get("job_id")
+        if job_id is not None and not job_id.isdigit():
+            raise HttpError(422, "job_id must be an integer.")
+        if job_id is None:
+            prefs = await self.run_db(db_operations.get_user_preferences, user_id)
+            job_id = prefs.get("job_id")
+        if not job_id:
+            raise HttpError(422, "No job_id given and no preferred job saved.")
+        rows = await self.run_db(
+            db_operations.get_recommendations, user_id, int(job_id)
+        )
+        return 200, {"job_id": int(job_id), "recommendations": rows}
+
+    async def generate_recommendations(self, request):
+        job_id = request.json().get("job_id")
+        if job_id is not None and not isinstance(job_id, int):
+            raise HttpError(422, "job_id must be an integer.")
+        loop = asyncio.get_running_loop()
+        try:
+            status, recommendations = await loop.run_in_executor(
+                self.generation_executor,
+                tracing.wrap(self._generate),
+                request.session.user_id,
+                job_id,
+            )
+        except ValueError as e:
+            raise HttpError(422, str(e))
+        except RuntimeError as e:
+            logger.error(f"Recommendation generation failed: {e}")
+            raise HttpError(500, "Failed to generate recommendations.")
+        return 200, {"status": status, "recommendations": recommendations}
+
+    @staticmethod
+    def _generate(user_id, job_id):
+        user_id, job, degree, degree_electives = recommendation_pipeline.resolve_inputs(
+            user_id, job_id=job_id
+        )
+        return recommendation_pipeline.generate_recommendations(
+            user_id, job, degree, degree_electives
+        )
+
+    def close(self):
+        self.db_executor.shutdown(wait=False)
+        self.generation_executor.shutdown(wait=False)
+
+
+async def serve(host, port, server=None):
+    """Runs the API until cancelled."""
+    server = server or ApiServer()
+    listener = await asyncio.start_server(
+        server.handle_connection, host, port, limit=MAX_HEADER_BYTES, backlog=1024
+    )
+    address = listener.sockets[0].getsockname()
+    logger.info(f"API listening on http://{address[0]}:{address[1]}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        logger.info(f"API stopped after {server.requests_served} request(s).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Elective Advisor HTTP API.")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8080")))
+    parser.add_argument(
+        "--skip-db-setup",
+        action="store_true",
+        help="Use the existing database without running the schema setup and CSV import.",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    try:
+        load_environment()
+    except ValueError as e:
+        logger.error(f"Error loading environment: {e}")
+    tracing.setup_tracing()
+    metrics.setup_metrics()
+    query_log.setup_query_log()
+    apply_service_defaults()
+    if not args.skip_db_setup:
+        main_int_db()
+    main_int_ai()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
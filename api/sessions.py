@@ -0,0 +1,89 @@
+# api/sessions.py
+
+import logging
+import os
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Idle time after which a session expires
+SESSION_TTL_SECONDS = float(os.getenv("API_SESSION_TTL_SECONDS", "3600"))
+
+
+class Session:
+    """The per-client state that the GUI keeps in its current_user global."""
+
+    def __init__(self, token, user):
+        self.token = token
+        self.user = user
+        self.created_at = time.monotonic()
+        self.last_seen = self.created_at
+
+    @property
+    def user_id(self):
+        return self.user["user_id"]
+
+
+class SessionStore:
+    """
+    In-memory sessions keyed by an unguessable bearer token.
+
+    Sessions expire after `ttl` seconds without use; expired sessions are dropped
+    lazily on lookup and in bulk whenever a new session is created.
+    """
+
+    def __init__(self, ttl=None):
+        """
+        :param ttl: float, optional, Idle timeout in seconds (API_SESSION_TTL_SECONDS).
+        """
+        self.ttl = SESSION_TTL_SECONDS if ttl is None else ttl
+        self._sessions = {}  # token -> Session
+        self._lock = threading.Lock()
+
+    def create(self, user):
+        """
+        Starts a session for an authenticated user.
+
+        :param user: dict, The user as returned by db_operations.authenticate_user.
+        :return: Session, The new session.
+        """
+        session = Session(secrets.token_urlsafe(32), user)
+        with self._lock:
+            self._purge_expired()
+            self._sessions[session.token] = session
+        logger.info(f"Session started for user_id {session.user_id}.")
+        return session
+
+    def get(self, token):
+        """
+        Returns the live session for `token` and marks it as used.
+
+        :param token: str, The bearer token.
+        :return: Session or None, None if the token is unknown or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if now - session.last_seen > self.ttl:
+                del self._sessions[token]
+                return None
+            session.last_seen = now
+            return session
+
+    def delete(self, token):
+        """Ends a session; returns True if it existed."""
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _purge_expired(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = [t for t, s in self._sessions.items() if s.last_seen < cutoff]
+        for token in expired:
+            del self._sessions[token]
@@ -0,0 +1,147 @@
+# benchmarks/api_load_test.py
+"""
+Load-tests a running API server (python -m api.server) with many concurrent users and
+reports requests per second and latency percentiles per endpoint.
+
+Every virtual user registers (if needed), logs in with its own session and then loops
+over a mix of catalog, preference and stored-recommendation requests. Recommendation
+generation is left out by default because it calls the model; add it with
+--generate.
+
+Usage:
+    python -m benchmarks.api_load_test --url http://127.0.0.1:8080 --users 50 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def summarize(samples, elapsed):
+    """Turns latency samples (ms) into a report entry."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"requests": 0, "rps": 0.0}
+    return {
+        "requests": len(ordered),
+        "rps": len(ordered) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "max_ms": ordered[-1],
+    }
+
+
+async def login(client, index):
+    email = f"loadtest-user-{index}@example.com"
+    credentials = {"email": email, "password": "LoadTest123!"}
+    await client.post(
+        "/register", json={"full_name": f"Load Test {index}", **credentials}
+    )  # 409 once the user exists
+    response = await client.post("/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+async def prepare_user(client, index, generate):
+    """Logs a virtual user in and saves preferences; returns (headers, requests)."""
+    token = await login(client, index)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    colleges = (await client.get("/catalog/colleges")).json()
+    # Save a valid preference chain so the other endpoints have data to return
+    college = random.choice(colleges)
+    departments = (
+        await client.get(f"/catalog/colleges/{college['college_id']}/departments")
+    ).json()
+    preferences = {"college_id": college["college_id"]}
+    if departments:
+        preferences["department_id"] = departments[0]["department_id"]
+    await client.put("/preferences", json=preferences, headers=headers)
+
+    requests = [
+        ("GET /catalog/colleges", "GET", "/catalog/colleges"),
+        (
+            "GET /catalog/colleges/<id>/departments",
+            "GET",
+            f"/catalog/colleges/{college['college_id']}/departments",
+        ),
+        ("GET /preferences", "GET", "/preferences"),
+        ("GET /recommendations", "GET", "/recommendations?job_id=1"),
+    ]
+    if generate:
+        requests.append(("POST /recommendations", "POST", "/recommendations"))
+    return headers, requests
+
+
+async def virtual_user(client, headers, requests, deadline, samples, errors):
+    while time.perf_counter() < deadline:
+        name, method, path = random.choice(requests)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, headers=headers)
+            ok = response.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        samples.setdefault(name, []).append(elapsed_ms)
+        if not ok:
+            errors[name] = errors.get(name, 0) + 1
+
+
+async def run(url, users, duration, generate):
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        # Logins hash passwords and are slow on purpose; keep them out of the timings
+        prepared = await asyncio.gather(
+            *(prepare_user(client, index, generate) for index in range(users))
+        )
+        samples = {}
+        errors = {}
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(
+            *(
+                virtual_user(client, headers, requests, deadline, samples, errors)
+                for headers, requests in prepared
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    report = {
+        "users": users,
+        "duration_s": elapsed,
+        "overall": summarize([ms for s in samples.values() for ms in s], elapsed),
+        "endpoints": {name: summarize(s, elapsed) for name, s in samples.items()},
+        "errors": errors,
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument(
+        "--generate", action="store_true", help="Include POST /recommendations."
+    )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.url, args.users, args.duration, args.generate))
+    print(json.dumps(report, indent=4))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/http_pool_bench.py
+"""
+Measures per-request connection overhead of the shared model HTTP pool against a
+local stand-in server.
+
+The stand-in server (stand_in_server.py, shared with the HTTP pool tests)
+speaks HTTP/1.1 with keep-alive and can add an artificial delay to every new
+connection to mimic TLS setup against the real backend.
+
+Usage:
+    python -m benchmarks.http_pool_bench --requests 200 --handshake-ms 30
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import httpx
+
+from ai_integration import http_pool
+from benchmarks.stand_in_server import start_stand_in_server
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(samples):
+    return {
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": _percentile(samples, 50) * 1000,
+        "p95_ms": _percentile(samples, 95) * 1000,
+    }
+
+
+def run_pooled(base_url, requests):
+    """Sends every request through one pooled client, as the model client does."""
+    before = http_pool.get_pool_metrics()
+    client = http_pool.create_http_client()
+    samples = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.post(base_url + "/chat/completions", json={"ping": True})
+            samples.append(time.perf_counter() - start)
+    finally:
+        client.close()
+    after = http_pool.get_pool_metrics()
+    result = _summarize(samples)
+    result["new_connections"] = after["new_connections"] - before["new_connections"]
+    return result
+
+
+def run_unpooled(base_url, requests):
+    """Opens a fresh client (and therefore a fresh connection) for every request."""
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        with httpx.Client() as client:
+            client.post(base_url + "/chat/completions", json={"ping": True})
+        samples.append(time.perf_counter() - start)
+    result = _summarize(samples)
+    result["new_connections"] = requests
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--handshake-ms",
+        type=float,
+        default=0.0,
+        help="Artificial delay added to each new connection (simulates TLS).",
+    )
+    args = parser.parse_args(argv)
+
+    server, base_url = start_stand_in_server(args.handshake_ms)
+    try:
+        pooled = run_pooled(base_url, args.requests)
+        unpooled = run_unpooled(base_url, args.requests)
+    finally:
+        server.shutdown()
+
+    report = {
+        "requests": args.requests,
+        "handshake_ms": args.handshake_ms,
+        "pooled": pooled,
+        "unpooled": unpooled,
+        "connection_overhead_ms": unpooled["mean_ms"] - pooled["mean_ms"],
+    }
+    print(json.dumps(report, indent=4))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/logging_bench.py
+"""
+Measures the logging overhead in two hot paths: populate_courses_data (one log
+record per CSV row) and save_recommendation_set (one record per saved set), and the
+cost of single logger.info() calls on the caller's side.
+
+Each workload runs under three logging setups:
+    sync-debug  StreamHandler and FileHandler on the root logger at DEBUG, which
+                writes the same per-row lines as the previous INFO logging did
+    sync-info   the same synchronous handlers at INFO
+    queue-info  utilities.logger_setup.setup_logger(): queue handler, background
+                listener, rotating file and rate limiting, at INFO
+
+Console output goes to os.devnull so the terminal does not skew the timings;
+--slow-sink-ms delays every console write instead, like a busy terminal, pipe or
+network disk would. Runs in a temporary directory with its own database.
+
+Usage:
+    python -m benchmarks.logging_bench --repeat 20 --sets 200
+    python -m benchmarks.logging_bench --slow-sink-ms 1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from database import db_operations, db_setup
+from utilities import logger_setup
+
+SETUPS = ("sync-debug", "sync-info", "queue-info")
+PREREQUISITES = (
+    db_setup.populate_colleges_data,
+    db_setup.populate_departments_data,
+    db_setup.populate_degree_levels_data,
+    db_setup.populate_degrees_data,
+    db_setup.populate_requirements_data,
+    db_setup.populate_subcategories_data,
+)
+
+
+class SlowStream:
+    """A console stream whose writes take `delay_ms`."""
+
+    def __init__(self, delay_ms):
+        self.delay = delay_ms / 1000
+
+    def write(self, text):
+        time.sleep(self.delay)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def configure(setup, workdir, slow_sink_ms=0):
+    """Replaces the root handlers with the given setup."""
+    logger_setup.stop_logger()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    console = SlowStream(slow_sink_ms) if slow_sink_ms else open(os.devnull, "w")
+    log_file = os.path.join(workdir, f"{setup}.log")
+    if setup == "queue-info":
+        os.environ["LOG_FILE"] = log_file
+        os.environ["LOG_LEVEL"] = "INFO"
+        logger_setup.setup_logger()
+        for handler in logger_setup._listener.handlers:
+            if type(handler) is logging.StreamHandler:
+                handler.setStream(console)
+        return
+
+    formatter = logging.Formatter(logger_setup.LOG_FORMAT)
+    for handler in (logging.StreamHandler(console), logging.FileHandler(log_file)):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(logging.DEBUG if setup == "sync-debug" else logging.INFO)
+
+
+def time_populate_courses(repeat):
+    """Loads courses.csv into a fresh in-memory database `repeat` times."""
+    timings = []
+    for _ in range(repeat):
+        conn = db_setup.create_connection(":memory:")
+        db_setup.create_tables(conn)
+        for populate in PREREQUISITES:
+            populate(conn)
+        start = time.perf_counter()
+        db_setup.populate_courses_data(conn)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.close()
+    return timings
+
+
+def time_save_sets(sets, run):
+    """Saves `sets` new recommendation sets of ten items each, one at a time."""
+    conn = db_operations.connect_db()
+    course_ids = [row[0] for row in conn.execute("SELECT course_id FROM Courses;")]
+    degree_id, job_id = conn.execute("SELECT degree_id, job_id FROM Jobs;").fetchone()
+    conn.close()
+    items = [
+        {"course_id": course_id, "rating": 8, "explanation": "Bench.", "rank": rank}
+        for rank, course_id in enumerate(course_ids[:10], start=1)
+    ]
+
+    timings = []
+    for index in range(sets):
+        start = time.perf_counter()
+        db_operations.save_recommendation_set(
+            degree_id, job_id, "bench", "bench", items, f"bench-{run}-{index}"
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def time_records(records):
+    """Times `records` INFO calls one by one."""
+    logger = logging.getLogger("benchmarks.hot_path")
+    timings = []
+    for index in range(records):
+        start = time.perf_counter()
+        logger.info("Processed row %s of %s.", index, records)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "max_ms": ordered[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sets", type=int, default=200)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--slow-sink-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    report = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                logging.disable(logging.CRITICAL)
+                db_setup.main_int_db()
+                logging.disable(logging.NOTSET)
+            for setup in SETUPS:
+                configure(setup, workdir, args.slow_sink_ms)
+                report[setup] = {
+                    "populate_courses_data": summarize(
+                        time_populate_courses(args.repeat)
+                    ),
+                    "save_recommendation_set": summarize(
+                        time_save_sets(args.sets, setup)
+                    ),
+                    "logger.info": summarize(time_records(args.records)),
+                }
+            logger_setup.stop_logger()
+        finally:
+            os.chdir(cwd)
+
+    json.dump(report, sys.stdout, indent=4)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
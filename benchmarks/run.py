@@ -0,0 +1,624 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the database, parser and startup paths, with baseline comparison.
+
+Benchmarks (milliseconds per operation; median, p95 and minimum are recorded):
+    populate.<function>        each db_setup.populate_*_data into a fresh database
+    db.<function>              each db_operations read and write call
+    db.concurrent_writes       writes from 16 threads at once, per write
+    parser.extract_and_parse   extract_starred_lines + parse_course_data, per response
+    format.format_elective_string
+    startup.import             cold import of the application modules (subprocess)
+    startup.db_setup           main_int_db() into an empty directory
+    startup.ai_init            main_int_ai()
+    generate.end_to_end        recommendation_pipeline.generate_recommendation_set
+                               with a simulated model (--model-latency-ms)
+
+Everything runs in a temporary directory with its own database, loaded from
+CATALOG_CSV_DIR if set (e.g. a catalog from database/synthetic_data.py). Results are
+written as JSON; with a baseline, a benchmark whose median is slower than the
+baseline by more than its threshold (and by more than --min-delta-ms) is a regression
+and the run exits with status 1. Thresholds are fractions matched by name pattern in
+benchmarks/thresholds.json; the first matching pattern wins.
+
+Usage:
+    python -m benchmarks.run --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.run                          # compare against it
+    python -m benchmarks.run --only "db.*" "parser.*" --output results.json
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_THRESHOLDS = os.path.join(BENCHMARK_DIR, "thresholds.json")
+
+# Modules the application imports at startup
+STARTUP_IMPORTS = "import ai_integration.ai_module, database.db_setup, ui.gui"
+
+BENCHMARKS = {}  # name -> (function(context, repeat) -> timings in ms, repeat)
+
+
+def benchmark(name, repeat):
+    """Registers a benchmark function returning a list of per-operation timings."""
+
+    def decorator(function):
+        BENCHMARKS[name] = (function, repeat)
+        return function
+
+    return decorator
+
+
+def time_calls(function, repeat, inner=1):
+    """Times `repeat` samples of `inner` calls each; returns ms per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(inner):
+            function()
+        timings.append((time.perf_counter() - start) * 1000 / inner)
+    return timings
+
+
+# -- populate_*_data -------------------------------------------------------------
+
+
+def _populate_benchmark(index):
+    def run(context, repeat):
+        from database import db_setup
+
+        steps = POPULATE_STEPS[: index + 1]
+        csv_dir = os.getenv("CATALOG_CSV_DIR") or None
+        timings = []
+        for _ in range(repeat):
+            conn = db_setup.create_connection(":memory:")
+            db_setup.create_tables(conn)
+            for step in steps[:-1]:
+                getattr(db_setup, step)(conn, csv_dir)
+            start = time.perf_counter()
+            getattr(db_setup, steps[-1])(conn, csv_dir)
+            timings.append((time.perf_counter() - start) * 1000)
+            conn.close()
+        return timings
+
+    return run
+
+
+POPULATE_STEPS = [
+    "populate_colleges_data",
+    "populate_departments_data",
+    "populate_degree_levels_data",
+    "populate_degrees_data",
+    "populate_requirements_data",
+    "populate_subcategories_data",
+    "populate_courses_data",
+    "populate_jobs_data",
+]
+for _index, _step in enumerate(POPULATE_STEPS):
+    benchmark(f"populate.{_step}", repeat=5)(_populate_benchmark(_index))
+
+
+# -- db_operations ---------------------------------------------------------------
+
+
+def _db_read(name, repeat, arguments):
+    def run(context, repeat):
+        from database import db_operations
+
+        function = getattr(db_operations, name)
+        args = arguments(context)
+        return time_calls(lambda: function(*args), repeat)
+
+    benchmark(f"db.{name}", repeat)(run)
+
+
+_db_read("get_colleges", 50, lambda c: ())
+_db_read("get_departments", 50, lambda c: (c["college_id"],))
+_db_read("get_degree_levels", 50, lambda c: (c["department_id"],))
+_db_read("get_degrees", 50, lambda c: (c["degree_level_id"],))
+_db_read("get_jobs_by_degree", 50, lambda c: (c["degree_id"],))
+_db_read("get_job_by_id", 50, lambda c: (c["job_id"],))
+_db_read("get_degree_by_id", 50, lambda c: (c["degree_id"],))
+_db_read("get_degree_electives", 50, lambda c: (c["degree_id"],))
+_db_read("get_course_by_code", 50, lambda c: (c["course_code"],))
+_db_read("get_course_id_by_code", 50, lambda c: (c["course_code"],))
+_db_read("get_user_by_email", 50, lambda c: (c["email"],))
+_db_read("get_user_preferences", 50, lambda c: (c["user_id"],))
+_db_read("find_recommendation_set", 50, lambda c: (c["fingerprint"],))
+_db_read("get_user_recommendation_set", 50, lambda c: (c["user_id"], c["job_id"]))
+_db_read("get_recommendation_set_items", 50, lambda c: (c["set_id"],))
+_db_read("get_recommendation_set_courses", 50, lambda c: (c["set_id"],))
+_db_read("get_recommendations", 50, lambda c: (c["user_id"], c["job_id"]))
+
+
+@benchmark("db.register_user", repeat=3)
+def bench_register_user(context, repeat):
+    from database import db_operations
+
+    emails = iter(f"bench-register-{i}@example.com" for i in range(repeat))
+    return time_calls(
+        lambda: db_operations.register_user("Bench", next(emails), "Bench123!"), repeat
+    )
+
+
+@benchmark("db.authenticate_user", repeat=3)
+def bench_authenticate_user(context, repeat):
+    from database import db_operations
+
+    return time_calls(
+        lambda: db_operations.authenticate_user(context["email"], "Bench123!"), repeat
+    )
+
+
+@benchmark("db.save_user_preferences", repeat=30)
+def bench_save_user_preferences(context, repeat):
+    from database import db_operations
+
+    preferences = db_operations.get_user_preferences(context["user_id"])
+    return time_calls(
+        lambda: db_operations.save_user_preferences(context["user_id"], preferences),
+        repeat,
+    )
+
+
+@benchmark("db.update_user_preferences", repeat=30)
+def bench_update_user_preferences(context, repeat):
+    from database import db_operations
+
+    return time_calls(
+        lambda: db_operations.update_user_preferences(context["user_id"], "S1", 3.5),
+        repeat,
+    )
+
+
+@benchmark("db.save_recommendation_set", repeat=30)
+def bench_save_recommendation_set(context, repeat):
+    from database import db_operations
+
+    fingerprints = iter(f"bench-save-{i}" for i in range(repeat))
+    return time_calls(
+        lambda: db_operations.save_recommendation_set(
+            context["degree_id"],
+            context["job_id"],
+            "bench",
+            "bench",
+            context["items"],
+            next(fingerprints),
+        ),
+        repeat,
+    )
+
+
+@benchmark("db.link_user_recommendation_set", repeat=30)
+def bench_link_user_recommendation_set(context, repeat):
+    from database import db_operations
+
+    return time_calls(
+        lambda: db_operations.link_user_recommendation_set(
+            context["user_id"], context["job_id"], context["set_id"]
+        ),
+        repeat,
+    )
+
+
+@benchmark("db.clear_recommendations", repeat=30)
+def bench_clear_recommendations(context, repeat):
+    from database import db_operations
+
+    def clear_and_relink():
+        db_operations.clear_recommendations(context["user_id"], context["job_id"])
+        db_operations.link_user_recommendation_set(
+            context["user_id"], context["job_id"], context["set_id"]
+        )
+
+    return time_calls(clear_and_relink, repeat)
+
+
+@benchmark("db.concurrent_writes", repeat=5)
+def bench_concurrent_writes(context, repeat):
+    """16 threads writing 25 links each; ms per write."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from database import db_operations
+
+    def write_links(_):
+        for _ in range(25):
+            db_operations.link_user_recommendation_set(
+                context["user_id"], context["job_id"], context["set_id"]
+            )
+
+    def run():
+        with ThreadPoolExecutor(16) as pool:
+            list(pool.map(write_links, range(16)))
+
+    return [timing / 400 for timing in time_calls(run, repeat)]
+
+
+# -- parsing and formatting --------------------------------------------------------
+
+
+def simulated_response(electives, count=10):
+    """A model reply in the prompt's output format for the first `count` electives."""
+    explanation = " ".join(["This elective builds directly relevant skills."] * 20)
+    blocks = []
+    for number, elective in enumerate(electives[:count], start=1):
+        blocks.append(
+            f"**Number:** {number}\n"
+            f"**Course Code:** {elective['course_code']}\n"
+            f"**Course Name:** {elective['name']}\n"
+            f"**Rating:** {100 - number}\n"
+            f"**Explanation:** {explanation}\n"
+            f"**Prerequisites:** Need to take: {elective['prerequisites'] or 'None'}\n"
+        )
+    return "Here are ten electives to choose from.\n\n" + "\n".join(blocks)
+
+
+@benchmark("parser.extract_and_parse", repeat=20)
+def bench_parser(context, repeat):
+    from ai_integration.ai_module import extract_starred_lines, parse_course_data
+
+    response = context["response"]
+    return time_calls(
+        lambda: parse_course_data(extract_starred_lines(response)), repeat, inner=20
+    )
+
+
+@benchmark("format.format_elective_string", repeat=20)
+def bench_format_elective_string(context, repeat):
+    from ai_integration.ai_module import format_elective_string
+
+    elective = context["electives"][0]
+    return time_calls(
+        lambda: format_elective_string(
+            elective["prerequisites"],
+            elective["course_code"],
+            elective["units"],
+            elective["name"],
+            elective["description"],
+        ),
+        repeat,
+        inner=1000,
+    )
+
+
+# -- startup ---------------------------------------------------------------------
+
+
+@benchmark("startup.import", repeat=3)
+def bench_import(context, repeat):
+    command = [sys.executable, "-c", STARTUP_IMPORTS]
+    return time_calls(
+        lambda: subprocess.run(command, cwd=REPO_DIR, check=True, capture_output=True),
+        repeat,
+    )
+
+
+@benchmark("startup.db_setup", repeat=3)
+def bench_db_setup(context, repeat):
+    from database.db_setup import main_int_db
+
+    timings = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as workdir, _working_directory(workdir):
+            start = time.perf_counter()
+            main_int_db()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+@benchmark("startup.ai_init", repeat=3)
+def bench_ai_init(context, repeat):
+    from ai_integration import ai_module
+
+    return time_calls(ai_module.main_int_ai, repeat)
+
+
+# -- end to end --------------------------------------------------------------------
+
+
+class SimulatedModel:
+    """Stands in for ChatOpenAI: waits `latency_ms` and returns a fixed reply."""
+
+    class _Result:
+        def __init__(self, content):
+            self.content = content
+            self.usage_metadata = {"total_tokens": len(content) // 4}
+
+    def __init__(self, content, latency_ms):
+        self.content = content
+        self.latency = latency_ms / 1000
+
+    def invoke(self, prompt):
+        time.sleep(self.latency)
+        return self._Result(self.content)
+
+
+@benchmark("generate.end_to_end", repeat=10)
+def bench_generate(context, repeat):
+    from ai_integration import ai_module, recommendation_pipeline
+    from database import db_operations
+
+    ai_module.main_int_ai()
+    ai_module.model = SimulatedModel(context["response"], context["model_latency_ms"])
+    job = db_operations.get_job_by_id(context["job_id"])
+    degree = db_operations.get_degree_by_id(context["degree_id"])
+    fingerprint = recommendation_pipeline.compute_inputs(
+        job, degree, context["electives"]
+    )["fingerprint"]
+
+    timings = []
+    with _environment(AI_ENABLED="True"):
+        for _ in range(repeat):
+            # Start from a miss every time: no stored set and no cached response
+            conn = db_operations.connect_db()
+            conn.execute(
+                "DELETE FROM Recommendation_Sets WHERE fingerprint = ?;", (fingerprint,)
+            )
+            conn.commit()
+            conn.close()
+            ai_module._response_cache.clear()
+
+            start = time.perf_counter()
+            recommendation_pipeline.generate_recommendation_set(
+                job, degree, db_operations.get_degree_electives(context["degree_id"])
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+# -- runner ------------------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def _working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def _environment(**values):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def prepare_context(model_latency_ms):
+    """Sets up the database in the current directory and picks the inputs."""
+    from database import db_operations
+    from database.db_setup import main_int_db
+
+    main_int_db()
+    conn = db_operations.connect_db()
+    job = conn.execute("""
+        SELECT j.job_id, j.degree_id FROM Jobs j
+        JOIN Degrees d ON d.degree_id = j.degree_id
+        JOIN Requirements r ON r.degree_id = d.degree_id
+        GROUP BY j.job_id ORDER BY j.job_id LIMIT 1;
+        """).fetchone()
+    chain = conn.execute(
+        """
+        SELECT d.degree_level_id, l.department_id, p.college_id
+        FROM Degrees d
+        JOIN Degree_Levels l ON l.degree_level_id = d.degree_level_id
+        JOIN Departments p ON p.department_id = l.department_id
+        WHERE d.degree_id = ?;
+        """,
+        (job["degree_id"],),
+    ).fetchone()
+    conn.close()
+
+    electives = db_operations.get_degree_electives(job["degree_id"])
+    email = "bench-user@example.com"
+    db_operations.register_user("Bench User", email, "Bench123!")
+    user = db_operations.get_user_by_email(email)
+    db_operations.save_user_preferences(
+        user["user_id"],
+        {
+            "college_id": chain["college_id"],
+            "department_id": chain["department_id"],
+            "degree_level_id": chain["degree_level_id"],
+            "degree_id": job["degree_id"],
+            "job_id": job["job_id"],
+        },
+    )
+    items = [
+        {"course_id": course["course_id"], "rating": 90, "explanation": "x", "rank": i}
+        for i, course in enumerate(electives[:10], start=1)
+    ]
+    set_id = db_operations.save_recommendation_set(
+        job["degree_id"], job["job_id"], "bench", "bench", items, "bench-context"
+    )
+    db_operations.link_user_recommendation_set(user["user_id"], job["job_id"], set_id)
+    return {
+        "college_id": chain["college_id"],
+        "department_id": chain["department_id"],
+        "degree_level_id": chain["degree_level_id"],
+        "degree_id": job["degree_id"],
+        "job_id": job["job_id"],
+        "course_code": electives[0]["course_code"],
+        "electives": electives,
+        "email": email,
+        "user_id": user["user_id"],
+        "items": items,
+        "set_id": set_id,
+        "fingerprint": "bench-context",
+        "response": simulated_response(electives),
+        "model_latency_ms": model_latency_ms,
+    }
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "median_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "min_ms": ordered[0],
+    }
+
+
+def run_suite(patterns, repeat_scale, model_latency_ms):
+    """Runs the selected benchmarks; returns {name: summary}."""
+    selected = [
+        name
+        for name in BENCHMARKS
+        if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, _working_directory(workdir):
+        context = prepare_context(model_latency_ms)
+        for name in selected:
+            function, repeat = BENCHMARKS[name]
+            repeat = max(1, int(round(repeat * repeat_scale)))
+            try:
+                results[name] = summarize(function(context, repeat))
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name}: {results[name]}", file=sys.stderr)
+    return results
+
+
+def threshold_for(name, thresholds, default):
+    for pattern, threshold in thresholds.items():
+        if fnmatch.fnmatch(name, pattern):
+            return threshold
+    return default
+
+
+def compare(results, baseline, thresholds, default_threshold, min_delta_ms):
+    """
+    Compares medians with the baseline.
+
+    :return: dict, Per benchmark: baseline and current median, ratio, threshold and
+        whether it regressed.
+    """
+    comparison = {}
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in current:
+            continue
+        threshold = threshold_for(name, thresholds, default_threshold)
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        comparison[name] = {
+            "baseline_ms": base["median_ms"],
+            "current_ms": current["median_ms"],
+            "ratio": ratio,
+            "threshold": threshold,
+            "regressed": ratio > 1 + threshold
+            and current["median_ms"] - base["median_ms"] > min_delta_ms,
+        }
+    return comparison
+
+
+def _load_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", metavar="PATTERN", help="e.g. 'db.*'")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks.")
+    parser.add_argument("--output", help="Write the results JSON here.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write these results as the new baseline instead of comparing.",
+    )
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown for benchmarks without a threshold pattern.",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.1,
+        help="Ignore slowdowns smaller than this (timer noise).",
+    )
+    parser.add_argument("--repeat-scale", type=float, default=1.0)
+    parser.add_argument("--model-latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    sys.path.insert(0, REPO_DIR)
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark-key-0")  # No request is sent
+    logging.disable(logging.WARNING)  # Expected warnings would flood the output
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_suite(args.only, args.repeat_scale, args.model_latency_ms)
+    logging.disable(logging.NOTSET)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=4)
+        print(f"Baseline written to {args.baseline}.", file=sys.stderr)
+    else:
+        baseline = _load_json(args.baseline)
+        if baseline:
+            thresholds = _load_json(args.thresholds) or {}
+            report["comparison"] = compare(
+                results,
+                baseline["results"],
+                thresholds,
+                args.threshold,
+                args.min_delta_ms,
+            )
+            regressions = [
+                name
+                for name, entry in report["comparison"].items()
+                if entry["regressed"]
+            ]
+            report["regressions"] = regressions
+            status = 1 if regressions else 0
+    if any("error" in result for result in results.values()):
+        status = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=4)
+    print(json.dumps(report, indent=4))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
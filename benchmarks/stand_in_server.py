@@ -0,0 +1,61 @@
+# benchmarks/stand_in_server.py
+"""
+Local stand-in for the model backend: speaks HTTP/1.1 with keep-alive and answers
+every request with a small JSON body. It counts the TCP connections it accepts and
+can add an artificial delay to each new one to mimic TLS setup against the real
+backend. Used by benchmarks/http_pool_bench.py and the HTTP pool tests.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON body and keeps the connection open."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls skewing the numbers
+    body = json.dumps({"object": "list", "data": []}).encode("utf-8")
+
+    def setup(self):
+        # Runs once per TCP connection, before any request is read
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+        super().setup()
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass  # Keep test and benchmark output clean
+
+
+def start_stand_in_server(handshake_ms=0.0):
+    """
+    Starts the stand-in server on a free localhost port.
+
+    Returns:
+        tuple: (server, base_url); server.connections counts accepted connections.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.handshake_delay = handshake_ms / 1000.0
+    server.connections = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
@@ -0,0 +1,166 @@
+# benchmarks/storage_profile_bench.py
+"""
+Compares the SQLite storage profiles (database/storage_profile.py) on read, write
+and mixed workloads.
+
+For each profile, a fresh database is built in its own temporary directory with
+DB_STORAGE_PROFILE set, and these workloads run against it (milliseconds per
+operation; connections are opened per call, as the application does):
+    catalog_load        main_int_db() into the empty directory
+    read                get_job_by_id and get_degree_electives, one thread
+    read_parallel       get_degree_electives from --threads threads
+    write               link_user_recommendation_set, one thread
+    write_parallel      the same from --threads threads (group-committed)
+    mixed_read          get_degree_electives while --threads writers are busy
+Set CATALOG_CSV_DIR to run against a generated catalog (database/synthetic_data.py).
+Timings depend heavily on the disk: run it on the kind of storage you deploy to.
+
+Usage:
+    python -m benchmarks.storage_profile_bench
+    python -m benchmarks.storage_profile_bench --profiles sqlite desktop --ops 500
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import db_operations, db_setup, db_writer, storage_profile
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def prepare():
+    """Registers a user and stores a set to link; returns (user_id, job_id, set_id, degree_id)."""
+    conn = db_operations.connect_db()
+    job_id, degree_id = conn.execute(
+        "SELECT job_id, degree_id FROM Jobs ORDER BY job_id LIMIT 1;"
+    ).fetchone()
+    conn.close()
+    db_operations.register_user("Bench", "bench@example.com", "Bench123!")
+    user_id = db_operations.get_user_by_email("bench@example.com")["user_id"]
+    electives = db_operations.get_degree_electives(degree_id)
+    items = [
+        {"course_id": e["course_id"], "rating": 90, "explanation": "x", "rank": i}
+        for i, e in enumerate(electives[:10], start=1)
+    ]
+    set_id = db_operations.save_recommendation_set(
+        degree_id, job_id, "bench", "bench", items, "bench"
+    )
+    return user_id, job_id, set_id, degree_id
+
+
+def parallel(function, threads, ops):
+    """Runs `ops` calls per thread; returns every call's duration."""
+    timings = []
+    lock = threading.Lock()
+
+    def run(_):
+        local = [timed(function) for _ in range(ops)]
+        with lock:
+            timings.extend(local)
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(run, range(threads)))
+    return timings
+
+
+def run_profile(profile, ops, threads):
+    report = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.environ["DB_STORAGE_PROFILE"] = profile
+        report["catalog_load"] = summarize([timed(db_setup.main_int_db)])
+        user_id, job_id, set_id, degree_id = prepare()
+
+        def read_electives():
+            db_operations.get_degree_electives(degree_id)
+
+        def write_link():
+            db_operations.link_user_recommendation_set(user_id, job_id, set_id)
+
+        report["read.get_job_by_id"] = summarize(
+            [timed(db_operations.get_job_by_id, job_id) for _ in range(ops)]
+        )
+        report["read.get_degree_electives"] = summarize(
+            [timed(read_electives) for _ in range(ops)]
+        )
+        report["read_parallel"] = summarize(
+            parallel(read_electives, threads, ops // threads)
+        )
+        report["write"] = summarize([timed(write_link) for _ in range(ops)])
+        report["write_parallel"] = summarize(
+            parallel(write_link, threads, ops // threads)
+        )
+
+        stop = threading.Event()
+
+        def keep_writing():
+            while not stop.is_set():
+                write_link()
+
+        writers = [threading.Thread(target=keep_writing) for _ in range(threads)]
+        for writer in writers:
+            writer.start()
+        try:
+            report["mixed_read"] = summarize(
+                [timed(read_electives) for _ in range(ops)]
+            )
+        finally:
+            stop.set()
+            for writer in writers:
+                writer.join()
+        db_writer.stop_writer()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", nargs="+", default=list(storage_profile.PROFILES))
+    parser.add_argument("--ops", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    report = {}
+    cwd = os.getcwd()
+    previous = os.environ.get("DB_STORAGE_PROFILE")
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for profile in args.profiles:
+                report[profile] = run_profile(profile, args.ops, args.threads)
+    finally:
+        os.chdir(cwd)
+        logging.disable(logging.NOTSET)
+        if previous is None:
+            os.environ.pop("DB_STORAGE_PROFILE", None)
+        else:
+            os.environ["DB_STORAGE_PROFILE"] = previous
+
+    json.dump(report, sys.stdout, indent=4)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
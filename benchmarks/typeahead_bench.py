@@ -0,0 +1,79 @@
+# benchmarks/typeahead_bench.py
+"""
+Measures the type-ahead index: build time and search time per keystroke over the
+catalog names (degrees, departments, colleges and jobs from the CSV files).
+
+Does not need a display.
+
+Usage:
+    python -m benchmarks.typeahead_bench --queries "computer science" "eng" "b.a."
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from ui.typeahead import NameIndex
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database"
+)
+CATALOGS = ("colleges", "departments", "degrees", "jobs")
+
+DEFAULT_QUERIES = [
+    "computer science",
+    "engineering",
+    "b.a.",
+    "concentration",
+    "nursing",
+    "xyz",
+]
+
+
+def load_names(catalog):
+    with open(os.path.join(DATA_DIR, f"{catalog}.csv"), newline="") as csv_file:
+        return [row["name"] for row in csv.DictReader(csv_file)]
+
+
+def run(names, queries, repeat):
+    """Builds an index over `names` and types every query one key at a time."""
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                index.search(query[:end])
+            timings.append((time.perf_counter() - start) * 1000 / repeat)
+    timings.sort()
+    return {
+        "names": len(names),
+        "build_ms": build_ms,
+        "keystrokes": len(timings),
+        "search_mean_ms": sum(timings) / len(timings),
+        "search_p99_ms": timings[min(len(timings) - 1, int(0.99 * len(timings)))],
+        "search_max_ms": timings[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    report = {
+        catalog: run(load_names(catalog), args.queries, args.repeat)
+        for catalog in CATALOGS
+    }
+    print(json.dumps(report, indent=4))
+    return report
+
+
+if __name__ == "__main__":
+    main()
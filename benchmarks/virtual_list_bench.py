@@ -0,0 +1,87 @@
+# benchmarks/virtual_list_bench.py
+"""
+Measures how long the recommendations list takes to render and scroll as the number of
+items grows.
+
+Requires a display (run under Xvfb on headless machines).
+
+Usage:
+    python -m benchmarks.virtual_list_bench --sizes 10 1000 10000
+"""
+
+import argparse
+import json
+import time
+import tkinter as tk
+
+from ui.gui import bind_recommendation_row, create_recommendation_row
+from ui.virtual_list import VirtualList
+
+
+def make_recommendations(count):
+    return [
+        {
+            "Course Code": f"CPSC {100 + i % 900}",
+            "Course Name": f"Synthetic Course {i}",
+            "Units": 3,
+            "Rating": 100 - i % 100,
+            "Prerequisites": "CPSC 131",
+            "Explanation": "Lorem ipsum dolor sit amet. " * 20,
+        }
+        for i in range(count)
+    ]
+
+
+def _count_widgets(widget):
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
+
+def run(root, count, scroll_steps):
+    """Renders `count` items, then scrolls through part of the list."""
+    frame = tk.Frame(root)
+    frame.pack(fill="both", expand=True)
+    rec_list = VirtualList(frame, create_recommendation_row, bind_recommendation_row)
+    rec_list.pack(fill="both", expand=True)
+    items = make_recommendations(count)
+
+    start = time.perf_counter()
+    rec_list.set_items(items)
+    root.update()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(scroll_steps):
+        rec_list.canvas.yview_scroll(10, "units")
+        rec_list.refresh()
+        root.update()
+    scroll_ms = (time.perf_counter() - start) * 1000 / max(scroll_steps, 1)
+
+    result = {
+        "items": count,
+        "render_ms": render_ms,
+        "scroll_step_ms": scroll_ms,
+        "widgets": _count_widgets(frame),
+    }
+    result.update(rec_list.stats())
+    frame.destroy()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--scroll-steps", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.geometry("1000x700")
+    try:
+        report = [run(root, count, args.scroll_steps) for count in args.sizes]
+    finally:
+        root.destroy()
+    print(json.dumps(report, indent=4))
+    return report
+
+
+if __name__ == "__main__":
+    main()
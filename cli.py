@@ -0,0 +1,182 @@
+# cli.py
+"""
+Headless recommendation runner: database setup, the AI pipeline and persistence
+without the Tk interface.
+
+Examples:
+    python cli.py --user-id 3                     # a user's saved preferences
+    python cli.py --user-id 3 --job-id 7          # ... for another job
+    python cli.py --degree-id 183 --job-id 1      # a (degree, job) pair, no user
+    python cli.py --stdin --workers 4 --format ndjson < batch.ndjson
+
+Batch input is NDJSON (or a single JSON array) of requests such as
+{"user_id": 3}, {"user_id": 3, "job_id": 7} or {"degree_id": 183, "job_id": 1};
+an optional "id" is echoed back. Results go to stdout as JSON (one document) or
+NDJSON (one line per request as it finishes); logs and any other output go to
+stderr. The exit status is 1 if any request failed.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai_integration import recommendation_pipeline
+from ai_integration.ai_module import main_int_ai
+from ai_integration.scheduler import BATCH, INTERACTIVE
+from database import query_log
+from database.db_setup import main_int_db
+from utilities import metrics, profiling, tracing
+from utilities.load_env import load_environment
+from utilities.logger_setup import setup_logger
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+
+@tracing.traced("cli.request", new_trace=True)
+@profiling.profiled("generate")
+def run_request(request, priority=INTERACTIVE):
+    """
+    Brings the recommendations for one request up to date.
+
+    :param request: dict, With 'user_id' and/or 'degree_id' and 'job_id'.
+    :param priority: int, Scheduler priority class for model requests.
+    :return: dict, The result record written to the output (never raises).
+    """
+    start = time.perf_counter()
+    result = {"request": request}
+    try:
+        user_id, job, degree, degree_electives = recommendation_pipeline.resolve_inputs(
+            request.get("user_id"), request.get("degree_id"), request.get("job_id")
+        )
+        if user_id is None:
+            status, set_id, recommendations = (
+                recommendation_pipeline.generate_recommendation_set(
+                    job, degree, degree_electives, priority=priority
+                )
+            )
+            result["set_id"] = set_id
+        else:
+            status, recommendations = recommendation_pipeline.generate_recommendations(
+                user_id, job, degree, degree_electives, priority=priority
+            )
+        result.update(
+            {
+                "status": status,
+                "degree": degree["name"],
+                "job": job["name"],
+                "recommendations": recommendations,
+            }
+        )
+    except Exception as e:
+        logger.error(f"Request {request} failed: {e}")
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def read_requests(stream):
+    """Parses batch requests from NDJSON lines or a single JSON array."""
+    text = stream.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Generate elective recommendations without the GUI."
+    )
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--degree-id", type=int)
+    parser.add_argument("--job-id", type=int)
+    parser.add_argument(
+        "--stdin", action="store_true", help="Read a batch of requests from stdin."
+    )
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Requests processed concurrently."
+    )
+    parser.add_argument(
+        "--skip-db-setup",
+        action="store_true",
+        help="Use the existing database without running the schema setup and CSV import.",
+    )
+    args = parser.parse_args(argv)
+    if not args.stdin and args.user_id is None and args.degree_id is None:
+        parser.error("give --user-id, --degree-id with --job-id, or --stdin")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    out = sys.stdout
+
+    # Library code prints progress messages; keep stdout for results only
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_logger()
+        try:
+            load_environment()
+        except ValueError as e:
+            logger.error(f"Error loading environment: {e}")
+        tracing.setup_tracing()
+        metrics.setup_metrics()
+        query_log.setup_query_log()
+        profiling.setup_profiling()
+        if args.workers > 1:
+            # Concurrent requests would overwrite each other's courses.json
+            os.environ.setdefault("AI_SAVE_RESPONSE", "False")
+        with profiling.profile("startup"):
+            if not args.skip_db_setup:
+                with profiling.profile("catalog_load"):
+                    main_int_db()
+            main_int_ai()
+
+        if args.stdin:
+            requests = read_requests(sys.stdin)
+            priority = BATCH  # Interactive GUI users go first
+        else:
+            requests = [
+                {
+                    key: value
+                    for key, value in (
+                        ("user_id", args.user_id),
+                        ("degree_id", args.degree_id),
+                        ("job_id", args.job_id),
+                    )
+                    if value is not None
+                }
+            ]
+            priority = INTERACTIVE
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {
+                executor.submit(run_request, request, priority): index
+                for index, request in enumerate(requests)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                result["index"] = futures[future]
+                results.append(result)
+                if args.format == "ndjson":
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+
+    if args.format == "json":
+        with profiling.profile("render_recommendations"):
+            results.sort(key=lambda result: result["index"])
+            document = results if args.stdin else results[0]
+            out.write(json.dumps(document, indent=4) + "\n")
+
+    failed = sum(1 for result in results if "error" in result)
+    logger.info(f"{len(results) - failed} of {len(results)} request(s) succeeded.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# database/catalog_db.py
+"""
+The catalog database: colleges, departments, degree levels, degrees, requirements,
+subcategories, courses, prerequisites and jobs, kept in their own file.
+
+The catalog is built once from the CSV files by db_setup.build_catalog() and never
+written afterwards, so it is opened with mode=ro&immutable=1: SQLite skips locking
+and change detection for it and reads it through a memory map. connect_db() attaches
+it to the user database (users, preferences, recommendation sets, the job queue) as
+the schema "catalog". SQLite resolves unqualified table names in the main (user)
+database first and then in attached ones, so queries name catalog tables without a
+prefix and can join them with user tables. Writes to the user database (which is in
+WAL mode) therefore never block catalog reads, and vacuuming it does not touch the
+catalog.
+
+A foreign key cannot point into another database file, so user tables store catalog
+IDs without foreign keys; build_catalog() refuses to publish a catalog that failed
+to load. To change the catalog, delete the file (CATALOG_DB_PATH, default
+db/catalog.db) and restart, or build a new one and move it into place: never modify
+it in place, since connections that have it open assume it does not change.
+"""
+
+import logging
+import os
+import sqlite3
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+CATALOG_SCHEMA = "catalog"
+
+# In dependency order (parents first)
+CATALOG_TABLES = (
+    "Colleges",
+    "Departments",
+    "Degree_Levels",
+    "Degrees",
+    "Requirements",
+    "Subcategories",
+    "Courses",
+    "Prerequisites",
+    "Jobs",
+)
+
+# Bytes of the catalog file read through a memory map
+CATALOG_MMAP_SIZE = int(os.getenv("CATALOG_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+_uris = {}  # Catalog path -> URI, for catalogs found to exist
+
+
+def catalog_db_path():
+    """
+    Returns the catalog database path: CATALOG_DB_PATH, or db/catalog.db in the
+    working directory (next to the user database, like connect_db()).
+    """
+    return os.getenv("CATALOG_DB_PATH") or os.path.join(os.getcwd(), "db", "catalog.db")
+
+
+def catalog_uri(path):
+    """Read-only, immutable URI for the catalog file."""
+    return f"file:{quote(os.path.abspath(path))}?mode=ro&immutable=1"
+
+
+def attach_catalog(conn, path=None):
+    """
+    Attaches the catalog database read-only as the schema "catalog".
+
+    The connection must have been opened with uri=True. Does nothing if the catalog
+    file does not exist yet (before the first setup, or for databases that still
+    hold the catalog tables themselves).
+
+    Parameters:
+        conn (sqlite3.Connection): A connection to the user database.
+        path (str, optional): Catalog file; defaults to catalog_db_path().
+
+    Returns:
+        bool: True if the catalog was attached.
+    """
+    path = path or catalog_db_path()
+    uri = _uris.get(path)
+    if uri is None:
+        # Checked until the catalog exists; it is never removed while in use
+        if not os.path.exists(path):
+            logger.debug("No catalog database at %s; not attaching it.", path)
+            return False
+        uri = _uris[path] = catalog_uri(path)
+    cursor = conn.cursor()
+    cursor.execute(f"ATTACH DATABASE ? AS {CATALOG_SCHEMA};", (uri,))
+    cursor.execute(f"PRAGMA {CATALOG_SCHEMA}.mmap_size = {CATALOG_MMAP_SIZE};")
+    cursor.close()
+    return True
+
+
+def tables_in(conn, schema="main"):
+    """Returns the names of the catalog tables present in a schema of a connection."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table';")
+    names = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return [table for table in CATALOG_TABLES if table in names]
+
+
+def is_catalog_table(name):
+    return name.lower() in {table.lower() for table in CATALOG_TABLES}
+
+
+def open_catalog(path=None):
+    """
+    Opens the catalog database on its own, read-only.
+
+    Returns:
+        sqlite3.Connection: With sqlite3.Row rows.
+
+    Raises:
+        sqlite3.OperationalError: If the file does not exist.
+    """
+    path = path or catalog_db_path()
+    if not os.path.exists(path):
+        raise sqlite3.OperationalError(f"No catalog database at {path}.")
+    conn = sqlite3.connect(catalog_uri(path), uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {CATALOG_MMAP_SIZE};")
+    return conn
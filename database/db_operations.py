@@ -1,13 +1,33 @@
 # database/db_operations.py
 
+import hashlib
+import json
 import logging
 import os
 import sqlite3
 
 import bcrypt  # For password hashing
 
+from database import catalog_db, db_writer, storage_profile
+from database.query_log import InstrumentedConnection
+from utilities import metrics, tracing
+
 logger = logging.getLogger(__name__)  # Reuse the global logger
 
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_seconds", "Latency of database operations.", ["function"]
+)
+PASSWORD_HASH_SECONDS = metrics.histogram(
+    "password_hash_seconds",
+    "Time spent in bcrypt hashing and verification.",
+    ["operation"],
+)
+LOGINS = metrics.counter("logins_total", "Login attempts by outcome.", ["result"])
+
+# Assuming subcategory_id 5 corresponds to Computer Science Electives
+# TODO: Replace with the correct subcategory_id if different
+ELECTIVE_SUBCATEGORY_ID = 5
+
 
 def connect_db():
     database = "smart_elective_advisor.db"
@@ -17,9 +37,13 @@ def connect_db():
     # Define the database path inside the db directory
     db_path = os.path.join(db_directory, database)
     try:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=InstrumentedConnection, uri=True)
         conn.row_factory = sqlite3.Row  # This allows accessing columns by name
-        logger.debug(f"Connected to database at {db_path}.")
+        # DB_STORAGE_PROFILE; main_int_db() has already set the journal mode
+        storage_profile.apply_profile(conn, persistent=False)
+        # Catalog tables live in a read-only file attached as "catalog"
+        catalog_db.attach_catalog(conn)
+        logger.debug("Connected to database at %s.", db_path)
         return conn
     except sqlite3.Error as e:
         logger.error(f"Database connection failed: {e}")
@@ -58,7 +82,8 @@ def hash_password(plain_password):
         str: The hashed password as a string.
     """
     salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(plain_password.encode("utf-8"), salt)
+    with PASSWORD_HASH_SECONDS.labels("hash").time():
+        hashed = bcrypt.hashpw(plain_password.encode("utf-8"), salt)
     return hashed.decode("utf-8")  # Convert bytes to string for storage
 
 
@@ -94,6 +119,7 @@ def verify_paswsord(hashed_password, user_password):
         return False
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def fetch_all_electives():
     conn = connect_db()
     cursor = conn.cursor()
@@ -105,6 +131,7 @@ def fetch_all_electives():
     return bcrypt.checkpw(user_password.encode("utf-8"), hashed_password)
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def register_user(full_name, email, password):
     """
     Inserts a new user into the Users table.
@@ -124,16 +151,8 @@ def register_user(full_name, email, password):
             f"Hashed password for user '{email}' the hash password is '{hashed_password}'."
         )
 
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO Users (full_name, email, password_hash)
-            VALUES (?, ?, ?)
-            """,
-            (full_name, email, hashed_password),
-        )
-        conn.commit()
+        # Hashing stays in the caller's thread; only the insert is queued
+        db_writer.submit_write(_insert_user, full_name, email, hashed_password).result()
         logger.info(f"Inserted user: {email} ({full_name}).")
         return True
     except sqlite3.IntegrityError as e:
@@ -146,8 +165,16 @@ def register_user(full_name, email, password):
     except Exception as e:
         logger.error(f"Unexpected error inserting user '{email}': {e}")
         return False
-    finally:
-        conn.close()
+
+
+def _insert_user(cursor, full_name, email, hashed_password):
+    cursor.execute(
+        """
+        INSERT INTO Users (full_name, email, password_hash)
+        VALUES (?, ?, ?)
+        """,
+        (full_name, email, hashed_password),
+    )
 
 
 # database/db_operations.py
@@ -168,7 +195,7 @@ def verify_password(hashed_password, user_password, user_email=None):
 
         # Log user email if provided (without revealing it)
         if user_email:
-            logger.debug(f"Authenticating user with email: {user_email}")
+            logger.debug("Authenticating user with email: %s", user_email)
 
         # Check if any of the inputs are empty
         if not hashed_password:
@@ -179,31 +206,34 @@ def verify_password(hashed_password, user_password, user_email=None):
             return False
 
         # Log the type of hashed_password
-        logger.debug(f"Type of hashed_password: {type(hashed_password)}")
+        logger.debug("Type of hashed_password: %s", type(hashed_password))
 
         # If hashed_password is bytes, decode it to str
         if isinstance(hashed_password, bytes):
             logger.debug("Decoding hashed_password from bytes to string.")
             hashed_password = hashed_password.decode("utf-8")
             logger.debug(
-                f"Decoded hashed_password: {hashed_password}"
+                "Decoded hashed_password: %s", hashed_password
             )  # Optional: Remove in production
 
         # Encode user_password to bytes
         user_password_bytes = user_password.encode("utf-8")
         logger.debug(
-            f"Encoded user_password to bytes: {user_password_bytes}"
+            "Encoded user_password to bytes: %s", user_password_bytes
         )  # Optional: Remove in production
 
         # Encode hashed_password to bytes for bcrypt
         hashed_password_bytes = hashed_password.encode("utf-8")
         logger.debug(
-            f"Encoded hashed_password to bytes: {hashed_password_bytes}"
+            "Encoded hashed_password to bytes: %s", hashed_password_bytes
         )  # Optional: Remove in production
 
         # Perform password verification
-        password_matches = bcrypt.checkpw(user_password_bytes, hashed_password_bytes)
-        logger.debug(f"Password matches: {password_matches}")
+        with PASSWORD_HASH_SECONDS.labels("verify").time():
+            password_matches = bcrypt.checkpw(
+                user_password_bytes, hashed_password_bytes
+            )
+        logger.debug("Password matches: %s", password_matches)
 
         if password_matches:
             logger.info(f"User '{user_email}' authenticated successfully.")
@@ -225,6 +255,7 @@ def verify_password(hashed_password, user_password, user_email=None):
 # database/db_operations.py
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def authenticate_user(email, password):
     """
     Authenticate a user by verifying email and password.
@@ -255,6 +286,7 @@ def authenticate_user(email, password):
             stored_hash = row["password_hash"]
             if verify_password(stored_hash, password, user_email=email):
                 logger.info(f"User authenticated successfully: {email}")
+                LOGINS.labels("success").inc()
 
                 # Fetch user preferences
                 preferences = get_user_preferences(user_id)
@@ -272,10 +304,12 @@ def authenticate_user(email, password):
                 logger.warning(
                     f"Authentication failed for user: {email} - Incorrect password."
                 )
+                LOGINS.labels("wrong_password").inc()
         else:
             logger.warning(
                 f"Authentication failed for user: {email} - Email not found."
             )
+            LOGINS.labels("unknown_email").inc()
 
     except sqlite3.Error as e:
         logger.error(f"Database Error during user authentication: {e}")
@@ -288,6 +322,7 @@ def authenticate_user(email, password):
 # database/db_operations.py
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_user_by_email(email):
     """
     Retrieves a user's details by their email.
@@ -335,6 +370,7 @@ def get_user_by_email(email):
         return None
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_user_by_id(user_id):
     """
     Retrieves a user's details by their ID.
@@ -376,6 +412,7 @@ def get_user_by_id(user_id):
         return None
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def update_user_preferences(user_id, student_id=None, gpa=None):
     """
     Updates a user's student_id and/or gpa in the User_Preferences table.
@@ -389,46 +426,45 @@ def update_user_preferences(user_id, student_id=None, gpa=None):
         bool: True if update is successful, False otherwise.
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-
-        # Update student_id if provided
+        db_writer.submit_write(
+            _update_user_preferences, user_id, student_id, gpa
+        ).result()
         if student_id:
-            cursor.execute(
-                """
-                UPDATE User_Preferences
-                SET student_id = ?
-                WHERE user_id = ?;
-                """,
-                (student_id, user_id),
-            )
             logger.info(f"Updated student_id for user_id: {user_id} to {student_id}")
-
-        # Update gpa if provided
         if gpa is not None:
-            cursor.execute(
-                """
-                UPDATE User_Preferences
-                SET gpa = ?
-                WHERE user_id = ?;
-                """,
-                (gpa, user_id),
-            )
             logger.info(f"Updated gpa for user_id: {user_id} to {gpa}")
-
-        conn.commit()
         return True
 
     except sqlite3.Error as e:
-        conn.rollback()
         logger.error(f"Database Error during updating user preferences: {e}")
         return False
     except Exception as e:
-        conn.rollback()
         logger.error(f"Unexpected error during updating user preferences: {e}")
         return False
-    finally:
-        conn.close()
+
+
+def _update_user_preferences(cursor, user_id, student_id, gpa):
+    # Update student_id if provided
+    if student_id:
+        cursor.execute(
+            """
+            UPDATE User_Preferences
+            SET student_id = ?
+            WHERE user_id = ?;
+            """,
+            (student_id, user_id),
+        )
+
+    # Update gpa if provided
+    if gpa is not None:
+        cursor.execute(
+            """
+            UPDATE User_Preferences
+            SET gpa = ?
+            WHERE user_id = ?;
+            """,
+            (gpa, user_id),
+        )
 
 
 """
@@ -443,6 +479,7 @@ get_degrees(degree_level_id): Retrieves degrees under a specific degree level.
 """
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_colleges():
     """Fetches all colleges from the Colleges table."""
     try:
@@ -457,6 +494,7 @@ def get_colleges():
         return []
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_departments(college_id):
     """Fetches departments based on the selected college."""
     try:
@@ -474,6 +512,7 @@ def get_departments(college_id):
         return []
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_degree_levels(department_id):
     """Fetches degree levels based on the selected department."""
     try:
@@ -493,6 +532,7 @@ def get_degree_levels(department_id):
         return []
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_degrees(degree_level_id):
     """Fetches degrees based on the selected degree level."""
     try:
@@ -528,6 +568,7 @@ get_user_preferences(user_id): Fetches the user's current preferences to pre-pop
 # database/db_operations.py
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def save_user_preferences(user_id, preferences):
     """
     Saves user preferences to the User_Preferences table.
@@ -541,66 +582,66 @@ def save_user_preferences(user_id, preferences):
         bool: True if preferences are saved successfully, False otherwise.
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-
-        # Check if the user already has preferences set
-        cursor.execute(
-            "SELECT preference_id FROM User_Preferences WHERE user_id = ?;",
-            (user_id,),
-        )
-        row = cursor.fetchone()
-
-        if row:
-            # Update existing preferences
-            cursor.execute(
-                """
-                UPDATE User_Preferences
-                SET college_id = ?, department_id = ?, degree_level_id = ?, degree_id = ?, job_id = ?
-                WHERE user_id = ?;
-                """,
-                (
-                    preferences.get("college_id"),
-                    preferences.get("department_id"),
-                    preferences.get("degree_level_id"),
-                    preferences.get("degree_id"),
-                    preferences.get("job_id"),
-                    user_id,
-                ),
-            )
-            logger.info(f"Updated preferences for user_id {user_id}.")
-        else:
-            # Insert new preferences
-            cursor.execute(
-                """
-                INSERT INTO User_Preferences (user_id, college_id, department_id, degree_level_id, degree_id, job_id)
-                VALUES (?, ?, ?, ?, ?, ?);
-                """,
-                (
-                    user_id,
-                    preferences.get("college_id"),
-                    preferences.get("department_id"),
-                    preferences.get("degree_level_id"),
-                    preferences.get("degree_id"),
-                    preferences.get("job_id"),
-                ),
-            )
-            logger.info(f"Inserted preferences for user_id {user_id}.")
-
-        conn.commit()
-        conn.close()
+        action = db_writer.submit_write(
+            _save_user_preferences, user_id, preferences
+        ).result()
+        logger.info(f"{action} preferences for user_id {user_id}.")
         return True
 
     except sqlite3.Error as e:
         logger.error(f"Error saving preferences for user_id {user_id}: {e}")
-        conn.rollback()
-        conn.close()
         return False
 
 
+def _save_user_preferences(cursor, user_id, preferences):
+    # Check if the user already has preferences set
+    cursor.execute(
+        "SELECT preference_id FROM User_Preferences WHERE user_id = ?;",
+        (user_id,),
+    )
+    row = cursor.fetchone()
+
+    if row:
+        # Update existing preferences
+        cursor.execute(
+            """
+            UPDATE User_Preferences
+            SET college_id = ?, department_id = ?, degree_level_id = ?, degree_id = ?, job_id = ?
+            WHERE user_id = ?;
+            """,
+            (
+                preferences.get("college_id"),
+                preferences.get("department_id"),
+                preferences.get("degree_level_id"),
+                preferences.get("degree_id"),
+                preferences.get("job_id"),
+                user_id,
+            ),
+        )
+        return "Updated"
+    else:
+        # Insert new preferences
+        cursor.execute(
+            """
+            INSERT INTO User_Preferences (user_id, college_id, department_id, degree_level_id, degree_id, job_id)
+            VALUES (?, ?, ?, ?, ?, ?);
+            """,
+            (
+                user_id,
+                preferences.get("college_id"),
+                preferences.get("department_id"),
+                preferences.get("degree_level_id"),
+                preferences.get("degree_id"),
+                preferences.get("job_id"),
+            ),
+        )
+        return "Inserted"
+
+
 # database/db_operations.py
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_jobs_by_degree(degree_id):
     """
     Retrieves all jobs associated with a specific degree.
@@ -635,7 +676,7 @@ def get_jobs_by_degree(degree_id):
                     "description": row["description"],
                 }
             )
-        logger.info(f"Fetched {len(jobs)} jobs for degree_id {degree_id}.")
+        logger.debug("Fetched %s jobs for degree_id %s.", len(jobs), degree_id)
         return jobs
 
     except sqlite3.Error as e:
@@ -649,6 +690,8 @@ def get_jobs_by_degree(degree_id):
 # database/db_operations.py
 
 
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
 def get_user_preferences(user_id):
     """
     Retrieves user preferences from the User_Preferences table.
@@ -694,33 +737,27 @@ def get_user_preferences(user_id):
 # database/db_operations.py
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def clear_recommendations(user_id, job_id):
     """
-    Deletes all course recommendations for a specific user and job from the Recommendations table.
+    Removes a user's reference to their recommendation set for a specific job.
+
+    The shared set itself is kept, since other users may still reference it.
 
     Parameters:
         user_id (int): The ID of the user whose recommendations are to be cleared.
         job_id (int): The ID of the job associated with the recommendations to be cleared.
 
     Returns:
-        bool: True if the deletion is successful, False otherwise.
+        bool: True if a reference was removed, False otherwise.
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            DELETE FROM Recommendations
-            WHERE user_id = ? AND job_id = ?;
-            """,
-            (user_id, job_id),
-        )
-        deleted_rows = cursor.rowcount  # Number of rows deleted
-        conn.commit()
-        conn.close()
+        deleted_rows = db_writer.submit_write(
+            _delete_user_recommendations, user_id, job_id
+        ).result()
         if deleted_rows > 0:
             logger.info(
-                f"Cleared {deleted_rows} recommendation(s) for user_id {user_id} and job_id {job_id}."
+                f"Cleared recommendations for user_id {user_id} and job_id {job_id}."
             )
             return True
         else:
@@ -732,19 +769,26 @@ def clear_recommendations(user_id, job_id):
         logger.error(
             f"Database error while clearing recommendations for user_id {user_id} and job_id {job_id}: {e}"
         )
-        if conn:
-            conn.rollback()
-            conn.close()
         return False
     except Exception as e:
         logger.error(
             f"Unexpected error while clearing recommendations for user_id {user_id} and job_id {job_id}: {e}"
         )
-        if conn:
-            conn.close()
         return False
 
 
+def _delete_user_recommendations(cursor, user_id, job_id):
+    cursor.execute(
+        """
+        DELETE FROM User_Recommendations
+        WHERE user_id = ? AND job_id = ?;
+        """,
+        (user_id, job_id),
+    )
+    return cursor.rowcount  # Number of rows deleted
+
+
+@metrics.timed(DB_QUERY_SECONDS)
 def get_course_id_by_code(course_code):
     """
     Retrieves the course_id for a given course_code from the Courses table.
@@ -780,50 +824,360 @@ def get_course_id_by_code(course_code):
         return None
 
 
-def save_recommendation(user_id, job_id, course_id, rating, explanation, rank):
+def _elective_row(elective):
+    """Returns the fields of an elective that the model sees, in a fixed order."""
+    return (
+        elective["course_code"],
+        elective["name"],
+        elective["units"],
+        elective["description"] or "",
+        elective["prerequisites"] or "",
+    )
+
+
+def compute_electives_hash(degree_electives):
     """
-    Saves a single recommendation to the Recommendations table.
+    Hashes the contents of an elective list, independent of its order.
 
-    :param user_name: string , The ID of the user.
-    :param job_id: int, The ID of the job.
-    :param course_code (str): The code of the course, e.g., "CPSC 120".
-    :param rating: float, The rating of the recommendation.
-    :param explanation: str, The explanation for the recommendation.
-    :param rank: int, The rank of the recommendation.
-    :return: bool, True if saved successfully, False otherwise.
+    Parameters:
+        degree_electives (list of dict): Electives as returned by get_degree_electives.
+
+    Returns:
+        str: A SHA-256 hex digest of the elective codes, names, units, descriptions and prerequisites.
+    """
+    rows = sorted(_elective_row(e) for e in degree_electives)
+    return hashlib.sha256(json.dumps(rows).encode("utf-8")).hexdigest()
+
+
+def snapshot_electives(degree_electives):
+    """
+    Records a per-course content hash so that a later elective list can be diffed.
+
+    Parameters:
+        degree_electives (list of dict): Electives as returned by get_degree_electives.
+
+    Returns:
+        dict: Course code -> SHA-256 hex digest of that elective's fields.
+    """
+    return {
+        e["course_code"]: hashlib.sha256(
+            json.dumps(_elective_row(e)).encode("utf-8")
+        ).hexdigest()
+        for e in degree_electives
+    }
+
+
+def compute_context_hash(
+    degree_name, job_name, job_description, prompt_version, source="model"
+):
+    """
+    Hashes every generation input other than the elective list.
+
+    Parameters:
+        degree_name (str): The degree in the prompt.
+        job_name (str): The career path in the prompt.
+        job_description (str): The stored job description.
+        prompt_version (str): Version of the prompt used for generation.
+        source (str): Where the response comes from: "model", or "stand-in" for the
+            stored response used when AI_ENABLED is off. Sets from different sources
+            never share a fingerprint.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    payload = json.dumps(
+        [degree_name, job_name, job_description or "", prompt_version, source]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compute_fingerprint(context_hash, electives_hash):
+    """
+    Combines the context and elective hashes into the fingerprint of a recommendation set.
+
+    Parameters:
+        context_hash (str): Hash from compute_context_hash.
+        electives_hash (str): Hash from compute_electives_hash.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the full set of generation inputs.
+    """
+    return hashlib.sha256(
+        f"{context_hash}:{electives_hash}".encode("utf-8")
+    ).hexdigest()
+
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def find_recommendation_set(fingerprint):
+    """
+    Looks up a shared recommendation set generated from the given inputs.
+
+    Parameters:
+        fingerprint (str): Fingerprint from compute_fingerprint.
+
+    Returns:
+        int or None: The set_id if a matching set exists, else None.
     """
     try:
-        # Lookup course_id using the course_code
-        # course_id = get_course_id_by_code(course_code)
-        if course_id is None:
-            logger.error(
-                f"Failed to save recommendation: Course code '{course_code}' not found."
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT set_id FROM Recommendation_Sets WHERE fingerprint = ?;",
+            (fingerprint,),
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return row["set_id"] if row else None
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while looking up recommendation set {fingerprint}: {e}"
+        )
+        return None
+
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def get_user_recommendation_set(user_id, job_id):
+    """
+    Retrieves the recommendation set a user's recommendations for a job currently point at.
+
+    Parameters:
+        user_id (int): The ID of the user.
+        job_id (int): The ID of the job.
+
+    Returns:
+        dict or None: Keys 'set_id', 'degree_id', 'prompt_version', 'context_hash',
+                      'fingerprint' and 'electives_snapshot' (a dict, or None for sets
+                      stored without one), or None if the user has no linked set.
+    """
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT s.set_id, s.degree_id, s.prompt_version, s.context_hash, s.fingerprint, s.electives_snapshot
+            FROM User_Recommendations ur
+            JOIN Recommendation_Sets s ON s.set_id = ur.set_id
+            WHERE ur.user_id = ? AND ur.job_id = ?;
+            """,
+            (user_id, job_id),
+        )
+        row = cursor.fetchone()
+        conn.close()
+        if row is None:
+            return None
+        linked_set = dict(row)
+        if linked_set["electives_snapshot"]:
+            linked_set["electives_snapshot"] = json.loads(
+                linked_set["electives_snapshot"]
             )
-            return False
+        return linked_set
+    except (sqlite3.Error, ValueError) as e:
+        logger.error(
+            f"Error while retrieving the recommendation set of user_id {user_id} and job_id {job_id}: {e}"
+        )
+        return None
 
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def get_recommendation_set_items(set_id):
+    """
+    Retrieves the items of a recommendation set in rank order.
+
+    Parameters:
+        set_id (int): The ID of the recommendation set.
+
+    Returns:
+        list of dict: Items with keys 'course_id', 'course_code', 'rating', 'explanation', 'rank'.
+    """
+    try:
         conn = connect_db()
         cursor = conn.cursor()
         cursor.execute(
             """
-            INSERT INTO Recommendations (user_id, job_id, course_id, rating, explanation, rank)
-            VALUES (?, ?, ?, ?, ?, ?)
+            SELECT i.course_id, c.course_code, i.rating, i.explanation, i.rank
+            FROM Recommendation_Set_Items i
+            JOIN Courses c ON c.course_id = i.course_id
+            WHERE i.set_id = ?
+            ORDER BY i.rank ASC;
             """,
-            (user_id, job_id, course_id, rating, explanation, rank),
+            (set_id,),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while retrieving items of recommendation set {set_id}: {e}"
+        )
+        return []
+
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def save_recommendation_set(
+    degree_id,
+    job_id,
+    electives_hash,
+    prompt_version,
+    items,
+    fingerprint,
+    context_hash=None,
+    electives_snapshot=None,
+):
+    """
+    Stores a generated result set once so that every user with the same inputs can share it.
+
+    If a set with the same fingerprint already exists (for example, generated
+    concurrently by another user), the existing set is returned and `items` are discarded.
+
+    Parameters:
+        degree_id (int): The ID of the degree.
+        job_id (int): The ID of the job.
+        electives_hash (str): Hash from compute_electives_hash.
+        prompt_version (str): Version of the prompt used for generation.
+        items (list of dict): Recommendations with keys 'course_id', 'rating', 'explanation', 'rank'.
+        fingerprint (str): Fingerprint from compute_fingerprint.
+        context_hash (str, optional): Hash from compute_context_hash.
+        electives_snapshot (dict, optional): Snapshot from snapshot_electives.
+
+    Returns:
+        int or None: The set_id, or None if saving failed.
+    """
+    try:
+        set_id, created = db_writer.submit_write(
+            _insert_recommendation_set,
+            degree_id,
+            job_id,
+            electives_hash,
+            prompt_version,
+            items,
+            fingerprint,
+            context_hash,
+            electives_snapshot,
+        ).result()
+        if created:
+            logger.info(
+                "Saved recommendation set %s with %s item(s) for degree_id %s and job_id %s.",
+                set_id,
+                len(items),
+                degree_id,
+                job_id,
+            )
+        else:
+            logger.info("Recommendation set %s already exists; reusing it.", set_id)
+        return set_id
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while saving recommendation set for degree_id {degree_id} and job_id {job_id}: {e}"
+        )
+        return None
+
+
+def _insert_recommendation_set(
+    cursor,
+    degree_id,
+    job_id,
+    electives_hash,
+    prompt_version,
+    items,
+    fingerprint,
+    context_hash,
+    electives_snapshot,
+):
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO Recommendation_Sets (degree_id, job_id, electives_hash, prompt_version, context_hash, fingerprint, electives_snapshot)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """,
+        (
+            degree_id,
+            job_id,
+            electives_hash,
+            prompt_version,
+            context_hash,
+            fingerprint,
+            json.dumps(electives_snapshot) if electives_snapshot else None,
+        ),
+    )
+    created = cursor.rowcount == 1
+    cursor.execute(
+        "SELECT set_id FROM Recommendation_Sets WHERE fingerprint = ?;",
+        (fingerprint,),
+    )
+    set_id = cursor.fetchone()["set_id"]
+
+    if created:
+        cursor.executemany(
+            """
+            INSERT INTO Recommendation_Set_Items (set_id, course_id, rating, explanation, rank)
+            VALUES (?, ?, ?, ?, ?);
+            """,
+            [
+                (
+                    set_id,
+                    item["course_id"],
+                    item["rating"],
+                    item["explanation"],
+                    item["rank"],
+                )
+                for item in items
+            ],
+        )
+    return set_id, created
+
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def link_user_recommendation_set(user_id, job_id, set_id):
+    """
+    Points a user's recommendations for a job at a shared recommendation set.
+
+    Parameters:
+        user_id (int): The ID of the user.
+        job_id (int): The ID of the job.
+        set_id (int): The shared set to reference.
+
+    Returns:
+        bool: True if the reference was saved, False otherwise.
+    """
+    try:
+        db_writer.submit_write(_link_user_set, user_id, job_id, set_id).result()
+        logger.debug(
+            "Linked user_id %s and job_id %s to recommendation set %s.",
+            user_id,
+            job_id,
+            set_id,
         )
-        conn.commit()
         return True
-    except Exception as e:
-        logger.error(f"Error saving recommendation: {e}")
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while linking user_id {user_id} to recommendation set {set_id}: {e}"
+        )
         return False
 
 
+def _link_user_set(cursor, user_id, job_id, set_id):
+    cursor.execute(
+        """
+        INSERT OR REPLACE INTO User_Recommendations (user_id, job_id, set_id)
+        VALUES (?, ?, ?);
+        """,
+        (user_id, job_id, set_id),
+    )
+
+
 # database/db_operations.py
 
 
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
 def get_recommendations(user_id, job_id):
     """
-    Retrieves all course recommendations for a specific user and job from the Recommendations table,
-    including detailed course information from the Courses table.
+    Retrieves all course recommendations for a specific user and job through the shared
+    recommendation store, including detailed course information from the Courses table.
 
     Parameters:
         user_id (int): The ID of the user whose recommendations are to be retrieved.
@@ -833,54 +1187,28 @@ def get_recommendations(user_id, job_id):
         list of dict: A list of dictionaries, each containing detailed information about a recommended course.
                       Returns an empty list if no recommendations are found.
     """
+    conn = None
     try:
         conn = connect_db()
         cursor = conn.cursor()
 
-        # Debug Fetch and count all records from the Recommendations table
-        cursor.execute("SELECT * FROM Recommendations")
-        all_records = cursor.fetchall()
-        record_count = len(all_records)
-        logger.info(f"Total records in Recommendations table: {record_count}")
-
-        #  Debug Fetch all records with the specified user_id and job_id
-        cursor.execute(
-            "SELECT * FROM Recommendations WHERE user_id = ? AND job_id = ?",
-            (user_id, job_id),
-        )
-        all_records = cursor.fetchall()
-        record_count = len(all_records)
-        logger.info(
-            f"Total records for user_id {user_id} and job_id {job_id}: {record_count}"
-        )
-
-        # Log the details of the first record, if it exists
-        if all_records:
-            first_record = all_records[0]
-            logger.info(
-                f"First record - recommendation_id: {first_record['recommendation_id']}, "
-                f"user_id: {first_record['user_id']}, job_id: {first_record['job_id']}, "
-                f"course_id: {first_record['course_id']}, rating: {first_record['rating']}, "
-                f"explanation: {first_record['explanation']}, rank: {first_record['rank']}"
-            )
-
-        # The Code Starts here
-        # SQL query to join Recommendations and Courses tables to get detailed course information
+        # Join the user's reference through the shared set to the course details
         cursor.execute(
             """
             SELECT 
-                r.course_id,
+                i.course_id,
                 c.course_code,
                 c.name AS course_name,
                 c.units,
                 c.prerequisites,
-                r.rating,
-                r.explanation,
-                r.rank
-            FROM Recommendations r
-            JOIN Courses c ON r.course_id = c.course_id
-            WHERE r.user_id = ? AND r.job_id = ?
-            ORDER BY r.rank ASC;  -- Assuming lower rank numbers are higher priority
+                i.rating,
+                i.explanation,
+                i.rank
+            FROM User_Recommendations ur
+            JOIN Recommendation_Set_Items i ON i.set_id = ur.set_id
+            JOIN Courses c ON i.course_id = c.course_id
+            WHERE ur.user_id = ? AND ur.job_id = ?
+            ORDER BY i.rank ASC;  -- Assuming lower rank numbers are higher priority
             """,
             (user_id, job_id),
         )
@@ -904,12 +1232,17 @@ def get_recommendations(user_id, job_id):
             )
 
         if recommendations:
-            logger.info(
-                f"Retrieved {len(recommendations)} recommendation(s) for user_id {user_id} and job_id {job_id}."
+            logger.debug(
+                "Retrieved %s recommendation(s) for user_id %s and job_id %s.",
+                len(recommendations),
+                user_id,
+                job_id,
             )
         else:
-            logger.info(
-                f"No recommendations found for user_id {user_id} and job_id {job_id}."
+            logger.debug(
+                "No recommendations found for user_id %s and job_id %s.",
+                user_id,
+                job_id,
             )
 
         return recommendations
@@ -930,6 +1263,64 @@ def get_recommendations(user_id, job_id):
         return []
 
 
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
+def get_recommendation_set_courses(set_id):
+    """
+    Retrieves the recommendations of a recommendation set with their course details,
+    without going through a user's link.
+
+    Parameters:
+        set_id (int): The ID of the recommendation set.
+
+    Returns:
+        list of dict: Recommendations in the format of get_recommendations, in rank order.
+    """
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                i.course_id,
+                c.course_code,
+                c.name AS course_name,
+                c.units,
+                c.prerequisites,
+                i.rating,
+                i.explanation,
+                i.rank
+            FROM Recommendation_Set_Items i
+            JOIN Courses c ON i.course_id = c.course_id
+            WHERE i.set_id = ?
+            ORDER BY i.rank ASC;
+            """,
+            (set_id,),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [
+            {
+                "Course ID": row["course_id"],
+                "Course Code": row["course_code"],
+                "Course Name": row["course_name"],
+                "Units": row["units"],
+                "Prerequisites": row["prerequisites"],
+                "Rating": row["rating"],
+                "Explanation": row["explanation"],
+                "Rank": row["rank"],
+            }
+            for row in rows
+        ]
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while retrieving recommendations of set {set_id}: {e}"
+        )
+        return []
+
+
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
 def get_job_by_id(job_id):
     """
     Retrieves job details based on job_id.
@@ -953,6 +1344,8 @@ def get_job_by_id(job_id):
         return None
 
 
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
 def get_degree_by_id(degree_id):
     """
     Retrieves degree details based on degree_id.
@@ -976,6 +1369,7 @@ def get_degree_by_id(degree_id):
         return None
 
 
+@metrics.timed(DB_QUERY_SECONDS)
 def get_course_by_code(course_code):
     """
     Retrieves course details based on course_code.
@@ -1002,6 +1396,8 @@ def get_course_by_code(course_code):
 # database/db_operations.py
 
 
+@tracing.traced()
+@metrics.timed(DB_QUERY_SECONDS)
 def get_degree_electives(degree_id):
     """
     Retrieves elective courses specific to a given degree.
@@ -1015,23 +1411,15 @@ def get_degree_electives(degree_id):
     try:
         conn = connect_db()
         cursor = conn.cursor()
-        # Assuming subcategory_id 5 corresponds to Computer Science Electives
-        # Adjust the subcategory_id as per your database schema
-        # TODO: Replace with the correct subcategory_id if different
-        # subcategory_id = 5 correctly represents Computer Science Electives in my database
-        # Replace '5' with the correct subcategory_id if different
-        subcategory_id = (
-            5  # Assuming subcategory_id 5 corresponds to Computer Science Electives
-        )
-
+        # Ties on name are broken by course_id, as in the shared catalog file
         cursor.execute(
             """
             SELECT course_id, course_code, name, units, description, prerequisites
             FROM Courses
             WHERE subcategory_id = ?
-            ORDER BY name;
+            ORDER BY name, course_id;
             """,
-            (subcategory_id,),
+            (ELECTIVE_SUBCATEGORY_ID,),
         )
         rows = cursor.fetchall()
         conn.close()
@@ -1048,7 +1436,9 @@ def get_degree_electives(degree_id):
                     "prerequisites": row["prerequisites"],
                 }
             )
-        logger.info(f"Fetched {len(electives)} electives for degree_id {degree_id}.")
+        logger.debug(
+            "Fetched %s electives for degree_id %s.", len(electives), degree_id
+        )
         return electives
 
     except sqlite3.Error as e:
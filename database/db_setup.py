@@ -7,6 +7,10 @@ import sqlite3
 
 import bcrypt  # Ensure bcrypt is installed: potery add bcrypt
 
+from database import catalog_db
+from database.query_log import InstrumentedConnection
+from database.storage_profile import apply_profile
+
 logger = logging.getLogger(__name__)  # Reuse the global logger
 
 
@@ -14,7 +18,8 @@ def create_connection(db_file):
     """Create a database connection to the SQLite database specified by db_file."""
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = sqlite3.connect(db_file, factory=InstrumentedConnection, uri=True)
+        apply_profile(conn)  # DB_STORAGE_PROFILE
         logger.info(f"Connected to SQLite database: {db_file}")
         return conn
     except sqlite3.Error as e:
@@ -22,8 +27,148 @@ def create_connection(db_file):
     return conn
 
 
+RECOMMENDATION_SETS_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        set_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        degree_id INTEGER NOT NULL,
+        job_id INTEGER NOT NULL,
+        electives_hash TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        context_hash TEXT,
+        fingerprint TEXT UNIQUE NOT NULL,
+        electives_snapshot TEXT,
+        generated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+# User data tables, in creation order. Columns holding catalog IDs (degree_id,
+# job_id, course_id, ...) have no foreign keys: the catalog is a separate database
+# file (database/catalog_db.py), and SQLite cannot enforce keys across files.
+USER_TABLES_SQL = {
+    "Users": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "User_Preferences": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            college_id INTEGER,
+            department_id INTEGER,
+            degree_level_id INTEGER,
+            degree_id INTEGER,
+            job_id INTEGER,
+            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+        );
+    """,
+    # Legacy per-user table; rows are moved into Recommendation_Sets by
+    # migrate_legacy_recommendations() and nothing new is written here
+    "Recommendations": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            recommendation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            job_id INTEGER,
+            course_id INTEGER,
+            rating REAL NOT NULL,
+            explanation TEXT NOT NULL,
+            rank INTEGER,
+            generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+        );
+    """,
+    # A generated result set is stored once per input fingerprint (degree, job
+    # description, elective list, prompt version) and shared by every user with
+    # the same inputs
+    "Recommendation_Sets": RECOMMENDATION_SETS_SQL,
+    "Recommendation_Set_Items": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            set_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            rating REAL NOT NULL,
+            explanation TEXT NOT NULL,
+            rank INTEGER,
+            FOREIGN KEY (set_id) REFERENCES Recommendation_Sets(set_id) ON DELETE CASCADE
+        );
+    """,
+    # Per-user reference to a shared set
+    "User_Recommendations": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            user_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            set_id INTEGER NOT NULL,
+            linked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, job_id),
+            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (set_id) REFERENCES Recommendation_Sets(set_id) ON DELETE CASCADE
+        );
+    """,
+    # Durable queue for recommendation generation (see database/job_queue.py);
+    # times are Unix epoch seconds
+    "Generation_Jobs": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            generation_job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            degree_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 2,
+            status TEXT NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            result_status TEXT,
+            set_id INTEGER,
+            error TEXT,
+            enqueued_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+        );
+    """,
+    "User_Interactions": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            interaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            action TEXT NOT NULL,
+            details TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+        );
+    """,
+}
+
+USER_INDEXES_SQL = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_recommendation_set_items_set
+    ON Recommendation_Set_Items (set_id, rank);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_generation_jobs_claim
+    ON Generation_Jobs (status, priority, available_at);
+    """,
+]
+
+
 def create_tables(conn):
-    """Create tables in the SQLite database."""
+    """
+    Create the catalog and the user data tables in one database (used for
+    in-memory databases; main_int_db() keeps them in separate files).
+    """
+    create_catalog_tables(conn)
+    create_user_tables(conn)
+
+
+def create_catalog_tables(conn):
+    """Create the catalog tables (see database/catalog_db.py) in the SQLite database."""
     try:
         cursor = conn.cursor()
         # Enable foreign key constraints
@@ -125,21 +270,6 @@ def create_tables(conn):
             """
         )
 
-        # Create Users Table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS Users (
-                user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                full_name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP                
-            );            
-       
-            """
-        )
-
         # Create Prerequisites Table referencing course_id instead of course_code
         cursor.execute(
             """
@@ -153,60 +283,6 @@ def create_tables(conn):
             """
         )
 
-        # Create User_Preferences Table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS User_Preferences (
-                preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                college_id INTEGER,
-                department_id INTEGER,
-                degree_level_id INTEGER,
-                degree_id INTEGER,
-                job_id INTEGER,
-                FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (college_id) REFERENCES Colleges(college_id),
-                FOREIGN KEY (department_id) REFERENCES Departments(department_id),
-                FOREIGN KEY (degree_level_id) REFERENCES Degree_Levels(degree_level_id),
-                FOREIGN KEY (degree_id) REFERENCES Degrees(degree_id),
-                FOREIGN KEY (job_id) REFERENCES Jobs(job_id) ON DELETE SET NULL
-            );
-            """
-        )
-
-        # Create Recommendations Table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS Recommendations (
-                recommendation_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                job_id INTEGER, 
-                course_id INTEGER,
-                rating REAL NOT NULL,
-                explanation TEXT NOT NULL,
-                rank INTEGER,
-                generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (job_id) REFERENCES Jobs(job_id) ON DELETE CASCADE, -- Foreign key constraint
-                FOREIGN KEY (course_id) REFERENCES Courses(course_id) ON DELETE CASCADE
-            );
-            """
-        )
-
-        # Create User_Interactions Table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS User_Interactions (
-                interaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT NOT NULL,
-                details TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
-            );
-            """
-        )
-
         # Create Jobs Table
         cursor.execute(
             """
@@ -221,17 +297,37 @@ def create_tables(conn):
         )
 
         conn.commit()
-        logger.info("All tables created successfully.")
+        logger.info("Catalog tables created successfully.")
 
     except sqlite3.Error as e:
-        logger.error(f"An error occurred while creating tables: {e}")
+        logger.error(f"An error occurred while creating catalog tables: {e}")
         conn.rollback()
 
 
-def populate_colleges_data(conn):
+def create_user_tables(conn):
+    """Create the user data tables (users, preferences, recommendations, job queue)."""
+    try:
+        cursor = conn.cursor()
+        # Enable foreign key constraints
+        cursor.execute("PRAGMA foreign_keys = ON;")
+
+        for table, sql in USER_TABLES_SQL.items():
+            cursor.execute(sql.format(table=table))
+        for sql in USER_INDEXES_SQL:
+            cursor.execute(sql)
+
+        conn.commit()
+        logger.info("User data tables created successfully.")
+
+    except sqlite3.Error as e:
+        logger.error(f"An error occurred while creating user data tables: {e}")
+        conn.rollback()
+
+
+def populate_colleges_data(conn, csv_dir=None):
     """
     Populate the Colleges table from colleges.csv.
-    The CSV file should be located in the same directory as this script.
+    The CSV file is read from csv_dir, by default the directory of this script.
     """
     try:
         cursor = conn.cursor()
@@ -244,8 +340,8 @@ def populate_colleges_data(conn):
             logger.info("Colleges table already populated. Skipping CSV loading.")
             return  # Exit the function to prevent duplicate data insertion
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the colleges.csv file
         csv_file_path = os.path.join(script_dir, "colleges.csv")
@@ -280,8 +376,10 @@ def populate_colleges_data(conn):
                             """,
                             (int(college_id), college_name),
                         )
-                        logger.info(
-                            f"Inserted college: {college_name} with ID: {college_id}"
+                        logger.debug(
+                            "Inserted college: %s with ID: %s",
+                            college_name,
+                            college_id,
                         )
                     else:
                         logger.warning(
@@ -307,7 +405,7 @@ def populate_colleges_data(conn):
         raise  # Re-raise exception after rollback
 
 
-def populate_departments_data(conn):
+def populate_departments_data(conn, csv_dir=None):
     """
     Populate the Departments table from departments.csv.
     """
@@ -322,8 +420,8 @@ def populate_departments_data(conn):
             logger.info("Departments table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the departments.csv file
         csv_file_path = os.path.join(script_dir, "departments.csv")
@@ -365,8 +463,11 @@ def populate_departments_data(conn):
                             """,
                             (int(department_id), int(college_id), department_name),
                         )
-                        logger.info(
-                            f"Inserted department: {department_name} with ID: {department_id} under College ID: {college_id}"
+                        logger.debug(
+                            "Inserted department: %s with ID: %s under College ID: %s",
+                            department_name,
+                            department_id,
+                            college_id,
                         )
                     else:
                         logger.warning(
@@ -392,7 +493,7 @@ def populate_departments_data(conn):
         raise
 
 
-def populate_degree_levels_data(conn):
+def populate_degree_levels_data(conn, csv_dir=None):
     """
     Populate the Degree_Levels table from degree_levels.csv.
     """
@@ -407,8 +508,8 @@ def populate_degree_levels_data(conn):
             logger.info("Degree_Levels table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the degree_levels.csv file
         csv_file_path = os.path.join(script_dir, "degree_levels.csv")
@@ -454,8 +555,11 @@ def populate_degree_levels_data(conn):
                                 degree_level_name,
                             ),
                         )
-                        logger.info(
-                            f"Inserted degree level: {degree_level_name} with ID: {degree_level_id} under Department ID: {department_id}"
+                        logger.debug(
+                            "Inserted degree level: %s with ID: %s under Department ID: %s",
+                            degree_level_name,
+                            degree_level_id,
+                            department_id,
                         )
                     else:
                         logger.warning(
@@ -483,7 +587,7 @@ def populate_degree_levels_data(conn):
         raise
 
 
-def populate_degrees_data(conn):
+def populate_degrees_data(conn, csv_dir=None):
     """
     Populate the Degrees table from degrees.csv.
     """
@@ -498,8 +602,8 @@ def populate_degrees_data(conn):
             logger.info("Degrees table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the degrees.csv file
         csv_file_path = os.path.join(script_dir, "degrees.csv")
@@ -541,8 +645,11 @@ def populate_degrees_data(conn):
                             """,
                             (int(degree_id), int(degree_level_id), degree_name),
                         )
-                        logger.info(
-                            f"Inserted degree: {degree_name} with ID: {degree_id} under Degree Level ID: {degree_level_id}"
+                        logger.debug(
+                            "Inserted degree: %s with ID: %s under Degree Level ID: %s",
+                            degree_name,
+                            degree_id,
+                            degree_level_id,
                         )
                     else:
                         logger.warning(
@@ -568,7 +675,7 @@ def populate_degrees_data(conn):
         raise
 
 
-def populate_requirements_data(conn):
+def populate_requirements_data(conn, csv_dir=None):
     """
     Populate the Requirements table from requirements.csv.
     """
@@ -583,8 +690,8 @@ def populate_requirements_data(conn):
             logger.info("Requirements table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the requirements.csv file
         csv_file_path = os.path.join(script_dir, "requirements.csv")
@@ -628,8 +735,10 @@ def populate_requirements_data(conn):
                             """,
                             (int(degree_id), req_type, req_name),
                         )
-                        logger.info(
-                            f"Inserted requirement: {req_name} for Degree ID: {degree_id}"
+                        logger.debug(
+                            "Inserted requirement: %s for Degree ID: %s",
+                            req_name,
+                            degree_id,
                         )
                     else:
                         logger.warning(
@@ -655,7 +764,7 @@ def populate_requirements_data(conn):
         raise
 
 
-def populate_subcategories_data(conn):
+def populate_subcategories_data(conn, csv_dir=None):
     """
     Populate the Subcategories table from subcategories.csv.
     """
@@ -670,8 +779,8 @@ def populate_subcategories_data(conn):
             logger.info("Subcategories table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the subcategories.csv file
         csv_file_path = os.path.join(script_dir, "subcategories.csv")
@@ -713,8 +822,10 @@ def populate_subcategories_data(conn):
                             """,
                             (int(requirement_id), subcat_name),
                         )
-                        logger.info(
-                            f"Inserted subcategory: {subcat_name} under Requirement ID: {requirement_id}"
+                        logger.debug(
+                            "Inserted subcategory: %s under Requirement ID: %s",
+                            subcat_name,
+                            requirement_id,
                         )
                     else:
                         logger.warning(
@@ -742,7 +853,7 @@ def populate_subcategories_data(conn):
         raise
 
 
-def populate_courses_data(conn):
+def populate_courses_data(conn, csv_dir=None):
     """
     Populate the Courses table from courses.csv.
     Extracts 'course_code' and 'units' from the 'name' field if 'course_code' and 'units' columns are missing.
@@ -758,8 +869,8 @@ def populate_courses_data(conn):
             logger.info("Courses table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the courses.csv file
         csv_file_path = os.path.join(script_dir, "courses.csv")
@@ -861,8 +972,12 @@ def populate_courses_data(conn):
                         prerequisites,
                     ),
                 )
-                logger.info(
-                    f"Inserted course: {course_name} ({course_code}) under Subcategory ID: {subcategory_id} with units: {units}"
+                logger.debug(
+                    "Inserted course: %s (%s) under Subcategory ID: %s with units: %s",
+                    course_name,
+                    course_code,
+                    subcategory_id,
+                    units,
                 )
 
         conn.commit()
@@ -882,7 +997,7 @@ def populate_courses_data(conn):
         raise
 
 
-def populate_jobs_data(conn):
+def populate_jobs_data(conn, csv_dir=None):
     """
     Populate the Jobs table from jobs.csv.
     """
@@ -897,8 +1012,8 @@ def populate_jobs_data(conn):
             logger.info("Jobs table already populated. Skipping CSV loading.")
             return
 
-        # Determine the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Read from csv_dir, or the directory where this script is located
+        script_dir = csv_dir or os.path.dirname(os.path.abspath(__file__))
 
         # Path to the jobs.csv file
         csv_file_path = os.path.join(script_dir, "jobs.csv")
@@ -943,8 +1058,11 @@ def populate_jobs_data(conn):
                                 job_description,
                             ),
                         )
-                        logger.info(
-                            f"Inserted job: {job_name} with ID: {job_id} under Degree ID: {degree_id}"
+                        logger.debug(
+                            "Inserted job: %s with ID: %s under Degree ID: %s",
+                            job_name,
+                            job_id,
+                            degree_id,
                         )
                     else:
                         logger.warning(
@@ -972,6 +1090,331 @@ def populate_jobs_data(conn):
         raise
 
 
+def migrate_recommendation_sets_schema(conn):
+    """
+    Rebuilds a Recommendation_Sets table created before input fingerprints existed.
+
+    Sets from the old schema keep their set_id (so user references and items stay
+    valid) and get a placeholder fingerprint, which means the next generation for
+    those users runs in full instead of incrementally.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(Recommendation_Sets);")
+        columns = {row[1] for row in cursor.fetchall()}
+        if "fingerprint" in columns:
+            return
+
+        logger.info("Upgrading Recommendation_Sets to the fingerprinted schema.")
+        # Dropping the old table must not cascade into items and user references
+        cursor.execute("PRAGMA foreign_keys = OFF;")
+        cursor.execute(
+            RECOMMENDATION_SETS_SQL.format(table="Recommendation_Sets_new")
+        )
+        cursor.execute(
+            """
+            INSERT INTO Recommendation_Sets_new (set_id, degree_id, job_id, electives_hash, prompt_version, fingerprint, generated_at)
+            SELECT set_id, degree_id, job_id, electives_hash, prompt_version, 'unfingerprinted:' || set_id, generated_at
+            FROM Recommendation_Sets;
+            """
+        )
+        cursor.execute("DROP TABLE Recommendation_Sets;")
+        cursor.execute(
+            "ALTER TABLE Recommendation_Sets_new RENAME TO Recommendation_Sets;"
+        )
+        conn.commit()
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        logger.info("Recommendation_Sets upgraded successfully.")
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"An error occurred while upgrading Recommendation_Sets: {e}")
+        raise
+
+
+def migrate_legacy_recommendations(conn):
+    """
+    Moves rows from the per-user Recommendations table into the shared store.
+
+    Legacy rows carry no record of the inputs they were generated from, so each
+    user's rows become a private set (fingerprint 'legacy:<user_id>:<job_id>', prompt
+    version '0') that is never matched by new generations. Rows without a user or a
+    course, or for a job that no longer exists, are left in Recommendations and
+    counted in a warning.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT DISTINCT r.user_id, r.job_id, j.degree_id
+            FROM Recommendations r
+            JOIN Jobs j ON r.job_id = j.job_id
+            WHERE r.user_id IS NOT NULL AND r.course_id IS NOT NULL;
+            """
+        )
+        groups = cursor.fetchall()
+        if not groups:
+            logger.info("No legacy recommendations to migrate.")
+            return
+
+        for user_id, job_id, degree_id in groups:
+            fingerprint = f"legacy:{user_id}:{job_id}"
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO Recommendation_Sets (degree_id, job_id, electives_hash, prompt_version, fingerprint)
+                VALUES (?, ?, ?, '0', ?);
+                """,
+                (degree_id, job_id, f"legacy:{user_id}", fingerprint),
+            )
+            cursor.execute(
+                "SELECT set_id FROM Recommendation_Sets WHERE fingerprint = ?;",
+                (fingerprint,),
+            )
+            set_id = cursor.fetchone()[0]
+            cursor.execute(
+                """
+                INSERT INTO Recommendation_Set_Items (set_id, course_id, rating, explanation, rank)
+                SELECT ?, course_id, rating, explanation, rank
+                FROM Recommendations
+                WHERE user_id = ? AND job_id = ? AND course_id IS NOT NULL;
+                """,
+                (set_id, user_id, job_id),
+            )
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO User_Recommendations (user_id, job_id, set_id)
+                VALUES (?, ?, ?);
+                """,
+                (user_id, job_id, set_id),
+            )
+            # Only the rows copied into the set; anything else stays for inspection
+            cursor.execute(
+                """
+                DELETE FROM Recommendations
+                WHERE user_id = ? AND job_id = ? AND course_id IS NOT NULL;
+                """,
+                (user_id, job_id),
+            )
+
+        conn.commit()
+        logger.info(
+            f"Migrated legacy recommendations for {len(groups)} user/job pair(s) into the shared store."
+        )
+        cursor.execute("SELECT COUNT(*) FROM Recommendations;")
+        skipped = cursor.fetchone()[0]
+        if skipped:
+            logger.warning(
+                f"{skipped} legacy recommendation(s) could not be migrated (no user, "
+                f"unknown job or no course) and were left in Recommendations."
+            )
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"An error occurred while migrating legacy recommendations: {e}")
+        raise
+
+
+def populate_catalog(conn, csv_dir=None):
+    """
+    Populate the catalog tables from their CSV files, parents before children.
+    csv_dir defaults to the directory of this script.
+    """
+    # Populate Colleges from CSV
+    populate_colleges_data(conn, csv_dir)
+
+    # Populate Departments from CSV
+    populate_departments_data(conn, csv_dir)
+
+    # Populate Degree Levels from CSV
+    populate_degree_levels_data(conn, csv_dir)
+
+    # Populate Degrees from CSV
+    populate_degrees_data(conn, csv_dir)
+
+    # Populate Requirements from CSV
+    populate_requirements_data(conn, csv_dir)
+
+    # Populate Subcategories from CSV
+    populate_subcategories_data(conn, csv_dir)
+
+    # Populate Courses from CSV
+    populate_courses_data(conn, csv_dir)
+
+    # Populate Jobs from CSV
+    populate_jobs_data(conn, csv_dir)
+
+
+def build_catalog(catalog_path, csv_dir=None):
+    """
+    Build the catalog database from the CSV files.
+
+    The catalog is written to a temporary file next to catalog_path and moved into
+    place only once every table it is read from has been loaded, so a failed load
+    never leaves a partial catalog behind (connections open it as immutable).
+    An existing catalog is left as it is; delete the file to rebuild it.
+
+    Parameters:
+        catalog_path (str): Where the catalog database goes.
+        csv_dir (str, optional): Directory of the CSV files (see populate_catalog()).
+
+    Returns:
+        bool: True if a new catalog was built.
+    """
+    if os.path.exists(catalog_path):
+        logger.info(f"Catalog database already built: {catalog_path}")
+        return False
+
+    build_path = catalog_path + ".building"
+    if os.path.exists(build_path):
+        os.remove(build_path)
+    conn = sqlite3.connect(build_path, factory=InstrumentedConnection)
+    try:
+        # Nothing reads the file until it is published, so skip the journal
+        conn.execute("PRAGMA journal_mode = OFF;")
+        conn.execute("PRAGMA synchronous = OFF;")
+        create_catalog_tables(conn)
+        populate_catalog(conn, csv_dir)
+        empty = [
+            table
+            for table in catalog_db.CATALOG_TABLES
+            if table != "Prerequisites"  # Not loaded from CSV
+            and conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0] == 0
+        ]
+    finally:
+        conn.close()
+
+    if empty:
+        os.remove(build_path)
+        raise RuntimeError(
+            f"Catalog not built; no rows loaded into: {', '.join(empty)}. "
+            "Check the CSV files."
+        )
+    with open(build_path, "rb") as built:
+        os.fsync(built.fileno())
+    os.replace(build_path, catalog_path)
+    logger.info(f"Catalog database built: {catalog_path}")
+    return True
+
+
+def split_catalog_database(conn, catalog_path):
+    """
+    Moves the catalog tables out of a database created before the catalog had its
+    own file.
+
+    The tables are copied with their IDs into a new catalog database at catalog_path
+    (unless one already exists there) and then dropped from the user database, which
+    is vacuumed to return the space.
+
+    Parameters:
+        conn (sqlite3.Connection): A connection to the user database, without the
+            catalog attached.
+        catalog_path (str): Where the catalog database goes.
+
+    Returns:
+        bool: True if catalog tables were moved out of the user database.
+    """
+    tables = catalog_db.tables_in(conn)
+    if not tables:
+        return False
+
+    cursor = conn.cursor()
+    if os.path.exists(catalog_path):
+        logger.warning(
+            f"Catalog database {catalog_path} already exists; dropping the old "
+            f"catalog tables from the user database without copying them."
+        )
+    else:
+        logger.info(f"Moving the catalog tables into {catalog_path}.")
+        build_path = catalog_path + ".building"
+        if os.path.exists(build_path):
+            os.remove(build_path)
+        build = sqlite3.connect(build_path)
+        create_catalog_tables(build)
+        build.close()
+
+        try:
+            cursor.execute("ATTACH DATABASE ? AS catalog_build;", (build_path,))
+            for table in tables:
+                cursor.execute(f"PRAGMA catalog_build.table_info({table});")
+                target = [row[1] for row in cursor.fetchall()]
+                cursor.execute(f"PRAGMA main.table_info({table});")
+                columns = ", ".join(
+                    row[1] for row in cursor.fetchall() if row[1] in target
+                )
+                cursor.execute(
+                    f"INSERT INTO catalog_build.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table};"
+                )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            cursor.execute("DETACH DATABASE catalog_build;")
+            os.remove(build_path)
+            raise
+        cursor.execute("DETACH DATABASE catalog_build;")
+        with open(build_path, "rb") as built:
+            os.fsync(built.fileno())
+        os.replace(build_path, catalog_path)
+
+    # Dropping parents must not cascade into the user tables that still reference
+    # them (remove_catalog_references() rebuilds those afterwards)
+    cursor.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        for table in reversed(tables):
+            cursor.execute(f"DROP TABLE main.{table};")
+        conn.commit()
+    finally:
+        cursor.execute("PRAGMA foreign_keys = ON;")
+    cursor.execute("VACUUM;")
+    logger.info(f"Moved {len(tables)} catalog table(s) out of the user database.")
+    return True
+
+
+def remove_catalog_references(conn):
+    """
+    Rebuilds user tables created with foreign keys to catalog tables.
+
+    Once the catalog is a separate file those keys point at tables that do not exist
+    in the user database, and SQLite rejects writes to the referencing tables
+    whenever foreign keys are enforced (as during setup). Each such table is
+    recreated from USER_TABLES_SQL with its rows (and row IDs) kept; run
+    migrate_recommendation_sets_schema() first.
+    """
+    cursor = conn.cursor()
+    outdated = []
+    for table in USER_TABLES_SQL:
+        cursor.execute(f"PRAGMA main.foreign_key_list({table});")
+        if any(catalog_db.is_catalog_table(row[2]) for row in cursor.fetchall()):
+            outdated.append(table)
+    if not outdated:
+        return
+
+    logger.info(f"Removing catalog foreign keys from: {', '.join(outdated)}.")
+    # Dropping the old tables must not cascade into the tables referencing them
+    cursor.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        for table in outdated:
+            cursor.execute(USER_TABLES_SQL[table].format(table=f"{table}_new"))
+            cursor.execute(f"PRAGMA main.table_info({table}_new);")
+            target = [row[1] for row in cursor.fetchall()]
+            cursor.execute(f"PRAGMA main.table_info({table});")
+            columns = ", ".join(row[1] for row in cursor.fetchall() if row[1] in target)
+            cursor.execute(
+                f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM main.{table};"
+            )
+            cursor.execute(f"DROP TABLE main.{table};")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table};")
+        for sql in USER_INDEXES_SQL:
+            cursor.execute(sql)  # Dropped with their tables
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"An error occurred while removing catalog foreign keys: {e}")
+        raise
+    finally:
+        cursor.execute("PRAGMA foreign_keys = ON;")
+
+
 def main_int_db():
     logger.info("Starting database setup...")
     database = "smart_elective_advisor.db"
@@ -990,34 +1433,30 @@ def main_int_db():
     # Create a database connection
     conn = create_connection(db_path)
 
+    # The catalog is a separate, read-only database (see database/catalog_db.py)
+    catalog_path = catalog_db.catalog_db_path()
+
     if conn is not None:
         try:
-            # Create tables
-            create_tables(conn)
-
-            # Populate Colleges from CSV
-            populate_colleges_data(conn)
-
-            # Populate Departments from CSV
-            populate_departments_data(conn)
-
-            # Populate Degree Levels from CSV
-            populate_degree_levels_data(conn)
+            # Move the catalog out of databases created with it inside
+            split_catalog_database(conn, catalog_path)
 
-            # Populate Degrees from CSV
-            populate_degrees_data(conn)
+            # Build the catalog from CSV (CATALOG_CSV_DIR selects another set,
+            # e.g. one written by database/synthetic_data.py)
+            build_catalog(catalog_path, os.getenv("CATALOG_CSV_DIR") or None)
+            catalog_db.attach_catalog(conn, catalog_path)
 
-            # Populate Requirements from CSV
-            populate_requirements_data(conn)
+            # Create the user data tables
+            create_user_tables(conn)
 
-            # Populate Subcategories from CSV
-            populate_subcategories_data(conn)
+            # Bring the shared recommendation store up to date
+            migrate_recommendation_sets_schema(conn)
 
-            # Populate Courses from CSV
-            populate_courses_data(conn)
+            # Drop foreign keys into the catalog from older user tables
+            remove_catalog_references(conn)
 
-            # Populate Jobs from CSV
-            populate_jobs_data(conn)
+            # Move per-user recommendations into the shared recommendation store
+            migrate_legacy_recommendations(conn)
 
             # Additional population functions can be added here
 
@@ -0,0 +1,288 @@
+# database/db_writer.py
+"""
+Single writer thread with group commit for database writes.
+
+Write functions in db_operations do not open their own connection and commit;
+they submit an operation to this process's writer thread and wait on the returned
+future. The writer owns one connection and takes operations from a queue: it takes
+everything already waiting (up to DB_WRITER_MAX_BATCH, default 100), runs it in one
+BEGIN IMMEDIATE transaction and commits once. Writes that arrive during a commit
+form the next batch, so a lone write is committed at once and batches grow with the
+load. DB_WRITER_MAX_DELAY_MS (default 0) makes the writer keep collecting for that
+long after the first operation, trading latency for larger batches. Each operation runs inside its own
+savepoint, so a failing operation (e.g. a duplicate email) is rolled back and raises
+in its caller without affecting the rest of the batch. Futures complete only after
+the commit, so a caller that reads right after a write sees it.
+
+This replaces one connection, one lock acquisition and one fsync per write with one
+per batch, and concurrent writers in the process queue up instead of failing with
+"database is locked". Readers keep their own connections from connect_db(). Writes
+from other processes (workers, a second GUI) still contend for the file lock; the
+writer waits for it for DB_WRITER_BUSY_TIMEOUT_MS (default 5000). If the writer cannot open
+the database, queued writes fail with that error and the next write starts a new
+writer.
+
+Usage:
+    def _link_op(cursor, user_id, job_id, set_id):
+        cursor.execute("INSERT OR REPLACE INTO ...", (user_id, job_id, set_id))
+        return cursor.rowcount
+
+    future = db_writer.submit_write(_link_op, user_id, job_id, set_id)
+    future.result()  # Raises what the operation raised
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from utilities import metrics, tracing
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+WRITE_BATCH_SIZE = metrics.histogram(
+    "db_write_batch_size",
+    "Write operations committed together.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+WRITE_WAIT_SECONDS = metrics.histogram(
+    "db_write_wait_seconds", "Time from submitting a write until it was committed."
+)
+WRITE_COMMITS = metrics.counter(
+    "db_write_commits_total", "Group commits by outcome.", ["result"]
+)
+
+_STOP = object()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class DatabaseWriter:
+    """Owns the write connection and commits queued operations in groups."""
+
+    def __init__(self, connect, max_batch=100, max_delay=0.0, busy_timeout=5.0):
+        """
+        Parameters:
+            connect (callable): Returns a new sqlite3 connection; called in the writer thread.
+            max_batch (int): Most operations committed together.
+            max_delay (float): Seconds to keep collecting after the first operation.
+            busy_timeout (float): Seconds to wait for another process's write lock.
+        """
+        self.connect = connect
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.busy_timeout = busy_timeout
+        self.pid = os.getpid()
+        # connect_db() resolves the database from the working directory
+        self.owner = (self.pid, os.getcwd())
+        self._queue = queue.SimpleQueue()
+        self._error = None  # Set once the thread can no longer commit
+        self._error_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation, *args, **kwargs):
+        """
+        Queues operation(cursor, *args, **kwargs) for the next group commit.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the operation's return value after
+                the commit, or to the exception it (or the commit) raised.
+        """
+        future = Future()
+        with self._error_lock:
+            if self._error is not None:
+                future.set_exception(self._error)
+                return future
+            self._queue.put(
+                (tracing.wrap(operation), args, kwargs, future, time.perf_counter())
+            )
+        return future
+
+    def stop(self, timeout=5.0):
+        """Commits what is queued, then ends the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        conn = None
+        try:
+            conn = self.connect()
+            conn.isolation_level = None  # Transactions are opened explicitly below
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)};")
+        except Exception as e:
+            logger.error(f"Database writer could not open the database: {e}")
+            if conn is not None:
+                conn.close()
+            self._shut_down(e)
+            _discard(self)
+            return
+
+        error = None
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = self._collect()
+                if not batch:
+                    continue
+                try:
+                    self._commit(conn, batch)
+                except Exception as e:
+                    logger.error(f"Group commit of {len(batch)} write(s) failed: {e}")
+                    _fail(batch, e)
+        except Exception as e:
+            logger.error(f"Database writer stopped unexpectedly: {e}")
+            error = e
+        finally:
+            conn.close()
+            self._shut_down(error or RuntimeError("The database writer has stopped."))
+        if error is not None:
+            _discard(self)
+
+    def _shut_down(self, error):
+        """Fails every queued and later write of this writer with `error`."""
+        with self._error_lock:
+            self._error = error
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+        _fail(pending, error)
+
+    def _commit(self, conn, batch):
+        cursor = conn.cursor()
+        outcomes = []  # (future, succeeded, result or exception, submitted)
+        try:
+            cursor.execute("BEGIN IMMEDIATE;")
+            for operation, args, kwargs, future, submitted in batch:
+                cursor.execute("SAVEPOINT write_operation;")
+                try:
+                    result = operation(cursor, *args, **kwargs)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_operation;")
+                    outcomes.append((future, False, e, submitted))
+                else:
+                    outcomes.append((future, True, result, submitted))
+                cursor.execute("RELEASE write_operation;")
+            cursor.execute("COMMIT;")
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} write(s) failed: {e}")
+            WRITE_COMMITS.labels("error").inc()
+            if conn.in_transaction:
+                conn.rollback()
+            _fail(batch, e)
+            return
+
+        WRITE_COMMITS.labels("ok").inc()
+        WRITE_BATCH_SIZE.observe(len(batch))
+        committed = time.perf_counter()
+        for future, succeeded, value, submitted in outcomes:
+            WRITE_WAIT_SECONDS.observe(committed - submitted)
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+def _fail(batch, error):
+    """Completes the futures of queued operations that are not done yet with `error`."""
+    for _, _, _, future, _ in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _connect():
+    from database.db_operations import connect_db
+
+    return connect_db()
+
+
+def get_writer():
+    """
+    Returns this process's writer, starting it on first use, after a fork and after
+    a change of working directory (which selects another database file).
+    """
+    global _writer
+    writer = _writer
+    if writer is not None and writer.owner == (os.getpid(), os.getcwd()):
+        return writer
+    replaced = None
+    with _writer_lock:
+        if _writer is None or _writer.owner != (os.getpid(), os.getcwd()):
+            first_start = _writer is None
+            if not first_start and _writer.pid == os.getpid():
+                replaced = _writer  # connect_db() now opens another database file
+            _writer = DatabaseWriter(
+                _connect,
+                max_batch=int(os.getenv("DB_WRITER_MAX_BATCH", "100")),
+                max_delay=float(os.getenv("DB_WRITER_MAX_DELAY_MS", "0")) / 1000,
+                busy_timeout=float(os.getenv("DB_WRITER_BUSY_TIMEOUT_MS", "5000"))
+                / 1000,
+            )
+            if first_start:
+                atexit.register(stop_writer)
+        writer = _writer
+    # Stopped outside the lock: the writer thread takes it in _discard() on its way out
+    if replaced is not None:
+        replaced.stop()
+    return writer
+
+
+def _discard(writer):
+    """Forgets a writer whose thread has ended, so the next write starts a new one."""
+    global _writer
+    with _writer_lock:
+        if _writer is writer:
+            _writer = None
+
+
+def submit_write(operation, *args, **kwargs):
+    """
+    Queues a write for the group commit of this process's writer thread.
+
+    Parameters:
+        operation (callable): Called as operation(cursor, *args, **kwargs) in the
+            writer thread; executes its statements without committing.
+
+    Returns:
+        concurrent.futures.Future: The operation's result once committed.
+    """
+    return get_writer().submit(operation, *args, **kwargs)
+
+
+def stop_writer():
+    """Commits pending writes and stops the writer thread (also run at exit)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None and writer.pid == os.getpid():
+        writer.stop()
@@ -0,0 +1,369 @@
+# database/job_queue.py
+"""
+Durable queue of recommendation generation jobs in the Generation_Jobs table.
+
+A job is claimed with a lease: the worker holding it must heartbeat before the lease
+expires, otherwise another worker may claim it again. Every state change runs in a
+BEGIN IMMEDIATE transaction, so any number of worker processes (on one machine or on
+several sharing the database file) can use the queue without claiming a job twice.
+
+Job life cycle: queued -> running -> done, or back to queued with a backoff delay
+when a retryable attempt fails, and failed once max_attempts is reached.
+"""
+
+import logging
+import sqlite3
+import time
+
+from database.db_operations import connect_db
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Queue priorities follow the model scheduler's classes (ai_integration.scheduler)
+DEFAULT_PRIORITY = 2  # BATCH
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 5.0  # Doubled after every failed attempt
+
+# Finished jobs considered for the latency statistics
+STATS_WINDOW = 500
+
+
+def _connect():
+    conn = connect_db()
+    conn.isolation_level = None  # Transactions are opened explicitly below
+    return conn
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def enqueue(
+    degree_id, job_id, user_id=None, priority=DEFAULT_PRIORITY, max_attempts=None
+):
+    """
+    Adds a generation job, unless the same one is already queued or running.
+
+    Parameters:
+        degree_id (int): The degree to generate recommendations for.
+        job_id (int): The career job to generate recommendations for.
+        user_id (int, optional): Link the result to this user's recommendations.
+        priority (int): Lower values are claimed first (scheduler priority classes).
+        max_attempts (int, optional): Attempts before the job is marked failed.
+
+    Returns:
+        int or None: The ID of the new or already pending job, or None on error.
+    """
+    conn = None
+    try:
+        conn = _connect()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE;")
+        cursor.execute(
+            """
+            SELECT generation_job_id FROM Generation_Jobs
+            WHERE degree_id = ? AND job_id = ? AND user_id IS ?
+              AND status IN ('queued', 'running');
+            """,
+            (degree_id, job_id, user_id),
+        )
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("COMMIT;")
+            logger.info(f"Generation job {row[0]} is already pending.")
+            return row[0]
+
+        now = time.time()
+        cursor.execute(
+            """
+            INSERT INTO Generation_Jobs
+                (user_id, degree_id, job_id, priority, max_attempts, available_at, enqueued_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+            """,
+            (
+                user_id,
+                degree_id,
+                job_id,
+                priority,
+                max_attempts or DEFAULT_MAX_ATTEMPTS,
+                now,
+                now,
+            ),
+        )
+        generation_job_id = cursor.lastrowid
+        cursor.execute("COMMIT;")
+        logger.info(
+            f"Enqueued generation job {generation_job_id} (degree_id {degree_id}, job_id {job_id}, user_id {user_id})."
+        )
+        return generation_job_id
+    except sqlite3.Error as e:
+        logger.error(f"Database error while enqueueing a generation job: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def claim(worker_id, lease_seconds):
+    """
+    Claims the next available job for a worker.
+
+    Jobs whose lease expired (their worker died or stalled) are requeued first, or
+    marked failed if they have no attempts left.
+
+    Parameters:
+        worker_id (str): Identifies the worker holding the lease.
+        lease_seconds (float): How long the lease lasts without a heartbeat.
+
+    Returns:
+        dict or None: The claimed job row, or None if no job is available.
+    """
+    conn = None
+    try:
+        conn = _connect()
+        cursor = conn.cursor()
+        now = time.time()
+        cursor.execute("BEGIN IMMEDIATE;")
+        cursor.execute(
+            """
+            UPDATE Generation_Jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                error = 'Lease expired (worker ' || lease_owner || ' stopped responding).',
+                finished_at = CASE WHEN attempts >= max_attempts THEN ? END,
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE status = 'running' AND lease_expires_at < ?;
+            """,
+            (now, now),
+        )
+        if cursor.rowcount:
+            logger.warning(
+                f"Reclaimed {cursor.rowcount} generation job(s) with expired leases."
+            )
+
+        cursor.execute(
+            """
+            SELECT generation_job_id FROM Generation_Jobs
+            WHERE status = 'queued' AND available_at <= ?
+            ORDER BY priority, generation_job_id
+            LIMIT 1;
+            """,
+            (now,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute("COMMIT;")
+            return None
+
+        cursor.execute(
+            """
+            UPDATE Generation_Jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                lease_owner = ?,
+                lease_expires_at = ?,
+                started_at = ?
+            WHERE generation_job_id = ?;
+            """,
+            (worker_id, now + lease_seconds, now, row[0]),
+        )
+        cursor.execute(
+            "SELECT * FROM Generation_Jobs WHERE generation_job_id = ?;", (row[0],)
+        )
+        job = dict(cursor.fetchone())
+        cursor.execute("COMMIT;")
+        return job
+    except sqlite3.Error as e:
+        logger.error(f"Database error while claiming a generation job: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def _update_leased(generation_job_id, worker_id, assignments, params):
+    """Updates a running job only while `worker_id` still holds its lease."""
+    conn = None
+    try:
+        conn = _connect()
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            UPDATE Generation_Jobs SET {assignments}
+            WHERE generation_job_id = ? AND status = 'running' AND lease_owner = ?;
+            """,
+            (*params, generation_job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while updating generation job {generation_job_id}: {e}"
+        )
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+
+def heartbeat(generation_job_id, worker_id, lease_seconds):
+    """
+    Extends the lease of a running job.
+
+    Returns:
+        bool: False if the worker no longer holds the lease (the job was reclaimed).
+    """
+    return _update_leased(
+        generation_job_id,
+        worker_id,
+        "lease_expires_at = ?",
+        (time.time() + lease_seconds,),
+    )
+
+
+def complete(generation_job_id, worker_id, result_status, set_id):
+    """
+    Marks a running job as done.
+
+    Parameters:
+        generation_job_id (int): The job.
+        worker_id (str): The worker holding the lease.
+        result_status (str): The pipeline outcome (generated, reused, ...).
+        set_id (int): The recommendation set the job produced or reused.
+
+    Returns:
+        bool: False if the worker no longer held the lease.
+    """
+    return _update_leased(
+        generation_job_id,
+        worker_id,
+        "status = 'done', result_status = ?, set_id = ?, error = NULL, "
+        "finished_at = ?, lease_owner = NULL, lease_expires_at = NULL",
+        (result_status, set_id, time.time()),
+    )
+
+
+def fail(generation_job_id, worker_id, error, retry=True):
+    """
+    Records a failed attempt.
+
+    The job is requeued with an exponential backoff while it has attempts left and
+    `retry` is set; otherwise it is marked failed.
+
+    Parameters:
+        generation_job_id (int): The job.
+        worker_id (str): The worker holding the lease.
+        error (str): Description of the failure.
+        retry (bool): False for permanent errors such as unknown IDs.
+
+    Returns:
+        bool: False if the worker no longer held the lease.
+    """
+    now = time.time()
+    if not retry:
+        return _update_leased(
+            generation_job_id,
+            worker_id,
+            "status = 'failed', error = ?, finished_at = ?, "
+            "lease_owner = NULL, lease_expires_at = NULL",
+            (error, now),
+        )
+    return _update_leased(
+        generation_job_id,
+        worker_id,
+        "status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+        "finished_at = CASE WHEN attempts >= max_attempts THEN ? END, "
+        "available_at = ? + ? * (1 << (attempts - 1)), "
+        "error = ?, lease_owner = NULL, lease_expires_at = NULL",
+        (now, now, RETRY_BASE_DELAY_SECONDS, error),
+    )
+
+
+def get_job(generation_job_id):
+    """
+    Retrieves a job by ID.
+
+    Returns:
+        dict or None: The job row, or None if it does not exist.
+    """
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM Generation_Jobs WHERE generation_job_id = ?;",
+            (generation_job_id,),
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
+    except sqlite3.Error as e:
+        logger.error(
+            f"Database error while retrieving generation job {generation_job_id}: {e}"
+        )
+        return None
+
+
+def get_queue_stats():
+    """
+    Summarizes the queue for monitoring.
+
+    Returns:
+        dict: Job counts per status, the age of the oldest queued job, the number of
+              running jobs per worker, and wait (enqueue to start) and run (start to
+              finish) time percentiles over the most recent finished jobs.
+    """
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        now = time.time()
+        cursor.execute("SELECT status, COUNT(*) FROM Generation_Jobs GROUP BY status;")
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({row[0]: row[1] for row in cursor.fetchall()})
+
+        cursor.execute(
+            "SELECT MIN(enqueued_at) FROM Generation_Jobs WHERE status = 'queued';"
+        )
+        oldest = cursor.fetchone()[0]
+
+        cursor.execute("""
+            SELECT lease_owner, COUNT(*) FROM Generation_Jobs
+            WHERE status = 'running' GROUP BY lease_owner;
+            """)
+        workers = {row[0]: row[1] for row in cursor.fetchall()}
+
+        cursor.execute(
+            """
+            SELECT started_at - enqueued_at, finished_at - started_at
+            FROM Generation_Jobs
+            WHERE status = 'done'
+            ORDER BY finished_at DESC
+            LIMIT ?;
+            """,
+            (STATS_WINDOW,),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+    except sqlite3.Error as e:
+        logger.error(f"Database error while reading queue statistics: {e}")
+        return {}
+
+    waits = sorted(row[0] for row in rows)
+    runs = sorted(row[1] for row in rows)
+    return {
+        "counts": counts,
+        "depth": counts[QUEUED] + counts[RUNNING],
+        "oldest_queued_age_s": now - oldest if oldest else None,
+        "running_by_worker": workers,
+        "wait_s": {"p50": _percentile(waits, 50), "p95": _percentile(waits, 95)},
+        "run_s": {"p50": _percentile(runs, 50), "p95": _percentile(runs, 95)},
+    }
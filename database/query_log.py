@@ -0,0 +1,303 @@
+# database/query_log.py
+"""
+Statement timing and a slow-query log for every database connection.
+
+connect_db() and create_connection() open connections with InstrumentedConnection,
+whose cursors time each statement from execute() until its rows have been fetched.
+A statement is written to the slow-query log when
+
+    - it took longer than SLOW_QUERY_MS (default 100), or
+    - its query plan scans a whole table holding at least SLOW_QUERY_SCAN_ROWS rows
+      (default 10000), however fast it was on this occasion; reported once per
+      statement text per process (while the statement stays among the
+      PLAN_CACHE_SIZE most recently run ones, whose plans are kept), so a debug
+      "SELECT * FROM ..." is caught before the table grows.
+
+Each entry carries the statement, the shape of its parameters (types only, never
+values), the elapsed time, its EXPLAIN QUERY PLAN output and the large tables it
+scans. Entries go to this module's logger as warnings and, if SLOW_QUERY_LOG is set,
+are appended to that file as JSON lines. SLOW_QUERY_MS=0 logs every statement;
+SLOW_QUERY_MS=off turns the instrumentation off.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from utilities import metrics
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+SLOW_QUERIES = metrics.counter(
+    "db_slow_queries_total", "Statements written to the slow-query log.", ["reason"]
+)
+
+_enabled = True
+_slow_seconds = 0.1
+_scan_rows = 10000
+_log_file = None
+_file_lock = threading.Lock()
+
+# Statement text -> {"plan": lines, "scanned": tables, "reported": full scan logged},
+# least recently used first
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+PLAN_CACHE_SIZE = 512
+_table_rows = {}  # (database path, table) -> (estimated rows, time checked)
+_TABLE_ROWS_TTL = 60.0
+
+# Only these statements have query plans worth explaining
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.I)
+# "SCAN Courses" / "SCAN TABLE Courses" / "SCAN c" (by alias) in EXPLAIN QUERY PLAN
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+_NOT_ALIASES = set(
+    "where join inner left cross natural on using group order limit union set "
+    "values as window".split()
+)
+
+
+def setup_query_log():
+    """Reads the SLOW_QUERY_* variables (call after loading the environment)."""
+    global _enabled, _slow_seconds, _scan_rows, _log_file
+    threshold = os.getenv("SLOW_QUERY_MS", "100").strip().lower()
+    _enabled = threshold not in ("off", "false", "none")
+    if _enabled:
+        _slow_seconds = float(threshold) / 1000
+    _scan_rows = int(os.getenv("SLOW_QUERY_SCAN_ROWS", "10000"))
+    _log_file = os.getenv("SLOW_QUERY_LOG") or None
+
+
+def parameter_shape(parameters, many=False):
+    """
+    Describes parameters by type only, so values (e.g. password hashes) never reach
+    the log.
+
+    :param parameters: Sequence or mapping passed to execute(), or the sequence of
+        them passed to executemany().
+    :param many: bool, `parameters` came from executemany().
+    :return: str, e.g. "(int, str)", "{user_id: int}" or "25 x (int, str)".
+    """
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else None
+        if not rows:
+            return "many"
+        return f"{len(rows)} x {parameter_shape(rows[0])}"
+    if isinstance(parameters, dict):
+        items = ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+        return "{" + items + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement through the fetching of its rows."""
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._statement = None  # [sql, parameters, many, elapsed seconds]
+        connection._cursors.add(self)
+
+    def execute(self, sql, parameters=()):
+        return self._timed(sql, parameters, False, super().execute)
+
+    def executemany(self, sql, parameters):
+        parameters = (
+            parameters if isinstance(parameters, (list, tuple)) else list(parameters)
+        )
+        return self._timed(sql, parameters, True, super().executemany)
+
+    def _timed(self, sql, parameters, many, run):
+        self.finish()
+        if not _enabled:
+            return run(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return run(sql, parameters)
+        finally:
+            self._statement = [sql, parameters, many, time.perf_counter() - start]
+
+    def _fetch(self, fetch, *args):
+        if self._statement is None:
+            return fetch(*args)
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self._statement[3] += time.perf_counter() - start
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, size or self.arraysize)
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self.finish()
+        return rows
+
+    def close(self):
+        self.finish()
+        super().close()
+
+    def finish(self):
+        """Closes the timing of the current statement and checks it."""
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            _check(self.connection, *statement)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including those of execute()) are instrumented."""
+
+    def __init__(self, database, *args, **kwargs):
+        super().__init__(database, *args, **kwargs)
+        self.database = database
+        self._cursors = weakref.WeakSet()
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+    def close(self):
+        for open_cursor in list(self._cursors):
+            open_cursor.finish()
+        super().close()
+
+
+def _aliases(sql):
+    """Maps the table aliases in a statement ("FROM Courses c") to table names."""
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases[alias] = table
+    return aliases
+
+
+def _cached_plan(sql):
+    with _plans_lock:
+        entry = _plans.get(sql)
+        if entry is not None:
+            _plans.move_to_end(sql)
+        return entry
+
+
+def _plan(conn, sql, parameters, many):
+    """
+    Returns the plan entry of a statement (see _plans), explaining it on a cache miss.
+    """
+    cached = _cached_plan(sql)
+    if cached is not None:
+        return cached
+    lines, scanned = [], []
+    if _EXPLAINABLE.match(sql):
+        if many:
+            parameters = parameters[0] if parameters else ()
+        try:
+            # A plain cursor, so explaining is not itself timed and checked
+            rows = (
+                sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+                .execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logger.debug("Could not explain %r: %s", sql, e)
+            rows = []
+        lines = [row[-1] for row in rows]
+        aliases = _aliases(sql)
+        for line in lines:
+            match = _SCAN.match(line)
+            # "SCAN ... USING (COVERING) INDEX" still reads the whole index, but
+            # SQLite plans that for ORDER BY or covering reads; flag table scans only
+            if match and "INDEX" not in match.group(2):
+                scanned.append(aliases.get(match.group(1), match.group(1)))
+    entry = {"plan": lines, "scanned": scanned, "reported": False}
+    with _plans_lock:
+        entry = _plans.setdefault(sql, entry)  # Another thread may have explained it
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return entry
+
+
+def _estimated_rows(conn, table):
+    """Row count estimate from MAX(rowid) (an index lookup, not a scan)."""
+    key = (getattr(conn, "database", None), table)
+    cached = _table_rows.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[1] < _TABLE_ROWS_TTL:
+        return cached[0]
+    try:
+        row = (
+            sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+            .execute(f'SELECT MAX(rowid) FROM "{table}";')
+            .fetchone()
+        )
+        rows = row[0] or 0
+    except sqlite3.Error:
+        rows = 0  # WITHOUT ROWID tables, views and CTE names
+    _table_rows[key] = (rows, now)
+    return rows
+
+
+def _check(conn, sql, parameters, many, elapsed):
+    slow = elapsed >= _slow_seconds
+    cached = _cached_plan(sql)
+    if not slow and cached is not None and cached["reported"]:
+        return
+    try:
+        entry = cached or _plan(conn, sql, parameters, many)
+        large_scans = [
+            table
+            for table in entry["scanned"]
+            if _estimated_rows(conn, table) >= _scan_rows
+        ]
+    except sqlite3.ProgrammingError:
+        return  # The connection was closed under the cursor
+    if large_scans and not entry["reported"]:
+        entry["reported"] = True
+        reason = "slow" if slow else "full_scan"
+    elif slow:
+        reason = "slow"
+    else:
+        return
+    _record(
+        {
+            "reason": reason,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "statement": " ".join(sql.split()),
+            "parameters": parameter_shape(parameters, many),
+            "plan": entry["plan"],
+            "full_scans": large_scans,
+        }
+    )
+
+
+def _record(entry):
+    SLOW_QUERIES.labels(entry["reason"]).inc()
+    scans = (
+        f"; full scan of {', '.join(entry['full_scans'])}"
+        if entry["full_scans"]
+        else ""
+    )
+    logger.warning(
+        f"Slow query ({entry['reason']}, {entry['elapsed_ms']} ms{scans}): "
+        f"{entry['statement']} {entry['parameters']}; plan: {' | '.join(entry['plan'])}"
+    )
+    if _log_file:
+        entry = dict(entry, time=time.strftime("%Y-%m-%dT%H:%M:%S"), pid=os.getpid())
+        try:
+            with _file_lock, open(_log_file, "a", encoding="utf-8") as slow_log:
+                slow_log.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.error(f"Could not write the slow-query log: {e}")
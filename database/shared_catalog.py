@@ -0,0 +1,557 @@
+# database/shared_catalog.py
+"""
+Read-only catalog (courses, jobs, degrees) and job x course scores, published once
+into a memory-mapped file with a fixed binary layout.
+
+Worker processes attach to the file instead of loading their own copies. The mapping
+is read-only and shared through the page cache, and records are read through typed
+memoryviews over it (no parsing or copying), so memory stays flat as the number of
+processes grows. Only the strings that are actually read are decoded.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header      magic "SEACAT01", format version (u32), section count (u32)
+    directory   per section: name (16 bytes), offset (u64), length (u64),
+                rows (u32), columns (u32)
+    courses     u32 rows: course_id, subcategory_id, units, then (offset, length)
+                into strings for code, name, description and prerequisites;
+                sorted by course_id
+    subcat_courses  u32 row index into courses, sorted by (subcategory_id,
+                name, course_id)
+    jobs        u32 rows: job_id, degree_id, (offset, length) of name and
+                description; sorted by job_id
+    degrees     u32 rows: degree_id, degree_level_id, (offset, length) of name;
+                sorted by degree_id
+    score_rows  u32, one per job plus one: where the job's scores start in
+                score_courses and score_values (compressed sparse rows)
+    score_courses  u32 course_id of every rated (job, course) pair, sorted by job
+                and course
+    score_values   f32 mean rating of the pair in stored recommendation sets
+    strings     UTF-8 blob; a NULL string has length 0xFFFFFFFF
+
+Only rated pairs are stored, so the file grows with the recommendations actually
+made, not with jobs x courses. publish() streams every section to the file from
+database cursors (SQLite does the sorting), so it never holds a table in memory.
+
+Publish after the database is set up (python -m database.shared_catalog publish);
+publishing replaces the file atomically, and processes attached to the previous
+version keep reading it until they call attach() again.
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+
+from database import catalog_db
+from database.db_operations import ELECTIVE_SUBCATEGORY_ID, connect_db
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Not CATALOG_DB_PATH: that is the SQLite catalog (database/catalog_db.py) this is built from
+SHARED_CATALOG_PATH = os.getenv(
+    "SHARED_CATALOG_PATH", os.path.join("db", "shared_catalog.bin")
+)
+
+MAGIC = b"SEACAT01"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<16sQQII")
+NULL_LENGTH = 0xFFFFFFFF
+FLUSH_BYTES = 1 << 16
+
+COURSE_FIELDS = ("course_id", "subcategory_id", "units")
+COURSE_STRINGS = ("course_code", "name", "description", "prerequisites")
+JOB_FIELDS = ("job_id", "degree_id")
+JOB_STRINGS = ("name", "description")
+DEGREE_FIELDS = ("degree_id", "degree_level_id")
+DEGREE_STRINGS = ("name",)
+
+SECTIONS = (
+    "courses",
+    "subcat_courses",
+    "jobs",
+    "degrees",
+    "score_rows",
+    "score_courses",
+    "score_values",
+    "strings",
+)
+
+# Mean rating per (job, course) over stored recommendation sets, for catalog rows only
+_RATINGS_SQL = """
+    SELECT s.job_id, i.course_id, AVG(i.rating) AS rating
+    FROM Recommendation_Set_Items i
+    JOIN Recommendation_Sets s ON s.set_id = i.set_id
+    WHERE s.job_id IN (SELECT job_id FROM Jobs)
+      AND i.course_id IN (SELECT course_id FROM Courses)
+    GROUP BY s.job_id, i.course_id
+"""
+
+_catalog = None  # This process's attached catalog
+_catalog_stat = None  # (inode, mtime) of the file it was attached from
+
+
+class _SectionWriter:
+    """Writes sections one after another, buffering small records."""
+
+    def __init__(self, catalog_file):
+        self.file = catalog_file
+        self.directory = []  # (name, offset, length, rows, columns)
+        self._buffer = bytearray()
+        self._start = None
+        self.file.write(b"\0" * (HEADER.size + SECTION.size * len(SECTIONS)))
+
+    def begin(self):
+        position = self.file.tell()
+        self.file.write(b"\0" * (-position % 8))
+        self._start = self.file.tell()
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self._buffer.clear()
+
+    def copy(self, source):
+        """Appends a whole spooled file to the current section."""
+        self.flush()
+        source.seek(0)
+        shutil.copyfileobj(source, self.file)
+
+    def end(self, name, rows, columns):
+        self.flush()
+        length = self.file.tell() - self._start
+        self.directory.append((name, self._start, length, rows, columns))
+
+    def finish(self):
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.directory)))
+        for name, offset, length, rows, columns in self.directory:
+            self.file.write(
+                SECTION.pack(name.encode("ascii"), offset, length, rows, columns)
+            )
+
+
+class _StringSpool:
+    """Collects strings in a temporary file; offsets are relative to its start."""
+
+    def __init__(self, spool):
+        self.file = spool
+        self.size = 0
+
+    def add(self, text):
+        if text is None:
+            return 0, NULL_LENGTH
+        encoded = str(text).encode("utf-8")
+        offset = self.size
+        self.file.write(encoded)
+        self.size += len(encoded)
+        return offset, len(encoded)
+
+
+def _write_table(writer, name, strings, cursor, int_fields, string_fields):
+    """Streams the rows of a cursor as a u32 table section; returns the row count."""
+    columns = len(int_fields) + 2 * len(string_fields)
+    row_struct = struct.Struct(f"<{columns}I")
+    rows = 0
+    writer.begin()
+    for row in cursor:
+        values = [int(row[field] or 0) for field in int_fields]
+        for field in string_fields:
+            values.extend(strings.add(row[field]))
+        writer.write(row_struct.pack(*values))
+        rows += 1
+    writer.end(name, rows, columns)
+    return rows
+
+
+def _write_u32_column(writer, name, values):
+    u32 = struct.Struct("<I")
+    rows = 0
+    writer.begin()
+    for value in values:
+        writer.write(u32.pack(value))
+        rows += 1
+    writer.end(name, rows, 1)
+    return rows
+
+
+def _write_sections(conn, writer, strings, value_spool):
+    """Writes every section in SECTIONS order; returns the record counts."""
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT course_id, subcategory_id, units, course_code, name, description,
+               prerequisites
+        FROM Courses ORDER BY course_id;
+        """)
+    courses = _write_table(
+        writer, "courses", strings, cursor, COURSE_FIELDS, COURSE_STRINGS
+    )
+
+    # Same order as get_degree_electives(), so both produce the same prompt
+    cursor.execute("""
+        SELECT ROW_NUMBER() OVER (ORDER BY course_id) - 1
+        FROM Courses ORDER BY subcategory_id, name, course_id;
+        """)
+    _write_u32_column(writer, "subcat_courses", (row[0] for row in cursor))
+
+    cursor.execute(
+        "SELECT job_id, degree_id, name, description FROM Jobs ORDER BY job_id;"
+    )
+    jobs = _write_table(writer, "jobs", strings, cursor, JOB_FIELDS, JOB_STRINGS)
+
+    cursor.execute(
+        "SELECT degree_id, degree_level_id, name FROM Degrees ORDER BY degree_id;"
+    )
+    degrees = _write_table(
+        writer, "degrees", strings, cursor, DEGREE_FIELDS, DEGREE_STRINGS
+    )
+
+    cursor.execute(f"""
+        SELECT COUNT(r.course_id)
+        FROM Jobs j LEFT JOIN ({_RATINGS_SQL}) r ON r.job_id = j.job_id
+        GROUP BY j.job_id ORDER BY j.job_id;
+        """)
+
+    def running_totals():
+        total = 0
+        yield total
+        for row in cursor:
+            total += row[0]
+            yield total
+
+    _write_u32_column(writer, "score_rows", running_totals())
+
+    # Course IDs go straight to the file, ratings to a spool copied in after them
+    cursor.execute(f"{_RATINGS_SQL} ORDER BY s.job_id, i.course_id;")
+    u32, f32 = struct.Struct("<I"), struct.Struct("<f")
+    pairs = 0
+    writer.begin()
+    for row in cursor:
+        writer.write(u32.pack(row["course_id"]))
+        value_spool.write(f32.pack(row["rating"]))
+        pairs += 1
+    writer.end("score_courses", pairs, 1)
+
+    writer.begin()
+    writer.copy(value_spool)
+    writer.end("score_values", pairs, 1)
+
+    writer.begin()
+    writer.copy(strings.file)
+    writer.end("strings", strings.size, 1)
+    return courses, jobs, degrees, pairs
+
+
+def publish(path=None):
+    """
+    Writes the catalog and the rated (job, course) scores from the database to the
+    catalog file.
+
+    Parameters:
+        path (str, optional): Output file (SHARED_CATALOG_PATH by default).
+
+    Returns:
+        str or None: The path written, or None if the database could not be read.
+    """
+    path = path or SHARED_CATALOG_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp{os.getpid()}"
+    conn = None
+    try:
+        conn = connect_db()
+        with (
+            open(temp_path, "wb") as catalog_file,
+            tempfile.TemporaryFile() as string_spool,
+            tempfile.TemporaryFile() as value_spool,
+        ):
+            writer = _SectionWriter(catalog_file)
+            counts = _write_sections(
+                conn, writer, _StringSpool(string_spool), value_spool
+            )
+            writer.finish()
+    except sqlite3.Error as e:
+        logger.error(f"Database error while publishing the shared catalog: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+    finally:
+        if conn:
+            conn.close()
+    os.replace(temp_path, path)  # Attached readers keep the old file until re-attach
+
+    logger.info(
+        "Published shared catalog to %s: %s courses, %s jobs, %s degrees, "
+        "%s rated pairs, %s bytes.",
+        path,
+        *counts,
+        os.path.getsize(path),
+    )
+    return path
+
+
+def _source_path():
+    """The database file the catalog is built from (the user database before the split)."""
+    path = catalog_db.catalog_db_path()
+    if os.path.exists(path):
+        return path
+    return os.path.join(os.getcwd(), "db", "smart_elective_advisor.db")
+
+
+def is_stale(path=None):
+    """Returns True if the catalog file is missing or older than the catalog database."""
+    path = path or SHARED_CATALOG_PATH
+    try:
+        published = os.path.getmtime(path)
+    except OSError:
+        return True
+    try:
+        return published < os.path.getmtime(_source_path())
+    except OSError:
+        return False  # No database to rebuild from; keep what was published
+
+
+def publish_if_stale(path=None):
+    """
+    Publishes the catalog file only if it is missing or older than the catalog database.
+
+    Returns:
+        str or None: The catalog file path, or None if it had to be published and
+            publishing failed.
+    """
+    path = path or SHARED_CATALOG_PATH
+    if not is_stale(path):
+        logger.debug("Shared catalog %s is up to date.", path)
+        return path
+    return publish(path)
+
+
+class _Column:
+    """Sequence view of one column of a table (for bisect), without copying."""
+
+    def __init__(self, table, column, order=None):
+        self.table = table
+        self.column = column
+        self.order = order
+
+    def __len__(self):
+        return len(self.order) if self.order is not None else self.table.shape[0]
+
+    def __getitem__(self, i):
+        row = self.order[i] if self.order is not None else i
+        return self.table[row, self.column]
+
+
+class SharedCatalog:
+    """A read-only view of a published catalog file."""
+
+    def __init__(self, path):
+        """
+        :param path: str, The catalog file written by publish().
+        """
+        self.path = path
+        with open(path, "rb") as catalog_file:
+            self._mmap = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, count = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} catalog file.")
+        self._sections = {}
+        for index in range(count):
+            name, offset, length, rows, columns = SECTION.unpack_from(
+                self._buffer, HEADER.size + index * SECTION.size
+            )
+            self._sections[name.rstrip(b"\0").decode("ascii")] = (
+                offset,
+                length,
+                rows,
+                columns,
+            )
+
+        self._strings = self._raw("strings")
+        self._courses = self._table("courses")
+        self._subcat_courses = self._raw("subcat_courses").cast("I")
+        self._jobs = self._table("jobs")
+        self._degrees = self._table("degrees")
+        self._score_rows = self._raw("score_rows").cast("I")
+        self._score_courses = self._raw("score_courses").cast("I")
+        self._score_values = self._raw("score_values").cast("f")
+        self._subcategories = _Column(self._courses, 1, self._subcat_courses)
+        self._job_ids = _Column(self._jobs, 0)
+        self._degree_ids = _Column(self._degrees, 0)
+
+    def _raw(self, name):
+        offset, length, _, _ = self._sections[name]
+        return self._buffer[offset : offset + length]
+
+    def _table(self, name):
+        _, _, rows, columns = self._sections[name]
+        # A zero-sized shape cannot be cast, so empty tables get a stand-in
+        return self._raw(name).cast("I", (rows, columns)) if rows else _EmptyTable()
+
+    def _string(self, offset, length):
+        if length == NULL_LENGTH:
+            return None
+        return bytes(self._strings[offset : offset + length]).decode("utf-8")
+
+    def _record(self, table, row, int_fields, string_fields):
+        record = {field: table[row, i] for i, field in enumerate(int_fields)}
+        column = len(int_fields)
+        for field in string_fields:
+            record[field] = self._string(table[row, column], table[row, column + 1])
+            column += 2
+        return record
+
+    @staticmethod
+    def _find(column, key):
+        i = bisect.bisect_left(column, key)
+        return i if i < len(column) and column[i] == key else None
+
+    # -- lookups ------------------------------------------------------------
+
+    def job(self, job_id):
+        """Returns the job as a dict (job_id, degree_id, name, description), or None."""
+        row = self._find(self._job_ids, job_id)
+        if row is None:
+            return None
+        return self._record(self._jobs, row, JOB_FIELDS, JOB_STRINGS)
+
+    def degree(self, degree_id):
+        """Returns the degree as a dict (degree_id, degree_level_id, name), or None."""
+        row = self._find(self._degree_ids, degree_id)
+        if row is None:
+            return None
+        return self._record(self._degrees, row, DEGREE_FIELDS, DEGREE_STRINGS)
+
+    def degree_electives(self, degree_id):
+        """
+        Returns the elective courses of a degree, like db_operations.get_degree_electives().
+
+        :param degree_id: int, The ID of the degree.
+        :return: list of dict, Keys course_id, course_code, name, units, description
+            and prerequisites, ordered by name.
+        """
+        start = bisect.bisect_left(self._subcategories, ELECTIVE_SUBCATEGORY_ID)
+        end = bisect.bisect_right(self._subcategories, ELECTIVE_SUBCATEGORY_ID)
+        electives = []
+        for i in range(start, end):
+            course = self._record(
+                self._courses,
+                self._subcat_courses[i],
+                COURSE_FIELDS,
+                COURSE_STRINGS,
+            )
+            del course["subcategory_id"]
+            electives.append(course)
+        logger.debug(
+            "Read %s electives for degree_id %s from the shared catalog.",
+            len(electives),
+            degree_id,
+        )
+        return electives
+
+    def job_scores(self, job_id):
+        """
+        Returns the stored mean rating of every rated course for a job.
+
+        :return: dict, course_id -> rating; empty for unknown or unrated jobs.
+        """
+        row = self._find(self._job_ids, job_id)
+        if row is None:
+            return {}
+        start, end = self._score_rows[row], self._score_rows[row + 1]
+        return dict(zip(self._score_courses[start:end], self._score_values[start:end]))
+
+    def stats(self):
+        """Returns record counts and the mapped size in bytes."""
+        return {
+            "path": self.path,
+            "bytes": len(self._mmap),
+            "courses": self._courses.shape[0],
+            "jobs": len(self._job_ids),
+            "degrees": len(self._degree_ids),
+            "rated_pairs": len(self._score_courses),
+        }
+
+    def close(self):
+        """Releases the views and unmaps the file."""
+        for name in ("_subcategories", "_job_ids", "_degree_ids"):
+            self.__dict__.pop(name, None)
+        for name in list(vars(self)):
+            if name.startswith("_") and isinstance(getattr(self, name), memoryview):
+                getattr(self, name).release()
+        self._mmap.close()
+
+
+class _EmptyTable:
+    shape = (0, 0)
+
+    def __getitem__(self, key):
+        raise IndexError("empty table")
+
+    def release(self):
+        pass
+
+
+def attach(path=None):
+    """
+    Returns this process's view of the published catalog, re-attaching if the file
+    was republished since.
+
+    Parameters:
+        path (str, optional): The catalog file (SHARED_CATALOG_PATH by default).
+
+    Returns:
+        SharedCatalog or None: The catalog, or None if it has not been published.
+    """
+    global _catalog, _catalog_stat
+    path = path or SHARED_CATALOG_PATH
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        logger.warning(f"No shared catalog at {path}; run publish() first.")
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns)
+    if _catalog is not None and _catalog.path == path and _catalog_stat == key:
+        return _catalog
+
+    # The previous mapping is unmapped once callers drop their views into it
+    _catalog = SharedCatalog(path)
+    _catalog_stat = key
+    logger.info(f"Attached shared catalog {_catalog.stats()}.")
+    return _catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared catalog file tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("publish", help="Write the catalog file from the database.")
+    subparsers.add_parser(
+        "stats", help="Attach to the catalog file and print its size."
+    )
+    parser.add_argument("--path", default=SHARED_CATALOG_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "publish":
+        publish(args.path)
+    else:
+        catalog = attach(args.path)
+        print(json.dumps(catalog.stats() if catalog else None, indent=4))
+
+
+if __name__ == "__main__":
+    main()
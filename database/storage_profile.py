@@ -0,0 +1,115 @@
+# database/storage_profile.py
+"""
+Named SQLite storage profiles: the PRAGMAs applied to every new connection.
+
+DB_STORAGE_PROFILE selects one (default "desktop"):
+
+    desktop    WAL journal, synchronous=NORMAL, 16 MiB page cache, 64 MiB mmap,
+               in-memory temp tables, 5 s busy timeout. One user; fast commits and
+               readers that are not blocked by the writer.
+    server     As desktop with a 64 MiB cache, 256 MiB mmap and a 10 s busy
+               timeout, for the API and worker processes sharing one file.
+    bulk_load  WAL journal, synchronous=OFF, 64 MiB cache. For the synthetic data
+               generator and rebuilding a database: a crash of the machine (not just
+               the process) during the load can corrupt the file, so only use it for
+               databases that can be rebuilt.
+    sqlite     No PRAGMAs; SQLite's defaults (rollback journal, synchronous=FULL, no
+               mmap), for comparison.
+
+WAL mode is stored in the database file, so once any connection has enabled it the
+file stays in WAL mode; the other settings last for the connection only. The database
+setup (db_setup.create_connection()) applies the whole profile, and connect_db(),
+which opens a connection per operation, applies only the per-connection settings.
+benchmarks/storage_profile_bench.py compares the profiles.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+DEFAULT_PROFILE = "desktop"
+
+# Applied in order; journal_mode first, since it can fail while the file is busy
+PROFILES = {
+    "desktop": [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("cache_size", -16384),  # Negative: KiB
+        ("mmap_size", 64 * 1024 * 1024),
+        ("temp_store", "MEMORY"),
+        ("busy_timeout", 5000),
+    ],
+    "server": [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("cache_size", -65536),
+        ("mmap_size", 256 * 1024 * 1024),
+        ("temp_store", "MEMORY"),
+        ("busy_timeout", 10000),
+    ],
+    "bulk_load": [
+        ("journal_mode", "WAL"),
+        ("synchronous", "OFF"),
+        ("cache_size", -65536),
+        ("temp_store", "MEMORY"),
+        ("busy_timeout", 10000),
+    ],
+    "sqlite": [],
+}
+
+# Stored in the database file; applied once by the database setup
+PERSISTENT_PRAGMAS = frozenset({"journal_mode"})
+
+_warned = set()  # Unknown profile names already reported
+
+
+def profile_name(name=None):
+    """
+    Resolves the profile to use.
+
+    Parameters:
+        name (str, optional): Profile name; defaults to DB_STORAGE_PROFILE.
+
+    Returns:
+        str: A key of PROFILES (the default profile if the name is unknown).
+    """
+    name = (name or os.getenv("DB_STORAGE_PROFILE") or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        if name not in _warned:
+            _warned.add(name)
+            logger.warning(
+                f"Unknown storage profile '{name}'; using '{DEFAULT_PROFILE}'. "
+                f"Choose from: {', '.join(PROFILES)}."
+            )
+        name = DEFAULT_PROFILE
+    return name
+
+
+def apply_profile(conn, name=None, persistent=True):
+    """
+    Applies a storage profile's PRAGMAs to a connection.
+
+    Parameters:
+        conn (sqlite3.Connection): A newly opened connection.
+        name (str, optional): Profile name; defaults to DB_STORAGE_PROFILE.
+        persistent (bool): Also apply the settings stored in the database file
+            (PERSISTENT_PRAGMAS); False for connections to a database that has
+            already been set up.
+
+    Returns:
+        str: The profile applied.
+    """
+    name = profile_name(name)
+    cursor = conn.cursor()
+    for pragma, value in PROFILES[name]:
+        if not persistent and pragma in PERSISTENT_PRAGMAS:
+            continue
+        cursor.execute(f"PRAGMA {pragma} = {value};")
+        if pragma == "journal_mode":
+            mode = cursor.fetchone()[0]
+            # In-memory databases report "memory"; otherwise the file is busy
+            if mode.lower() not in (str(value).lower(), "memory"):
+                logger.warning(f"journal_mode stays {mode} (requested {value}).")
+    cursor.close()
+    return name
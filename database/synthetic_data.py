@@ -0,0 +1,493 @@
+# database/synthetic_data.py
+"""
+Deterministic generator of a large synthetic catalog and user population.
+
+The catalog is written as CSV files with the same columns as the shipped ones
+(colleges.csv ... jobs.csv), so it is loaded by the same populate_*_data functions
+that main_int_db() uses. Users, their preferences and their linked recommendation
+sets have no CSV loaders; they are bulk-inserted into an already populated database.
+
+Shape of the generated catalog:
+    - departments are spread over the colleges, and each department offers three
+      degree levels (rotating through DEGREE_LEVELS); degrees are spread over the
+      levels
+    - every degree has a Core requirement (three subcategories) and an Elective
+      requirement (two subcategories); the fifth subcategory overall is the first
+      degree's major electives, which get_degree_electives() reads
+    - courses are spread over the subcategories (electives weighted higher), with
+      unique codes per department subject and prerequisites on earlier courses of
+      the same department
+    - jobs_per_degree jobs per degree
+Users get preferences for a random degree and one of its jobs; a share of them is
+linked to a recommendation set, stored once per (degree, job) as in production.
+Every synthetic user's password is SYNTHETIC_PASSWORD. The same seed and scale
+always produce the same files and rows (apart from the creation timestamps).
+
+Usage:
+    python -m database.synthetic_data --csv-dir data/synthetic
+    python -m database.synthetic_data --csv-dir data/synthetic \\
+        --db db/smart_elective_advisor.db --courses 100000 --degrees 2000 \\
+        --users 1000000
+
+Then run the application with CATALOG_CSV_DIR=data/synthetic (new catalog databases
+load that catalog), or point it at the generated databases: --db gets the users and
+the catalog database goes next to it as catalog.db (see database/catalog_db.py), or
+to --catalog-db. An existing catalog database is kept; delete it to rebuild it.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import string
+
+import bcrypt
+
+from database.catalog_db import attach_catalog
+from database.db_setup import build_catalog, create_connection, create_user_tables
+from database.storage_profile import apply_profile
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+SYNTHETIC_PASSWORD = "Synthetic123!"
+BATCH_SIZE = 10000
+
+DEGREE_LEVELS = [
+    "Bachelor of Science",
+    "Bachelor of Arts",
+    "Master of Science",
+    "Master of Arts",
+    "Minor",
+    "Certificate",
+]
+CORE_SUBCATEGORIES = [
+    "Lower-Division Core",
+    "Upper-Division Core",
+    "Mathematics Requirements",
+]
+ELECTIVE_SUBCATEGORIES = ["Science and Mathematics Electives", "{subject} Electives"]
+# Share of a degree's courses per subcategory, in the order above
+SUBCATEGORY_WEIGHTS = [2, 2, 1, 2, 4]
+
+TOPICS = [
+    "Systems",
+    "Networks",
+    "Algorithms",
+    "Data",
+    "Design",
+    "Analysis",
+    "Security",
+    "Modeling",
+    "Theory",
+    "Ethics",
+    "Statistics",
+    "Learning",
+    "Graphics",
+    "Policy",
+    "Management",
+    "Chemistry",
+    "Ecology",
+    "Media",
+    "Languages",
+    "Optimization",
+]
+QUALIFIERS = [
+    "Introduction to",
+    "Principles of",
+    "Advanced",
+    "Applied",
+    "Foundations of",
+    "Topics in",
+    "Seminar in",
+    "Computational",
+]
+ROLES = ["Engineer", "Analyst", "Specialist", "Consultant", "Researcher", "Manager"]
+WORDS = (
+    "study of methods models tools and practice with projects on real problems "
+    "including analysis design evaluation communication teams data systems theory "
+    "laboratory fieldwork reading writing case studies and current research"
+).split()
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery"]
+LAST_NAMES = ["Nguyen", "Garcia", "Smith", "Kim", "Patel", "Lopez", "Chen", "Brown"]
+
+
+def _subject(index):
+    """Four-letter subject prefix for a department, e.g. 'BAAC'."""
+    letters = []
+    value = index + 26**3
+    while value:
+        value, remainder = divmod(value, 26)
+        letters.append(string.ascii_uppercase[remainder])
+    return "".join(reversed(letters))[-4:]
+
+
+def _sentence(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _write_csv(csv_dir, file_name, header, rows):
+    path = os.path.join(csv_dir, file_name)
+    with open(path, mode="w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        writer.writerows(rows)
+    logger.info(f"Wrote {len(rows)} row(s) to {path}.")
+
+
+def write_catalog_csvs(
+    csv_dir,
+    colleges=10,
+    departments=200,
+    degrees=2000,
+    courses=100000,
+    jobs_per_degree=5,
+    seed=42,
+):
+    """
+    Writes a synthetic catalog as CSV files readable by populate_catalog().
+
+    :param csv_dir: str, Output directory (created if needed).
+    :param colleges: int, Number of colleges.
+    :param departments: int, Number of departments.
+    :param degrees: int, Number of degrees.
+    :param courses: int, Number of courses.
+    :param jobs_per_degree: int, Jobs per degree.
+    :param seed: int, Random seed; the same seed gives the same files.
+    """
+    rng = random.Random(seed)
+    os.makedirs(csv_dir, exist_ok=True)
+
+    _write_csv(
+        csv_dir,
+        "colleges.csv",
+        ["college_id", "name"],
+        [
+            [c, f"College of {TOPICS[c % len(TOPICS)]} {c}"]
+            for c in range(1, colleges + 1)
+        ],
+    )
+    department_rows = [
+        [d, (d - 1) % colleges + 1, f"{TOPICS[d % len(TOPICS)]} Department {d}"]
+        for d in range(1, departments + 1)
+    ]
+    _write_csv(
+        csv_dir,
+        "departments.csv",
+        ["department_id", "college_id", "name"],
+        department_rows,
+    )
+
+    level_rows = []
+    for d in range(1, departments + 1):
+        for k in range(3):
+            level_name = DEGREE_LEVELS[(d + k) % len(DEGREE_LEVELS)]
+            level_rows.append([len(level_rows) + 1, d, level_name])
+    _write_csv(
+        csv_dir,
+        "degree_levels.csv",
+        ["degree_level_id", "department_id", "name"],
+        level_rows,
+    )
+
+    degree_rows = []
+    degree_departments = []
+    for g in range(1, degrees + 1):
+        level_id, department_id, level_name = level_rows[(g - 1) % len(level_rows)]
+        topic = TOPICS[department_id % len(TOPICS)]
+        degree_rows.append([g, level_id, f"{topic} {g}, {level_name}"])
+        degree_departments.append(department_id)
+    _write_csv(
+        csv_dir, "degrees.csv", ["degree_id", "degree_level_id", "name"], degree_rows
+    )
+
+    # Requirement tree: two requirements and five subcategories per degree, in
+    # degree order, so the IDs assigned on loading follow the row order
+    requirement_rows = []
+    subcategory_rows = []
+    for g in range(1, degrees + 1):
+        subject = _subject(degree_departments[g - 1] - 1)
+        for req_type, names in (
+            ("Core", CORE_SUBCATEGORIES),
+            ("Elective", ELECTIVE_SUBCATEGORIES),
+        ):
+            requirement_id = len(requirement_rows) + 1
+            requirement_rows.append(
+                [requirement_id, g, req_type, f"{subject} {req_type}"]
+            )
+            for name in names:
+                subcategory_rows.append(
+                    [
+                        len(subcategory_rows) + 1,
+                        requirement_id,
+                        name.format(subject=subject),
+                    ]
+                )
+    _write_csv(
+        csv_dir,
+        "requirements.csv",
+        ["requirement_id", "degree_id", "type", "name"],
+        requirement_rows,
+    )
+    _write_csv(
+        csv_dir,
+        "subcategories.csv",
+        ["subcategory_id", "requirement_id", "name"],
+        subcategory_rows,
+    )
+
+    subcategories_per_degree = len(SUBCATEGORY_WEIGHTS)
+    numbers = {}  # department_id -> courses numbered so far
+    codes = {}  # department_id -> course codes, for prerequisites
+    course_rows = []
+    for course_id in range(1, courses + 1):
+        degree_id = (course_id - 1) % degrees + 1
+        offset = rng.choices(range(subcategories_per_degree), SUBCATEGORY_WEIGHTS)[0]
+        subcategory_id = (degree_id - 1) * subcategories_per_degree + offset + 1
+        department_id = degree_departments[degree_id - 1]
+        sequence = numbers.get(department_id, 0)
+        numbers[department_id] = sequence + 1
+        suffix = string.ascii_uppercase[sequence // 900 - 1] if sequence >= 900 else ""
+        code = f"{_subject(department_id - 1)} {100 + sequence % 900}{suffix}"
+        earlier = codes.setdefault(department_id, [])
+        prerequisites = ", ".join(
+            rng.sample(earlier, min(len(earlier), rng.randint(0, 2)))
+        )
+        earlier.append(code)
+        name = f"{rng.choice(QUALIFIERS)} {rng.choice(TOPICS)}"
+        course_rows.append(
+            [
+                course_id,
+                subcategory_id,
+                f"{code}, {name}, ({rng.choice((1, 2, 3, 3, 3, 4))})",
+                _sentence(rng, rng.randint(15, 35)),
+                prerequisites,
+            ]
+        )
+    _write_csv(
+        csv_dir,
+        "courses.csv",
+        ["course_id", "subcategory_id", "name", "description", "prerequisites"],
+        course_rows,
+    )
+
+    job_rows = []
+    for g in range(1, degrees + 1):
+        for _ in range(jobs_per_degree):
+            topic = rng.choice(TOPICS)
+            job_rows.append(
+                [
+                    len(job_rows) + 1,
+                    g,
+                    f"{topic} {rng.choice(ROLES)}",
+                    _sentence(rng, rng.randint(10, 20)),
+                ]
+            )
+    _write_csv(
+        csv_dir, "jobs.csv", ["job_id", "degree_id", "name", "description"], job_rows
+    )
+
+
+def _catalog_maps(conn):
+    """Reads what users are generated from: degree chains, jobs and electives."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT d.degree_id, l.degree_level_id, p.department_id, p.college_id
+        FROM Degrees d
+        JOIN Degree_Levels l ON l.degree_level_id = d.degree_level_id
+        JOIN Departments p ON p.department_id = l.department_id
+        ORDER BY d.degree_id;
+        """)
+    chains = {row[0]: row[1:] for row in cursor.fetchall()}
+    jobs = {}
+    cursor.execute("SELECT job_id, degree_id FROM Jobs ORDER BY job_id;")
+    for job_id, degree_id in cursor.fetchall():
+        jobs.setdefault(degree_id, []).append(job_id)
+    electives = {}
+    cursor.execute("""
+        SELECT r.degree_id, c.course_id
+        FROM Courses c
+        JOIN Subcategories s ON s.subcategory_id = c.subcategory_id
+        JOIN Requirements r ON r.requirement_id = s.requirement_id
+        WHERE r.type = 'Elective'
+        ORDER BY c.course_id;
+        """)
+    for degree_id, course_id in cursor.fetchall():
+        electives.setdefault(degree_id, []).append(course_id)
+    degree_ids = [degree_id for degree_id in chains if degree_id in jobs]
+    return degree_ids, chains, jobs, electives
+
+
+def populate_users(conn, users, recommended_share=0.6, items_per_set=10, seed=42):
+    """
+    Bulk-inserts synthetic users with preferences and linked recommendation sets.
+
+    :param conn: sqlite3.Connection, A database with the catalog loaded.
+    :param users: int, Number of users to add (after any existing ones).
+    :param recommended_share: float, Share of users linked to a recommendation set.
+    :param items_per_set: int, Courses per recommendation set.
+    :param seed: int, Random seed.
+    """
+    rng = random.Random(seed)
+    degree_ids, chains, jobs, electives = _catalog_maps(conn)
+    if not degree_ids:
+        logger.error("No degrees with jobs in the database; load the catalog first.")
+        return
+
+    # bcrypt is deliberately slow, so every user shares one hash; the salt comes
+    # from the seed to keep the output reproducible
+    salt_characters = "./" + string.ascii_letters + string.digits
+    salt = (
+        "$2b$12$"
+        + "".join(rng.choice(salt_characters) for _ in range(21))
+        + rng.choice(".Oeu")  # The last character only carries two bits
+    )
+    password_hash = bcrypt.hashpw(
+        SYNTHETIC_PASSWORD.encode("utf-8"), salt.encode("utf-8")
+    ).decode("utf-8")
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(user_id), 0) FROM Users;")
+    first_user_id = cursor.fetchone()[0] + 1
+    set_ids = {}  # (degree_id, job_id) -> set_id
+
+    def set_for(degree_id, job_id):
+        key = (degree_id, job_id)
+        if key not in set_ids:
+            fingerprint = f"synthetic:{degree_id}:{job_id}"
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO Recommendation_Sets (degree_id, job_id, electives_hash, prompt_version, fingerprint)
+                VALUES (?, ?, 'synthetic', 'synthetic', ?);
+                """,
+                (degree_id, job_id, fingerprint),
+            )
+            if cursor.rowcount:
+                set_id = cursor.lastrowid
+                courses = electives.get(degree_id, [])
+                chosen = rng.sample(courses, min(items_per_set, len(courses)))
+                cursor.executemany(
+                    """
+                    INSERT INTO Recommendation_Set_Items (set_id, course_id, rating, explanation, rank)
+                    VALUES (?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (set_id, course_id, 95 - 5 * rank, _sentence(rng, 20), rank)
+                        for rank, course_id in enumerate(chosen, start=1)
+                    ],
+                )
+            else:
+                cursor.execute(
+                    "SELECT set_id FROM Recommendation_Sets WHERE fingerprint = ?;",
+                    (fingerprint,),
+                )
+                set_id = cursor.fetchone()[0]
+            set_ids[key] = set_id
+        return set_ids[key]
+
+    for batch_start in range(0, users, BATCH_SIZE):
+        user_rows, preference_rows, link_rows = [], [], []
+        for n in range(batch_start, min(users, batch_start + BATCH_SIZE)):
+            user_id = first_user_id + n
+            degree_id = rng.choice(degree_ids)
+            job_id = rng.choice(jobs[degree_id])
+            level_id, department_id, college_id = chains[degree_id]
+            user_rows.append(
+                (
+                    user_id,
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    f"synthetic{user_id}@example.com",
+                    password_hash,
+                )
+            )
+            preference_rows.append(
+                (user_id, college_id, department_id, level_id, degree_id, job_id)
+            )
+            if rng.random() < recommended_share:
+                link_rows.append((user_id, job_id, set_for(degree_id, job_id)))
+
+        cursor.executemany(
+            "INSERT INTO Users (user_id, full_name, email, password_hash) VALUES (?, ?, ?, ?);",
+            user_rows,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO User_Preferences (user_id, college_id, department_id, degree_level_id, degree_id, job_id)
+            VALUES (?, ?, ?, ?, ?, ?);
+            """,
+            preference_rows,
+        )
+        cursor.executemany(
+            "INSERT INTO User_Recommendations (user_id, job_id, set_id) VALUES (?, ?, ?);",
+            link_rows,
+        )
+        conn.commit()
+        logger.info(
+            f"Inserted {batch_start + len(user_rows)} of {users} synthetic user(s)."
+        )
+
+    logger.info(
+        f"Added {users} user(s) and {len(set_ids)} recommendation set(s); "
+        f"password for every synthetic user: {SYNTHETIC_PASSWORD}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Synthetic catalog and user generator."
+    )
+    parser.add_argument("--csv-dir", required=True, help="Where the CSV files go.")
+    parser.add_argument(
+        "--db", help="Also build a database from the CSV files and add the users."
+    )
+    parser.add_argument(
+        "--catalog-db",
+        help="Where the catalog database goes (default: catalog.db next to --db).",
+    )
+    parser.add_argument("--colleges", type=int, default=10)
+    parser.add_argument("--departments", type=int, default=200)
+    parser.add_argument("--degrees", type=int, default=2000)
+    parser.add_argument("--courses", type=int, default=100000)
+    parser.add_argument("--jobs-per-degree", type=int, default=5)
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--recommended-share", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    write_catalog_csvs(
+        args.csv_dir,
+        colleges=args.colleges,
+        departments=args.departments,
+        degrees=args.degrees,
+        courses=args.courses,
+        jobs_per_degree=args.jobs_per_degree,
+        seed=args.seed,
+    )
+    if not args.db:
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    catalog_path = args.catalog_db or os.path.join(
+        os.path.dirname(os.path.abspath(args.db)), "catalog.db"
+    )
+    build_catalog(catalog_path, args.csv_dir)
+    conn = create_connection(args.db)
+    apply_profile(conn, "bulk_load")  # The database can be regenerated after a crash
+    try:
+        attach_catalog(conn, catalog_path)
+        create_user_tables(conn)
+        if args.users:
+            populate_users(
+                conn,
+                args.users,
+                recommended_share=args.recommended_share,
+                seed=args.seed,
+            )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
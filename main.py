@@ -2,8 +2,10 @@
 import logging
 
 from ai_integration.ai_module import main_int_ai
+from database import query_log
 from database.db_setup import main_int_db
 from ui.gui import main_int_ui
+from utilities import metrics, profiling, tracing
 from utilities.load_env import load_environment
 from utilities.logger_setup import setup_logger
 
@@ -22,11 +24,19 @@ def main():
         logger.error(f"Error loading environment: {e}")
         print(f"Error: {e}")
 
-    # Initialize Database
-    main_int_db()
+    # Record spans and metrics if TRACE_FILE / METRICS_FILE are set
+    tracing.setup_tracing()
+    metrics.setup_metrics()
+    query_log.setup_query_log()  # SLOW_QUERY_MS / SLOW_QUERY_LOG
+    profiling.setup_profiling()  # PROFILE_CPU / PROFILE_ALLOCATIONS
 
-    # Initialize AI Integration
-    main_int_ai()
+    with profiling.profile("startup"):
+        # Initialize Database
+        with profiling.profile("catalog_load"):
+            main_int_db()
+
+        # Initialize AI Integration
+        main_int_ai()
 
     # Initialize UI
     main_int_ui()
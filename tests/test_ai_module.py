@@ -0,0 +1,158 @@
+# tests/test_ai_module.py
+
+import json
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from ai_integration import ai_module
+from ai_integration.scheduler import INTERACTIVE, PREFETCH
+
+
+def test_save_response_replaces_the_file_atomically(tmp_path, monkeypatch):
+    monkeypatch.delenv("AI_SAVE_RESPONSE", raising=False)
+    path = tmp_path / "courses.json"
+    responses = [json.dumps([{"Course Code": f"CPSC {n}"}] * 200) for n in range(8)]
+
+    threads = [
+        threading.Thread(target=ai_module.save_response, args=(data, str(path)))
+        for data in responses
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert path.read_text(encoding="utf-8") in responses
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_save_response_can_be_turned_off(tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_SAVE_RESPONSE", "False")
+    path = tmp_path / "courses.json"
+    ai_module.save_response("[]", str(path))
+    assert not path.exists()
+
+
+def test_invoke_model_does_not_print_the_response(capsys, monkeypatch):
+    class Reply:
+        content = "* CPSC 332, Databases, 90, CPSC 131, Useful."
+        usage_metadata = {"total_tokens": 10}
+
+    class FakeModel:
+        def invoke(self, prompt):
+            return Reply()
+
+    monkeypatch.setattr(ai_module, "model", FakeModel())
+    ai_module._invoke_model("prompt", 10)
+    assert capsys.readouterr().out == ""
+
+
+class FakePrompt:
+    def __init__(self, values):
+        self.values = values
+
+    def to_string(self):
+        return json.dumps(self.values)
+
+
+class FakeTemplate:
+    def invoke(self, values):
+        return FakePrompt(values)
+
+
+class FakeScheduler:
+    """Queues calls without running them, so the tests decide when they finish."""
+
+    def __init__(self):
+        self.submitted = []
+        self.moved = []
+
+    def submit(self, fn, *args, priority, tokens):
+        future = Future()
+        self.submitted.append((future, priority))
+        return future
+
+    def reprioritize(self, future, priority):
+        self.moved.append(priority)
+        return True
+
+
+ELECTIVES = [
+    {
+        "prerequisites": "CPSC 131",
+        "course_code": "CPSC 332",
+        "units": 3,
+        "name": "File Structures and Database Systems",
+        "description": "Relational databases.",
+    }
+]
+
+
+@pytest.fixture
+def fake_scheduler(monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(ai_module, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(ai_module, "prompt_template", FakeTemplate())
+    monkeypatch.setattr(ai_module, "delta_prompt_template", FakeTemplate())
+    ai_module._response_cache.clear()
+    ai_module._in_flight.clear()
+    yield scheduler
+    ai_module._response_cache.clear()
+    ai_module._in_flight.clear()
+
+
+def request(priority=INTERACTIVE):
+    return ai_module.request_recommendations(
+        "Data Scientist", "Computer Science", ELECTIVES, priority=priority
+    )
+
+
+def test_identical_requests_share_one_model_call(fake_scheduler):
+    key, first = request()
+    same_key, joined = request()
+    assert same_key == key
+    assert joined is first
+    assert len(fake_scheduler.submitted) == 1
+
+    first.set_result("[]")
+    _, cached = request()
+    assert cached.result(timeout=0) == "[]"
+    assert ai_module.get_cached_response(key) == "[]"
+    assert len(fake_scheduler.submitted) == 1
+
+
+def test_joining_at_a_higher_priority_moves_the_request_up(fake_scheduler):
+    request(priority=PREFETCH)
+    request(priority=INTERACTIVE)
+    assert fake_scheduler.moved == [INTERACTIVE]
+    # Already interactive: nothing to move
+    request(priority=PREFETCH)
+    assert fake_scheduler.moved == [INTERACTIVE]
+
+
+def test_cancel_request_waits_for_the_last_waiter(fake_scheduler):
+    key, future = request()
+    request()
+
+    assert ai_module.cancel_request(key) is False
+    assert not future.cancelled()
+    assert ai_module.cancel_request(key) is True
+    assert future.cancelled()
+
+    # Nothing was cached, so the next request calls the model again
+    assert ai_module.get_cached_response(key) is None
+    assert ai_module.cancel_request(key) is False
+    request()
+    assert len(fake_scheduler.submitted) == 2
+
+
+def test_failed_requests_are_not_cached(fake_scheduler):
+    key, future = request()
+    future.set_exception(RuntimeError("model unavailable"))
+
+    assert ai_module.get_cached_response(key) is None
+    _, retry = request()
+    assert retry is not future
+    assert len(fake_scheduler.submitted) == 2
@@ -0,0 +1,42 @@
+# tests/test_api_server.py
+
+import asyncio
+
+import pytest
+
+from api.server import ApiServer
+
+
+async def exchange(raw_request):
+    """Sends raw bytes to a server on a free port; returns the raw response."""
+    api = ApiServer()
+    server = await asyncio.start_server(api.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw_request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+        api.close()
+
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1.5", "\xb2"])
+def test_invalid_content_length_gets_400(length):
+    raw = (
+        f"POST /login HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n{{}}"
+    ).encode("latin-1")
+    response = asyncio.run(exchange(raw))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Content-Length" in response.split(b"\r\n\r\n", 1)[1]
+
+
+def test_health_still_answers():
+    response = asyncio.run(
+        exchange(b"GET /health HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+    )
+    assert response.startswith(b"HTTP/1.1 200 ")
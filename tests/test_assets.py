@@ -0,0 +1,72 @@
+# tests/test_assets.py
+
+import os
+import tkinter as tk
+
+import pytest
+
+from ui import assets
+
+
+class FakePhoto:
+    """Stands in for tk.PhotoImage, which needs a display; counts decodes."""
+
+    decoded = []
+
+    def __init__(self, file):
+        if not os.path.exists(file):
+            raise tk.TclError(f'couldn\'t open "{file}"')
+        self.size = assets.png_size(file)
+        FakePhoto.decoded.append(file)
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+@pytest.fixture
+def photos(monkeypatch):
+    FakePhoto.decoded = []
+    monkeypatch.setattr(assets.tk, "PhotoImage", FakePhoto)
+    assets.clear_cache()
+    yield FakePhoto.decoded
+    assets.clear_cache()
+
+
+def test_icons_are_decoded_once(photos):
+    first = assets.get_icon("home")
+    assert assets.get_icon("home") is first
+    assert photos == [assets.icon_path("home")]
+
+    report = assets.get_asset_report()
+    assert report["count"] == 1
+    assert report["bytes"] == 64 * 64 * 4
+
+
+def test_missing_icons_are_not_cached(photos, monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "ICON_DIR", str(tmp_path))
+    assert assets.get_icon("home") is None
+    assert assets.get_icon("home") is None
+    assert assets.get_asset_report()["count"] == 0
+
+
+def test_preload_decodes_the_startup_icons(photos):
+    report = assets.preload()
+    assert set(report["icons"]) == set(assets.STARTUP_ICONS)
+    assets.get_icon("logout")
+    assert len(photos) == len(assets.STARTUP_ICONS)
+
+
+def test_shipped_icons_have_their_display_size():
+    for name, size in assets.ICON_SIZES.items():
+        assert assets.png_size(assets.icon_path(name)) == (size, size), name
+
+
+def test_normalize_skips_icons_that_are_up_to_date(tmp_path):
+    pytest.importorskip("PIL")
+    written = assets.normalize_icons(dest_dir=str(tmp_path))
+    assert len(written) == len(assets.ICON_SIZES)
+    assert assets.png_size(str(tmp_path / "home.png")) == (64, 64)
+    assert assets.normalize_icons(dest_dir=str(tmp_path)) == []
@@ -0,0 +1,89 @@
+# tests/test_benchmarks.py
+
+import json
+
+import pytest
+
+from benchmarks import run
+
+THRESHOLDS = {"startup.*": 0.5, "db.register_user": 0.5, "*": 0.25}
+
+
+def result(median_ms):
+    return {"runs": 5, "median_ms": median_ms, "p95_ms": median_ms, "min_ms": median_ms}
+
+
+def test_first_matching_threshold_pattern_wins():
+    assert run.threshold_for("startup.import", THRESHOLDS, 0.1) == 0.5
+    assert run.threshold_for("db.register_user", THRESHOLDS, 0.1) == 0.5
+    assert run.threshold_for("db.get_colleges", THRESHOLDS, 0.1) == 0.25
+    assert run.threshold_for("db.get_colleges", {}, 0.1) == 0.1
+
+
+def test_regression_needs_both_the_ratio_and_the_delta():
+    baseline = {
+        "db.slow": result(10.0),
+        "db.noisy": result(0.01),
+        "db.within": result(10.0),
+        "startup.import": result(100.0),
+    }
+    results = {
+        "db.slow": result(13.0),  # 30% slower, 3 ms
+        "db.noisy": result(0.05),  # 5x slower, but only 0.04 ms
+        "db.within": result(12.0),  # 20% slower, under the 25% threshold
+        "startup.import": result(140.0),  # 40% slower, under its 50% threshold
+        "db.new": result(1.0),  # Not in the baseline
+    }
+
+    comparison = run.compare(results, baseline, THRESHOLDS, 0.25, 0.1)
+
+    assert {name for name, entry in comparison.items() if entry["regressed"]} == {
+        "db.slow"
+    }
+    assert "db.new" not in comparison
+    assert comparison["db.slow"]["ratio"] == pytest.approx(1.3)
+
+
+def test_failed_benchmarks_are_not_compared():
+    comparison = run.compare(
+        {"db.broken": {"error": "OperationalError: no such table"}},
+        {"db.broken": result(1.0)},
+        {},
+        0.25,
+        0.1,
+    )
+    assert comparison == {}
+
+
+def test_summarize_reports_median_p95_and_minimum():
+    summary = run.summarize([float(n) for n in range(20, 0, -1)])
+    assert summary == {"runs": 20, "median_ms": 11.0, "p95_ms": 19.0, "min_ms": 1.0}
+
+
+@pytest.mark.parametrize("baseline_ms, status", [(10_000.0, 0), (1e-9, 1)])
+def test_main_exits_with_1_on_a_regression(baseline_ms, status, tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"results": {"parser.extract_and_parse": result(baseline_ms)}})
+    )
+    output = tmp_path / "results.json"
+
+    code = run.main(
+        [
+            "--only",
+            "parser.*",
+            "--repeat-scale",
+            "0.05",
+            "--min-delta-ms",
+            "0",
+            "--baseline",
+            str(baseline),
+            "--output",
+            str(output),
+        ]
+    )
+
+    report = json.loads(output.read_text())
+    assert code == status
+    assert report["regressions"] == (["parser.extract_and_parse"] if status else [])
@@ -0,0 +1,40 @@
+# tests/test_catalog_db.py
+
+import sqlite3
+
+import pytest
+
+from database import catalog_db, db_operations, db_setup, db_writer
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CATALOG_DB_PATH", raising=False)
+    (tmp_path / "db").mkdir()
+    yield tmp_path
+    db_writer.stop_writer()
+
+
+def test_connect_db_attaches_the_catalog_read_only(workdir):
+    db_setup.main_int_db()
+    conn = db_operations.connect_db()
+    try:
+        databases = {row[1] for row in conn.execute("PRAGMA database_list;")}
+        assert "catalog" in databases
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] > 0
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("INSERT INTO Colleges (name) VALUES ('x');")
+    finally:
+        conn.close()
+
+
+def test_catalog_is_attached_once_it_exists(workdir):
+    path = str(workdir / "db" / "catalog.db")
+    conn = sqlite3.connect(":memory:", uri=True)
+    assert catalog_db.attach_catalog(conn, path) is False
+
+    db_setup.build_catalog(path)
+    assert catalog_db.attach_catalog(conn, path) is True
+    assert conn.execute("SELECT COUNT(*) FROM catalog.Jobs;").fetchone()[0] > 0
+    conn.close()
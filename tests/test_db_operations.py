@@ -0,0 +1,96 @@
+# tests/test_db_operations.py
+
+import pytest
+
+from database import db_operations, db_setup, db_writer
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CATALOG_DB_PATH", raising=False)
+    (tmp_path / "db").mkdir()
+    db_setup.main_int_db()
+    yield tmp_path
+    db_writer.stop_writer()
+
+
+def catalog_ids():
+    """Returns a (degree_id, job_id, [course_id, ...]) triple from the loaded catalog."""
+    conn = db_operations.connect_db()
+    job = conn.execute("SELECT job_id, degree_id FROM Jobs LIMIT 1;").fetchone()
+    courses = [
+        row["course_id"]
+        for row in conn.execute(
+            "SELECT course_id FROM Courses ORDER BY course_id LIMIT 3;"
+        )
+    ]
+    conn.close()
+    return job["degree_id"], job["job_id"], courses
+
+
+def new_user(email):
+    assert db_operations.register_user("Test User", email, "Secret123!")
+    return db_operations.get_user_by_email(email)["user_id"]
+
+
+def items_for(courses, explanation):
+    return [
+        {
+            "course_id": course_id,
+            "rating": 90 - rank,
+            "explanation": explanation,
+            "rank": rank,
+        }
+        for rank, course_id in enumerate(courses, start=1)
+    ]
+
+
+def save(degree_id, job_id, items, fingerprint="f" * 64):
+    return db_operations.save_recommendation_set(
+        degree_id, job_id, "e" * 64, "1", items, fingerprint, context_hash="c" * 64
+    )
+
+
+def test_same_fingerprint_is_stored_once(database):
+    degree_id, job_id, courses = catalog_ids()
+    first = save(degree_id, job_id, items_for(courses, "first"))
+    second = save(degree_id, job_id, items_for(courses[:1], "second"))
+
+    assert first is not None
+    assert second == first
+    assert db_operations.find_recommendation_set("f" * 64) == first
+    items = db_operations.get_recommendation_set_items(first)
+    assert [item["course_id"] for item in items] == courses
+    assert {item["explanation"] for item in items} == {"first"}
+
+
+def test_users_with_the_same_inputs_share_one_set(database):
+    degree_id, job_id, courses = catalog_ids()
+    set_id = save(degree_id, job_id, items_for(courses, "shared"))
+    alice, bob = new_user("alice@example.com"), new_user("bob@example.com")
+
+    assert db_operations.link_user_recommendation_set(alice, job_id, set_id)
+    assert db_operations.link_user_recommendation_set(bob, job_id, set_id)
+
+    assert db_operations.get_recommendations(alice, job_id) == (
+        db_operations.get_recommendations(bob, job_id)
+    )
+    assert len(db_operations.get_recommendations(alice, job_id)) == len(courses)
+    assert db_operations.get_user_recommendation_set(bob, job_id)["set_id"] == set_id
+
+
+def test_relinking_a_user_leaves_the_shared_set_alone(database):
+    degree_id, job_id, courses = catalog_ids()
+    shared = save(degree_id, job_id, items_for(courses, "shared"))
+    other = save(
+        degree_id, job_id, items_for(courses[:1], "other"), fingerprint="0" * 64
+    )
+    alice, bob = new_user("alice@example.com"), new_user("bob@example.com")
+    db_operations.link_user_recommendation_set(alice, job_id, shared)
+    db_operations.link_user_recommendation_set(bob, job_id, shared)
+
+    db_operations.link_user_recommendation_set(alice, job_id, other)
+
+    assert len(db_operations.get_recommendations(alice, job_id)) == 1
+    assert len(db_operations.get_recommendations(bob, job_id)) == len(courses)
@@ -0,0 +1,63 @@
+# tests/test_db_setup.py
+
+import sqlite3
+
+import pytest
+
+from database import db_setup
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    db_setup.create_tables(conn)
+    conn.execute("PRAGMA foreign_keys = OFF;")  # No degrees or courses are needed
+    conn.execute("INSERT INTO Jobs (job_id, degree_id, name) VALUES (7, 3, 'Analyst');")
+    conn.execute(
+        "INSERT INTO Users (user_id, full_name, email, password_hash) "
+        "VALUES (1, 'A', 'a@example.com', 'x');"
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def add_legacy(conn, user_id, job_id, course_id, rank):
+    conn.execute(
+        "INSERT INTO Recommendations (user_id, job_id, course_id, rating, explanation, rank) "
+        "VALUES (?, ?, ?, 90, 'x', ?);",
+        (user_id, job_id, course_id, rank),
+    )
+
+
+def test_migration_keeps_rows_it_cannot_map(conn):
+    add_legacy(conn, 1, 7, 11, 1)
+    add_legacy(conn, 1, 7, 12, 2)
+    add_legacy(conn, 1, 99, 13, 1)  # Unknown job
+    add_legacy(conn, None, 7, 14, 1)  # No user
+    add_legacy(conn, 1, 7, None, 3)  # No course
+    conn.commit()
+
+    db_setup.migrate_legacy_recommendations(conn)
+
+    items = conn.execute(
+        "SELECT course_id FROM Recommendation_Set_Items ORDER BY rank;"
+    ).fetchall()
+    assert [row[0] for row in items] == [11, 12]
+    left = conn.execute(
+        "SELECT job_id, user_id, course_id FROM Recommendations ORDER BY job_id, user_id;"
+    ).fetchall()
+    assert sorted(left, key=str) == sorted(
+        [(99, 1, 13), (7, None, 14), (7, 1, None)], key=str
+    )
+
+
+def test_migration_is_idempotent(conn):
+    add_legacy(conn, 1, 7, 11, 1)
+    conn.commit()
+    db_setup.migrate_legacy_recommendations(conn)
+    db_setup.migrate_legacy_recommendations(conn)
+    assert conn.execute(
+        "SELECT COUNT(*) FROM Recommendation_Set_Items;"
+    ).fetchone() == (1,)
+    assert conn.execute("SELECT COUNT(*) FROM Recommendation_Sets;").fetchone() == (1,)
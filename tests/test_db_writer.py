@@ -0,0 +1,149 @@
+# tests/test_db_writer.py
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from database import db_operations, db_writer
+
+
+@pytest.fixture(autouse=True)
+def fresh_writer():
+    db_writer.stop_writer()
+    yield
+    db_writer.stop_writer()
+
+
+def call_with_timeout(function, *args, timeout=10):
+    """Runs function(*args) in a thread; fails the test if it does not return."""
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(value=function(*args)), daemon=True
+    )
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{function.__name__} did not return"
+    return result["value"]
+
+
+def test_register_user_returns_false_when_database_cannot_be_opened(
+    tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)  # No db/ directory, so connect_db() fails
+    assert (
+        call_with_timeout(
+            db_operations.register_user, "Test", "test@example.com", "Secret123!"
+        )
+        is False
+    )
+    # The failed writer was discarded, so later writes fail instead of hanging
+    assert (
+        call_with_timeout(
+            db_operations.register_user, "Test", "test@example.com", "Secret123!"
+        )
+        is False
+    )
+
+
+def test_writer_restarts_after_a_failed_connect(tmp_path):
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("unable to open database file")
+        return sqlite3.connect(tmp_path / "test.db", check_same_thread=False)
+
+    writer = db_writer.DatabaseWriter(connect)
+    future = writer.submit(lambda cursor: None)
+    with pytest.raises(sqlite3.OperationalError):
+        future.result(timeout=10)
+    with pytest.raises(sqlite3.OperationalError):
+        writer.submit(lambda cursor: None).result(timeout=10)
+
+    writer = db_writer.DatabaseWriter(connect)
+    assert writer.submit(lambda cursor: 42).result(timeout=10) == 42
+    writer.stop()
+
+
+def test_switching_databases_does_not_wait_on_the_old_writer(tmp_path, monkeypatch):
+    def slow_failing_connect():
+        time.sleep(0.2)
+        raise sqlite3.OperationalError("unable to open database file")
+
+    old = db_writer.DatabaseWriter(slow_failing_connect)
+    old.owner = (old.pid, str(tmp_path / "elsewhere"))
+    monkeypatch.setattr(db_writer, "_writer", old)
+    monkeypatch.chdir(tmp_path)
+
+    # The old thread discards itself on the way out, which needs the writer lock
+    writer = call_with_timeout(db_writer.get_writer, timeout=2)
+    assert writer is not old
+    assert not old._thread.is_alive()
+
+
+@pytest.fixture
+def writer(tmp_path):
+    path = tmp_path / "test.db"
+    setup = sqlite3.connect(path)
+    setup.execute("CREATE TABLE Users (email TEXT PRIMARY KEY);")
+    setup.close()
+    statements = []
+
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    instance = db_writer.DatabaseWriter(connect)
+    instance.path = path
+    instance.statements = statements
+    yield instance
+    instance.stop()
+
+
+def insert(cursor, *emails):
+    for email in emails:
+        cursor.execute("INSERT INTO Users (email) VALUES (?);", (email,))
+    return cursor.rowcount
+
+
+def emails(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT email FROM Users ORDER BY email;").fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+def test_failing_operation_does_not_affect_its_batch(writer):
+    # Hold the writer inside a first batch so the next writes queue up together
+    started, release = threading.Event(), threading.Event()
+
+    def block(cursor):
+        started.set()
+        return release.wait(10)
+
+    blocker = writer.submit(block)
+    assert started.wait(10)
+    futures = [
+        writer.submit(insert, "a@example.com"),
+        # Inserts a row, then fails: its savepoint must undo both statements
+        writer.submit(insert, "b@example.com", "a@example.com"),
+        writer.submit(insert, "c@example.com"),
+    ]
+    release.set()
+
+    assert blocker.result(timeout=10) is True
+    assert futures[0].result(timeout=10) == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result(timeout=10)
+    assert futures[2].result(timeout=10) == 1
+    assert emails(writer.path) == ["a@example.com", "c@example.com"]
+    assert writer.statements.count("COMMIT;") == 2
+
+
+def test_write_is_committed_before_its_future_completes(writer):
+    writer.submit(insert, "a@example.com").result(timeout=10)
+    assert emails(writer.path) == ["a@example.com"]
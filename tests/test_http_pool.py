@@ -0,0 +1,68 @@
+# tests/test_http_pool.py
+
+import socket
+
+import httpx
+import pytest
+
+from ai_integration import http_pool
+from benchmarks.stand_in_server import start_stand_in_server
+
+
+@pytest.fixture
+def stand_in():
+    server, base_url = start_stand_in_server()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def shared_client(stand_in, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", stand_in[1])
+    http_pool.close_http_client()
+    yield
+    http_pool.close_http_client()
+
+
+def test_pooled_requests_reuse_one_connection(stand_in):
+    server, base_url = stand_in
+    before = http_pool.get_pool_metrics()
+    with http_pool.create_http_client() as client:
+        for _ in range(20):
+            assert (
+                client.post(base_url + "/chat/completions", json={}).status_code == 200
+            )
+    after = http_pool.get_pool_metrics()
+
+    assert server.connections == 1
+    assert after["new_connections"] - before["new_connections"] == 1
+    assert after["responses"] - before["responses"] == 20
+
+
+def test_unpooled_requests_open_a_connection_each(stand_in):
+    server, base_url = stand_in
+    for _ in range(5):
+        with httpx.Client() as client:
+            client.post(base_url + "/chat/completions", json={})
+    assert server.connections == 5
+
+
+def test_warm_up_opens_the_connection_later_requests_use(stand_in, shared_client):
+    server, base_url = stand_in
+    assert http_pool.warm_up() is True
+    http_pool.get_http_client().post(base_url + "/chat/completions", json={})
+    assert server.connections == 1
+    assert http_pool.get_pool_metrics()["idle_connections"] == 1
+
+
+def test_warm_up_reports_an_unreachable_backend(monkeypatch):
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{port}")
+    http_pool.close_http_client()
+    try:
+        assert http_pool.warm_up() is False
+    finally:
+        http_pool.close_http_client()
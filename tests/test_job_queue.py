@@ -0,0 +1,105 @@
+# tests/test_job_queue.py
+
+import pytest
+
+from database import db_setup, db_writer, job_queue
+
+LEASE = 30.0
+
+
+class Clock:
+    """Replaces the time module in job_queue so tests can move time forward."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CATALOG_DB_PATH", raising=False)
+    (tmp_path / "db").mkdir()
+    db_setup.main_int_db()
+    clock = Clock()
+    monkeypatch.setattr(job_queue, "time", clock)
+    yield clock
+    db_writer.stop_writer()
+
+
+def test_pending_jobs_are_not_enqueued_twice(clock):
+    first = job_queue.enqueue(1, 2)
+    assert job_queue.enqueue(1, 2) == first
+    assert job_queue.enqueue(1, 2, user_id=5) != first
+
+
+def test_jobs_are_claimed_by_priority(clock):
+    batch = job_queue.enqueue(1, 2)
+    interactive = job_queue.enqueue(1, 3, priority=0)
+
+    assert job_queue.claim("w1", LEASE)["generation_job_id"] == interactive
+    assert job_queue.claim("w1", LEASE)["generation_job_id"] == batch
+    assert job_queue.claim("w1", LEASE) is None
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(clock):
+    job_id = job_queue.enqueue(1, 2)
+    job = job_queue.claim("w1", LEASE)
+    assert (job["status"], job["attempts"], job["lease_owner"]) == ("running", 1, "w1")
+    assert job_queue.claim("w2", LEASE) is None
+
+    clock.now += LEASE / 2
+    assert job_queue.heartbeat(job_id, "w1", LEASE)
+    clock.now += LEASE - 1
+    assert job_queue.claim("w2", LEASE) is None  # The heartbeat extended the lease
+
+    clock.now += 2
+    job = job_queue.claim("w2", LEASE)
+    assert (job["lease_owner"], job["attempts"]) == ("w2", 2)
+    # The first worker lost the job and cannot finish it
+    assert job_queue.heartbeat(job_id, "w1", LEASE) is False
+    assert job_queue.complete(job_id, "w1", "generated", 1) is False
+    assert job_queue.complete(job_id, "w2", "generated", 1) is True
+    assert job_queue.get_job(job_id)["status"] == job_queue.DONE
+
+
+def test_failed_attempts_back_off_then_fail(clock):
+    job_id = job_queue.enqueue(1, 2, max_attempts=3)
+    base = job_queue.RETRY_BASE_DELAY_SECONDS
+
+    for attempt, delay in ((1, base), (2, 2 * base)):
+        assert job_queue.claim("w1", LEASE)["attempts"] == attempt
+        assert job_queue.fail(job_id, "w1", "timeout")
+        job = job_queue.get_job(job_id)
+        assert job["status"] == job_queue.QUEUED
+        assert job["available_at"] == clock.now + delay
+
+        clock.now += delay - 1
+        assert job_queue.claim("w1", LEASE) is None
+        clock.now += 1
+
+    job_queue.claim("w1", LEASE)
+    job_queue.fail(job_id, "w1", "timeout")
+    job = job_queue.get_job(job_id)
+    assert (job["status"], job["error"]) == (job_queue.FAILED, "timeout")
+
+
+def test_permanent_errors_are_not_retried(clock):
+    job_id = job_queue.enqueue(1, 2)
+    job_queue.claim("w1", LEASE)
+    assert job_queue.fail(job_id, "w1", "Unknown job_id 2.", retry=False)
+    assert job_queue.get_job(job_id)["status"] == job_queue.FAILED
+
+
+def test_expired_lease_without_attempts_left_fails_the_job(clock):
+    job_id = job_queue.enqueue(1, 2, max_attempts=1)
+    job_queue.claim("w1", LEASE)
+    clock.now += LEASE + 1
+
+    assert job_queue.claim("w2", LEASE) is None
+    job = job_queue.get_job(job_id)
+    assert job["status"] == job_queue.FAILED
+    assert "w1" in job["error"]
+    assert job_queue.get_queue_stats()["counts"][job_queue.FAILED] == 1
@@ -0,0 +1,74 @@
+# tests/test_prefetch.py
+
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from ai_integration import prefetch
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Stubs the database and model; returns the futures of the issued requests."""
+    issued = []
+
+    def request_recommendations(job_name, degree_name, electives, priority):
+        issued.append(Future())
+        return f"key-{len(issued)}", issued[-1]
+
+    monkeypatch.setenv("AI_ENABLED", "True")
+    monkeypatch.setattr(
+        prefetch.db_operations, "get_job_by_id", lambda i: {"name": "Job"}
+    )
+    monkeypatch.setattr(
+        prefetch.db_operations, "get_degree_by_id", lambda i: {"name": "Degree"}
+    )
+    monkeypatch.setattr(prefetch.db_operations, "get_degree_electives", lambda i: [])
+    monkeypatch.setattr(
+        prefetch.recommendation_pipeline,
+        "compute_inputs",
+        lambda *args: {"fingerprint": "f"},
+    )
+    monkeypatch.setattr(
+        prefetch.db_operations, "find_recommendation_set", lambda fingerprint: None
+    )
+    monkeypatch.setattr(
+        prefetch.ai_module, "request_recommendations", request_recommendations
+    )
+    yield issued
+    prefetch.cancel_prefetch()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_same_pair_is_not_requested_twice_while_running(requests):
+    prefetch.prefetch_recommendations(1, 2, delay=0)
+    wait_for(lambda: len(requests) == 1)
+    prefetch.prefetch_recommendations(1, 2, delay=0)
+    time.sleep(0.1)
+    assert len(requests) == 1
+
+
+def test_same_pair_is_prefetched_again_after_the_request_finished(requests):
+    prefetch.prefetch_recommendations(1, 2, delay=0)
+    wait_for(lambda: len(requests) == 1)
+    requests[0].set_result("[]")
+    assert prefetch._current is None
+
+    prefetch.prefetch_recommendations(1, 2, delay=0)
+    wait_for(lambda: len(requests) == 2)
+
+
+def test_skipped_prefetch_does_not_block_the_pair(requests, monkeypatch):
+    monkeypatch.setattr(
+        prefetch.db_operations, "find_recommendation_set", lambda fingerprint: 5
+    )
+    prefetch.prefetch_recommendations(1, 2, delay=0)
+    wait_for(lambda: prefetch._current is None)
+    assert requests == []
@@ -0,0 +1,70 @@
+# tests/test_profiling.py
+
+import threading
+
+import pytest
+
+from utilities import profiling
+
+
+@pytest.fixture
+def cpu_profiling(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_CPU", "generate")
+    monkeypatch.delenv("PROFILE_ALLOCATIONS", raising=False)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    profiling.setup_profiling()
+    yield tmp_path
+    monkeypatch.delenv("PROFILE_CPU")
+    profiling.setup_profiling()
+
+
+def test_concurrent_operations_do_not_raise(cpu_profiling):
+    inside = threading.Barrier(3)
+    errors = []
+
+    @profiling.profiled("generate")
+    def operation():
+        inside.wait(timeout=10)  # All three run at the same time
+        return sum(range(1000))
+
+    def run():
+        try:
+            operation()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(list(cpu_profiling.glob("generate-*.prof"))) == 1
+    assert profiling._cpu_owner is None
+
+
+def test_failed_enable_runs_unprofiled_and_does_not_block_later_profiles(
+    cpu_profiling, monkeypatch
+):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    real_profile = profiling.cProfile.Profile
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    with profiling.profile("generate"):
+        pass
+    assert profiling._cpu_owner is None
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", real_profile)
+    with profiling.profile("generate"):
+        sum(range(1000))
+    assert len(list(cpu_profiling.glob("generate-*.prof"))) == 1
+
+
+def test_nested_operation_in_the_same_thread_is_not_profiled_twice(cpu_profiling):
+    with profiling.profile("generate"):
+        with profiling.profile("generate"):
+            sum(range(1000))
+    assert len(list(cpu_profiling.glob("generate-*.prof"))) == 1
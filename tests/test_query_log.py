@@ -0,0 +1,72 @@
+# tests/test_query_log.py
+
+import json
+import sqlite3
+
+import pytest
+
+from database import query_log
+
+
+@pytest.fixture
+def slow_log(tmp_path, monkeypatch):
+    """Enables the log with a 1-row scan threshold; returns the JSON lines file."""
+    path = tmp_path / "slow.jsonl"
+    monkeypatch.setenv("SLOW_QUERY_MS", "10000")
+    monkeypatch.setenv("SLOW_QUERY_SCAN_ROWS", "1")
+    monkeypatch.setenv("SLOW_QUERY_LOG", str(path))
+    query_log.setup_query_log()
+    query_log._plans.clear()
+    query_log._table_rows.clear()
+    yield path
+    monkeypatch.undo()
+    query_log.setup_query_log()
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", factory=query_log.InstrumentedConnection)
+    conn.execute("CREATE TABLE Courses (course_id INTEGER PRIMARY KEY, name TEXT);")
+    conn.executemany(
+        "INSERT INTO Courses (name) VALUES (?);", [(f"c{n}",) for n in range(5)]
+    )
+    yield conn
+    conn.close()
+
+
+def entries(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_full_scan_is_logged_once_with_plan_and_parameter_types(slow_log, conn):
+    sql = "SELECT * FROM Courses c WHERE c.name = ?;"
+    for _ in range(3):
+        conn.execute(sql, ("c1",)).fetchall()
+
+    logged = entries(slow_log)
+    assert len(logged) == 1
+    assert logged[0]["reason"] == "full_scan"
+    assert logged[0]["full_scans"] == ["Courses"]  # Alias resolved
+    assert logged[0]["parameters"] == "(str)"  # Types only, never values
+    assert any(line.startswith("SCAN") for line in logged[0]["plan"])
+
+
+def test_index_lookup_is_not_logged(slow_log, conn):
+    conn.execute("SELECT name FROM Courses WHERE course_id = ?;", (1,)).fetchall()
+    assert entries(slow_log) == []
+
+
+def test_slow_statement_is_logged(slow_log, conn, monkeypatch):
+    monkeypatch.setattr(query_log, "_slow_seconds", 0.0)
+    conn.execute("SELECT name FROM Courses WHERE course_id = ?;", (1,)).fetchall()
+    assert [entry["reason"] for entry in entries(slow_log)] == ["slow"]
+
+
+def test_plan_cache_is_bounded(slow_log, conn, monkeypatch):
+    monkeypatch.setattr(query_log, "PLAN_CACHE_SIZE", 10)
+    for n in range(50):
+        conn.execute(f"SELECT name FROM Courses WHERE course_id = {n};").fetchall()
+    assert len(query_log._plans) == 10
+    assert "SELECT name FROM Courses WHERE course_id = 49;" in query_log._plans
@@ -0,0 +1,76 @@
+# tests/test_recommendation_pipeline.py
+
+from ai_integration import recommendation_pipeline
+
+JOB = {"job_id": 1, "name": "Data Engineer", "description": "Builds pipelines."}
+DEGREE = {"degree_id": 2, "name": "Computer Science, B.S."}
+ELECTIVES = [
+    {
+        "course_code": "CPSC 332",
+        "name": "File Structures and Database Systems",
+        "units": 3,
+        "description": "Databases.",
+        "prerequisites": "CPSC 131",
+    }
+]
+
+
+def test_stand_in_sets_do_not_share_the_model_fingerprint(monkeypatch):
+    monkeypatch.setenv("AI_ENABLED", "False")
+    stand_in = recommendation_pipeline.compute_inputs(JOB, DEGREE, ELECTIVES)
+    monkeypatch.setenv("AI_ENABLED", "True")
+    model = recommendation_pipeline.compute_inputs(JOB, DEGREE, ELECTIVES)
+
+    assert stand_in["fingerprint"] != model["fingerprint"]
+    assert stand_in["context_hash"] != model["context_hash"]
+    assert stand_in["electives_hash"] == model["electives_hash"]
+
+
+def item(code, rating, rank=0):
+    return {"course_code": code, "rating": rating, "explanation": code, "rank": rank}
+
+
+def test_diff_electives_counts_changed_electives_as_added_and_removed():
+    old = {"CPSC 332": "a", "CPSC 335": "b", "CPSC 349": "c"}
+    new = {"CPSC 332": "a", "CPSC 335": "changed", "CPSC 411": "d"}
+
+    added, removed = recommendation_pipeline.diff_electives(old, new)
+
+    assert added == {"CPSC 335", "CPSC 411"}
+    assert removed == {"CPSC 335", "CPSC 349"}
+    assert recommendation_pipeline.diff_electives(old, dict(old)) == (set(), set())
+
+
+def test_merge_drops_removed_items_and_reranks_by_rating():
+    existing = [item("A", 90, 1), item("B", 80, 2), item("C", 70, 3)]
+    new = [item("D", 85), item("E", 60)]
+
+    merged = recommendation_pipeline.merge_ranked_items(existing, {"B"}, new)
+
+    assert [entry["course_code"] for entry in merged] == ["A", "D", "C", "E"]
+    assert [entry["rank"] for entry in merged] == [1, 2, 3, 4]
+    # The inputs are not modified
+    assert existing[2]["rank"] == 3
+
+
+def test_merge_keeps_existing_items_ahead_on_ties_and_ignores_duplicates():
+    existing = [item("A", 80, 1), item("B", "n/a", 2)]
+    new = [item("C", 80), item("A", 99)]
+
+    merged = recommendation_pipeline.merge_ranked_items(existing, set(), new)
+
+    # A non-numeric rating sorts as 0; a new item for a kept code is dropped
+    assert [(entry["course_code"], entry["rating"]) for entry in merged] == [
+        ("A", 80),
+        ("C", 80),
+        ("B", "n/a"),
+    ]
+
+
+def test_merge_is_cut_to_the_limit():
+    existing = [item(f"OLD {n}", 50 - n, n) for n in range(1, 4)]
+    new = [item("NEW", 100)]
+
+    merged = recommendation_pipeline.merge_ranked_items(existing, set(), new, limit=3)
+
+    assert [entry["course_code"] for entry in merged] == ["NEW", "OLD 1", "OLD 2"]
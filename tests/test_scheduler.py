@@ -0,0 +1,205 @@
+# tests/test_scheduler.py
+
+import threading
+import time
+
+import pytest
+
+from ai_integration import scheduler as llm_scheduler
+from ai_integration.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    PREFETCH,
+    RequestScheduler,
+    SchedulerFullError,
+)
+
+BACKOFF = 0.3
+
+
+class RateLimitError(Exception):
+    """Named like the OpenAI client's 429 error, which the scheduler detects by name."""
+
+
+@pytest.fixture
+def scheduler():
+    instance = RequestScheduler(
+        requests_per_minute=6000,
+        tokens_per_minute=10**9,
+        max_concurrency=1,
+        max_queue_depth={INTERACTIVE: None, PREFETCH: 1, BATCH: None},
+        backoff_seconds=BACKOFF,
+    )
+    yield instance
+    instance.shutdown()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def pause(scheduler, calls):
+    """
+    Submits a batch call that hits the rate limit once, so dispatching pauses for
+    BACKOFF seconds while the test queues more work. Returns the call's future.
+    """
+    attempts = []
+
+    def rate_limited():
+        attempts.append(time.monotonic())
+        calls.append("pause")
+        if len(attempts) == 1:
+            raise RateLimitError("429")
+        return attempts
+
+    future = scheduler.submit(rate_limited, priority=BATCH)
+    wait_for(lambda: scheduler.get_metrics()["rate_limited"] == 1)
+    return future
+
+
+def test_queued_work_is_served_by_priority_after_a_pause(scheduler):
+    calls = []
+    paused = pause(scheduler, calls)
+    futures = [
+        scheduler.submit(calls.append, name, priority=priority)
+        for name, priority in (
+            ("batch", BATCH),
+            ("prefetch", PREFETCH),
+            ("interactive", INTERACTIVE),
+        )
+    ]
+    for future in futures:
+        future.result(timeout=5)
+    attempts = paused.result(timeout=5)
+
+    # The retried call keeps its place among the batch work, ahead of later batch calls
+    assert calls == ["pause", "interactive", "prefetch", "pause", "batch"]
+    assert attempts[1] - attempts[0] >= BACKOFF
+
+
+def test_rate_limit_backoff_doubles_until_retries_run_out():
+    instance = RequestScheduler(
+        requests_per_minute=6000,
+        tokens_per_minute=10**9,
+        max_retries=2,
+        backoff_seconds=0.05,
+    )
+    attempts = []
+
+    def always_rate_limited():
+        attempts.append(time.monotonic())
+        raise RateLimitError("429")
+
+    try:
+        with pytest.raises(RateLimitError):
+            instance.submit(always_rate_limited).result(timeout=5)
+    finally:
+        instance.shutdown()
+
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+    metrics = instance.get_metrics()
+    assert metrics["rate_limited"] == 2
+    assert metrics["failed"] == 1
+
+
+def test_reprioritize_moves_a_queued_request_ahead(scheduler):
+    calls = []
+    paused = pause(scheduler, calls)
+    first = scheduler.submit(calls.append, "first", priority=BATCH)
+    second = scheduler.submit(calls.append, "second", priority=BATCH)
+
+    assert scheduler.reprioritize(second, INTERACTIVE) is True
+    assert scheduler.queue_depth(INTERACTIVE) == 1
+    second.result(timeout=5)
+    first.result(timeout=5)
+    paused.result(timeout=5)
+
+    assert calls == ["pause", "second", "pause", "first"]
+    # Already finished: there is nothing left to move
+    assert scheduler.reprioritize(first, INTERACTIVE) is False
+
+
+def test_full_prefetch_queue_sheds_new_requests(scheduler):
+    calls = []
+    paused = pause(scheduler, calls)
+    queued = scheduler.submit(calls.append, "prefetch", priority=PREFETCH)
+
+    with pytest.raises(SchedulerFullError):
+        scheduler.submit(calls.append, "shed", priority=PREFETCH)
+    # Interactive work is never shed
+    scheduler.submit(calls.append, "interactive", priority=INTERACTIVE).result(
+        timeout=5
+    )
+    queued.result(timeout=5)
+    paused.result(timeout=5)
+
+    assert "shed" not in calls
+    assert scheduler.get_metrics()["rejected"] == 1
+
+
+def test_cancelled_request_is_dropped_from_the_queue(scheduler):
+    calls = []
+    paused = pause(scheduler, calls)
+    cancelled = scheduler.submit(calls.append, "cancelled", priority=PREFETCH)
+
+    assert cancelled.cancel() is True
+    assert scheduler.queue_depth(PREFETCH) == 0
+    paused.result(timeout=5)
+
+    assert calls == ["pause", "pause"]
+    assert scheduler.get_metrics()["cancelled"] == 1
+
+
+def test_shutdown_fails_queued_and_retried_requests():
+    instance = RequestScheduler(
+        requests_per_minute=6000,
+        tokens_per_minute=10**9,
+        max_concurrency=1,
+        backoff_seconds=60,
+    )
+    calls = []
+    retried = pause(instance, calls)
+    queued = instance.submit(calls.append, "queued", priority=BATCH)
+
+    instance.shutdown()
+
+    # The retried request's future is already running and cannot be cancelled
+    for future in (retried, queued):
+        with pytest.raises(RuntimeError, match="scheduler shut down"):
+            future.result(timeout=1)
+    assert calls == ["pause"]
+
+
+def test_reprioritize_keeps_the_retry_budget(scheduler):
+    calls = []
+    paused = pause(scheduler, calls)
+    queued = scheduler.submit(calls.append, "queued", priority=BATCH)
+    scheduler._jobs_by_future[queued].attempts = 2
+
+    assert scheduler.reprioritize(queued, INTERACTIVE) is True
+    assert scheduler._jobs_by_future[queued].attempts == 2
+    queued.result(timeout=5)
+    paused.result(timeout=5)
+
+
+def test_get_scheduler_returns_one_instance(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "scheduler", None)
+    created = []
+
+    def get():
+        created.append(llm_scheduler.get_scheduler())
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len({id(instance) for instance in created}) == 1
+    finally:
+        created[0].shutdown()
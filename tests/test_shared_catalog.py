@@ -0,0 +1,131 @@
+# tests/test_shared_catalog.py
+
+import os
+import sqlite3
+
+import pytest
+
+from ai_integration import recommendation_pipeline
+from database import catalog_db, db_operations, db_setup, db_writer, shared_catalog
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CATALOG_DB_PATH", raising=False)
+    (tmp_path / "db").mkdir()
+    db_setup.main_int_db()
+    yield tmp_path
+    db_writer.stop_writer()
+
+
+@pytest.fixture
+def catalog_path(database):
+    return str(database / "db" / "shared_catalog.bin")
+
+
+def open_catalog(path):
+    assert shared_catalog.publish(path) == path
+    return shared_catalog.SharedCatalog(path)
+
+
+def test_records_match_the_database(catalog_path):
+    catalog = open_catalog(catalog_path)
+    try:
+        job = db_operations.get_job_by_id(1)
+        assert catalog.job(1) == {key: job[key] for key in catalog.job(1)}
+        degree = db_operations.get_degree_by_id(1)
+        assert catalog.degree(1) == {key: degree[key] for key in catalog.degree(1)}
+        assert catalog.degree_electives(1) == db_operations.get_degree_electives(1)
+        assert catalog.job(10**6) is None
+        assert catalog.degree(10**6) is None
+    finally:
+        catalog.close()
+
+
+def test_null_strings_stay_null(catalog_path):
+    conn = sqlite3.connect(catalog_db.catalog_db_path())
+    conn.execute("UPDATE Courses SET prerequisites = NULL, description = '';")
+    conn.commit()
+    conn.close()
+
+    catalog = open_catalog(catalog_path)
+    try:
+        elective = catalog.degree_electives(1)[0]
+        assert elective["prerequisites"] is None
+        assert elective["description"] == ""
+    finally:
+        catalog.close()
+
+
+def test_only_rated_pairs_are_stored(catalog_path):
+    conn = db_operations.connect_db()
+    job = conn.execute("SELECT job_id, degree_id FROM Jobs LIMIT 1;").fetchone()
+    courses = [
+        row[0]
+        for row in conn.execute(
+            "SELECT course_id FROM Courses ORDER BY course_id LIMIT 2;"
+        )
+    ]
+    conn.close()
+    for fingerprint, ratings in (("a" * 64, (80, 60)), ("b" * 64, (90, 70))):
+        items = [
+            {"course_id": course_id, "rating": rating, "explanation": "", "rank": rank}
+            for rank, (course_id, rating) in enumerate(zip(courses, ratings), start=1)
+        ]
+        db_operations.save_recommendation_set(
+            job["degree_id"], job["job_id"], "e" * 64, "1", items, fingerprint
+        )
+
+    catalog = open_catalog(catalog_path)
+    try:
+        assert catalog.job_scores(job["job_id"]) == {courses[0]: 85.0, courses[1]: 65.0}
+        assert catalog.job_scores(job["job_id"] + 1) == {}
+        # Two pairs are stored, not a jobs x courses matrix
+        assert catalog.stats()["rated_pairs"] == 2
+    finally:
+        catalog.close()
+
+
+def test_publish_if_stale_rebuilds_only_after_a_catalog_change(catalog_path):
+    assert shared_catalog.publish_if_stale(catalog_path) == catalog_path
+    published = os.stat(catalog_path).st_mtime_ns
+
+    assert shared_catalog.publish_if_stale(catalog_path) == catalog_path
+    assert os.stat(catalog_path).st_mtime_ns == published
+
+    source = catalog_db.catalog_db_path()
+    later = os.stat(catalog_path).st_mtime + 10
+    os.utime(source, (later, later))
+    shared_catalog.publish_if_stale(catalog_path)
+    assert os.stat(catalog_path).st_mtime_ns != published
+
+
+def test_attach_picks_up_a_republished_file(catalog_path, monkeypatch):
+    monkeypatch.setattr(shared_catalog, "_catalog", None)
+    assert shared_catalog.attach(catalog_path) is None
+
+    shared_catalog.publish(catalog_path)
+    first = shared_catalog.attach(catalog_path)
+    assert shared_catalog.attach(catalog_path) is first
+
+    shared_catalog.publish(catalog_path)
+    assert shared_catalog.attach(catalog_path) is not first
+
+
+def test_resolve_inputs_reads_electives_from_the_catalog(catalog_path, monkeypatch):
+    catalog = open_catalog(catalog_path)
+    job = catalog.job(1)
+
+    def no_database(degree_id):
+        raise AssertionError("electives were read from the database")
+
+    monkeypatch.setattr(db_operations, "get_degree_electives", no_database)
+    try:
+        _, resolved_job, _, electives = recommendation_pipeline.resolve_inputs(
+            degree_id=job["degree_id"], job_id=1, catalog=catalog
+        )
+        assert resolved_job == job
+        assert electives == catalog.degree_electives(job["degree_id"])
+    finally:
+        catalog.close()
@@ -0,0 +1,49 @@
+# tests/test_storage_profile.py
+
+import sqlite3
+
+import pytest
+
+from database import db_operations, db_setup, db_writer, storage_profile
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DB_STORAGE_PROFILE", "desktop")
+    monkeypatch.delenv("CATALOG_DB_PATH", raising=False)
+    (tmp_path / "db").mkdir()
+    yield tmp_path
+    db_writer.stop_writer()
+
+
+def journal_mode(conn):
+    return conn.execute("PRAGMA main.journal_mode;").fetchone()[0].lower()
+
+
+def test_connect_db_applies_only_per_connection_settings(workdir):
+    conn = db_operations.connect_db()
+    try:
+        assert journal_mode(conn) == "delete"  # Left to the database setup
+        assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA cache_size;").fetchone()[0] == -16384
+    finally:
+        conn.close()
+
+
+def test_setup_applies_the_persistent_settings(workdir):
+    db_setup.main_int_db()
+    conn = db_operations.connect_db()
+    try:
+        assert journal_mode(conn) == "wal"
+    finally:
+        conn.close()
+
+
+def test_apply_profile_skips_persistent_pragmas_on_request(tmp_path):
+    conn = sqlite3.connect(tmp_path / "test.db")
+    storage_profile.apply_profile(conn, "server", persistent=False)
+    assert journal_mode(conn) == "delete"
+    storage_profile.apply_profile(conn, "server")
+    assert journal_mode(conn) == "wal"
+    conn.close()
@@ -0,0 +1,74 @@
+# tests/test_typeahead.py
+
+import random
+
+from ui.typeahead import NameIndex, normalize
+
+NAMES = [
+    "Computer Engineering",
+    "Civil Engineering",
+    "Computer Science",
+    "Engineering Management",
+    "Applied Computational Science",
+    "Mechanical Engineering",
+    "Cinema and Television Arts",
+]
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("  Café-Society, B.A. ") == "cafe society b a"
+
+
+def test_results_are_ranked_by_tier_in_list_order():
+    index = NameIndex(NAMES)
+    assert index.search("eng") == [
+        # The name starts with the query
+        "Engineering Management",
+        # A word starts with the query
+        "Computer Engineering",
+        "Civil Engineering",
+        "Mechanical Engineering",
+    ]
+    assert index.search("comp sci") == [
+        # Every typed word starts a word
+        "Computer Science",
+        "Applied Computational Science",
+    ]
+
+
+def test_substring_matches_come_last():
+    index = NameIndex(NAMES)
+    assert index.search("put") == [
+        "Computer Engineering",
+        "Computer Science",
+        "Applied Computational Science",
+    ]
+    assert index.search("ci") == [
+        "Civil Engineering",
+        "Cinema and Television Arts",
+    ]  # Two letters: only the prefix tiers, so "Science" is not matched
+
+
+def test_empty_query_and_limit():
+    index = NameIndex(NAMES)
+    assert index.search("") == NAMES
+    assert index.search("  ", limit=2) == NAMES[:2]
+    assert index.search("eng", limit=2) == [
+        "Engineering Management",
+        "Computer Engineering",
+    ]
+    assert index.search("xyz") == []
+    assert "Civil Engineering" in index
+    assert "Civil" not in index
+
+
+def test_substring_tier_matches_a_plain_scan():
+    generator = random.Random(7)
+    words = ["data", "science", "engineering", "art", "history", "bio", "chem"]
+    names = [
+        " ".join(generator.choice(words) for _ in range(3)).title() for _ in range(200)
+    ]
+    index = NameIndex(names)
+    for query in ["ata sci", "neer", "story", "o ch", "ist"]:
+        expected = {name for name in names if query in normalize(name)}
+        assert expected <= set(index.search(query))
@@ -0,0 +1,57 @@
+# tests/test_virtual_list.py
+
+import random
+
+import pytest
+
+from ui.virtual_list import HeightIndex
+
+
+def naive_find(heights, y):
+    offset = 0
+    for index, height in enumerate(heights):
+        offset += height
+        if y < offset:
+            return index
+    return len(heights) - 1
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 8, 9, 100])
+def test_new_index_matches_uniform_heights(count):
+    index = HeightIndex(count, 150)
+    assert index.total() == 150 * count
+    for row in range(count + 1):
+        assert index.offset(row) == 150 * row
+
+
+def test_offsets_and_lookups_match_a_plain_list_after_updates():
+    generator = random.Random(42)
+    index = HeightIndex(257, 150)
+    heights = [150] * 257
+    for _ in range(500):
+        row = generator.randrange(257)
+        height = generator.choice([0, 40, 150, 310])
+        index.set(row, height)
+        heights[row] = height
+
+    assert index.heights == heights
+    assert index.total() == sum(heights)
+    for row in range(0, 258, 16):
+        assert index.offset(row) == sum(heights[:row])
+    for y in range(0, sum(heights), 97):
+        assert index.find(y) == naive_find(heights, y)
+
+
+def test_find_treats_row_boundaries_as_the_start_of_the_next_row():
+    index = HeightIndex(3, 100)
+    assert index.find(0) == 0
+    assert index.find(99) == 0
+    assert index.find(100) == 1
+    assert index.find(250) == 2
+
+
+def test_find_is_clamped_to_the_list():
+    assert HeightIndex(0, 100).find(50) == 0
+    index = HeightIndex(3, 100)
+    assert index.find(-10) == 0
+    assert index.find(10_000) == 2
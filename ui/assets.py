@@ -0,0 +1,246 @@
+# ui/assets.py
+"""
+Process-wide cache for the GUI's icons, plus an offline step that normalizes them.
+
+Icons are decoded at most once per process. STARTUP_ICONS are decoded up front by
+preload(); every other image is decoded the first time get_icon() asks for it.
+
+The full-resolution masters in ui/icons/ (1024x1024) are not used at runtime. The
+normalize step writes copies at the sizes the GUI displays into icons/:
+
+    python -m ui.assets normalize [--force]
+    python -m ui.assets report
+
+Normalizing uses Pillow when it is installed (better downscaling). Otherwise it falls
+back to Tk's integer subsampling, which needs a display.
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+import time
+import tkinter as tk
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICON_DIR = os.path.join(PROJECT_ROOT, "icons")  # Normalized icons loaded at runtime
+SOURCE_ICON_DIR = os.path.join(PROJECT_ROOT, "ui", "icons")  # Full-resolution masters
+
+# Displayed size in pixels (square) of every icon the GUI uses
+ICON_SIZES = {
+    "university_logo": 64,
+    "home": 64,
+    "login": 64,
+    "logout": 64,
+    "register": 64,
+    "preferences": 64,
+    "recommendations": 64,
+    "profile": 64,
+    "help": 64,
+}
+
+# Decoded before the main window is shown; everything else is decoded on first use
+STARTUP_ICONS = (
+    "university_logo",
+    "home",
+    "login",
+    "logout",
+    "preferences",
+    "recommendations",
+    "profile",
+    "help",
+)
+
+_cache = {}  # name -> tk.PhotoImage
+_stats = {}  # name -> {"decode_ms", "width", "height", "bytes"}
+
+
+def icon_path(name):
+    """Returns the path of the normalized icon `name`."""
+    return os.path.join(ICON_DIR, f"{name}.png")
+
+
+def png_size(path):
+    """
+    Reads the dimensions of a PNG file from its header, without decoding it.
+
+    :param path: str, Path of the PNG file.
+    :return: tuple or None, (width, height), or None if the file is not a PNG.
+    """
+    with open(path, "rb") as png_file:
+        header = png_file.read(24)
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def get_icon(name):
+    """
+    Returns the decoded icon `name`, decoding it on first use.
+
+    A Tk root window must exist. The cached images belong to that root; call
+    clear_cache() if it is destroyed.
+
+    :param name: str, Icon name (a key of ICON_SIZES).
+    :return: tk.PhotoImage or None, The image, or None if it is missing or invalid.
+    """
+    image = _cache.get(name)
+    if image is not None:
+        return image
+
+    path = icon_path(name)
+    start = time.perf_counter()
+    try:
+        image = tk.PhotoImage(file=path)
+    except tk.TclError as e:
+        logger.warning(f"Icon '{path}' not found or invalid: {e}")
+        return None
+    decode_ms = (time.perf_counter() - start) * 1000
+
+    width, height = image.width(), image.height()
+    _cache[name] = image
+    _stats[name] = {
+        "decode_ms": decode_ms,
+        "width": width,
+        "height": height,
+        "bytes": width * height * 4,  # Tk keeps photos as 32-bit RGBA
+    }
+    expected = ICON_SIZES.get(name)
+    if expected and (width, height) != (expected, expected):
+        logger.warning(
+            f"Icon '{name}' is {width}x{height} but is displayed at {expected}x{expected}; run 'python -m ui.assets normalize'."
+        )
+    return image
+
+
+def preload(names=STARTUP_ICONS):
+    """
+    Decodes the given icons now so that later lookups are free.
+
+    :param names: iterable of str, Icon names to decode.
+    :return: dict, The asset report (see get_asset_report).
+    """
+    for name in names:
+        get_icon(name)
+    return get_asset_report()
+
+
+def get_asset_report():
+    """
+    Summarizes decode time and memory of every icon decoded so far.
+
+    :return: dict, Totals ('count', 'decode_ms', 'bytes') and per-icon stats under 'icons'.
+    """
+    return {
+        "count": len(_stats),
+        "decode_ms": sum(stat["decode_ms"] for stat in _stats.values()),
+        "bytes": sum(stat["bytes"] for stat in _stats.values()),
+        "icons": {name: dict(stat) for name, stat in _stats.items()},
+    }
+
+
+def clear_cache():
+    """Drops every cached image (for example after the root window is destroyed)."""
+    _cache.clear()
+    _stats.clear()
+
+
+def _resize_png(source, destination, size, image_module=None):
+    if image_module is not None:
+        with image_module.open(source) as image:
+            image.convert("RGBA").resize((size, size), image_module.LANCZOS).save(
+                destination, optimize=True
+            )
+        return
+
+    # Tk fallback: integer subsampling (nearest neighbour) and Tk's PNG writer
+    image = tk.PhotoImage(file=source)
+    factor = max(1, image.width() // size)
+    image.subsample(factor).write(destination, format="png")
+
+
+def normalize_icons(source_dir=SOURCE_ICON_DIR, dest_dir=ICON_DIR, force=False):
+    """
+    Writes every icon in ICON_SIZES from `source_dir` to `dest_dir` at its display size.
+
+    Up-to-date icons (already the right size and newer than their source) are skipped
+    unless `force` is set. Source files without an entry in ICON_SIZES, such as the
+    '*1.png' variants, are reported and left alone.
+
+    :param source_dir: str, Directory with the full-resolution masters.
+    :param dest_dir: str, Directory the GUI loads icons from.
+    :param force: bool, Rewrite icons that are already up to date.
+    :return: list of str, Paths of the icons written.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+    root = None
+    written = []
+    try:
+        for name, size in ICON_SIZES.items():
+            source = os.path.join(source_dir, f"{name}.png")
+            destination = os.path.join(dest_dir, f"{name}.png")
+            if not os.path.exists(source):
+                logger.warning(f"No source image for icon '{name}' in {source_dir}.")
+                continue
+            if (
+                not force
+                and os.path.exists(destination)
+                and os.path.getmtime(destination) >= os.path.getmtime(source)
+                and png_size(destination) == (size, size)
+            ):
+                continue
+
+            if Image is None and root is None:
+                root = tk.Tk()  # Tk photo images need an interpreter with Tk loaded
+                root.withdraw()
+            _resize_png(source, destination, size, Image)
+            written.append(destination)
+            logger.info(f"Normalized {source} -> {destination} ({size}x{size}).")
+    finally:
+        if root is not None:
+            root.destroy()
+
+    unused = sorted(
+        filename
+        for filename in os.listdir(source_dir)
+        if filename.endswith(".png") and filename[:-4] not in ICON_SIZES
+    )
+    if unused:
+        logger.info(f"Source images not used by the GUI: {', '.join(unused)}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Icon asset tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    normalize_parser = subparsers.add_parser(
+        "normalize", help="Write display-size icons from the full-resolution masters."
+    )
+    normalize_parser.add_argument("--force", action="store_true")
+    subparsers.add_parser(
+        "report", help="Decode the startup icons and print timing and memory."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "normalize":
+        written = normalize_icons(force=args.force)
+        print(f"{len(written)} icon(s) written to {ICON_DIR}")
+    else:
+        root = tk.Tk()
+        root.withdraw()
+        try:
+            print(json.dumps(preload(), indent=4))
+        finally:
+            root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# ui/build_scheduler.py
+
+import logging
+import os
+import time
+import tkinter as tk
+from collections import deque
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Time the scheduler may spend building per idle slice (half a 60 Hz frame)
+BUILD_BUDGET_MS = float(os.getenv("UI_BUILD_BUDGET_MS", "8"))
+
+
+def calls(*functions):
+    """Returns job steps that call each of `functions` in turn, one per step."""
+    return (function() for function in functions)
+
+
+class BuildJob:
+    """A queued piece of UI construction; returned by BuildScheduler.schedule()."""
+
+    def __init__(self, steps, on_done, name):
+        self.steps = steps
+        self.on_done = on_done
+        self.name = name
+        self.steps_run = 0
+        self.cancelled = False
+        self.done = False
+        self.queued_at = time.perf_counter()
+
+    def cancel(self):
+        """Stops the job before its next step."""
+        self.cancelled = True
+
+
+class BuildScheduler:
+    """
+    Spreads widget construction across idle slices under a per-slice time budget.
+
+    A job is an iterator whose every next() performs one unit of work, typically a
+    generator that yields after each widget or row, or `(build(x) for x in items)`.
+    Jobs run in the order they were scheduled. Each slice runs steps until the budget
+    is used up and then reschedules itself with after_idle, so Tk handles input and
+    redraws between slices and a screen is usable before it is fully built.
+    """
+
+    def __init__(self, widget, budget_ms=None):
+        """
+        :param widget: Any widget of the application, used for after_idle.
+        :param budget_ms: float, optional, Build time per slice (UI_BUILD_BUDGET_MS).
+        """
+        self.widget = widget
+        self.budget_ms = BUILD_BUDGET_MS if budget_ms is None else budget_ms
+        self._jobs = deque()
+        self._after_id = None
+        self._stats = {"jobs": 0, "steps": 0, "slices": 0, "max_slice_ms": 0.0}
+
+    def schedule(self, steps, on_done=None, name="build"):
+        """
+        Queues a job.
+
+        :param steps: iterable, Each item pulled from it performs one unit of work.
+        :param on_done: callable, optional, Called after the last step.
+        :param name: str, Name used in logs.
+        :return: BuildJob, The job; call cancel() on it to drop the remaining steps.
+        """
+        job = BuildJob(iter(steps), on_done, name)
+        self._jobs.append(job)
+        self._wake()
+        return job
+
+    def pending(self):
+        """Returns the number of jobs not yet finished or cancelled."""
+        return sum(1 for job in self._jobs if not job.cancelled)
+
+    def flush(self):
+        """Runs every queued job to completion now, ignoring the budget."""
+        while self._jobs:
+            self._step(self._jobs[0])
+
+    def get_metrics(self):
+        """
+        Returns build statistics.
+
+        :return: dict, Keys 'jobs' (completed), 'steps', 'slices' and 'max_slice_ms'.
+        """
+        return dict(self._stats)
+
+    # -- internals ----------------------------------------------------------
+
+    def _wake(self):
+        if self._after_id is None:
+            self._after_id = self.widget.after_idle(self._run_slice)
+
+    def _run_slice(self):
+        self._after_id = None
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        while self._jobs and time.perf_counter() < deadline:
+            self._step(self._jobs[0])
+
+        slice_ms = (time.perf_counter() - start) * 1000
+        self._stats["slices"] += 1
+        self._stats["max_slice_ms"] = max(self._stats["max_slice_ms"], slice_ms)
+        if self._jobs:
+            self._wake()
+
+    def _step(self, job):
+        """Runs one step of `job` (the job at the head of the queue)."""
+        if job.cancelled:
+            self._jobs.popleft()
+            return
+        try:
+            next(job.steps)
+        except StopIteration:
+            self._jobs.popleft()
+            self._finish(job)
+            return
+        except tk.TclError as e:
+            # Usually the view was destroyed (e.g. on logout) while still building
+            self._jobs.popleft()
+            logger.debug(f"Build job '{job.name}' dropped: {e}")
+            return
+        except Exception:
+            self._jobs.popleft()
+            logger.exception(f"Build job '{job.name}' failed.")
+            return
+        job.steps_run += 1
+        self._stats["steps"] += 1
+
+    def _finish(self, job):
+        job.done = True
+        self._stats["jobs"] += 1
+        logger.debug(
+            f"Build job '{job.name}' finished {job.steps_run} step(s) in "
+            f"{(time.perf_counter() - job.queued_at) * 1000:.1f} ms."
+        )
+        if job.on_done is not None:
+            job.on_done()
@@ -1,11 +1,17 @@
 # ui/gui.py
-import json
 import logging
 import tkinter as tk
-from tkinter import PhotoImage, messagebox, ttk
+from tkinter import messagebox, ttk
 
-from ai_integration.ai_module import get_recommendations_ai
+from ai_integration import recommendation_pipeline
+from ai_integration.prefetch import cancel_prefetch, prefetch_recommendations
 from database import db_operations  # Importing db_operations for authenticatio
+from ui import assets, responsiveness
+from ui.build_scheduler import BuildScheduler, calls
+from ui.typeahead import TypeaheadCombobox
+from ui.views import ViewRegistry
+from ui.virtual_list import VirtualList
+from utilities import profiling, tracing
 
 logger = logging.getLogger(__name__)  # Reuse the global logger
 
@@ -17,10 +23,17 @@ current_user = None  # Will hold user details after login
 # Dictionary to store navigation button references
 nav_buttons = {}
 
+# Screens of the content area, built once and shown/hidden on navigation
+views = None
+
+# Spreads long widget builds across idle slices
+build_scheduler = None
+
 
 def main_int_ui():
     """Initializes and runs the main interface of the Smart Elective Advisor."""
 
+    global views, build_scheduler
     logger.info("Initializing the Smart Elective Advisor GUI.")
 
     # Initialize the main window
@@ -29,11 +42,23 @@ def main_int_ui():
     root.geometry("1200x800")
     root.resizable(False, False)  # Fixed window size for consistency
 
+    # Measure main-loop lag and log callbacks that block it
+    responsiveness.start(root)
+    build_scheduler = BuildScheduler(root)
+
+    # Decode the startup icons once; the cache keeps them alive for the whole session
+    icon_report = assets.preload()
+    logger.info(
+        f"Decoded {icon_report['count']} icons in {icon_report['decode_ms']:.1f} ms "
+        f"(~{icon_report['bytes'] / 1024:.0f} KiB of image memory)."
+    )
+
     # Set the window icon (ensure the icon file exists)
-    try:
-        root.iconphoto(False, PhotoImage(file="icons/university_logo.png"))
-    except Exception as e:
-        logger.error(f"Icon file not found or invalid: {e}")
+    logo = assets.get_icon("university_logo")
+    if logo is not None:
+        root.iconphoto(False, logo)
+    else:
+        logger.error("Icon file not found or invalid: university_logo")
 
     # Configure grid layout
     root.columnconfigure(0, weight=1)  # Navigation Menu
@@ -52,32 +77,38 @@ def main_int_ui():
     content_frame.columnconfigure(0, weight=1)
     content_frame.rowconfigure(0, weight=1)
 
+    # Register the screens shown in the content area
+    views = ViewRegistry(content_frame)
+    views.register("home", build_home)
+    views.register("login", build_login)
+    views.register("registration", build_registration)
+    views.register("preferences", build_preferences, user_scoped=True)
+    views.register("recommendations", build_recommendations, user_scoped=True)
+    views.register("profile", build_profile, user_scoped=True)
+    views.register("help", build_help)
+
     # Define menu items with their respective icons and commands
     menu_items = [
-        ("Home Dashboard", "icons/home.png", show_home),
-        ("Login", "icons/login.png", show_login),
-        ("Logout", "icons/logout.png", show_logout),
-        # ("User Registration", "icons/register.png", show_registration),  # Removed
-        ("Preferences", "icons/preferences.png", show_preferences),
-        ("Recommendations", "icons/recommendations.png", show_recommendations),
-        ("Profile", "icons/profile.png", show_profile),
-        ("Help", "icons/help.png", show_help),
+        ("Home Dashboard", "home", show_home),
+        ("Login", "login", show_login),
+        ("Logout", "logout", show_logout),
+        # ("User Registration", "register", show_registration),  # Removed
+        ("Preferences", "preferences", show_preferences),
+        ("Recommendations", "recommendations", show_recommendations),
+        ("Profile", "profile", show_profile),
+        ("Help", "help", show_help),
     ]
 
     # Load and create buttons for the Navigation Menu
-    for idx, (text, icon_path, command) in enumerate(menu_items):
-        try:
-            icon = PhotoImage(file=icon_path)
-        except Exception as e:
-            logger.warning(f"Icon '{icon_path}' not found. Using text only. Error: {e}")
-            icon = None
+    for idx, (text, icon_name, command) in enumerate(menu_items):
+        icon = assets.get_icon(icon_name)  # None (text only) if the icon is missing
 
         btn = ttk.Button(
             nav_frame,
             text=text,
             image=icon,
             compound="left",
-            command=lambda cmd=command: cmd(content_frame),
+            command=responsiveness.timed(command, f"nav:{text}"),
         )
         btn.image = icon  # Keep a reference to prevent garbage collection
         btn.grid(row=idx, column=0, padx=10, pady=10, sticky="ew")
@@ -89,11 +120,15 @@ def main_int_ui():
     update_nav_buttons()
 
     # Initialize with the Home Dashboard
-    show_home(content_frame)
+    show_home()
 
     # Start the Tkinter event loop
     logger.info("Starting the Tkinter main loop.")
     root.mainloop()
+    responsiveness.stop()
+    logger.info(f"Navigation latency: {views.get_metrics()}")
+    logger.info(f"Incremental builds: {build_scheduler.get_metrics()}")
+    assets.clear_cache()  # The images belonged to the destroyed root
 
 
 def clear_content(frame):
@@ -129,10 +164,14 @@ def update_nav_buttons():
         nav_buttons["Help"].config(state="normal")
 
 
-def show_home(frame):
+def show_home():
     """Displays the Home Dashboard in the content area."""
     logger.info("Displaying Home Dashboard.")
-    clear_content(frame)
+    views.show("home")
+
+
+def build_home(frame):
+    """Builds the Home Dashboard in the given view frame."""
 
     header_font = ("Helvetica", 16, "bold")
     header_label = ttk.Label(
@@ -154,11 +193,14 @@ def show_home(frame):
 # ui/gui.py
 
 
-def show_login(frame):
+def show_login():
     """Displays the Login Page in the content area."""
-    global login_status, current_user
     logger.info("Displaying Login Page.")
-    clear_content(frame)
+    views.show("login")
+
+
+def build_login(frame):
+    """Builds the Login Page in the given view frame."""
 
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="Login", font=header_font)
@@ -181,6 +223,7 @@ def show_login(frame):
     password_entry.grid(row=1, column=1, padx=5, pady=5)
 
     # Login Button
+    @profiling.profiled("login")
     def perform_login():
         global login_status, current_user
         email = email_entry.get()
@@ -196,9 +239,10 @@ def show_login(frame):
                     "Login Successful", f"Welcome back, {user['full_name']}!"
                 )
                 logger.info(f"User '{email}' logged in successfully.")
+                clear_form()  # The page is kept; do not keep credentials in it
                 # Redirect to Home Dashboard after successful login
-                # show_home(frame)
-                show_preferences(frame)  # Redirects to Preferences Page
+                # show_home()
+                show_preferences()  # Redirects to Preferences Page
                 update_nav_buttons()  # Refresh button states
             else:
                 messagebox.showerror("Login Failed", "Invalid email or password.")
@@ -209,7 +253,9 @@ def show_login(frame):
             )
             logger.warning("Login failed due to incomplete credentials.")
 
-    login_button = ttk.Button(frame, text="Login", command=perform_login)
+    login_button = ttk.Button(
+        frame, text="Login", command=responsiveness.timed(perform_login)
+    )
     login_button.pack(pady=10)
 
     # Register Link
@@ -220,10 +266,22 @@ def show_login(frame):
         cursor="hand2",
     )
     register_label.pack(pady=5)
-    register_label.bind("<Button-1>", lambda e: show_registration(frame))
+    register_label.bind(
+        "<Button-1>",
+        responsiveness.timed(lambda e: show_registration(), "to_registration"),
+    )
+
+    def clear_form():
+        email_entry.delete(0, tk.END)
+        password_entry.delete(0, tk.END)
+
+    def refresh():
+        password_entry.delete(0, tk.END)
+
+    return refresh
 
 
-def show_logout(frame):
+def show_logout():
     """Handles user logout."""
     global login_status, current_user
     logger.info("User initiated logout.")
@@ -231,17 +289,21 @@ def show_logout(frame):
     # Implement logout logic (e.g., clear session, tokens)
     login_status = False  # Reset login status
     current_user = None  # Clear current user details
+    views.invalidate_user_views()  # Drop screens holding the previous user's data
 
     messagebox.showinfo("Logout", "You have been logged out successfully.")
-    show_home(frame)  # Redirect to Home Dashboard after logout
+    show_home()  # Redirect to Home Dashboard after logout
     update_nav_buttons()  # Refresh button states
 
 
-def show_registration(frame):
+def show_registration():
     """Displays the User Registration Form in the content area."""
-    global login_status, current_user
     logger.info("Displaying User Registration Form.")
-    clear_content(frame)
+    views.show("registration")
+
+
+def build_registration(frame):
+    """Builds the User Registration Form in the given view frame."""
 
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="User Registration", font=header_font)
@@ -321,14 +383,18 @@ def show_registration(frame):
                 "Registration Successful", "Your account has been created successfully!"
             )
             logger.info(f"User '{email}' registered successfully.")
-            show_login(frame)  # Redirect to Login after successful registration
+            for entry in (name_entry, email_entry, password_entry, confirm_entry):
+                entry.delete(0, tk.END)
+            show_login()  # Redirect to Login after successful registration
         else:
             messagebox.showerror(
                 "Registration Failed", "An account with this email already exists."
             )
             logger.warning(f"Registration failed: Email '{email}' already exists.")
 
-    register_button = ttk.Button(frame, text="Register", command=perform_registration)
+    register_button = ttk.Button(
+        frame, text="Register", command=responsiveness.timed(perform_registration)
+    )
     register_button.pack(pady=10)
 
     # Back to Login Link
@@ -339,7 +405,9 @@ def show_registration(frame):
         cursor="hand2",
     )
     back_label.pack(pady=5)
-    back_label.bind("<Button-1>", lambda e: show_login(frame))
+    back_label.bind(
+        "<Button-1>", responsiveness.timed(lambda e: show_login(), "to_login")
+    )
 
 
 """
@@ -379,7 +447,13 @@ Logs all significant actions and warnings for easier debugging.
 # ui/gui.py
 
 
-def show_preferences(frame):
+def _preferences_key(prefs):
+    """Returns a comparable snapshot of stored preferences."""
+    keys = ("college_id", "department_id", "degree_level_id", "degree_id", "job_id")
+    return tuple(prefs.get(key) for key in keys) if prefs else ()
+
+
+def show_preferences():
     """Displays the Preferences Form in the content area."""
     if not login_status:
         messagebox.showerror("Access Denied", "Please log in to access Preferences.")
@@ -387,7 +461,16 @@ def show_preferences(frame):
         return  # Exit the function without displaying the page
 
     logger.info("Displaying Preferences Form.")
-    clear_content(frame)
+    views.show("preferences")
+
+
+def build_preferences(frame):
+    """
+    Builds the Preferences Form in the given view frame.
+
+    :return: callable, Re-applies the stored preferences when they changed since the
+        form was last filled from them.
+    """
 
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="User Preferences", font=header_font)
@@ -397,8 +480,9 @@ def show_preferences(frame):
     pref_frame = ttk.Frame(frame)
     pref_frame.pack(pady=10)
 
-    # Fetch existing preferences
-    existing_prefs = db_operations.get_user_preferences(current_user["user_id"])
+    # Fetch existing preferences (updated in place by refresh)
+    existing_prefs = dict(db_operations.get_user_preferences(current_user["user_id"]))
+    state = {"key": _preferences_key(existing_prefs)}
 
     # Initialize mapping dictionaries
     college_id_map = {}
@@ -447,17 +531,17 @@ def show_preferences(frame):
     college_label = ttk.Label(pref_frame, text="College of:")
     college_label.grid(row=0, column=0, padx=5, pady=5, sticky="e")
     college_var = tk.StringVar()
-    college_combo = ttk.Combobox(
+    college_combo = TypeaheadCombobox(
         pref_frame,
         textvariable=college_var,
-        state="readonly",
+        state="normal",
         width=45,  # Increased width
     )
     college_combo.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
     # Populate Colleges
     colleges = db_operations.get_colleges()
-    college_combo["values"] = [college["name"] for college in colleges]
+    college_combo.set_names([college["name"] for college in colleges])
     college_id_map = {college["name"]: college["college_id"] for college in colleges}
 
     # Set existing preference if available
@@ -472,7 +556,7 @@ def show_preferences(frame):
     department_label = ttk.Label(pref_frame, text="Department:")
     department_label.grid(row=1, column=0, padx=5, pady=5, sticky="e")
     department_var = tk.StringVar()
-    department_combo = ttk.Combobox(
+    department_combo = TypeaheadCombobox(
         pref_frame,
         textvariable=department_var,
         state="disabled",
@@ -496,7 +580,7 @@ def show_preferences(frame):
     degree_label = ttk.Label(pref_frame, text="Degree:")
     degree_label.grid(row=3, column=0, padx=5, pady=5, sticky="e")
     degree_var = tk.StringVar()
-    degree_combo = ttk.Combobox(
+    degree_combo = TypeaheadCombobox(
         pref_frame, textvariable=degree_var, state="disabled", width=45  # Updated width
     )
     degree_combo.grid(row=3, column=1, padx=5, pady=5, sticky="w")
@@ -505,7 +589,7 @@ def show_preferences(frame):
     job_label = ttk.Label(pref_frame, text="Preferred Job:")
     job_label.grid(row=4, column=0, padx=5, pady=5, sticky="e")
     job_var = tk.StringVar()
-    job_combo = ttk.Combobox(
+    job_combo = TypeaheadCombobox(
         pref_frame,
         textvariable=job_var,
         state="disabled",
@@ -521,26 +605,28 @@ def show_preferences(frame):
 
     # Functions to handle dropdown changes
     def on_college_select(event):
+        if event is not None:
+            cancel_prefetch()  # The user changed the selection
         selected_college = college_var.get()
         if selected_college != "Select your college":
             college_id = college_id_map.get(selected_college)
             departments = db_operations.get_departments(college_id)
             if departments:
-                department_combo["values"] = [dept["name"] for dept in departments]
+                department_combo.set_names([dept["name"] for dept in departments])
                 department_id_map.clear()
                 department_id_map.update(
                     {dept["name"]: dept["department_id"] for dept in departments}
                 )
-                department_combo["state"] = "readonly"
+                department_combo["state"] = "normal"
                 department_combo.set("Select your department")
                 degree_level_combo.set("")
                 degree_level_combo["values"] = []
                 degree_level_combo["state"] = "disabled"
                 degree_combo.set("")
-                degree_combo["values"] = []
+                degree_combo.set_names([])
                 degree_combo["state"] = "disabled"
                 job_combo.set("")
-                job_combo["values"] = []
+                job_combo.set_names([])
                 job_combo["state"] = "disabled"
                 job_desc_text.config(state="normal")
                 job_desc_text.delete("1.0", tk.END)
@@ -556,22 +642,24 @@ def show_preferences(frame):
                         on_department_select(None)
         else:
             department_combo.set("")
-            department_combo["values"] = []
+            department_combo.set_names([])
             department_combo["state"] = "disabled"
             degree_level_combo.set("")
             degree_level_combo["values"] = []
             degree_level_combo["state"] = "disabled"
             degree_combo.set("")
-            degree_combo["values"] = []
+            degree_combo.set_names([])
             degree_combo["state"] = "disabled"
             job_combo.set("")
-            job_combo["values"] = []
+            job_combo.set_names([])
             job_combo["state"] = "disabled"
             job_desc_text.config(state="normal")
             job_desc_text.delete("1.0", tk.END)
             job_desc_text.config(state="disabled")
 
     def on_department_select(event):
+        if event is not None:
+            cancel_prefetch()  # The user changed the selection
         selected_department = department_var.get()
         if selected_department != "Select your department":
             department_id = department_id_map.get(selected_department)
@@ -585,10 +673,10 @@ def show_preferences(frame):
                 degree_level_combo["state"] = "readonly"
                 degree_level_combo.set("Select your degree level")
                 degree_combo.set("")
-                degree_combo["values"] = []
+                degree_combo.set_names([])
                 degree_combo["state"] = "disabled"
                 job_combo.set("")
-                job_combo["values"] = []
+                job_combo.set_names([])
                 job_combo["state"] = "disabled"
                 job_desc_text.config(state="normal")
                 job_desc_text.delete("1.0", tk.END)
@@ -607,28 +695,30 @@ def show_preferences(frame):
             degree_level_combo["values"] = []
             degree_level_combo["state"] = "disabled"
             degree_combo.set("")
-            degree_combo["values"] = []
+            degree_combo.set_names([])
             degree_combo["state"] = "disabled"
             job_combo.set("")
-            job_combo["values"] = []
+            job_combo.set_names([])
             job_combo["state"] = "disabled"
             job_desc_text.config(state="normal")
             job_desc_text.delete("1.0", tk.END)
             job_desc_text.config(state="disabled")
 
     def on_degree_level_select(event):
+        if event is not None:
+            cancel_prefetch()  # The user changed the selection
         selected_degree_level = degree_level_var.get()
         if selected_degree_level != "Select your degree level":
             degree_level_id = degree_level_id_map.get(selected_degree_level)
             degrees = db_operations.get_degrees(degree_level_id)
             if degrees:
-                degree_combo["values"] = [deg["name"] for deg in degrees]
+                degree_combo.set_names([deg["name"] for deg in degrees])
                 degree_id_map.clear()
                 degree_id_map.update({deg["name"]: deg["degree_id"] for deg in degrees})
-                degree_combo["state"] = "readonly"
+                degree_combo["state"] = "normal"
                 degree_combo.set("Select your degree")
                 job_combo.set("")
-                job_combo["values"] = []
+                job_combo.set_names([])
                 job_combo["state"] = "disabled"
                 job_desc_text.config(state="normal")
                 job_desc_text.delete("1.0", tk.END)
@@ -642,28 +732,30 @@ def show_preferences(frame):
                         on_degree_select_degree(None)
         else:
             degree_combo.set("")
-            degree_combo["values"] = []
+            degree_combo.set_names([])
             degree_combo["state"] = "disabled"
             job_combo.set("")
-            job_combo["values"] = []
+            job_combo.set_names([])
             job_combo["state"] = "disabled"
             job_desc_text.config(state="normal")
             job_desc_text.delete("1.0", tk.END)
             job_desc_text.config(state="disabled")
 
     def on_degree_select_degree(event):
+        if event is not None:
+            cancel_prefetch()  # The user changed the selection
         selected_degree = degree_var.get()
         if selected_degree != "Select your degree":
             degree_id = degree_id_map.get(selected_degree)
             jobs = db_operations.get_jobs_by_degree(degree_id)
             if jobs:
-                job_combo["values"] = [job["name"] for job in jobs]
+                job_combo.set_names([job["name"] for job in jobs])
                 job_id_map.clear()
                 job_id_to_name_map.clear()
                 for job in jobs:
                     job_id_map[job["name"]] = job["description"]
                     job_id_to_name_map[job["job_id"]] = job["name"]
-                job_combo["state"] = "readonly"
+                job_combo["state"] = "normal"
                 job_combo.set("Select your job")
                 job_desc_text.config(state="normal")
                 job_desc_text.delete("1.0", tk.END)
@@ -680,7 +772,7 @@ def show_preferences(frame):
             else:
                 # No jobs available for the selected degree
                 job_combo.set("No jobs available for this degree.")
-                job_combo["values"] = []
+                job_combo.set_names([])
                 job_combo["state"] = "disabled"
                 job_desc_text.config(state="normal")
                 job_desc_text.delete("1.0", tk.END)
@@ -689,7 +781,7 @@ def show_preferences(frame):
                 logger.info(f"No jobs found for degree_id {degree_id}.")
         else:
             job_combo.set("")
-            job_combo["values"] = []
+            job_combo.set_names([])
             job_combo["state"] = "disabled"
             job_desc_text.config(state="normal")
             job_desc_text.delete("1.0", tk.END)
@@ -700,6 +792,14 @@ def show_preferences(frame):
         if selected_job and selected_job in job_id_map:
             display_job_description(selected_job)
 
+            # Start generating in the background while the user is still on this page
+            job_id = None
+            for jid, jname in job_id_to_name_map.items():
+                if jname == selected_job:
+                    job_id = jid
+                    break
+            prefetch_recommendations(degree_id_map.get(degree_var.get()), job_id)
+
     def display_job_description(job_name):
         """Displays the description of the selected job."""
         description = job_id_map.get(job_name, "No description available.")
@@ -710,18 +810,34 @@ def show_preferences(frame):
         logger.info(f"Displayed description for job: {job_name}")
 
     # Bind the functions to the dropdowns
-    college_combo.bind("<<ComboboxSelected>>", on_college_select)
-    department_combo.bind("<<ComboboxSelected>>", on_department_select)
-    degree_level_combo.bind("<<ComboboxSelected>>", on_degree_level_select)
-    degree_combo.bind("<<ComboboxSelected>>", on_degree_select_degree)
-    job_combo.bind("<<ComboboxSelected>>", on_job_select)
-
-    # Initialize Department Dropdown if existing preferences exist
-    if existing_prefs.get("college_id"):
-        college_name = get_college_name(existing_prefs["college_id"])
-        if college_name in college_id_map:
-            college_combo.set(college_name)
-            on_college_select(None)
+    college_combo.bind("<<ComboboxSelected>>", responsiveness.timed(on_college_select))
+    department_combo.bind(
+        "<<ComboboxSelected>>", responsiveness.timed(on_department_select)
+    )
+    degree_level_combo.bind(
+        "<<ComboboxSelected>>", responsiveness.timed(on_degree_level_select)
+    )
+    degree_combo.bind(
+        "<<ComboboxSelected>>", responsiveness.timed(on_degree_select_degree)
+    )
+    job_combo.bind("<<ComboboxSelected>>", responsiveness.timed(on_job_select))
+
+    def apply_existing_preferences():
+        # Initialize Department Dropdown if existing preferences exist
+        if existing_prefs.get("college_id"):
+            college_name = get_college_name(existing_prefs["college_id"])
+            if college_name in college_id_map:
+                college_combo.set(college_name)
+                on_college_select(None)
+
+    # The stored selections are filled in once the form is on screen: restoring them
+    # walks every catalog level with a query each
+    if build_scheduler is None:
+        apply_existing_preferences()
+    else:
+        state["fill_job"] = build_scheduler.schedule(
+            calls(apply_existing_preferences), name="preferences"
+        )
 
     # Save and Reset Buttons Frame
     button_frame = ttk.Frame(frame)
@@ -794,6 +910,12 @@ def show_preferences(frame):
         )
 
         if success:
+            existing_prefs.clear()
+            existing_prefs.update(preferences)
+            state["key"] = _preferences_key(preferences)
+            prefetch_recommendations(
+                preferences.get("degree_id"), preferences.get("job_id")
+            )
             messagebox.showinfo("Success", "Preferences updated successfully!")
             logger.info("User preferences updated successfully.")
         else:
@@ -801,18 +923,19 @@ def show_preferences(frame):
             logger.error("User preferences update failed.")
 
     def reset_preferences():
+        cancel_prefetch()
         college_combo.set("Select your college")
         department_combo.set("")
-        department_combo["values"] = []
+        department_combo.set_names([])
         department_combo["state"] = "disabled"
         degree_level_combo.set("")
         degree_level_combo["values"] = []
         degree_level_combo["state"] = "disabled"
         degree_combo.set("")
-        degree_combo["values"] = []
+        degree_combo.set_names([])
         degree_combo["state"] = "disabled"
         job_combo.set("")
-        job_combo["values"] = []
+        job_combo.set_names([])
         job_combo["state"] = "disabled"
         job_desc_text.config(state="normal")
         job_desc_text.delete("1.0", tk.END)
@@ -820,15 +943,35 @@ def show_preferences(frame):
         logger.debug("Preferences form reset by user.")
 
     save_btn = ttk.Button(
-        button_frame, text="Save Preferences", command=save_preferences
+        button_frame,
+        text="Save Preferences",
+        command=responsiveness.timed(save_preferences),
     )
     save_btn.grid(row=0, column=0, padx=5)
 
     reset_btn = ttk.Button(
-        button_frame, text="Reset Preferences", command=reset_preferences
+        button_frame,
+        text="Reset Preferences",
+        command=responsiveness.timed(reset_preferences),
     )
     reset_btn.grid(row=0, column=1, padx=5)
 
+    def refresh():
+        prefs = db_operations.get_user_preferences(current_user["user_id"])
+        key = _preferences_key(prefs)
+        if key == state["key"]:
+            return  # Keep the form as the user left it
+        logger.debug("Stored preferences changed; refreshing the form.")
+        existing_prefs.clear()
+        existing_prefs.update(prefs)
+        state["key"] = key
+        if state.get("fill_job") is not None:
+            state["fill_job"].cancel()  # Superseded by the fill below
+        reset_preferences()
+        apply_existing_preferences()
+
+    return refresh
+
 
 def get_current_user_preferences():
     """Fetches the current user's preferences from the database."""
@@ -847,7 +990,7 @@ def get_current_user_preferences():
     return preferences
 
 
-def show_recommendations(frame):
+def show_recommendations():
     """Displays AI-generated course recommendations in the content area."""
     if not login_status:
         messagebox.showerror(
@@ -857,8 +1000,29 @@ def show_recommendations(frame):
         return  # Exit the function without displaying the page
 
     logger.info("Displaying Recommendations Page.")
-    clear_content(frame)
+    views.show("recommendations")
+
+
+def _recommendations_key():
+    """
+    Identifies what the Recommendations page should show for the current user.
+
+    :return: tuple, (user_id, job_id, set_id) of the user's linked recommendation set.
+    """
+    user_id = current_user["user_id"]
+    job_id = db_operations.get_user_preferences(user_id).get("job_id")
+    linked_set = (
+        db_operations.get_user_recommendation_set(user_id, job_id) if job_id else None
+    )
+    return (user_id, job_id, linked_set["set_id"] if linked_set else None)
+
+
+def build_recommendations(frame):
+    """
+    Builds the Recommendations page in the given view frame.
 
+    :return: callable, Reloads the list when the user's linked recommendation set changed.
+    """
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="Course Recommendations", font=header_font)
     header_label.pack(pady=20)
@@ -867,37 +1031,50 @@ def show_recommendations(frame):
     generate_btn = ttk.Button(
         frame,
         text="Generate Recommendations",
-        command=lambda: generate_recommendations_ui(frame),
+        command=responsiveness.timed(
+            lambda: generate_recommendations_ui(frame), "generate_recommendations"
+        ),
     )
     generate_btn.pack(pady=10)
 
     # Recommendations Display Frame
     rec_frame = ttk.Frame(frame)
     rec_frame.pack(pady=10, fill="both", expand=True)
+    frame.binding_key = None  # Key of the recommendations currently displayed
 
-    # Optionally, fetch and display existing recommendations
-    user_prefs = db_operations.get_user_preferences(current_user["user_id"])
-    if user_prefs and user_prefs.get("job_id"):
-        existing_recs = db_operations.get_recommendations(
-            current_user["user_id"], user_prefs["job_id"]
-        )
+    def refresh():
+        key = _recommendations_key()
+        if key == frame.binding_key:
+            return
+        frame.binding_key = key
+
+        # Optionally, fetch and display existing recommendations
+        user_id, job_id, set_id = key
+        if not job_id:
+            clear_content(rec_frame)
+            logger.info("User preferences missing job_id. Please set preferences.")
+            return
+        existing_recs = db_operations.get_recommendations(user_id, job_id)
         if existing_recs:
             display_recommendations(rec_frame, existing_recs)
         else:
+            clear_content(rec_frame)
             logger.info("No existing recommendations to display.")
-    else:
-        logger.info("User preferences missing job_id. Please set preferences.")
+
+    refresh()
+    return refresh
 
 
 # ui/gui.py
 
 
+@tracing.traced("ui.generate_recommendations", new_trace=True)
+@profiling.profiled("generate")
 def generate_recommendations_ui(frame):
     """Generates and displays AI-driven course recommendations."""
     logger.info("Generating course recommendations.")
 
     rec_frame = frame.winfo_children()[-1]  # Get the last child, which is rec_frame
-    clear_content(rec_frame)
 
     # Fetch user preferences
     user_prefs = get_current_user_preferences()
@@ -924,12 +1101,10 @@ def generate_recommendations_ui(frame):
         )
         return
 
-    # Retrieve job_name from job_id
+    # Retrieve the job from job_id
     try:
         job = db_operations.get_job_by_id(job_id)
-        if job:
-            job_name = job["name"]
-        else:
+        if not job:
             logger.error(f"No job found with job_id {job_id}.")
             messagebox.showerror("Error", "Invalid job preference.")
             return
@@ -938,12 +1113,10 @@ def generate_recommendations_ui(frame):
         messagebox.showerror("Error", "Failed to retrieve job information.")
         return
 
-    # Retrieve degree_name from degree_id
+    # Retrieve the degree from degree_id
     try:
         degree = db_operations.get_degree_by_id(degree_id)
-        if degree:
-            degree_name = degree["name"]
-        else:
+        if not degree:
             logger.error(f"No degree found with degree_id {degree_id}.")
             messagebox.showerror("Error", "Invalid degree preference.")
             return
@@ -962,14 +1135,11 @@ def generate_recommendations_ui(frame):
         messagebox.showerror("Error", "Failed to fetch degree electives.")
         return
 
-    # Invoke AI to get recommendations
-    # The required format will be Prepare in the ai_integration/ai_module.py file
+    # Regenerate only what changed since the last generation (see recommendation_pipeline)
     try:
-        recommendations_raw = get_recommendations_ai(
-            job_id, job_name, degree_name, degree_electives
+        status, recommendations = recommendation_pipeline.generate_recommendations(
+            current_user["user_id"], job, degree, degree_electives
         )
-        logger.debug("AI Recommendations Raw Response:")
-        logger.debug(recommendations_raw)
     except Exception as e:
         messagebox.showerror(
             "AI Error", "Failed to generate recommendations. Please try again later."
@@ -977,222 +1147,130 @@ def generate_recommendations_ui(frame):
         logger.error(f"Failed to generate recommendations: {e}")
         return
 
-    # Parse the AI response
-    recommendations = parse_recommendations(recommendations_raw)
     if not recommendations:
         messagebox.showerror(
-            "AI Error", "Failed to parse recommendations. Please try again."
+            "Error", "Failed to load recommendations from the database."
         )
-        logger.error("No recommendations parsed from AI response.")
+        logger.error("No recommendations found after generation.")
+        return
+
+    if status == recommendation_pipeline.UNCHANGED and rec_frame.winfo_children():
+        logger.info("Recommendations are already up to date.")
         return
 
     # Display the recommendations
     display_recommendations_ui(rec_frame, recommendations)
-
-    # Save recommendations to the database
-    try:
-        user_id = current_user["user_id"]  # Access user_id directly from current_user
-        db_operations.clear_recommendations(user_id, job_id)
-        save_recommendations_to_db(user_id, job_id, recommendations)
-        # Debug: Log the recommendations to the logger
-        # log_recommendations(user_id, job_id)
-
-        logger.info("Recommendations generated and saved successfully.")
-    except KeyError as ke:
-        logger.error(f"Error saving recommendations to database: {ke}")
-        messagebox.showerror("Error", f"Error saving recommendations to database: {ke}")
-    except Exception as e:
-        logger.error(f"Error saving recommendations to database: {e}")
-        messagebox.showerror("Error", "Failed to save recommendations to database.")
+    frame.binding_key = _recommendations_key()
+    logger.info(f"Recommendations ready ({status}).")
 
 
-def display_recommendations(frame, recommendations):
+def create_recommendation_row(parent):
     """
-    Displays the list of recommendations in the given frame with toggleable explanations.
+    Builds an empty recommendation row; VirtualList recycles it across recommendations.
 
-    :param frame: ttk.Frame, The parent frame where recommendations will be displayed.
-    :param recommendations: list of dicts, The course recommendations to display.
+    :param parent: The widget the row is placed in.
+    :return: ttk.Frame, The row, with its labels and buttons as attributes.
     """
-    clear_content(frame)
-
-    if not recommendations:
-        messagebox.showinfo("No Recommendations", "No recommendations available.")
-        return
+    row = ttk.Frame(parent, relief="solid", borderwidth=1, padding=(10, 10))
 
-    # Create a Canvas widget inside the frame
-    canvas = tk.Canvas(frame, borderwidth=0, background="#f0f0f0")
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas, padding=(10, 10, 10, 10))
-
-    # Configure the scrollable region
-    scrollable_frame.bind(
-        "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+    # Course Name and Code
+    row.course_label = ttk.Label(
+        row, font=("Helvetica", 12, "bold"), background="#ffffff"
     )
+    row.course_label.pack(anchor="w", padx=5, pady=5)
 
-    # Create a window inside the canvas
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
+    # Units
+    row.units_label = ttk.Label(row, background="#ffffff")
+    row.units_label.pack(anchor="w", padx=5)
 
-    # Pack the canvas and scrollbar into the frame
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    # Rating
+    row.rating_label = ttk.Label(row, background="#ffffff")
+    row.rating_label.pack(anchor="w", padx=5)
 
-    # Iterate through each recommendation and display it
-    for rec in recommendations:
-        rec_container = ttk.Frame(
-            scrollable_frame, relief="solid", borderwidth=1, padding=(10, 10)
-        )
-        rec_container.pack(padx=5, pady=5, fill="x", expand=True)
-
-        # Course Name and Code
-        course_label = ttk.Label(
-            rec_container,
-            text=f"{rec.get('Course Name', 'N/A')} ({rec.get('Course Code', 'N/A')})",
-            font=("Helvetica", 12, "bold"),
-            background="#ffffff",
-        )
-        course_label.pack(anchor="w", padx=5, pady=5)
+    # Prerequisites
+    row.prereq_label = ttk.Label(row, background="#ffffff")
+    row.prereq_label.pack(anchor="w", padx=5, pady=5)
 
-        # Units
-        units = rec.get("Units", "N/A")
-        units_label = ttk.Label(
-            rec_container, text=f"Units: {units}", background="#ffffff"
-        )
-        units_label.pack(anchor="w", padx=5)
+    # Toggle Button for Explanation
+    row.toggle_btn = ttk.Button(row)
+    row.toggle_btn.pack(anchor="w", padx=5, pady=5)
 
-        # Rating
-        rating = rec.get("Rating", "N/A")
-        rating_label = ttk.Label(
-            rec_container, text=f"Rating: {rating}/100", background="#ffffff"
-        )
-        rating_label.pack(anchor="w", padx=5)
+    # Optional: Button to view more details
+    row.details_btn = ttk.Button(row, text="View Details")
+    row.details_btn.pack(anchor="e", padx=5, pady=5)
 
-        # Prerequisites
-        prereqs = rec.get("Prerequisites", "")
-        prereq_text = prereqs if prereqs else "None"
-        prereq_label = ttk.Label(
-            rec_container, text=f"Prerequisites: {prereq_text}", background="#ffffff"
-        )
-        prereq_label.pack(anchor="w", padx=5, pady=5)
-
-        # Toggle Button for Explanation
-        toggle_btn = ttk.Button(rec_container, text="Show Explanation")
-        toggle_btn.pack(anchor="w", padx=5, pady=5)
-
-        # Explanation Label (Initially Hidden)
-        explanation = rec.get("Explanation", "No explanation provided.")
-        explanation_label = ttk.Label(
-            rec_container,
-            text=explanation,
-            wraplength=800,
-            justify="left",
-            background="#e6e6e6",
-            padding=(5, 5),
-        )
-        # Do not pack the explanation_label yet (hidden by default)
+    # Explanation Label (packed only while the row is expanded)
+    row.explanation_label = ttk.Label(
+        row,
+        wraplength=800,
+        justify="left",
+        background="#e6e6e6",
+        padding=(5, 5),
+    )
+    return row
 
-        def toggle_explanation(label=explanation_label, button=toggle_btn):
-            """Toggle the visibility of the explanation label."""
-            if label.winfo_ismapped():
-                label.pack_forget()
-                button.config(text="Show Explanation")
-            else:
-                label.pack(anchor="w", padx=5, pady=5)
-                button.config(text="Hide Explanation")
 
-        toggle_btn.config(command=toggle_explanation)
+def bind_recommendation_row(row, rec, index, expanded, toggle):
+    """
+    Fills a row from create_recommendation_row with one recommendation.
 
-        # Optional: Button to view more details
-        details_btn = ttk.Button(
-            rec_container,
-            text="View Details",
-            command=lambda c=rec: show_course_details(frame, c),
+    :param row: ttk.Frame, The row to fill.
+    :param rec: dict, The recommendation.
+    :param index: int, Position of the recommendation in the list.
+    :param expanded: bool, Whether the explanation is shown.
+    :param toggle: callable, Flips the expanded state of this row.
+    """
+    row.course_label.config(
+        text=f"{rec.get('Course Name', 'N/A')} ({rec.get('Course Code', 'N/A')})"
+    )
+    row.units_label.config(text=f"Units: {rec.get('Units', 'N/A')}")
+    row.rating_label.config(text=f"Rating: {rec.get('Rating', 'N/A')}/100")
+    prereqs = rec.get("Prerequisites", "")
+    row.prereq_label.config(text=f"Prerequisites: {prereqs if prereqs else 'None'}")
+    row.details_btn.config(
+        command=responsiveness.timed(
+            lambda c=rec: show_course_details(row, c), "course_details"
         )
-        details_btn.pack(anchor="e", padx=5, pady=5)
+    )
+    row.toggle_btn.config(command=responsiveness.timed(toggle, "toggle_explanation"))
 
+    if expanded:
+        row.explanation_label.config(
+            text=rec.get("Explanation", "No explanation provided.")
+        )
+        if not row.explanation_label.winfo_manager():
+            row.explanation_label.pack(anchor="w", padx=5, pady=5)
+        row.toggle_btn.config(text="Hide Explanation")
+    else:
+        row.explanation_label.pack_forget()
+        row.toggle_btn.config(text="Show Explanation")
 
-def save_recommendations_to_db(user_id, job_id, recommendations):
-    """
-    Saves the list of course recommendations to the Recommendations table.
 
-    :param user_id: int, The ID of the user.
-    :param job_id: int, The ID of the job associated with the recommendations.
-    :param recommendations: list of dicts, The course recommendations.
-    """
-
-    """
-    Process:
-        Iterate through each recommendation.
-        Extract course_code, rating, explanation, and rank.
-        Fetch course_id using db_operations.get_course_by_code(course_code).
-        Save the recommendation using db_operations.save_recommendation.
+def display_recommendations(frame, recommendations):
     """
+    Displays the list of recommendations in the given frame with toggleable explanations.
 
-    saved_count = 0  # Counter for successfully saved recommendations
+    Only the rows in view exist as widgets (see ui/virtual_list.py), so the cost of
+    rendering does not depend on the number of recommendations.
 
-    for rec in recommendations:
-        # Access fields using indexing instead of .get()
-        course_code = rec["Course Code"] if "Course Code" in rec else None
-        rating = rec["Rating"] if "Rating" in rec else None
-        explanation = (
-            rec["Explanation"] if "Explanation" in rec else "No explanation provided."
-        )
-        rank = rec["Number"] if "Number" in rec else 0  # Assign default rank if missing
-
-        # Validate required fields
-        if not course_code:
-            logger.warning("Recommendation missing 'Course Code'. Skipping.")
-            continue
-        if rating is None:
-            logger.warning(
-                f"Recommendation for {course_code} missing 'Rating'. Skipping."
-            )
-            continue
-
-        # Fetch course_id from course_code
-        course = db_operations.get_course_by_code(course_code)
-        if not course:
-            logger.warning(f"Course with code {course_code} not found in database.")
-            continue  # Skip if course not found
-
-        # Access course_id using indexing
-
-        # Access course_id more reliably
-        course_id = course["course_id"]
-        if course_id is None:
-            logger.warning(f"Course ID for course code {course_code} is missing.")
-            continue  # Skip if course_id is missing
-
-        # Handle rank if 'Number' is missing or invalid
-        if not isinstance(rank, int):
-            logger.warning(
-                f"Recommendation for course {course_code} has invalid 'Number': {rank}. Assigning default rank."
-            )
-            rank = 0  # Assign default rank
+    :param frame: ttk.Frame, The parent frame where recommendations will be displayed.
+    :param recommendations: list of dicts, The course recommendations to display.
+    """
+    clear_content(frame)
 
-        # Save the recommendation
-        try:
-            success = db_operations.save_recommendation(
-                user_id=user_id,
-                job_id=job_id,
-                course_id=course_id,
-                rating=rating,
-                explanation=explanation,
-                rank=rank,
-            )
-            if success:
-                saved_count += 1
-                logger.info(
-                    f"Recommendation for course {course_code} saved successfully."
-                )
-            else:
-                logger.error(f"Failed to save recommendation for course {course_code}.")
-        except Exception as e:
-            logger.error(f"Error saving recommendation for course {course_code}: {e}")
+    if not recommendations:
+        messagebox.showinfo("No Recommendations", "No recommendations available.")
+        return
 
-    logger.info(
-        f"Total Recommendations Saved: {saved_count} out of {len(recommendations)}"
+    rec_list = VirtualList(
+        frame,
+        create_recommendation_row,
+        bind_recommendation_row,
+        scheduler=build_scheduler,
+        padding=(10, 10),
     )
+    rec_list.pack(fill="both", expand=True)
+    rec_list.set_items(recommendations)
 
 
 def log_recommendations(user_id, job_id):
@@ -1232,136 +1310,11 @@ def log_recommendations(user_id, job_id):
         )
 
 
-def parse_recommendations(raw_response):
-    """
-    Parses the raw AI response (JSON string) into a structured list of course recommendations.
-
-    :param raw_response: str, The raw JSON response from the AI model.
-    :return: list of dicts, Each dict contains course details.
-    """
-    recommendations = []
-    try:
-        # Parse the JSON string into a Python list
-        data = json.loads(raw_response)
-        logger.debug("Parsed JSON response successfully.")
-
-        if isinstance(data, list):
-            for course in data:
-                # Optional: Validate required keys
-                required_keys = [
-                    "Course Code",
-                    "Course Name",
-                    "Rating",
-                    "Prerequisites",
-                    "Explanation",
-                ]
-                if all(key in course for key in required_keys):
-                    recommendations.append(course)
-                else:
-                    logger.warning(f"Course data missing required keys: {course}")
-        else:
-            logger.error("AI response is not a list.")
-    except json.JSONDecodeError as jde:
-        logger.error(f"JSON decoding failed: {jde}")
-    except Exception as e:
-        logger.error(f"Error parsing AI recommendations: {e}")
-    return recommendations
-
-
+@tracing.traced("ui.display_recommendations")
+@profiling.profiled("render_recommendations")
 def display_recommendations_ui(rec_frame, recommendations):
     """Displays the list of recommendations in the given frame with toggleable explanations."""
-    clear_content(rec_frame)
-
-    if not recommendations:
-        messagebox.showinfo("No Recommendations", "No recommendations available.")
-        return
-
-    # Create a Canvas widget inside rec_frame
-    canvas = tk.Canvas(rec_frame, borderwidth=0, background="#f0f0f0")
-    scrollbar = ttk.Scrollbar(rec_frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas, padding=(10, 10, 10, 10))
-
-    scrollable_frame.bind(
-        "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    for rec in recommendations:
-        rec_container = ttk.Frame(
-            scrollable_frame, relief="solid", borderwidth=1, padding=(10, 10)
-        )
-        rec_container.pack(padx=5, pady=5, fill="x", expand=True)
-
-        # Course Name and Code
-        course_label = ttk.Label(
-            rec_container,
-            text=f"{rec.get('Course Name', 'N/A')} ({rec.get('Course Code', 'N/A')})",
-            font=("Helvetica", 12, "bold"),
-            background="#ffffff",
-        )
-        course_label.pack(anchor="w", padx=5, pady=5)
-
-        # Units
-        units = rec.get("Units", "N/A")
-        units_label = ttk.Label(
-            rec_container, text=f"Units: {units}", background="#ffffff"
-        )
-        units_label.pack(anchor="w", padx=5)
-
-        # Rating
-        rating = rec.get("Rating", "N/A")
-        rating_label = ttk.Label(
-            rec_container, text=f"Rating: {rating}/100", background="#ffffff"
-        )
-        rating_label.pack(anchor="w", padx=5)
-
-        # Prerequisites
-        prereqs = rec.get("Prerequisites", "")
-        prereq_text = prereqs if prereqs else "None"
-        prereq_label = ttk.Label(
-            rec_container, text=f"Prerequisites: {prereq_text}", background="#ffffff"
-        )
-        prereq_label.pack(anchor="w", padx=5, pady=5)
-
-        # Toggle Button for Explanation
-        toggle_btn = ttk.Button(rec_container, text="Show Explanation")
-        toggle_btn.pack(anchor="w", padx=5, pady=5)
-
-        # Explanation Label (Initially Hidden)
-        explanation = rec.get("Explanation", "No explanation provided.")
-        explanation_label = ttk.Label(
-            rec_container,
-            text=explanation,
-            wraplength=800,
-            justify="left",
-            background="#e6e6e6",
-            padding=(5, 5),
-        )
-        # Do not pack the explanation_label yet (hidden by default)
-
-        def toggle_explanation(label=explanation_label, button=toggle_btn):
-            """Toggle the visibility of the explanation label."""
-            if label.winfo_ismapped():
-                label.pack_forget()
-                button.config(text="Show Explanation")
-            else:
-                label.pack(anchor="w", padx=5, pady=5)
-                button.config(text="Hide Explanation")
-
-        toggle_btn.config(command=toggle_explanation)
-
-        # Optional: Button to view more details
-        details_btn = ttk.Button(
-            rec_container,
-            text="View Details",
-            command=lambda c=rec: show_course_details(rec_container, c),
-        )
-        details_btn.pack(anchor="e", padx=5, pady=5)
+    display_recommendations(rec_frame, recommendations)
 
 
 def show_course_details(parent_frame, course):
@@ -1477,21 +1430,27 @@ def show_course_details(parent_frame, course):
                 f"Unexpected error while sharing course '{course.get('Course Name', 'N/A')}': {e}"
             )
 
-    save_btn = ttk.Button(action_frame, text="Save Course", command=save_course)
+    save_btn = ttk.Button(
+        action_frame, text="Save Course", command=responsiveness.timed(save_course)
+    )
     save_btn.grid(row=0, column=0, padx=5)
 
     share_btn = ttk.Button(
-        action_frame, text="Share with Advisor", command=share_with_advisor
+        action_frame,
+        text="Share with Advisor",
+        command=responsiveness.timed(share_with_advisor),
     )
     share_btn.grid(row=0, column=1, padx=5)
 
     back_btn = ttk.Button(
-        action_frame, text="Back to Recommendations", command=details_window.destroy
+        action_frame,
+        text="Back to Recommendations",
+        command=responsiveness.timed(details_window.destroy, "close_course_details"),
     )
     back_btn.grid(row=0, column=2, padx=5)
 
 
-def show_profile(frame):
+def show_profile():
     """Displays the User Profile and Account Settings in the content area."""
     if not login_status or not current_user:
         messagebox.showerror("Access Denied", "Please log in to access Profile.")
@@ -1499,7 +1458,15 @@ def show_profile(frame):
         return  # Exit the function without displaying the page
 
     logger.info("Displaying Profile Page.")
-    clear_content(frame)
+    views.show("profile")
+
+
+def build_profile(frame):
+    """
+    Builds the User Profile and Account Settings page in the given view frame.
+
+    :return: callable, Updates the profile fields that changed.
+    """
 
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="User Profile", font=header_font)
@@ -1509,19 +1476,30 @@ def show_profile(frame):
     profile_frame = ttk.Frame(frame)
     profile_frame.pack(pady=10)
 
-    user_info = {
-        "Full Name": current_user["full_name"],
-        "Email": current_user["email"],
-        "Student ID": current_user["student_id"],
-        "GPA": current_user["gpa"],
+    user_fields = {
+        "Full Name": "full_name",
+        "Email": "email",
+        "Student ID": "student_id",
+        "GPA": "gpa",
     }
+    user_vars = {}
 
-    for idx, (key, value) in enumerate(user_info.items()):
+    for idx, (key, field) in enumerate(user_fields.items()):
         label = ttk.Label(profile_frame, text=f"{key}:")
         label.grid(row=idx, column=0, padx=5, pady=5, sticky="e")
-        value_label = ttk.Label(profile_frame, text=value)
+        user_vars[field] = tk.StringVar(profile_frame)
+        value_label = ttk.Label(profile_frame, textvariable=user_vars[field])
         value_label.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
 
+    def refresh():
+        for field, var in user_vars.items():
+            value = current_user[field]
+            text = "" if value is None else str(value)
+            if var.get() != text:
+                var.set(text)
+
+    refresh()
+
     # Account Settings Frame
     settings_frame = ttk.LabelFrame(frame, text="Account Settings")
     settings_frame.pack(pady=20, fill="x", padx=20)
@@ -1606,12 +1584,14 @@ def show_profile(frame):
         change_pwd_button = ttk.Button(
             password_change_window,
             text="Change Password",
-            command=perform_password_change,
+            command=responsiveness.timed(perform_password_change),
         )
         change_pwd_button.pack(pady=20)
 
     change_pwd_btn = ttk.Button(
-        settings_frame, text="Change Password", command=change_password
+        settings_frame,
+        text="Change Password",
+        command=responsiveness.timed(change_password),
     )
     change_pwd_btn.pack(pady=10, padx=10, anchor="w")
 
@@ -1625,101 +1605,23 @@ def show_profile(frame):
         )
 
     notif_btn = ttk.Button(
-        settings_frame, text="Manage Notifications", command=manage_notifications
+        settings_frame,
+        text="Manage Notifications",
+        command=responsiveness.timed(manage_notifications),
     )
     notif_btn.pack(pady=10, padx=10, anchor="w")
 
+    return refresh
 
-def show_help(frame):
-    """Displays the Help and Support page in the content area."""
-    logger.info("Displaying Help Page.")
-    clear_content(frame)
 
-    header_font = ("Helvetica", 14, "bold")
-    header_label = ttk.Label(frame, text="Help & Support", font=header_font)
-    header_label.pack(pady=20)
-
-    # Help Content Frame
-    help_frame = ttk.Frame(frame)
-    help_frame.pack(pady=10, padx=20, fill="both", expand=True)
-
-    # Placeholder Help Information
-    help_text = (
-        "Welcome to the Smart Elective Advisor Help Center!\n\n"
-        "If you need assistance navigating the application or have any questions, please refer to the following resources:\n\n"
-        "1. **User Guides:** Comprehensive manuals to help you understand and utilize all features of the application.\n"
-        "2. **FAQs:** Answers to the most commonly asked questions by users.\n"
-        "3. **Contact Support:** If you encounter any issues or need personalized assistance, please contact our support team at support@university.edu.\n\n"
-        "We are here to help you make informed and strategic decisions for your academic journey!"
-    )
-    help_label = ttk.Label(help_frame, text=help_text, wraplength=800, justify="left")
-    help_label.pack(pady=10)
-
-    # Search Help Topics (Placeholder)
-    search_label = ttk.Label(help_frame, text="Search Help Topics:")
-    search_label.pack(pady=5, anchor="w")
-    search_entry = ttk.Entry(help_frame, width=50)
-    search_entry.pack(pady=5, anchor="w")
-
-    def search_help():
-        query = search_entry.get()
-        logger.info(f"User searched for help topic: {query}")
-        # Implement search functionality, possibly via db_operations or AI integration
-        messagebox.showinfo(
-            "Search Help", f"Search functionality for '{query}' is not yet implemented."
-        )
-
-    search_btn = ttk.Button(help_frame, text="Search", command=search_help)
-    search_btn.pack(pady=5, anchor="w")
-
-
-def show_help(frame):
+def show_help():
     """Displays the Help and Support page in the content area."""
     logger.info("Displaying Help Page.")
-    clear_content(frame)
+    views.show("help")
 
-    header_font = ("Helvetica", 14, "bold")
-    header_label = ttk.Label(frame, text="Help & Support", font=header_font)
-    header_label.pack(pady=20)
 
-    # Help Content Frame
-    help_frame = ttk.Frame(frame)
-    help_frame.pack(pady=10, padx=20, fill="both", expand=True)
-
-    # Placeholder Help Information
-    help_text = (
-        "Welcome to the Smart Elective Advisor Help Center!\n\n"
-        "If you need assistance navigating the application or have any questions, please refer to the following resources:\n\n"
-        "1. **User Guides:** Comprehensive manuals to help you understand and utilize all features of the application.\n"
-        "2. **FAQs:** Answers to the most commonly asked questions by users.\n"
-        "3. **Contact Support:** If you encounter any issues or need personalized assistance, please contact our support team at support@university.edu.\n\n"
-        "We are here to help you make informed and strategic decisions for your academic journey!"
-    )
-    help_label = ttk.Label(help_frame, text=help_text, wraplength=800, justify="left")
-    help_label.pack(pady=10)
-
-    # Search Help Topics (Placeholder)
-    search_label = ttk.Label(help_frame, text="Search Help Topics:")
-    search_label.pack(pady=5, anchor="w")
-    search_entry = ttk.Entry(help_frame, width=50)
-    search_entry.pack(pady=5, anchor="w")
-
-    def search_help():
-        query = search_entry.get()
-        logger.info(f"User searched for help topic: {query}")
-        # Implement search functionality, possibly via db_operations or AI integration
-        messagebox.showinfo(
-            "Search Help", f"Search functionality for '{query}' is not yet implemented."
-        )
-
-    search_btn = ttk.Button(help_frame, text="Search", command=search_help)
-    search_btn.pack(pady=5, anchor="w")
-
-
-def show_help(frame):
-    """Displays the Help and Support page in the content area."""
-    logger.info("Displaying Help Page.")
-    clear_content(frame)
+def build_help(frame):
+    """Builds the Help and Support page in the given view frame."""
 
     header_font = ("Helvetica", 14, "bold")
     header_label = ttk.Label(frame, text="Help & Support", font=header_font)
@@ -1755,48 +1657,7 @@ def show_help(frame):
             "Search Help", f"Search functionality for '{query}' is not yet implemented."
         )
 
-    search_btn = ttk.Button(help_frame, text="Search", command=search_help)
-    search_btn.pack(pady=5, anchor="w")
-
-
-def show_help(frame):
-    """Displays the Help and Support page in the content area."""
-    logger.info("Displaying Help Page.")
-    clear_content(frame)
-
-    header_font = ("Helvetica", 14, "bold")
-    header_label = ttk.Label(frame, text="Help & Support", font=header_font)
-    header_label.pack(pady=20)
-
-    # Help Content Frame
-    help_frame = ttk.Frame(frame)
-    help_frame.pack(pady=10, padx=20, fill="both", expand=True)
-
-    # Placeholder Help Information
-    help_text = (
-        "Welcome to the Smart Elective Advisor Help Center!\n\n"
-        "If you need assistance navigating the application or have any questions, please refer to the following resources:\n\n"
-        "1. **User Guides:** Comprehensive manuals to help you understand and utilize all features of the application.\n"
-        "2. **FAQs:** Answers to the most commonly asked questions by users.\n"
-        "3. **Contact Support:** If you encounter any issues or need personalized assistance, please contact our support team at support@university.edu.\n\n"
-        "We are here to help you make informed and strategic decisions for your academic journey!"
+    search_btn = ttk.Button(
+        help_frame, text="Search", command=responsiveness.timed(search_help)
     )
-    help_label = ttk.Label(help_frame, text=help_text, wraplength=800, justify="left")
-    help_label.pack(pady=10)
-
-    # Search Help Topics (Placeholder)
-    search_label = ttk.Label(help_frame, text="Search Help Topics:")
-    search_label.pack(pady=5, anchor="w")
-    search_entry = ttk.Entry(help_frame, width=50)
-    search_entry.pack(pady=5, anchor="w")
-
-    def search_help():
-        query = search_entry.get()
-        logger.info(f"User searched for help topic: {query}")
-        # Implement search functionality, possibly via db_operations or AI integration
-        messagebox.showinfo(
-            "Search Help", f"Search functionality for '{query}' is not yet implemented."
-        )
-
-    search_btn = ttk.Button(help_frame, text="Search", command=search_help)
     search_btn.pack(pady=5, anchor="w")
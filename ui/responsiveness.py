@@ -0,0 +1,300 @@
+# ui/responsiveness.py
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from utilities import metrics
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Samples kept for the exit summary (a 50 ms tick fills this in about 40 minutes)
+MAX_SAMPLES = 50000
+
+# The active monitor, set by start()
+_monitor = None
+
+UI_STALLS = metrics.counter(
+    "ui_stalls_total",
+    "Main loop stalls over the threshold, in wrapped callbacks or elsewhere.",
+    ["source"],
+)
+UI_TICK_LAG_SECONDS = metrics.histogram(
+    "ui_tick_lag_seconds", "Lateness of the main loop's periodic tick."
+)
+UI_CALLBACK_SECONDS = metrics.histogram(
+    "ui_callback_seconds", "Duration of wrapped UI callbacks.", ["callback"]
+)
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _distribution(samples):
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else None,
+    }
+
+
+class ResponsivenessMonitor:
+    """
+    Measures how long the Tk main loop is blocked.
+
+    - A periodic `after` tick records its own lateness (lag) on every run.
+    - Callbacks run through call() (see timed()) record their duration; any callback
+      slower than the threshold is logged.
+    - A watchdog thread notices when the main thread has not reported in for longer
+      than the threshold and samples its stack with sys._current_frames, so a slow
+      callback is logged with the code it was stuck in.
+    """
+
+    def __init__(self, root, tick_ms=50, threshold_ms=100):
+        """
+        :param root: tk.Tk, The main window.
+        :param tick_ms: int, Interval of the lag-measuring tick.
+        :param threshold_ms: float, Blocking time above which a stall is logged.
+        """
+        self.root = root
+        self.tick_ms = tick_ms
+        self.threshold_ms = threshold_ms
+        self._main_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._beat = time.monotonic()  # Last time the main thread reported in
+        self._beat_id = 0
+        self._sample = None  # (beat_id, formatted stack) taken by the watchdog
+        self._lag_ms = deque(maxlen=MAX_SAMPLES)
+        self._callback_ms = deque(maxlen=MAX_SAMPLES)
+        self._callback_stats = {}  # name -> {"count", "total_ms", "max_ms", "slow"}
+        self._callback_ms_since_tick = 0.0
+        self._stalls = 0
+        self._expected_tick = None
+        self._after_id = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        """Starts the tick and the watchdog thread."""
+        self._heartbeat()
+        self._expected_tick = time.monotonic() + self.tick_ms / 1000.0
+        self._after_id = self.root.after(self.tick_ms, self._tick)
+        self._watchdog = threading.Thread(
+            target=self._watch, name="ui-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"UI responsiveness monitor started (tick {self.tick_ms} ms, stall threshold {self.threshold_ms} ms)."
+        )
+
+    def stop(self):
+        """Stops the tick and the watchdog thread."""
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # The root window is already destroyed
+            self._after_id = None
+
+    def call(self, callback, name, *args, **kwargs):
+        """Runs `callback` with timing and stall logging and returns its result."""
+        entry_beat = self._heartbeat()
+        start = time.perf_counter()
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record_callback(name, elapsed_ms, entry_beat)
+            self._heartbeat()
+
+    def summary(self):
+        """
+        Summarizes lag and callback durations.
+
+        :return: dict, Percentiles of tick lag and callback time, stall count and the
+            slowest callbacks.
+        """
+        with self._lock:
+            lag = list(self._lag_ms)
+            callbacks = list(self._callback_ms)
+            stats = {name: dict(stat) for name, stat in self._callback_stats.items()}
+            stalls = self._stalls
+        slowest = sorted(
+            stats.items(), key=lambda item: item[1]["max_ms"], reverse=True
+        )
+        return {
+            "tick_ms": self.tick_ms,
+            "threshold_ms": self.threshold_ms,
+            "stalls": stalls,
+            "tick_lag": _distribution(lag),
+            "callbacks": _distribution(callbacks),
+            "slowest_callbacks": dict(slowest[:10]),
+        }
+
+    # -- internals ----------------------------------------------------------
+
+    def _heartbeat(self):
+        with self._lock:
+            self._beat = time.monotonic()
+            self._beat_id += 1
+            return self._beat_id
+
+    def _take_sample(self, since_beat):
+        """Returns the watchdog's stack sample if it was taken at or after `since_beat`."""
+        with self._lock:
+            if self._sample is not None and self._sample[0] >= since_beat:
+                return self._sample[1]
+        return None
+
+    def _record_callback(self, name, elapsed_ms, entry_beat):
+        UI_CALLBACK_SECONDS.labels(name).observe(elapsed_ms / 1000)
+        with self._lock:
+            self._callback_ms.append(elapsed_ms)
+            self._callback_ms_since_tick += elapsed_ms
+            stat = self._callback_stats.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0}
+            )
+            stat["count"] += 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            slow = elapsed_ms > self.threshold_ms
+            if slow:
+                stat["slow"] += 1
+                self._stalls += 1
+        if slow:
+            UI_STALLS.labels("callback").inc()
+            stack = self._take_sample(entry_beat)
+            logger.warning(
+                f"UI callback '{name}' blocked the main loop for {elapsed_ms:.0f} ms."
+                + (f" Stack while blocked:\n{stack}" if stack else "")
+            )
+
+    def _tick(self):
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - self._expected_tick) * 1000)
+        UI_TICK_LAG_SECONDS.observe(lag_ms / 1000)
+        with self._lock:
+            self._lag_ms.append(lag_ms)
+            # Lag already reported as a slow wrapped callback is not logged twice
+            unexplained_ms = lag_ms - self._callback_ms_since_tick
+            self._callback_ms_since_tick = 0.0
+            beat_id = self._beat_id
+        if unexplained_ms > self.threshold_ms:
+            with self._lock:
+                self._stalls += 1
+            UI_STALLS.labels("loop").inc()
+            stack = self._take_sample(beat_id)
+            logger.warning(
+                f"UI main loop stalled for {lag_ms:.0f} ms outside instrumented callbacks."
+                + (f" Stack while blocked:\n{stack}" if stack else "")
+            )
+
+        self._heartbeat()
+        self._expected_tick = time.monotonic() + self.tick_ms / 1000.0
+        if not self._stop.is_set():
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+
+    def _watch(self):
+        # Sample part-way into a stall so that callbacks just over the threshold
+        # still get a stack; an idle loop beats every tick_ms and never qualifies
+        sample_after_ms = max(self.threshold_ms / 2, self.tick_ms * 1.5)
+        interval = self.threshold_ms / 4000.0
+        while not self._stop.wait(interval):
+            with self._lock:
+                blocked_ms = (time.monotonic() - self._beat) * 1000
+                beat_id = self._beat_id
+                sampled = self._sample is not None and self._sample[0] == beat_id
+            if blocked_ms <= sample_after_ms or sampled:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            with self._lock:
+                self._sample = (beat_id, stack)
+
+
+def start(root, tick_ms=None, threshold_ms=None):
+    """
+    Starts monitoring the main loop of `root` (UI_LAG_TICK_MS / UI_STALL_THRESHOLD_MS).
+
+    :param root: tk.Tk, The main window.
+    :return: ResponsivenessMonitor, The active monitor.
+    """
+    global _monitor
+    _monitor = ResponsivenessMonitor(
+        root,
+        tick_ms=tick_ms or int(os.getenv("UI_LAG_TICK_MS", "50")),
+        threshold_ms=threshold_ms or float(os.getenv("UI_STALL_THRESHOLD_MS", "100")),
+    )
+    _monitor.start()
+    return _monitor
+
+
+def stop(report_path=None):
+    """
+    Stops monitoring, then logs the stall summary and writes it as JSON.
+
+    :param report_path: str, optional, Output file (UI_RESPONSIVENESS_REPORT by default).
+    :return: dict or None, The summary, or None if monitoring was not started.
+    """
+    global _monitor
+    monitor, _monitor = _monitor, None
+    if monitor is None:
+        return None
+    monitor.stop()
+    summary = monitor.summary()
+    lag = summary["tick_lag"]
+    if lag["count"]:
+        logger.info(
+            f"UI stall summary: {summary['stalls']} stall(s); tick lag p50 {lag['p50_ms']:.1f} ms, "
+            f"p95 {lag['p95_ms']:.1f} ms, p99 {lag['p99_ms']:.1f} ms."
+        )
+
+    report_path = report_path or os.getenv(
+        "UI_RESPONSIVENESS_REPORT", "ui_responsiveness.json"
+    )
+    try:
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(summary, report_file, indent=4)
+        logger.info(f"UI responsiveness summary written to {report_path}")
+    except OSError as e:
+        logger.error(f"Could not write UI responsiveness summary: {e}")
+    return summary
+
+
+def timed(callback, name=None):
+    """
+    Wraps a Tk command or event callback with timing.
+
+    The wrapper looks up the monitor at call time, so callbacks may be wrapped before
+    start() is called; without a monitor they run untimed.
+
+    :param callback: callable, The callback.
+    :param name: str, optional, Name used in logs (the callback's qualified name by default).
+    :return: callable, The wrapped callback.
+    """
+    name = name or getattr(callback, "__qualname__", repr(callback))
+
+    @functools.wraps(callback)
+    def wrapper(*args, **kwargs):
+        monitor = _monitor
+        if monitor is None:
+            return callback(*args, **kwargs)
+        return monitor.call(callback, name, *args, **kwargs)
+
+    return wrapper
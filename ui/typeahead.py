@@ -0,0 +1,220 @@
+# ui/typeahead.py
+
+import bisect
+import logging
+import os
+import re
+import time
+import unicodedata
+from tkinter import ttk
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Quiet time after the last keystroke before the list is filtered
+DEBOUNCE_MS = int(os.getenv("TYPEAHEAD_DEBOUNCE_MS", "150"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Lowercases `text`, strips accents and collapses punctuation to single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Prefix and trigram index over a fixed list of names.
+
+    Matches are ranked in tiers, each kept in the original list order: names that
+    start with the query, names with a word that starts with the query (e.g. "eng"
+    finds "Civil Engineering"), names where every typed word starts a word ("comp
+    sci"), then names that contain the query anywhere. The prefix tiers are bisected
+    from sorted key lists and the substring tier intersects trigram posting sets, so
+    no tier scans every name.
+    """
+
+    def __init__(self, names):
+        """
+        :param names: iterable of str, The names to index, in display order.
+        """
+        self.names = list(names)
+        self._name_set = set(self.names)
+        self._keys = [normalize(name) for name in self.names]
+        self._name_keys = sorted((key, i) for i, key in enumerate(self._keys))
+        self._word_keys = sorted(
+            {
+                (key[start:], i)
+                for i, key in enumerate(self._keys)
+                for start in self._word_starts(key)
+            }
+        )
+        self._postings = {}  # trigram -> set of name indexes
+        for i, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                self._postings.setdefault(trigram, set()).add(i)
+
+    def __contains__(self, name):
+        return name in self._name_set
+
+    @staticmethod
+    def _word_starts(key):
+        return [0] + [i + 1 for i, ch in enumerate(key) if ch == " "]
+
+    @staticmethod
+    def _prefix_range(sorted_keys, prefix):
+        lo = bisect.bisect_left(sorted_keys, (prefix,))
+        hi = bisect.bisect_left(sorted_keys, (prefix + "\uffff",))
+        return (i for _, i in sorted_keys[lo:hi])
+
+    def search(self, query, limit=None):
+        """
+        Returns the names matching `query`, best matches first.
+
+        :param query: str, The text typed so far.
+        :param limit: int, optional, Maximum number of names to return.
+        :return: list of str, Matching names (every name for an empty query).
+        """
+        key = normalize(query)
+        if not key:
+            return self.names[:limit] if limit else list(self.names)
+
+        seen = set()
+        ranked = []
+        tiers = [
+            self._prefix_range(self._name_keys, key),
+            self._prefix_range(self._word_keys, key),
+            self._word_prefix_matches(key),
+            self._substring_matches(key),
+        ]
+        for tier in tiers:
+            matches = sorted(set(tier) - seen)
+            seen.update(matches)
+            ranked.extend(matches)
+            if limit and len(ranked) >= limit:
+                break
+        if limit:
+            ranked = ranked[:limit]
+        return [self.names[i] for i in ranked]
+
+    def _word_prefix_matches(self, key):
+        words = key.split(" ")
+        if len(words) < 2:
+            return []  # Same as the word tier
+        candidates = None
+        for word in words:
+            matches = set(self._prefix_range(self._word_keys, word))
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        return candidates
+
+    def _substring_matches(self, key):
+        if len(key) < 3:
+            return []  # Shorter queries are covered by the prefix tiers
+        candidates = None
+        # Rarest trigrams first keeps the intersections small
+        for trigram in sorted(
+            _trigrams(key), key=lambda t: len(self._postings.get(t, ()))
+        ):
+            posting = self._postings.get(trigram)
+            if not posting:
+                return []
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return []
+        # Trigrams can match out of order, so confirm the substring
+        return [i for i in candidates if key in self._keys[i]]
+
+
+class TypeaheadCombobox(ttk.Combobox):
+    """
+    A combobox whose drop-down list is filtered by what the user types.
+
+    Behaves like a read-only combobox for callers: <<ComboboxSelected>> fires when a
+    name is picked from the list (or with Return on the best match), and text that
+    does not match a name is reverted when the widget loses focus. Filtering waits
+    until typing pauses for `debounce_ms`.
+    """
+
+    def __init__(self, parent, debounce_ms=None, **kwargs):
+        """
+        :param parent: The parent widget.
+        :param debounce_ms: int, optional, Pause before filtering (TYPEAHEAD_DEBOUNCE_MS).
+        """
+        super().__init__(parent, **kwargs)
+        self.debounce_ms = DEBOUNCE_MS if debounce_ms is None else debounce_ms
+        self.index = NameIndex([])
+        self._committed = ""  # Last text set by the program or picked by the user
+        self._after_id = None
+
+        # A bindtag after the widget's own, so callers can still bind() these events
+        tag = f"TypeaheadCombobox{id(self)}"
+        self.bind_class(tag, "<KeyRelease>", self._on_key)
+        self.bind_class(tag, "<Return>", self._on_return)
+        self.bind_class(tag, "<FocusIn>", self._on_focus_in)
+        self.bind_class(tag, "<FocusOut>", self._on_focus_out)
+        self.bind_class(tag, "<<ComboboxSelected>>", self._on_selected)
+        tags = self.bindtags()
+        self.bindtags(tags[:1] + (tag,) + tags[1:])
+
+    def set_names(self, names):
+        """Replaces the selectable names and rebuilds the index."""
+        self._cancel_filter()
+        self.index = NameIndex(names)
+        self["values"] = self.index.names
+
+    def set(self, value):
+        super().set(value)
+        self._committed = value
+
+    def _cancel_filter(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _on_key(self, event):
+        if event.keysym in ("Return", "Escape", "Up", "Down", "Tab"):
+            return
+        self._cancel_filter()
+        self._after_id = self.after(self.debounce_ms, self._filter)
+
+    def _filter(self):
+        self._after_id = None
+        start = time.perf_counter()
+        matches = self.index.search(self.get())
+        self["values"] = matches
+        logger.debug(
+            f"Filtered {len(self.index.names)} names to {len(matches)} in "
+            f"{(time.perf_counter() - start) * 1000:.2f} ms."
+        )
+
+    def _on_return(self, event):
+        self._cancel_filter()
+        text = self.get()
+        matches = self.index.search(text, limit=1)
+        if matches and text not in self.index:
+            super().set(matches[0])
+        if self.get() in self.index:
+            self.event_generate("<<ComboboxSelected>>")
+        return "break"
+
+    def _on_selected(self, event):
+        self._committed = self.get()
+        self["values"] = self.index.names
+
+    def _on_focus_in(self, event):
+        # Typing replaces the current text (often a "Select your ..." prompt)
+        self.select_range(0, "end")
+        self.icursor("end")
+
+    def _on_focus_out(self, event):
+        self._cancel_filter()
+        if self.get() not in self.index:
+            super().set(self._committed)
+        self["values"] = self.index.names
@@ -0,0 +1,121 @@
+# ui/views.py
+
+import logging
+import statistics
+import time
+from collections import deque
+from tkinter import ttk
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Latency samples kept per view and navigation kind
+LATENCY_SAMPLES = 100
+
+
+class ViewRegistry:
+    """
+    Builds each screen once and switches between them by hiding and showing frames.
+
+    A view is registered with a `build(frame)` function that creates its widgets in a
+    dedicated frame and may return a `refresh()` callable. The first navigation to a
+    view builds it; later navigations only call `refresh()`, which should update the
+    data bindings that changed since the view was last shown.
+
+    Navigation latency is measured from the call to `show` until Tk has processed the
+    resulting idle work (geometry and redraw), and is kept separately for first builds
+    and revisits.
+    """
+
+    def __init__(self, container):
+        """
+        :param container: The widget views are placed in; it must use the grid manager
+            with row 0 and column 0 configured to expand.
+        """
+        self.container = container
+        self._specs = {}  # name -> {"build", "user_scoped"}
+        self._views = {}  # name -> {"frame", "refresh"}
+        self.current = None
+        self._latencies = {}  # (name, "build" | "revisit") -> deque of ms
+
+    def register(self, name, build, user_scoped=False):
+        """
+        Registers a view.
+
+        :param name: str, The view name used with show().
+        :param build: callable, Creates the view's widgets in the given frame and
+            optionally returns a refresh callable.
+        :param user_scoped: bool, Discard the view on invalidate_user_views() (logout).
+        """
+        self._specs[name] = {"build": build, "user_scoped": user_scoped}
+
+    def show(self, name):
+        """
+        Shows a view, building it on first use and refreshing it otherwise.
+
+        :param name: str, A registered view name.
+        :return: ttk.Frame, The view's frame.
+        """
+        start = time.perf_counter()
+        view = self._views.get(name)
+        built = view is None
+        if built:
+            frame = ttk.Frame(self.container)
+            try:
+                refresh = self._specs[name]["build"](frame)
+            except Exception:
+                frame.destroy()
+                raise
+            view = {"frame": frame, "refresh": refresh}
+            self._views[name] = view
+        elif view["refresh"] is not None:
+            view["refresh"]()
+
+        if self.current != name:
+            previous = self._views.get(self.current)
+            if previous is not None:
+                previous["frame"].grid_remove()
+            view["frame"].grid(row=0, column=0, sticky="nsew")
+            self.current = name
+
+        kind = "build" if built else "revisit"
+        self.container.after_idle(self._record, name, kind, start)
+        return view["frame"]
+
+    def invalidate(self, name):
+        """Destroys a cached view so that the next show() rebuilds it."""
+        view = self._views.pop(name, None)
+        if view is None:
+            return
+        view["frame"].destroy()
+        if self.current == name:
+            self.current = None
+
+    def invalidate_user_views(self):
+        """Destroys every user-scoped view, e.g. after logout."""
+        for name, spec in self._specs.items():
+            if spec["user_scoped"]:
+                self.invalidate(name)
+
+    def get_metrics(self):
+        """
+        Summarizes navigation latency.
+
+        :return: dict, "<view>/<build|revisit>" -> {"count", "mean_ms", "p95_ms", "max_ms"}.
+        """
+        summary = {}
+        for (name, kind), samples in self._latencies.items():
+            ordered = sorted(samples)
+            summary[f"{name}/{kind}"] = {
+                "count": len(ordered),
+                "mean_ms": statistics.mean(ordered),
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                "max_ms": ordered[-1],
+            }
+        return summary
+
+    def _record(self, name, kind, start):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._latencies.setdefault((name, kind), deque(maxlen=LATENCY_SAMPLES)).append(
+            elapsed_ms
+        )
+        logger.debug(f"Navigation to '{name}' ({kind}) took {elapsed_ms:.1f} ms.")
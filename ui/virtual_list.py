@@ -0,0 +1,369 @@
+# ui/virtual_list.py
+
+import logging
+import tkinter as tk
+from tkinter import ttk
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+
+class HeightIndex:
+    """
+    Fenwick (binary indexed) tree over row heights.
+
+    Gives the y offset of a row and the row at a given y offset in O(log n), and
+    updates a single height in O(log n), so scrolling cost does not grow with the
+    number of rows.
+    """
+
+    def __init__(self, count, default_height):
+        self.count = count
+        self.heights = [default_height] * count
+        self._tree = [0] * (count + 1)
+        # Linear-time build: push each node's sum into its parent
+        for i in range(1, count + 1):
+            self._tree[i] += default_height
+            parent = i + (i & -i)
+            if parent <= count:
+                self._tree[parent] += self._tree[i]
+
+    def set(self, index, height):
+        """Sets the height of row `index`."""
+        delta = height - self.heights[index]
+        if not delta:
+            return
+        self.heights[index] = height
+        i = index + 1
+        while i <= self.count:
+            self._tree[i] += delta
+            i += i & -i
+
+    def offset(self, index):
+        """Returns the y offset of row `index` (the sum of all heights above it)."""
+        total = 0
+        i = index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def total(self):
+        """Returns the height of all rows together."""
+        return self.offset(self.count)
+
+    def find(self, y):
+        """Returns the index of the row that contains offset `y` (clamped to the list)."""
+        if self.count == 0:
+            return 0
+        position = 0
+        remaining = y
+        step = 1 << self.count.bit_length()
+        while step:
+            candidate = position + step
+            if candidate <= self.count and self._tree[candidate] <= remaining:
+                position = candidate
+                remaining -= self._tree[candidate]
+            step >>= 1
+        return min(position, self.count - 1)
+
+
+class VirtualList(ttk.Frame):
+    """
+    A scrollable list that only keeps widgets for the rows in view.
+
+    Row widgets are created by `create_row(parent)` and filled by
+    `bind_row(row, item, index, expanded, toggle)`; when a row scrolls out of view its
+    widget goes back to a pool and is rebound to the next row that scrolls in. Each
+    row's measured height is cached per expanded state, so the scroll region stays
+    exact without building every row.
+
+    With a BuildScheduler, only the rows in the viewport are built synchronously;
+    the overscan rows above and below are built in later idle slices.
+    """
+
+    def __init__(
+        self,
+        parent,
+        create_row,
+        bind_row,
+        estimated_row_height=150,
+        row_gap=10,
+        overscan=2,
+        background="#f0f0f0",
+        scheduler=None,
+        **kwargs,
+    ):
+        """
+        :param parent: The parent widget.
+        :param create_row: callable, Builds an empty row widget under the given parent.
+        :param bind_row: callable, Fills a row widget with an item. `expanded` is the
+            row's expanded state and `toggle` a callable that flips it.
+        :param estimated_row_height: int, Height assumed for rows not yet measured.
+        :param row_gap: int, Vertical space between rows in pixels.
+        :param overscan: int, Rows kept built above and below the viewport.
+        :param background: str, Canvas background color.
+        :param scheduler: BuildScheduler, optional, Builds overscan rows in idle slices.
+        """
+        super().__init__(parent, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.estimated_row_height = estimated_row_height
+        self.row_gap = row_gap
+        self.overscan = overscan
+        self.scheduler = scheduler
+        self._fill_job = None  # Pending overscan build
+        self._measure_id = None  # Pending measurement of overscan rows
+
+        self.canvas = tk.Canvas(
+            self,
+            borderwidth=0,
+            highlightthickness=0,
+            background=background,
+            yscrollincrement=20,
+        )
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.items = []
+        self._heights = HeightIndex(0, estimated_row_height)
+        self._measured = {}  # (index, expanded) -> height including row_gap
+        self._expanded = set()
+        self._unmeasured = set()  # Overscan rows built but not yet measured
+        self._visible = {}  # index -> (row, window_id)
+        self._pool = []  # [(row, window_id)] not currently showing an item
+        self._width = 1
+
+        # Wheel events reach the list from the canvas and every row widget
+        self._wheel_tag = f"VirtualListWheel{id(self)}"
+        self.bind_class(self._wheel_tag, "<MouseWheel>", self._on_mousewheel)
+        self.bind_class(self._wheel_tag, "<Button-4>", self._on_mousewheel)
+        self.bind_class(self._wheel_tag, "<Button-5>", self._on_mousewheel)
+        self._add_wheel_tag(self.canvas)
+        self.canvas.bind("<Configure>", self._on_resize)
+
+    # -- public API ---------------------------------------------------------
+
+    def set_items(self, items):
+        """Replaces the list contents and scrolls back to the top."""
+        for index in list(self._visible):
+            self._release(index)
+        self.items = list(items)
+        self._heights = HeightIndex(len(self.items), self.estimated_row_height)
+        self._measured.clear()
+        self._expanded.clear()
+        self._unmeasured.clear()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def is_expanded(self, index):
+        return index in self._expanded
+
+    def toggle_expanded(self, index):
+        """Flips the expanded state of row `index` and re-lays out the list."""
+        expanded = index not in self._expanded
+        if expanded:
+            self._expanded.add(index)
+        else:
+            self._expanded.discard(index)
+        cached = self._measured.get((index, expanded))
+        if cached is not None:
+            self._heights.set(index, cached)
+        if index in self._visible:
+            row, _ = self._visible[index]
+            self._bind(row, index)
+            self._measure([index])
+        self.refresh()
+
+    def refresh(self):
+        """Builds, recycles and positions row widgets for the current scroll position."""
+        if self._fill_job is not None:
+            self._fill_job.cancel()
+            self._fill_job = None
+        if not self.items:
+            self.canvas.configure(scrollregion=(0, 0, self._width, 0))
+            return
+
+        viewport_top = self.canvas.canvasy(0)
+        viewport_height = max(self.canvas.winfo_height(), 1)
+        anchor = self._anchor()
+        first = anchor[0]
+        last = self._heights.find(viewport_top + viewport_height)
+        keep_first = max(0, first - self.overscan)
+        keep_last = min(len(self.items) - 1, last + self.overscan)
+
+        for index in list(self._visible):
+            if not keep_first <= index <= keep_last:
+                self._release(index)
+
+        if self.scheduler is None:
+            first, last = keep_first, keep_last
+        self._build_rows([i for i in range(first, last + 1) if i not in self._visible])
+        self._layout(anchor)
+
+        deferred = [
+            i for i in range(keep_first, keep_last + 1) if i not in self._visible
+        ]
+        if deferred:
+            self._fill_job = self.scheduler.schedule(
+                self._fill(deferred), name="virtual-list-overscan"
+            )
+
+    def destroy(self):
+        if self._measure_id is not None:
+            self.after_cancel(self._measure_id)
+            self._measure_id = None
+        super().destroy()
+
+    def stats(self):
+        """
+        Returns widget counts for diagnostics.
+
+        :return: dict, Keys 'items', 'visible_rows', 'pooled_rows' and 'measured_rows'.
+        """
+        return {
+            "items": len(self.items),
+            "visible_rows": len(self._visible),
+            "pooled_rows": len(self._pool),
+            "measured_rows": len(self._measured),
+        }
+
+    # -- internals ----------------------------------------------------------
+
+    def _anchor(self):
+        """Returns the row at the top of the viewport and how far into it the view is."""
+        viewport_top = self.canvas.canvasy(0)
+        anchor = self._heights.find(viewport_top)
+        return anchor, viewport_top - self._heights.offset(anchor)
+
+    def _build_rows(self, indexes):
+        for index in indexes:
+            row, window_id = self._acquire()
+            self._visible[index] = (row, window_id)
+            self._bind(row, index)
+        self._measure(indexes)
+
+    def _layout(self, anchor):
+        """Updates the scroll region and row positions after rows were measured."""
+        total = self._heights.total()
+        self.canvas.configure(scrollregion=(0, 0, self._width, total))
+
+        # Keep the row at the top of the viewport still when rows above it were measured
+        index, delta = anchor
+        viewport_top = self.canvas.canvasy(0)
+        top = self._heights.offset(index) + delta
+        if total and abs(top - viewport_top) >= 1:
+            self.canvas.yview_moveto(top / total)
+
+        for index, (_, window_id) in self._visible.items():
+            if index in self._unmeasured:
+                continue  # Shown once measured
+            self.canvas.coords(window_id, 0, self._heights.offset(index))
+            self.canvas.itemconfigure(window_id, state="normal")
+
+    def _fill(self, indexes):
+        """
+        Build job for overscan rows: one row per step.
+
+        The rows are measured in a separate idle callback rather than here, since
+        update_idletasks() inside a build slice would run other idle callbacks,
+        including the scheduler's next slice.
+        """
+        for index in indexes:
+            if index in self._visible:
+                continue
+            row, window_id = self._acquire()
+            self._visible[index] = (row, window_id)
+            self._bind(row, index)
+            self._unmeasured.add(index)
+            # Queued behind the layout of the row just bound
+            if self._measure_id is not None:
+                self.after_cancel(self._measure_id)
+            self._measure_id = self.after_idle(self._measure_built)
+            yield
+        self._fill_job = None
+
+    def _measure_built(self):
+        """Measures and shows the overscan rows once Tk has laid them out."""
+        self._measure_id = None
+        indexes = [index for index in self._unmeasured if index in self._visible]
+        self._unmeasured.clear()
+        if indexes:
+            anchor = self._anchor()
+            self._record_heights(indexes)
+            self._layout(anchor)
+
+    def _add_wheel_tag(self, widget):
+        widget.bindtags((self._wheel_tag,) + widget.bindtags())
+        for child in widget.winfo_children():
+            self._add_wheel_tag(child)
+
+    def _acquire(self):
+        if self._pool:
+            return self._pool.pop()
+        row = self.create_row(self.canvas)
+        self._add_wheel_tag(row)
+        window_id = self.canvas.create_window(
+            0, 0, window=row, anchor="nw", width=self._width, state="hidden"
+        )
+        return row, window_id
+
+    def _release(self, index):
+        row, window_id = self._visible.pop(index)
+        self._unmeasured.discard(index)
+        self.canvas.itemconfigure(window_id, state="hidden")
+        self._pool.append((row, window_id))
+
+    def _bind(self, row, index):
+        self.bind_row(
+            row,
+            self.items[index],
+            index,
+            index in self._expanded,
+            lambda i=index: self.toggle_expanded(i),
+        )
+
+    def _measure(self, indexes):
+        if not indexes:
+            return
+        self.canvas.update_idletasks()  # One layout pass for every new row
+        self._record_heights(indexes)
+
+    def _record_heights(self, indexes):
+        """Caches the requested heights of rows Tk has already laid out."""
+        for index in indexes:
+            row, _ = self._visible[index]
+            height = row.winfo_reqheight() + self.row_gap
+            self._measured[(index, index in self._expanded)] = height
+            self._heights.set(index, height)
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            # Windows reports multiples of 120, macOS small deltas
+            step = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        if step:
+            self.canvas.yview_scroll(step, "units")
+            self.refresh()
+
+    def _on_resize(self, event):
+        if event.width == self._width:
+            self.refresh()
+            return
+        self._width = event.width
+        for _, window_id in list(self._visible.values()) + self._pool:
+            self.canvas.itemconfigure(window_id, width=self._width)
+        # Wrapped text may change height with the width
+        self._measured.clear()
+        self._measure(list(self._visible))
+        self.refresh()
@@ -30,3 +30,14 @@ def load_environment():
     # API key is valid
     logger.info("API Key loaded successfully.")
     print("API Key loaded successfully.")
+
+
+def apply_service_defaults():
+    """
+    Sets the defaults shared by the API server and the worker processes, unless the
+    environment already chooses otherwise.
+    """
+    # Many concurrent requests share the file unless another profile is chosen
+    os.environ.setdefault("DB_STORAGE_PROFILE", "server")
+    # Responses belong to many users; keep them out of the shared courses.json
+    os.environ.setdefault("AI_SAVE_RESPONSE", "False")
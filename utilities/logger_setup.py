@@ -1,21 +1,121 @@
 # utilities/logger_setup.py
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
 
 # Add other file to use the logger
 # import logging
 # logger = logging.getLogger(__name__)  # Reuse the global logger
 
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s:%(lineno)d %(message)s"
+
+_listener = None  # The QueueListener writing records to the real handlers
+_queue_handler = None  # The root handler feeding it
+_owner_pid = None  # A forked child inherits the handler but not the listener thread
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Passes at most `rate` records per second from each logger, in bursts of up to
+    `burst` records (a token bucket per logger name). Warnings and errors always pass.
+    The number of records dropped is appended to the next record that passes.
+    """
+
+    def __init__(self, rate, burst=None, min_exempt_level=logging.WARNING):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.min_exempt_level = min_exempt_level
+        self._buckets = {}  # logger name -> [tokens, last refill time, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.min_exempt_level:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.msg = f"{record.msg} [{dropped} earlier message(s) suppressed]"
+        return True
+
+
+def _build_handlers():
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.getenv("LOG_FILE", "app.log"),
+        mode="a",
+        maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+        encoding="utf-8",
+    )
+    handlers = [logging.StreamHandler(), file_handler]  # Console and rotating file
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
 
-# TODO: Log Rotation: Implement log rotation to prevent log files from growing indefinitely.
 def setup_logger():
-    # Set up logging globally
-    logging.basicConfig(
-        level=logging.INFO,  # Change to DEBUG for more detailed logs
-        format="%(asctime)s %(levelname)s %(name)s:%(lineno)d %(message)s",
-        handlers=[
-            logging.StreamHandler(),  # Console output
-            logging.FileHandler("app.log", mode="a"),  # Log file (append mode)
-        ],
+    """
+    Sets up logging globally.
+
+    Records are put on an in-memory queue by the calling thread and written to the
+    console and to a size-rotated log file by a background listener thread, so
+    logging never blocks on I/O. Configured with LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT and LOG_RATE_LIMIT (records per second per logger below
+    WARNING; 0 turns sampling off). Calling it again has no effect.
+
+    :return: logging.Logger, The logger of this module.
+    """
+    global _listener, _queue_handler, _owner_pid
+    if _listener is not None and _owner_pid == os.getpid():
+        return logging.getLogger(__name__)
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    rate = float(os.getenv("LOG_RATE_LIMIT", "50"))
+    if rate > 0:
+        # Filter before enqueueing so dropped records cost no formatting or I/O
+        queue_handler.addFilter(RateLimitFilter(rate, burst=rate * 2))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(queue_handler)
+    _queue_handler = queue_handler
+    _owner_pid = os.getpid()
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *_build_handlers(), respect_handler_level=True
     )
+    _listener.start()
+    atexit.register(stop_logger)
     return logging.getLogger(__name__)  # Return the root logger for global usage
+
+
+def stop_logger():
+    """Writes out the queued records and stops the listener thread."""
+    global _listener, _queue_handler
+    if _listener is None or _owner_pid != os.getpid():
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = _queue_handler = None
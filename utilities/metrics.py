@@ -0,0 +1,360 @@
+# utilities/metrics.py
+"""
+In-process metrics: counters, gauges and fixed-bucket histograms, exported in the
+Prometheus text format.
+
+Metrics are module-level objects created once where they are measured:
+
+    DB_QUERY_SECONDS = metrics.histogram(
+        "db_query_seconds", "Database function latency.", ["function"]
+    )
+
+    @metrics.timed(DB_QUERY_SECONDS)
+    def get_job_by_id(job_id): ...
+
+The API serves them at GET /metrics for scraping. Other processes (the GUI, the CLI,
+workers) write them to METRICS_FILE on exit, for the node_exporter textfile collector
+or for comparing runs; a "{pid}" in the file name is replaced by the process ID.
+"""
+
+import atexit
+import bisect
+import functools
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Latency buckets in seconds, from sub-millisecond queries to slow model calls
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_registry = {}  # metric name -> metric, in creation order
+_registry_lock = threading.Lock()
+_metrics_file = None
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """Base of the metric types: one value (or histogram) per label combination."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **labels):
+        """Returns the child for a label combination, given in order or by name."""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} needs labels {self.labelnames}.")
+        return self.labels()
+
+    def collect(self):
+        """Returns the exposition lines of this metric."""
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            lines.extend(self._sample_lines(values, child))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """A value that only goes up (requests, hits, tokens); name it "..._total"."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        self._default().inc(amount)
+
+    def _sample_lines(self, values, child):
+        labels = _label_text(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, or is read from a function when collected."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._default().dec(amount)
+
+    def set_function(self, function):
+        """Reads the (unlabelled) value from `function()` whenever it is collected."""
+        self._function = function
+
+    def collect(self):
+        if self._function is not None:
+            try:
+                self.set(self._function())
+            except Exception as e:
+                logger.error(f"Could not read gauge {self.name}: {e}")
+        return super().collect()
+
+    def _sample_lines(self, values, child):
+        labels = _label_text(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # Per bucket; cumulated when exported
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)  # First bucket >= value
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager observing the duration of its block in seconds."""
+        return _Timer(self)
+
+
+class _Timer:
+    def __init__(self, target):
+        self.target = target
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.target.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    """Counts observations (usually durations in seconds) into fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def _sample_lines(self, values, child):
+        with child._lock:
+            counts = list(child.counts)
+            count, total = child.count, child.sum
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _label_text(
+                self.labelnames, values, [("le", _format_value(bound))]
+            )
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _label_text(self.labelnames, values, [("le", "+Inf")])
+        lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def _register(metric_class, name, *args, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = metric_class(name, *args, **kwargs)
+        elif not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    """Returns the counter called `name`, creating it on first use."""
+    return _register(Counter, name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=()):
+    """Returns the gauge called `name`, creating it on first use."""
+    return _register(Gauge, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """Returns the histogram called `name`, creating it on first use."""
+    return _register(Histogram, name, documentation, labelnames, buckets)
+
+
+def timed(metric, label="function"):
+    """
+    Decorator observing each call's duration in a histogram labelled with the
+    function name.
+
+    :param metric: Histogram, With a single label named `label`.
+    :param label: str, The label that receives the function name.
+    """
+
+    def decorator(function):
+        child = metric.labels(**{label: function.__name__})
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def render():
+    """
+    Returns every registered metric in the Prometheus text exposition format.
+
+    :return: str, Text for a /metrics response or a .prom file.
+    """
+    with _registry_lock:
+        registered = list(_registry.values())
+    lines = []
+    for metric in registered:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path=None):
+    """
+    Writes the metrics to a file atomically (written next to it, then renamed).
+
+    :param path: str, optional, Output path (defaults to METRICS_FILE).
+    :return: str or None, The path written, or None if no path is configured.
+    """
+    path = path or _metrics_file
+    if not path:
+        return None
+    path = path.replace("{pid}", str(os.getpid()))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as metrics_output:
+        metrics_output.write(render())
+    os.replace(temp_path, path)
+    return path
+
+
+def setup_metrics():
+    """Writes the metrics to METRICS_FILE on exit, if set (call after loading .env)."""
+    global _metrics_file
+    metrics_file = os.getenv("METRICS_FILE")
+    if metrics_file and _metrics_file is None:
+        _metrics_file = metrics_file
+        atexit.register(_write_at_exit)
+
+
+def _write_at_exit():
+    try:
+        path = write_textfile()
+        logger.info(f"Wrote metrics to {path}.")
+    except OSError as e:
+        logger.error(f"Could not write the metrics file: {e}")
@@ -0,0 +1,195 @@
+# utilities/profiling.py
+"""
+Profiling hooks around named operations, switched on by environment variables.
+
+    PROFILE_CPU=startup,login,generate
+        Runs each listed operation under cProfile and writes
+        <PROFILE_DIR>/<operation>-<timestamp>-<pid>-<n>.prof (open with snakeviz or
+        python -m pstats), logging the top functions by cumulative time. One CPU
+        profile runs at a time per process; operations that start while another is
+        being profiled run unprofiled.
+    PROFILE_ALLOCATIONS=catalog_load,render_recommendations
+        Takes tracemalloc snapshots before and after each listed operation and writes
+        the allocation difference to <operation>-<timestamp>-<pid>-<n>.alloc.txt,
+        logging
+        the top lines by allocated size.
+    PROFILE_DIR=profiles, PROFILE_TOP_N=20
+
+"all" selects every operation. Operations used by the application: startup,
+catalog_load, login, generate and render_recommendations. When neither variable is
+set, profile() and @profiled only check one flag.
+"""
+
+import contextlib
+import cProfile
+import functools
+import io
+import itertools
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+_active = False  # True once setup_profiling() found something to profile
+_cpu_operations = frozenset()
+_allocation_operations = frozenset()
+_output_dir = "profiles"
+_top_n = 20
+_cpu_lock = threading.Lock()
+_cpu_owner = None  # Thread running the active CPU profile (one per process)
+_allocation_lock = threading.Lock()
+_allocation_users = 0  # Allocation profiles running (tracemalloc is process-wide)
+_started_tracemalloc = False
+_sequence = itertools.count(1)  # Keeps file names unique within a second
+
+
+def _parse(value):
+    return frozenset(name.strip() for name in (value or "").split(",") if name.strip())
+
+
+def setup_profiling():
+    """Reads the PROFILE_* variables (call after loading the environment)."""
+    global _active, _cpu_operations, _allocation_operations, _output_dir, _top_n
+    _cpu_operations = _parse(os.getenv("PROFILE_CPU"))
+    _allocation_operations = _parse(os.getenv("PROFILE_ALLOCATIONS"))
+    _output_dir = os.getenv("PROFILE_DIR", "profiles")
+    _top_n = int(os.getenv("PROFILE_TOP_N", "20"))
+    _active = bool(_cpu_operations or _allocation_operations)
+    if _active:
+        os.makedirs(_output_dir, exist_ok=True)
+        logger.info(
+            f"Profiling enabled: CPU {sorted(_cpu_operations) or '-'}, "
+            f"allocations {sorted(_allocation_operations) or '-'}; output in {_output_dir}."
+        )
+
+
+def _selected(operations, name):
+    return name in operations or "all" in operations
+
+
+def _output_path(name, suffix):
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(
+        _output_dir, f"{name}-{timestamp}-{os.getpid()}-{next(_sequence)}{suffix}"
+    )
+
+
+@contextlib.contextmanager
+def _cpu_profile(name):
+    global _cpu_owner
+    # Only one cProfile profiler can be active in a process (Python 3.12+ raises
+    # for a second one), so concurrent operations are run unprofiled
+    with _cpu_lock:
+        owner = _cpu_owner
+        if owner is None:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # Another profiling tool, e.g. a debugger
+                logger.info(f"Not profiling '{name}': {e}")
+                owner = "other"
+            else:
+                _cpu_owner = threading.get_ident()
+    if owner is not None:
+        if owner != threading.get_ident():
+            logger.info(f"Not profiling '{name}': another CPU profile is running.")
+        yield  # Otherwise an enclosing operation in this thread is being profiled
+        return
+
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _cpu_lock:
+            _cpu_owner = None
+        try:
+            path = _output_path(name, ".prof")
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_top_n)
+            logger.info(
+                f"CPU profile of '{name}' written to {path}:\n{summary.getvalue()}"
+            )
+        except (OSError, TypeError) as e:  # TypeError: no calls were recorded
+            logger.error(f"Could not write the CPU profile of '{name}': {e}")
+
+
+@contextlib.contextmanager
+def _allocation_profile(name):
+    global _allocation_users, _started_tracemalloc
+    with _allocation_lock:
+        if _allocation_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        _allocation_users += 1
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        with _allocation_lock:
+            _allocation_users -= 1
+            if _allocation_users == 0 and _started_tracemalloc:
+                tracemalloc.stop()
+                _started_tracemalloc = False
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        differences = after.filter_traces(filters).compare_to(
+            before.filter_traces(filters), "lineno"
+        )
+        total = sum(difference.size_diff for difference in differences)
+        path = _output_path(name, ".alloc.txt")
+        with open(path, "w", encoding="utf-8") as allocation_output:
+            allocation_output.write(
+                f"Allocation difference for '{name}': {total / 1024:.1f} KiB net, "
+                f"{peak / 1024:.1f} KiB peak traced\n"
+            )
+            for difference in differences:
+                allocation_output.write(f"{difference}\n")
+        top = "\n".join(str(difference) for difference in differences[:_top_n])
+        logger.info(
+            f"Allocations of '{name}' ({total / 1024:.1f} KiB net) written to {path}:\n{top}"
+        )
+
+
+def profile(name):
+    """
+    Profiles the enclosed block if the operation is selected.
+
+    :param name: str, Operation name matched against PROFILE_CPU and PROFILE_ALLOCATIONS.
+    :return: context manager.
+    """
+    if not _active:
+        return contextlib.nullcontext()
+    return _profile(name)
+
+
+@contextlib.contextmanager
+def _profile(name):
+    with contextlib.ExitStack() as stack:
+        if _selected(_allocation_operations, name):
+            stack.enter_context(_allocation_profile(name))
+        if _selected(_cpu_operations, name):
+            stack.enter_context(_cpu_profile(name))
+        yield
+
+
+def profiled(name):
+    """Decorator form of profile(); the selection is checked on every call."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return function(*args, **kwargs)
+            with profile(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,274 @@
+# utilities/tracing.py
+"""
+Lightweight request tracing with nested spans.
+
+A span times one step (a database query, prompt building, the model call, ...). Spans
+opened while another span is active become its children and share its trace ID, so
+one "Generate Recommendations" click or API request yields a single trace. The active
+span is kept in a context variable: it follows asyncio tasks automatically, and
+wrap() carries it into thread pools and the model scheduler's worker threads.
+
+Tracing is off unless TRACE_FILE is set (or enable() is called). When off, span() and
+@traced cost one flag check. Finished spans are kept in memory and written on exit
+(or by export()) in the Chrome trace event format, which can be opened in
+chrome://tracing, edge://tracing or https://ui.perfetto.dev. A "{pid}" in the file
+name is replaced by the process ID, so worker processes do not overwrite each other's
+traces.
+
+Usage:
+    from utilities import tracing
+
+    @tracing.traced()
+    def get_job_by_id(job_id): ...
+
+    with tracing.span("model.invoke", tokens=estimated_tokens):
+        result = model.invoke(prompt)
+"""
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+# Finished spans kept for export; older spans are dropped beyond this
+MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "100000"))
+
+_enabled = False
+_trace_file = None
+_spans = []
+_dropped = 0
+_lock = threading.Lock()
+_current = contextvars.ContextVar("current_span", default=None)
+
+# Chrome traces use microsecond timestamps; anchor perf_counter to the wall clock so
+# traces from several processes line up
+_EPOCH_OFFSET_US = time.time() * 1e6 - time.perf_counter() * 1e6
+
+
+class Span:
+    """One timed step of a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start",
+        "end",
+        "thread_id",
+        "thread_name",
+    )
+
+    def __init__(self, name, parent, attributes, new_trace=False):
+        self.name = name
+        self.trace_id = (
+            uuid.uuid4().hex[:16] if new_trace or parent is None else parent.trace_id
+        )
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = None if new_trace or parent is None else parent.span_id
+        self.attributes = attributes
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.start = time.perf_counter()
+        self.end = None
+
+    def set(self, **attributes):
+        """Adds attributes (shown as the event's args in the trace viewer)."""
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    """Stands in for a span while tracing is off."""
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(trace_file=None):
+    """
+    Turns tracing on.
+
+    :param trace_file: str, optional, Where export() writes by default; also written
+        when the process exits.
+    """
+    global _enabled, _trace_file
+    _trace_file = trace_file or _trace_file
+    if not _enabled:
+        _enabled = True
+        atexit.register(_export_at_exit)
+        logger.info(f"Tracing enabled; spans are written to {_trace_file}.")
+
+
+def setup_tracing():
+    """Enables tracing if TRACE_FILE is set (call after loading the environment)."""
+    trace_file = os.getenv("TRACE_FILE")
+    if trace_file:
+        enable(trace_file)
+
+
+def is_enabled():
+    return _enabled
+
+
+def current_span():
+    """Returns the active span, or None."""
+    return _current.get()
+
+
+def current_trace_id():
+    """Returns the active trace ID, or None outside a trace."""
+    active = _current.get()
+    return active.trace_id if active else None
+
+
+@contextlib.contextmanager
+def _span(name, new_trace, attributes):
+    active = Span(name, _current.get(), attributes, new_trace)
+    token = _current.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        active.end = time.perf_counter()
+        _current.reset(token)
+        _record(active)
+
+
+def span(name, new_trace=False, **attributes):
+    """
+    Times the enclosed block as a child of the active span.
+
+    :param name: str, Span name shown in the trace viewer.
+    :param new_trace: bool, Start a new trace even inside another span.
+    :param attributes: Values recorded with the span.
+    :return: context manager yielding the Span (a no-op object when tracing is off).
+    """
+    if not _enabled:
+        return contextlib.nullcontext(_NULL_SPAN)
+    return _span(name, new_trace, attributes)
+
+
+def traced(name=None, new_trace=False):
+    """
+    Decorator that runs each call of the function in a span.
+
+    :param name: str, optional, Span name; defaults to "<module>.<function>" without
+        the package prefix.
+    :param new_trace: bool, Start a new trace for every call (entry points).
+    """
+
+    def decorator(function):
+        span_name = name or (
+            f"{function.__module__.rsplit('.', 1)[-1]}.{function.__qualname__}"
+        )
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _span(span_name, new_trace, {}):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def wrap(function):
+    """
+    Binds a callable to the current context, so spans it opens in another thread
+    (thread pools, scheduler workers) join the caller's trace.
+    """
+    if not _enabled:
+        return function
+    return functools.partial(contextvars.copy_context().run, function)
+
+
+def _record(finished):
+    global _dropped
+    with _lock:
+        _spans.append(finished)
+        if len(_spans) > MAX_SPANS:
+            _dropped += len(_spans) - MAX_SPANS
+            del _spans[: len(_spans) - MAX_SPANS]
+
+
+def _event(finished, pid):
+    args = {
+        "trace_id": finished.trace_id,
+        "span_id": finished.span_id,
+        "parent_id": finished.parent_id,
+    }
+    args.update({key: _arg(value) for key, value in finished.attributes.items()})
+    return {
+        "name": finished.name,
+        "cat": finished.name.split(".", 1)[0],
+        "ph": "X",
+        "ts": _EPOCH_OFFSET_US + finished.start * 1e6,
+        "dur": (finished.end - finished.start) * 1e6,
+        "pid": pid,
+        "tid": finished.thread_id,
+        "args": args,
+    }
+
+
+def _arg(value):
+    return (
+        value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+    )
+
+
+def export(trace_file=None, clear=True):
+    """
+    Writes the finished spans as a Chrome trace JSON file.
+
+    :param trace_file: str, optional, Output path (defaults to the enabled file).
+    :param clear: bool, Forget the written spans.
+    :return: str or None, The path written, or None if there was nothing to write.
+    """
+    path = (trace_file or _trace_file or "trace.json").replace(
+        "{pid}", str(os.getpid())
+    )
+    with _lock:
+        finished = list(_spans)
+        if clear:
+            _spans.clear()
+    if not finished:
+        return None
+
+    pid = os.getpid()
+    events = [_event(item, pid) for item in finished]
+    thread_names = {item.thread_id: item.thread_name for item in finished}
+    events.extend(
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": n}}
+        for tid, n in thread_names.items()
+    )
+    with open(path, "w", encoding="utf-8") as trace_output:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_output)
+    logger.info(
+        f"Wrote {len(finished)} span(s) to {path}"
+        + (f" ({_dropped} older span(s) dropped)." if _dropped else ".")
+    )
+    return path
+
+
+def _export_at_exit():
+    try:
+        export()
+    except OSError as e:
+        logger.error(f"Could not write the trace file: {e}")
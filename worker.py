@@ -0,0 +1,235 @@
+# worker.py
+"""
+Recommendation generation workers for the durable job queue (database/job_queue.py).
+
+Each worker process claims a job, runs the recommendation pipeline (model call and
+persistence) while renewing its lease, and records the outcome. Start several
+processes here, or on other machines that share the database file, to scale out.
+
+Usage:
+    python worker.py --processes 4             # run workers until interrupted
+    python worker.py --once                     # drain the queue, then exit
+    python worker.py --enqueue 183:1 183:1:3    # degree:job[:user] jobs to queue
+    python worker.py --stats                    # print queue depth and latency
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from ai_integration import recommendation_pipeline
+from ai_integration.ai_module import main_int_ai
+from database import db_operations, job_queue, query_log, shared_catalog
+from database.db_setup import main_int_db
+from utilities import metrics, tracing
+from utilities.load_env import apply_service_defaults, load_environment
+from utilities.logger_setup import setup_logger
+
+logger = logging.getLogger(__name__)  # Reuse the global logger
+
+LEASE_SECONDS = float(os.getenv("WORKER_LEASE_SECONDS", "60"))
+POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "1.0"))
+
+
+class LeaseKeeper(threading.Thread):
+    """Renews a job's lease in the background while the job runs."""
+
+    def __init__(self, generation_job_id, worker_id, lease_seconds):
+        super().__init__(name=f"lease-{generation_job_id}", daemon=True)
+        self.generation_job_id = generation_job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.lease_seconds / 3):
+            if not job_queue.heartbeat(
+                self.generation_job_id, self.worker_id, self.lease_seconds
+            ):
+                self.lost = True
+                logger.warning(
+                    f"Lost the lease on generation job {self.generation_job_id}."
+                )
+                return
+
+    def stop(self):
+        self._stop_event.set()
+
+
+@tracing.traced("worker.job", new_trace=True)
+def process_job(job, catalog=None):
+    """
+    Runs the pipeline for a claimed job.
+
+    :param job: dict, The claimed Generation_Jobs row.
+    :param catalog: SharedCatalog, optional, The attached shared catalog.
+    :return: tuple, (result_status, set_id).
+    :raises ValueError: If the job refers to unknown or incomplete inputs (permanent).
+    :raises RuntimeError: If the model call or persistence failed (retryable).
+    """
+    user_id, career_job, degree, degree_electives = (
+        recommendation_pipeline.resolve_inputs(
+            job["user_id"], job["degree_id"], job["job_id"], catalog
+        )
+    )
+    if user_id is None:
+        status, set_id, _ = recommendation_pipeline.generate_recommendation_set(
+            career_job, degree, degree_electives, priority=job["priority"]
+        )
+        return status, set_id
+
+    status, _ = recommendation_pipeline.generate_recommendations(
+        user_id, career_job, degree, degree_electives, priority=job["priority"]
+    )
+    linked = db_operations.get_user_recommendation_set(user_id, job["job_id"])
+    return status, linked["set_id"] if linked else None
+
+
+def run_worker(worker_id, lease_seconds=LEASE_SECONDS, poll=POLL_SECONDS, once=False):
+    """
+    Claims and runs jobs until stopped (SIGINT/SIGTERM) or, with `once`, until the
+    queue has no available job.
+
+    :return: int, The number of jobs processed.
+    """
+    stopping = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopping.set())
+
+    processed = 0
+    logger.info(f"Worker {worker_id} started.")
+    while not stopping.is_set():
+        job = job_queue.claim(worker_id, lease_seconds)
+        if job is None:
+            if once:
+                break
+            stopping.wait(poll)
+            continue
+
+        generation_job_id = job["generation_job_id"]
+        logger.info(
+            f"Worker {worker_id} running generation job {generation_job_id} (attempt {job['attempts']})."
+        )
+        keeper = LeaseKeeper(generation_job_id, worker_id, lease_seconds)
+        keeper.start()
+        start = time.perf_counter()
+        try:
+            status, set_id = process_job(job, shared_catalog.attach())
+        except ValueError as e:
+            job_queue.fail(generation_job_id, worker_id, str(e), retry=False)
+            logger.error(f"Generation job {generation_job_id} failed: {e}")
+        except Exception as e:
+            job_queue.fail(generation_job_id, worker_id, str(e))
+            logger.error(f"Generation job {generation_job_id} attempt failed: {e}")
+        else:
+            if job_queue.complete(generation_job_id, worker_id, status, set_id):
+                logger.info(
+                    f"Generation job {generation_job_id} {status} set {set_id} in "
+                    f"{time.perf_counter() - start:.1f} s."
+                )
+            else:
+                logger.warning(
+                    f"Generation job {generation_job_id} finished after its lease was lost."
+                )
+        finally:
+            keeper.stop()
+        processed += 1
+
+    logger.info(f"Worker {worker_id} stopped after {processed} job(s).")
+    return processed
+
+
+def _worker_process(index, lease_seconds, poll, once):
+    # Library code prints progress messages; workers only log
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_logger()
+        try:
+            load_environment()
+        except ValueError as e:
+            logger.error(f"Error loading environment: {e}")
+        tracing.setup_tracing()
+        metrics.setup_metrics()
+        query_log.setup_query_log()
+        apply_service_defaults()
+        main_int_ai()
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        run_worker(worker_id, lease_seconds, poll, once)
+
+
+def parse_job_spec(spec):
+    """Parses 'degree_id:job_id[:user_id]' into enqueue() keyword arguments."""
+    parts = [int(part) for part in spec.split(":")]
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Expected degree:job[:user], got '{spec}'.")
+    return {
+        "degree_id": parts[0],
+        "job_id": parts[1],
+        "user_id": parts[2] if len(parts) == 3 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run recommendation generation workers."
+    )
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS)
+    parser.add_argument(
+        "--once", action="store_true", help="Exit when no job is available."
+    )
+    parser.add_argument(
+        "--db-setup",
+        action="store_true",
+        help="Run the schema setup and CSV import before starting.",
+    )
+    parser.add_argument("--enqueue", nargs="+", type=parse_job_spec, metavar="SPEC")
+    parser.add_argument("--stats", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.db_setup:
+        with contextlib.redirect_stdout(sys.stderr):
+            setup_logger()
+            main_int_db()
+
+    if args.enqueue or args.stats:
+        ids = [job_queue.enqueue(**spec) for spec in args.enqueue or []]
+        report = {"enqueued": ids} if args.enqueue else {}
+        if args.stats:
+            report["stats"] = job_queue.get_queue_stats()
+        print(json.dumps(report, indent=4))
+        return 0 if None not in ids else 1
+
+    processes = [
+        multiprocessing.Process(
+            target=_worker_process,
+            args=(index, args.lease, args.poll, args.once),
+            name=f"worker-{index}",
+        )
+        for index in range(max(1, args.processes))
+    ]
+    # Every worker maps the same read-only file; rebuilt only after a catalog change
+    shared_catalog.publish_if_stale()
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Each worker got the SIGINT too and stops after its current job
+        for process in processes:
+            process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())